@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Checkpoint bytes-written benchmark: full snapshots vs delta checkpoints.
+
+Grows a synthetic IdeaDag the way a real run does (expansion fan-out, visit
+leaves carrying ``content_full`` / ``links_full`` / ``link_contexts``, parent
+status flips) and saves a checkpoint after every step with each mode. No
+network, no LLM.
+
+Usage::
+
+    PYTHONPATH=services:services/agent python scripts/bench_checkpoint_bytes.py
+    PYTHONPATH=services:services/agent python scripts/bench_checkpoint_bytes.py --steps 80 --compact-every 20
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Mirror the runner's import roots so this works from a plain checkout.
+_ROOT = Path(__file__).resolve().parent.parent
+for _p in (_ROOT / "services", _ROOT / "services" / "agent"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from agent.app.idea_checkpointer import FileCheckpointer  # noqa: E402
+from agent.app.idea_dag import IdeaDag  # noqa: E402
+from agent.app.idea_policies.base import IdeaNodeStatus  # noqa: E402
+
+
+def _grow(graph: IdeaDag, step: int, page_chars: int) -> None:
+    """Mutate ``graph`` like one engine step: add a visit leaf, flip a parent."""
+    parents = [n for n in graph.iter_breadth_first() if len(n.children) < 3]
+    parent = parents[0]
+    links = [f"https://en.wikipedia.org/wiki/Page_{step}_{i}" for i in range(60)]
+    child = graph.add_child(
+        parent.node_id,
+        f"visit page {step}",
+        details={
+            "action": "visit",
+            "url": links[0],
+            "content_full": ("lorem ipsum dolor sit amet " * (page_chars // 27 + 1))[:page_chars],
+            "links_full": links,
+            "link_contexts": {link: f"context for {link}" for link in links},
+        },
+    )
+    graph.update_status(child.node_id, IdeaNodeStatus.DONE)
+    graph.update_status(parent.node_id, IdeaNodeStatus.ACTIVE)
+
+
+async def _run(mode: str, steps: int, compact_every: int, page_chars: int) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        cp = FileCheckpointer(root_dir=tmp, mode=mode, compact_every=compact_every)
+        graph = IdeaDag(root_title="bench", root_details={"mandate": "bench"})
+        started = time.perf_counter()
+        for step in range(steps):
+            _grow(graph, step, page_chars)
+            await cp.save_step("bench", step, {"graph": graph.to_dict(), "current_id": graph.root_id()})
+        elapsed = time.perf_counter() - started
+        return {"mode": mode, "bytes": cp.bytes_written, "seconds": elapsed}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=60)
+    parser.add_argument("--compact-every", type=int, default=10)
+    parser.add_argument("--page-chars", type=int, default=40_000)
+    args = parser.parse_args()
+
+    rows = [
+        asyncio.run(_run(mode, args.steps, args.compact_every, args.page_chars))
+        for mode in ("full", "delta")
+    ]
+    full_bytes = rows[0]["bytes"] or 1
+    print(f"steps={args.steps} compact_every={args.compact_every} page_chars={args.page_chars}")
+    print(f"{'mode':<8}{'bytes written':>16}{'MB':>10}{'vs full':>10}{'seconds':>10}")
+    for row in rows:
+        print(
+            f"{row['mode']:<8}{row['bytes']:>16,}{row['bytes'] / 1e6:>10.1f}"
+            f"{row['bytes'] / full_bytes:>10.1%}{row['seconds']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
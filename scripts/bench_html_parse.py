@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Visit-page HTML parsing benchmark: single-pass ``parse_page`` vs the old path.
+
+The old ``_parse_visit_html`` built two BeautifulSoup trees per page (one in
+``clean_operation``, which then ran a ``find_all`` pass per selector, and one
+for links/title/h1). This replays that multi-pass path next to
+``observation.parse_page`` over stored ``web_fixtures`` pages and reports
+pages/sec and peak traced memory for each, plus whether the extracted main
+text and links agree. ``--concurrent N`` also times N pages landing at once
+through the thread executor vs the parse process pool (``parse_pool``). With
+no fixtures on disk it falls back to synthetic Wikipedia-shaped pages. No
+network.
+
+Usage::
+
+    PYTHONPATH=services:services/agent python scripts/bench_html_parse.py
+    PYTHONPATH=services:services/agent python scripts/bench_html_parse.py --fixtures-dir /path/to/web_fixtures --rounds 5
+    PYTHONPATH=services:services/agent python scripts/bench_html_parse.py --synthetic 20
+    PYTHONPATH=services:services/agent python scripts/bench_html_parse.py --concurrent 4
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+# Mirror the runner's import roots so this works from a plain checkout.
+_ROOT = Path(__file__).resolve().parent.parent
+for _p in (_ROOT / "services", _ROOT / "services" / "agent"):
+    if str(_p) not in sys.path:
+        sys.path.insert(0, str(_p))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+from agent.app import observation  # noqa: E402
+from agent.app import parse_pool  # noqa: E402
+
+
+def _legacy_parse(html: str) -> Tuple[str, List[Tuple[str, str]], str, str]:
+    """The pre-single-pass path: multi-pass clean on one tree, links/title/h1 on a second."""
+    soup = BeautifulSoup(html, "html.parser")
+    for tag_name in observation._STRIP_TAGS:
+        for tag in soup.find_all(tag_name):
+            tag.decompose()
+    for role in observation._STRIP_ROLES:
+        for tag in soup.find_all(attrs={"role": role}):
+            tag.decompose()
+    for elem_id in observation._REMOVE_IDS:
+        tag = soup.find(id=elem_id)
+        if tag:
+            tag.decompose()
+    for tag in soup.find_all(id=observation._REMOVE_ID_PREFIX):
+        tag.decompose()
+    for cls in observation._REMOVE_CLASSES:
+        for tag in soup.find_all(class_=cls):
+            tag.decompose()
+    target = soup.find(class_="mw-parser-output") or (
+        soup.find("main")
+        or soup.find(id="mw-content-text")
+        or soup.find(id="bodyContent")
+        or soup.find(id="content")
+        or soup.find("article")
+        or soup.find(id="main-content")
+        or soup.find(class_="main-content")
+        or soup.find(role="main")
+    ) or soup
+    text = target.get_text(separator="\n", strip=True)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = re.sub("|".join(observation._JUNK_LINE_PATTERNS), "", text, flags=re.MULTILINE)
+    text = re.sub(r"\n{3,}", "\n\n", text).strip()
+
+    soup = BeautifulSoup(html, "html.parser")
+    links = [(a.get("href"), a.get_text(strip=True)) for a in soup.find_all("a", href=True) if a.get("href")]
+    title_tag = soup.find("title")
+    h1_tag = soup.find("h1")
+    return (
+        text,
+        links,
+        title_tag.get_text(strip=True) if title_tag else "",
+        h1_tag.get_text(separator=" ", strip=True) if h1_tag else "",
+    )
+
+
+def _single_pass(html: str) -> Tuple[str, List[Tuple[str, str]], str, str]:
+    page = observation.parse_page(html)
+    return page.main_text, page.links, page.title, page.h1
+
+
+def _synthetic_page(i: int, sections: int = 40) -> str:
+    """A Wikipedia-shaped page: Vector chrome, TOC, navboxes, references, body."""
+    body = []
+    for s in range(sections):
+        body.append(
+            f'<h2 id="s{s}">Section {s}<span class="mw-editsection">[edit]</span></h2>'
+            f'<p>Paragraph {s} of page {i} with <a href="/wiki/Topic_{i}_{s}">topic {s}</a> and '
+            f'<a href="/wiki/Other_{s}">other</a> text.<sup class="reference"><a href="#cite{s}">[{s}]</a></sup></p>'
+            f'<table class="infobox"><tr><td>key {s}</td><td>value {s}</td></tr></table>'
+        )
+    nav = "".join(f'<li><a href="/wiki/Nav_{n}">Nav {n}</a></li>' for n in range(200))
+    refs = "".join(f'<li id="cite{r}">Reference {r}</li>' for r in range(sections))
+    return (
+        f"<html><head><title>Page {i} - Wikipedia</title><style>.x{{}}</style>"
+        f"<script>var x = {i};</script></head><body>"
+        f'<a class="mw-jump-link" href="#content">Jump to content</a>'
+        f'<header class="vector-header"><nav id="p-navigation"><ul>{nav}</ul></nav></header>'
+        f'<div id="vector-toc"><ul>{nav[:4000]}</ul></div>'
+        f'<main id="content"><h1 id="firstHeading">Page <i>{i}</i></h1>'
+        f'<div id="mw-content-text"><div class="mw-parser-output">'
+        f'<div class="shortdescription">Short description</div>{"".join(body)}'
+        f'<div class="navbox"><ul>{nav}</ul></div><ol class="references">{refs}</ol>'
+        f"</div></div></main>"
+        f'<div id="catlinks">Categories</div><footer id="footer">Footer</footer>'
+        f"</body></html>"
+    )
+
+
+def _load_pages(fixtures_dir: Path) -> List[str]:
+    pages = []
+    if not fixtures_dir.is_dir():
+        return pages
+    for path in sorted(fixtures_dir.glob("*.json")):
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        data = payload.get("data")
+        if payload.get("method") == "GET" and isinstance(data, str) and "<html" in data[:2000].lower():
+            pages.append(data)
+    return pages
+
+
+def _measure(fn: Callable[[str], tuple], pages: List[str], rounds: int) -> dict:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for html in pages:
+            fn(html)
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    for html in pages:
+        fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"pages_per_sec": len(pages) * rounds / elapsed, "peak_mb": peak / 1e6}
+
+
+async def _concurrent_wall(pages: List[str], workers: int) -> float:
+    """Wall seconds to parse ``pages`` all at once: threads if ``workers`` is 0, else processes."""
+    loop = asyncio.get_running_loop()
+    if workers:
+        parse_pool.get_parse_executor(workers)
+        # Wait out the warm-up so start-up isn't billed to the first batch.
+        await parse_pool.parse_page_offloaded(pages[0], workers=workers, min_bytes=0)
+    started = time.perf_counter()
+    if workers:
+        await asyncio.gather(*(parse_pool.parse_page_offloaded(p, workers=workers, min_bytes=0) for p in pages))
+    else:
+        await asyncio.gather(*(loop.run_in_executor(None, observation.parse_page, p) for p in pages))
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures-dir", type=Path, default=None)
+    parser.add_argument("--synthetic", type=int, default=10, help="Synthetic pages when no fixtures are found")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--concurrent", type=int, default=0, help="Also time N simultaneous pages: threads vs processes")
+    args = parser.parse_args()
+
+    if args.fixtures_dir is None:
+        from agent.app.web_fixtures import _fixtures_dir
+        args.fixtures_dir = _fixtures_dir()
+    pages = _load_pages(args.fixtures_dir)
+    source = f"{len(pages)} fixture pages from {args.fixtures_dir}"
+    if not pages:
+        pages = [_synthetic_page(i) for i in range(args.synthetic)]
+        source = f"{len(pages)} synthetic pages (no fixtures in {args.fixtures_dir})"
+
+    mismatches = sum(1 for html in pages if _legacy_parse(html) != _single_pass(html))
+    rows = [
+        ("legacy", _measure(_legacy_parse, pages, args.rounds)),
+        (f"single[{observation.HTML_PARSER}]", _measure(_single_pass, pages, args.rounds)),
+    ]
+    avg_kb = sum(len(p) for p in pages) / len(pages) / 1e3
+    print(f"{source}, avg {avg_kb:.0f} KB, rounds={args.rounds}, output mismatches={mismatches}")
+    print(f"{'path':<22}{'pages/sec':>12}{'peak MB':>10}")
+    for name, row in rows:
+        print(f"{name:<22}{row['pages_per_sec']:>12.1f}{row['peak_mb']:>10.1f}")
+
+    if args.concurrent > 0:
+        batch = (pages * args.concurrent)[: args.concurrent]
+        threads = asyncio.run(_concurrent_wall(batch, 0))
+        processes = asyncio.run(_concurrent_wall(batch, args.concurrent))
+        parse_pool.shutdown_parse_executor()
+        print(f"{args.concurrent} pages at once: threads {threads:.3f}s, processes {processes:.3f}s "
+              f"({threads / processes:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,19 +2,32 @@ import asyncio
 import json
 import logging
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from agent.app.connector_llm import ConnectorLLM
 from agent.app.connector_search import ConnectorSearch
 from agent.app.connector_http import ConnectorHttp
 from agent.app.connector_chroma import ConnectorChroma
 from agent.app.connector_browser import ConnectorBrowser, BROWSER_FALLBACK_STATUSES
-from agent.app.observation import clean_operation
+from agent.app.llm_hedge import HedgePolicy
+from agent.app.llm_limiter import CHARS_PER_TOKEN
+from agent.app.observation import ParsedPage, parse_page
+from agent.app.page_cache import PageCache, normalize_url
 from agent.app.telemetry import TelemetrySession
 
 _logger = logging.getLogger(__name__)
 
 
+class _Flight:
+    """One in-flight request shared by concurrent identical callers."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[Any]") -> None:
+        self.task = task
+        self.waiters = 0
+
+
 class AgentIO:
     """
     Unified async interface for LLM, web search, HTTP, ChromaDB, and browser operations.
@@ -24,6 +37,8 @@ class AgentIO:
 
     ``visit`` and ``fetch_url`` try aiohttp (HTTPS/HTTP) first; on 401/403 or when
     the HTTP request raises they fall back to the headless Chrome connector (if provided).
+    Concurrent identical ``visit``/``fetch_url``/``search`` calls (e.g. sibling
+    leaves under one ``asyncio.gather``) share one underlying request.
 
     :param connector_llm: LLM connector.
     :param connector_search: Search API connector.
@@ -32,6 +47,11 @@ class AgentIO:
     :param connector_browser: Optional headless Chrome connector for bot-blocked sites.
     :param telemetry: Optional telemetry session.
     :param collection_name: ChromaDB collection for memory isolation.
+    :param page_cache: Optional page cache for ``visit``/``fetch_url`` (workers
+        pass ``shared_page_cache()``).
+    :param hedge_policy: Optional hedging policy for ``query_llm_with_fallback``
+        (workers pass ``shared_hedge_policy()``); this instance gets its own
+        ``hedge_policy.budget`` hedges.
     """
     def __init__(
         self,
@@ -42,6 +62,8 @@ class AgentIO:
         connector_browser: Optional[ConnectorBrowser] = None,
         telemetry: Optional[TelemetrySession] = None,
         collection_name: str = "agent_memory",
+        page_cache: Optional[PageCache] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
     ) -> None:
         self.connector_llm = connector_llm
         self.connector_search = connector_search
@@ -49,8 +71,17 @@ class AgentIO:
         self.connector_chroma = connector_chroma
         self.connector_browser = connector_browser
         self.collection_name = collection_name
+        self.page_cache = page_cache
+        self._inflight: Dict[Tuple[str, ...], _Flight] = {}
+        self.coalesced_counts: Dict[str, int] = {}
+        self.hedge_policy = hedge_policy
+        self.hedge_budget = hedge_policy.budget if hedge_policy is not None else 0
+        self.hedge_stats = {"fired": 0, "primary_wins": 0, "hedge_wins": 0, "budget_exhausted": 0}
         self.telemetry = telemetry
         self._attach_telemetry()
+        if hasattr(self.connector_llm, "begin_usage_scope"):
+            # Usage is per task; a shared connector must not hand this mandate another one's tokens.
+            self.connector_llm.begin_usage_scope()
 
     def _attach_telemetry(self) -> None:
         if self.connector_llm:
@@ -77,24 +108,40 @@ class AgentIO:
         payload: Dict[str, Any],
         model_name: Optional[str] = None,
         timeout_seconds: Optional[float] = None,
+        operation: Optional[str] = None,
+        stream_sink: Optional[Any] = None,
     ) -> Optional[str]:
         """
         Send a payload to the LLM and return the response text.
         :param payload: LLM request payload.
         :param model_name: Override model for this call.
         :param timeout_seconds: Optional timeout.
+        :param operation: Call site label (selects the response cache TTL).
+        :param stream_sink: Optional ``feed``/``reset`` receiver for the streamed response text.
         :returns: Response text or None.
         """
         started_at = time.perf_counter()
+        model_key = self._llm_model_key(payload, model_name)
         success = False
         error_text = None
         try:
             response = await self._with_timeout(
-                self.connector_llm.query_llm(payload, model_name=model_name),
+                self.connector_llm.query_llm(
+                    payload, model_name=model_name, operation=operation, stream_sink=stream_sink,
+                ),
                 timeout_seconds,
             )
             success = response is not None
+            usage = self.connector_llm.last_usage or {}
+            if success and self.hedge_policy is not None and not usage.get("cached"):
+                self.hedge_policy.record(model_key, operation, time.perf_counter() - started_at)
             return response
+        except asyncio.CancelledError:
+            # A call hedged away (or otherwise abandoned) ran at least this long;
+            # dropping it would bias the learned latencies toward fast calls.
+            if self.hedge_policy is not None:
+                self.hedge_policy.record(model_key, operation, time.perf_counter() - started_at)
+            raise
         except Exception as exc:
             error_text = str(exc)
             raise
@@ -114,6 +161,8 @@ class AgentIO:
         model_name: Optional[str] = None,
         fallback_model: Optional[str] = None,
         timeout_seconds: Optional[float] = None,
+        operation: Optional[str] = None,
+        stream_sink: Optional[Any] = None,
     ) -> Optional[str]:
         """
         Query the LLM; retry with fallback_model if the primary fails.
@@ -122,7 +171,9 @@ class AgentIO:
         primary_error: Optional[Exception] = None
         content: Optional[str] = None
         try:
-            content = await self.query_llm(payload, model_name=model_name, timeout_seconds=timeout_seconds)
+            content = await self._query_llm_hedged(
+                payload, model_name, fallback_model, timeout_seconds, operation, stream_sink,
+            )
         except Exception as exc:
             primary_error = exc
         if content:
@@ -130,11 +181,149 @@ class AgentIO:
         if fallback_model and fallback_model.strip():
             fallback_name = fallback_model.strip()
             if not model_name or fallback_name != model_name:
-                return await self.query_llm(payload, model_name=fallback_name, timeout_seconds=timeout_seconds)
+                return await self.query_llm(
+                    payload, model_name=fallback_name, timeout_seconds=timeout_seconds, operation=operation,
+                    stream_sink=stream_sink,
+                )
         if primary_error:
             raise primary_error
         return content
 
+    def _llm_model_key(self, payload: Dict[str, Any], model_name: Optional[str]) -> str:
+        return str(model_name or payload.get("model") or self.connector_llm.get_model())
+
+    async def _query_llm_hedged(
+        self,
+        payload: Dict[str, Any],
+        model_name: Optional[str],
+        fallback_model: Optional[str],
+        timeout_seconds: Optional[float],
+        operation: Optional[str],
+        stream_sink: Optional[Any],
+    ) -> Optional[str]:
+        """
+        Primary LLM call, hedged when it outlives the learned latency percentile.
+
+        Without a hedge policy, below the sample threshold, or with the run's
+        hedge budget spent, this is a plain ``query_llm``. Otherwise a second
+        request goes to ``HedgePolicy.hedge_model`` and the first non-empty
+        answer wins; the other call is cancelled.
+        :returns: Response text or None.
+        """
+        policy = self.hedge_policy
+        model_key = self._llm_model_key(payload, model_name)
+        delay = policy.delay_for(model_key, operation) if policy is not None else None
+        if delay is None:
+            return await self.query_llm(
+                payload, model_name=model_name, timeout_seconds=timeout_seconds, operation=operation,
+                stream_sink=stream_sink,
+            )
+        # ConnectorLLM normalizes the payload in place; each call gets its own copy.
+        primary = asyncio.ensure_future(self._hedge_leg(
+            dict(payload), model_name, timeout_seconds, operation, stream_sink,
+        ))
+        tasks = {primary: "primary"}
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return self._adopt_leg(primary.result())
+            if self.hedge_budget <= 0:
+                self.hedge_stats["budget_exhausted"] += 1
+                return self._adopt_leg(await primary)
+            self.hedge_budget -= 1
+            self.hedge_stats["fired"] += 1
+            hedge_model = policy.hedge_model(model_key, fallback_model)
+            hedge = asyncio.ensure_future(self._hedge_leg(
+                dict(payload), hedge_model, timeout_seconds, operation, None,
+            ))
+            tasks[hedge] = "hedge"
+            pending = set(tasks)
+            winner: Optional[asyncio.Future] = None
+            first_error: Optional[BaseException] = None
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        first_error = first_error or task.exception()
+                    elif task.result()[0] and winner is None:
+                        winner = task
+            label = tasks[winner] if winner is not None else "none"
+            if label in ("primary", "hedge"):
+                self.hedge_stats[f"{label}_wins"] += 1
+            if self.telemetry:
+                self.telemetry.record_event("llm_hedge", {
+                    "model": model_key,
+                    "hedge_model": hedge_model,
+                    "operation": operation,
+                    "delay_seconds": round(delay, 3),
+                    "winner": label,
+                    "budget_left": self.hedge_budget,
+                    **self._hedge_waste([task for task in tasks if task is not winner], payload),
+                })
+            if winner is not None:
+                return self._adopt_leg(winner.result())
+            if first_error is not None and all(task.exception() is not None for task in tasks):
+                raise first_error
+            return None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _hedge_leg(
+        self,
+        payload: Dict[str, Any],
+        model_name: Optional[str],
+        timeout_seconds: Optional[float],
+        operation: Optional[str],
+        stream_sink: Optional[Any],
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        One side of a hedged call, in its own usage slot: both sides share the
+        connector, so ``last_usage`` would otherwise show the other side's call.
+        :returns: Response text (or None) and this call's usage.
+        """
+        if hasattr(self.connector_llm, "begin_usage_scope"):
+            self.connector_llm.begin_usage_scope()
+        response = await self.query_llm(
+            payload, model_name=model_name, timeout_seconds=timeout_seconds, operation=operation,
+            stream_sink=stream_sink,
+        )
+        return response, dict(self.connector_llm.last_usage or {})
+
+    def _adopt_leg(self, leg: Tuple[Optional[str], Dict[str, Any]]) -> Optional[str]:
+        """Expose the returned side's usage to the caller, as a plain ``query_llm`` would."""
+        response, usage = leg
+        self.connector_llm.last_usage = usage or None
+        return response
+
+    @staticmethod
+    def _hedge_waste(losers: List[asyncio.Future], payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Tokens billed for the side(s) of a hedge whose answer was not used.
+        A side still in flight is about to be cancelled; its prompt was sent,
+        so it is counted from the prompt size and flagged as estimated.
+        :returns: ``wasted_prompt_tokens``, ``wasted_completion_tokens`` and ``wasted_tokens_estimated``.
+        """
+        prompt_tokens = completion_tokens = 0
+        estimated = False
+        for task in losers:
+            if not task.done():
+                messages = payload.get("messages") or []
+                prompt_chars = sum(len(str(m.get("content", ""))) for m in messages if isinstance(m, dict))
+                prompt_tokens += prompt_chars // CHARS_PER_TOKEN
+                estimated = True
+            elif not task.cancelled() and task.exception() is None:
+                usage = task.result()[1]
+                if not usage.get("cached"):
+                    prompt_tokens += int(usage.get("prompt_tokens") or 0)
+                    completion_tokens += int(usage.get("completion_tokens") or 0)
+        return {
+            "wasted_prompt_tokens": prompt_tokens,
+            "wasted_completion_tokens": completion_tokens,
+            "wasted_tokens_estimated": estimated,
+        }
+
     def pop_last_llm_usage(self) -> Optional[Dict[str, Any]]:
         """
         Pop and return the last LLM usage record (tokens, cost).
@@ -181,10 +370,13 @@ class AgentIO:
         :returns: List of dicts with title, url, description.
         """
         started_at = time.perf_counter()
+        coalesced = False
         try:
-            results = await self._with_timeout(
-                self.connector_search.query_search(query, count=count),
+            results, coalesced = await self._single_flight(
+                ("search", query, str(count)),
+                lambda: self.connector_search.query_search(query, count=count),
                 timeout_seconds,
+                leader_timeout_seconds=timeout_seconds,
             )
         except Exception as exc:
             if self.telemetry:
@@ -192,10 +384,13 @@ class AgentIO:
                     name="search",
                     started_at=started_at,
                     success=False,
-                    payload={"query": query, "result_count": 0},
+                    payload={"query": query, "result_count": 0, "coalesced": coalesced},
                     error=str(exc),
                 )
             raise
+        if results is not None:
+            # Every caller of a shared query gets its own dicts, so none can mutate another's results.
+            results = [dict(item) for item in results]
         if self.telemetry and results:
             for item in results:
                 self.telemetry.record_document_seen(
@@ -212,7 +407,7 @@ class AgentIO:
                 name="search",
                 started_at=started_at,
                 success=results is not None,
-                payload={"query": query, "result_count": len(results or [])},
+                payload={"query": query, "result_count": len(results or []), "coalesced": coalesced},
             )
         return results
 
@@ -221,7 +416,8 @@ class AgentIO:
         Fetch a URL, clean the HTML, return extracted text.
 
         Tries aiohttp (HTTPS/HTTP) first. Falls back to headless Chrome only on
-        401/403 (bot blocking) or when the HTTP request raises.
+        401/403 (bot blocking) or when the HTTP request raises. Served from the
+        page cache (body and parse) when it holds a fresh copy.
 
         :param url: Target URL.
         :param timeout_seconds: Optional per-call timeout.
@@ -229,57 +425,21 @@ class AgentIO:
         :raises RuntimeError: On HTTP failure after all attempts.
         """
         started_at = time.perf_counter()
-        used_browser = False
-        result = None
-        http_result = None
-        http_error = None
-        try:
-            http_result = await self._with_timeout(
-                self.connector_http.request("GET", url, retries=2),
-                timeout_seconds,
-            )
-        except Exception as exc:
-            http_error = exc
-
-        if http_result and not http_result.error:
-            result = http_result
-        if (result is None or result.error) and self.connector_browser and (
-            http_result is None or (http_result.error and http_result.status in BROWSER_FALLBACK_STATUSES)
-        ):
-            _logger.info(f"Falling back to headless Chrome for {url}")
-            browser_result = await self._with_timeout(
-                self.connector_browser.fetch_page(url),
-                timeout_seconds,
-            )
-            if not browser_result.error:
-                result = browser_result
-                used_browser = True
-            else:
-                _logger.warning(f"Browser fetch failed for {url}: {browser_result.data}")
-        if result is None and http_result is not None and http_result.error:
-            result = http_result
-        if result is None and http_error is not None:
-            raise http_error
-
-        if result.error:
-            error_text = f"HTTP visit failed: {url} status={result.status}"
+        text_body, status, used_browser, cache_state = await self._fetch_body_shared(url, 2, timeout_seconds)
+        if text_body is None:
+            error_text = f"HTTP visit failed: {url} status={status}"
             if self.telemetry:
                 self.telemetry.record_timing(
                     name="visit",
                     started_at=started_at,
                     success=False,
-                    payload={"url": url, "status": result.status, "used_browser": used_browser},
+                    payload={"url": url, "status": status, "used_browser": used_browser},
                     error=error_text,
                 )
             raise RuntimeError(error_text)
 
-        resp = result.data
         try:
-            if isinstance(resp, dict):
-                text_body = json.dumps(resp)
-            else:
-                text_body = resp
-            cleaned = clean_operation(text_body)
+            cleaned = self.parse_body(text_body, url).main_text
             summary = cleaned if cleaned else "[No main content found]"
         except Exception as exc:
             error_text = str(exc)
@@ -288,7 +448,7 @@ class AgentIO:
                     name="visit",
                     started_at=started_at,
                     success=False,
-                    payload={"url": url, "status": result.status, "used_browser": used_browser},
+                    payload={"url": url, "status": status, "used_browser": used_browser},
                     error=error_text,
                 )
             raise
@@ -302,7 +462,7 @@ class AgentIO:
                 name="visit",
                 started_at=started_at,
                 success=True,
-                payload={"url": url, "status": result.status, "used_browser": used_browser},
+                payload={"url": url, "status": status, "used_browser": used_browser, "cache": cache_state},
             )
         return summary
 
@@ -316,7 +476,8 @@ class AgentIO:
         Fetch raw content from a URL (no HTML cleaning).
 
         Tries aiohttp (HTTPS/HTTP) first. Falls back to headless Chrome only on
-        401/403 (bot blocking) or when the HTTP request raises.
+        401/403 (bot blocking) or when the HTTP request raises. Served from the
+        page cache when it holds a fresh copy.
 
         :param url: Target URL.
         :param retries: Number of aiohttp retries.
@@ -324,19 +485,137 @@ class AgentIO:
         :returns: Raw response text or JSON string.
         :raises RuntimeError: On HTTP failure after all attempts.
         """
+        text_body, status, _, _ = await self._fetch_body_shared(url, retries, timeout_seconds)
+        if text_body is None:
+            raise RuntimeError(f"HTTP fetch failed: {url} status={status}")
+        return text_body
+
+    def parse_body(self, body: str, url: Optional[str] = None) -> ParsedPage:
+        """
+        Parse a fetched body, reusing the page cache's stored parse when present.
+        :param body: Body returned by ``fetch_url``.
+        :param url: URL it was fetched from.
+        :returns: ParsedPage.
+        """
+        page = self.page_cache.parsed(body, url) if self.page_cache else None
+        if page is None:
+            page = parse_page(body)
+            if self.page_cache:
+                self.page_cache.store_parsed(body, page, url)
+        return page
+
+    async def _fetch_body_shared(
+        self,
+        url: str,
+        retries: int,
+        timeout_seconds: Optional[float],
+    ) -> Tuple[Optional[str], Optional[int], bool, Optional[str]]:
+        """
+        ``_fetch_body`` through the single-flight layer: concurrent visits and
+        fetches of the same (normalized) URL share one fetch. The caller that
+        starts it keeps the per-connector timeouts; callers that join wait at
+        most their own ``timeout_seconds``. ``retries`` is not part of the key:
+        joiners accept the retry budget of the caller that started the fetch.
+        :returns: Same as ``_fetch_body``; cache state is ``coalesced`` for joiners.
+        """
+        result, coalesced = await self._single_flight(
+            ("page", normalize_url(url)),
+            lambda: self._fetch_body(url, retries, timeout_seconds),
+            timeout_seconds,
+        )
+        if coalesced:
+            text_body, status, used_browser, _ = result
+            return text_body, status, used_browser, "coalesced"
+        return result
+
+    async def _single_flight(
+        self,
+        key: Tuple[str, ...],
+        factory: Callable[[], Awaitable[Any]],
+        timeout_seconds: Optional[float],
+        leader_timeout_seconds: Optional[float] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        Run ``factory()`` once for all concurrent callers with the same ``key``.
+
+        Each caller awaits the shared task through ``asyncio.shield``, so one
+        caller timing out or being cancelled does not cancel it for the others;
+        the task is cancelled once every caller has stopped waiting.
+
+        :param key: Request identity (kind first, e.g. ``("page", url)``).
+        :param factory: Starts the underlying request.
+        :param timeout_seconds: Wait limit for callers joining an in-flight request.
+        :param leader_timeout_seconds: Wait limit for the caller that starts it.
+        :returns: (result, coalesced) where coalesced means this caller joined.
+        """
+        flight = self._inflight.get(key)
+        coalesced = flight is not None
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(factory()))
+            self._inflight[key] = flight
+            flight.task.add_done_callback(lambda _task: self._end_flight(key, flight))
+        else:
+            self.coalesced_counts[key[0]] = self.coalesced_counts.get(key[0], 0) + 1
+            if self.telemetry:
+                self.telemetry.record_event(
+                    "single_flight_coalesced",
+                    {"kind": key[0], "key": key[1], "count": self.coalesced_counts[key[0]]},
+                )
+        flight.waiters += 1
+        try:
+            result = await self._with_timeout(
+                asyncio.shield(flight.task),
+                timeout_seconds if coalesced else leader_timeout_seconds,
+            )
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                # Unregister now, not in the done callback: a caller arriving
+                # before the task finishes cancelling must start a new flight.
+                self._end_flight(key, flight)
+        return result, coalesced
+
+    def _end_flight(self, key: Tuple[str, ...], flight: "_Flight") -> None:
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+
+    async def _fetch_body(
+        self,
+        url: str,
+        retries: int,
+        timeout_seconds: Optional[float],
+    ) -> Tuple[Optional[str], Optional[int], bool, Optional[str]]:
+        """
+        Page body via the page cache, then HTTP, then the browser fallback.
+        :returns: (body text or None on failure, status, used_browser,
+            cache state: hit/revalidated/miss, or None without a cache).
+        """
+        cached = await self.page_cache.lookup(url) if self.page_cache else None
+        if cached is not None and cached.fresh:
+            return cached.body, cached.status, False, "hit"
+
         result = None
+        used_browser = False
         http_result = None
         http_error = None
+        request_kwargs = {}
+        if cached is not None and cached.validator_headers():
+            request_kwargs["headers"] = cached.validator_headers()
         try:
             http_result = await self._with_timeout(
-                self.connector_http.request("GET", url, retries=retries),
+                self.connector_http.request("GET", url, retries=retries, **request_kwargs),
                 timeout_seconds,
             )
         except Exception as exc:
             http_error = exc
 
         if http_result and not http_result.error:
-            result = http_result
+            if http_result.status == 304 and cached is not None:
+                self.page_cache.revalidated(url)
+                return cached.body, cached.status, False, "revalidated"
+            if http_result.status != 304:
+                result = http_result
         if (result is None or result.error) and self.connector_browser and (
             http_result is None or (http_result.error and http_result.status in BROWSER_FALLBACK_STATUSES)
         ):
@@ -347,18 +626,31 @@ class AgentIO:
             )
             if not browser_result.error:
                 result = browser_result
+                used_browser = True
             else:
                 _logger.warning(f"Browser fetch failed for {url}: {browser_result.data}")
-        if result is None and http_result is not None and http_result.error:
+        if result is None and http_result is not None:
             result = http_result
         if result is None and http_error is not None:
             raise http_error
-        if result.error:
-            raise RuntimeError(f"HTTP fetch failed: {url} status={result.status}")
+
+        if result.error or result.data is None:
+            return None, result.status, used_browser, None
         resp = result.data
-        if isinstance(resp, dict):
-            return json.dumps(resp)
-        return str(resp)
+        text_body = json.dumps(resp) if isinstance(resp, dict) else str(resp)
+        if self.page_cache is None:
+            return text_body, result.status, used_browser, None
+        headers = getattr(result, "headers", None) or {}
+        self.page_cache.store(
+            url,
+            text_body,
+            status=result.status,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified"),
+            cache_control=headers.get("Cache-Control"),
+            api_response=isinstance(resp, dict),
+        )
+        return text_body, result.status, used_browser, "miss"
 
     async def store_chroma(
         self,
@@ -510,36 +802,20 @@ class AgentIO:
         observations = []
         
         try:
-            internal_results = await self._with_timeout(
-                self.connector_chroma.query_chroma(
-                    collection=self.collection_name,
-                    query_texts=topics,
-                    n_results=n_internal,
-                    where={"memory_type": "internal_thought"},
-                ),
-                timeout_seconds,
-            )
-            if internal_results and "documents" in internal_results:
-                for doc_list in internal_results["documents"]:
-                    internal_thoughts.extend(doc_list)
-        except Exception as exc:
-            _logger.warning(f"Failed to retrieve internal thoughts: {exc}")
-        
-        try:
-            observation_results = await self._with_timeout(
-                self.connector_chroma.query_chroma(
+            split = await self._with_timeout(
+                self.connector_chroma.query_chroma_split(
                     collection=self.collection_name,
                     query_texts=topics,
-                    n_results=n_observations,
-                    where={"memory_type": "observation"},
+                    n_by_type={"internal_thought": n_internal, "observation": n_observations},
                 ),
                 timeout_seconds,
             )
-            if observation_results and "documents" in observation_results:
-                for doc_list in observation_results["documents"]:
-                    observations.extend(doc_list)
+            for doc_list in (split.get("internal_thought") or {}).get("documents") or []:
+                internal_thoughts.extend(doc_list)
+            for doc_list in (split.get("observation") or {}).get("documents") or []:
+                observations.extend(doc_list)
         except Exception as exc:
-            _logger.warning(f"Failed to retrieve observations: {exc}")
+            _logger.warning(f"Failed to retrieve split memories: {exc}")
         
         if self.telemetry:
             self.telemetry.record_chroma_retrieve(
@@ -1,4 +1,5 @@
 import logging
+from contextvars import ContextVar
 from typing import Any, Dict, Optional
 
 from shared.connector_config import ConnectorConfig
@@ -7,6 +8,10 @@ from shared.connector_config import ConnectorConfig
 class ConnectorBase:
     """
     Base connector with optional telemetry and structured logging helpers.
+
+    The attached telemetry session is task-local (a ``ContextVar``): one
+    connector instance can serve several concurrent mandates, and each asyncio
+    task sees the session its own ``AgentIO`` attached.
     """
     def __init__(self, connector_config: ConnectorConfig, name: Optional[str] = None):
         """
@@ -16,12 +21,22 @@ class ConnectorBase:
         """
         self.config = connector_config
         self.logger = logging.getLogger(name or self.__class__.__name__)
-        self._telemetry = None
+        self._telemetry_var: ContextVar[Optional[Any]] = ContextVar(
+            f"{self.__class__.__name__}_telemetry_{id(self)}", default=None
+        )
         self._full_capture = False
 
+    @property
+    def _telemetry(self) -> Optional[Any]:
+        return self._telemetry_var.get()
+
+    @_telemetry.setter
+    def _telemetry(self, telemetry: Optional[Any]) -> None:
+        self._telemetry_var.set(telemetry)
+
     def set_telemetry(self, telemetry: Optional[Any]) -> None:
         """
-        Attach telemetry session for deep tracking.
+        Attach telemetry session for deep tracking (in the current task's context).
         :param telemetry: Telemetry session object or None.
         :returns: None
         """
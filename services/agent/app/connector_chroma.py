@@ -1,6 +1,7 @@
 import asyncio
 import math
 import time
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 import chromadb
 from chromadb.config import Settings
@@ -17,15 +18,47 @@ class ConnectorChroma(ConnectorBase):
     initialized on first use and retried automatically if ChromaDB is
     temporarily unavailable.
 
+    Collection handles are kept in a small LRU cache so reads and writes skip
+    the ``get_or_create_collection`` round trip. The cache is dropped whenever
+    the connection is marked not ready and per-name on ``delete_collection``.
+
     :param connector_config: Shared connector configuration with chroma_url.
     """
 
     PARALLEL_BATCH_SIZE = 50
+    SPLIT_OVERFETCH_FACTOR = 2
+    COLLECTION_CACHE_SIZE = 64
 
     def __init__(self, connector_config: ConnectorConfig):
         super().__init__(connector_config)
         self._chroma = None
+        self._collections: "OrderedDict[str, Any]" = OrderedDict()
+        self._collection_cache_hits = 0
+        self._collection_cache_misses = 0
         self.chroma_api_ready = False
+        self._embedding_function = None
+
+    @property
+    def chroma_api_ready(self) -> bool:
+        return self._chroma_api_ready
+
+    @chroma_api_ready.setter
+    def chroma_api_ready(self, ready: bool) -> None:
+        # Handles belong to the old client; a reset must not hand them out.
+        if not ready:
+            self._collections.clear()
+        self._chroma_api_ready = bool(ready)
+
+    def collection_cache_stats(self) -> Dict[str, int]:
+        """
+        Collection handle cache counters.
+        :returns: Dict with hits, misses and current size.
+        """
+        return {
+            "hits": self._collection_cache_hits,
+            "misses": self._collection_cache_misses,
+            "size": len(self._collections),
+        }
 
     async def _try_init_chroma(self) -> bool:
         """Attempt to connect to ChromaDB via AsyncHttpClient and verify heartbeat."""
@@ -87,11 +120,38 @@ class ConnectorChroma(ConnectorBase):
         if not await self._ensure_ready():
             self.logger.warning("ChromaDB not ready.")
             return None
+        started_at = time.perf_counter()
+        cached = self._collections.get(collection)
+        if cached is not None:
+            self._collections.move_to_end(collection)
+            self._collection_cache_hits += 1
+            self._record_collection_cache(started_at, collection, hit=True)
+            return cached
         try:
-            return await self._chroma.get_or_create_collection(name=collection)
+            handle = await self._chroma.get_or_create_collection(name=collection)
         except Exception as e:
             self.logger.error(f"Failed to create/get collection '{collection}': {e}")
             return None
+        self._collection_cache_misses += 1
+        if handle is not None:
+            self._collections[collection] = handle
+            while len(self._collections) > self.COLLECTION_CACHE_SIZE:
+                self._collections.popitem(last=False)
+        self._record_collection_cache(started_at, collection, hit=False)
+        return handle
+
+    def _record_collection_cache(self, started_at: float, collection: str, hit: bool) -> None:
+        lookups = self._collection_cache_hits + self._collection_cache_misses
+        self._record_timing(
+            name="chroma_collection_cache", started_at=started_at, success=True,
+            payload={
+                "collection": collection,
+                "hit": hit,
+                "hits": self._collection_cache_hits,
+                "misses": self._collection_cache_misses,
+                "hit_rate": round(self._collection_cache_hits / lookups, 4) if lookups else 0.0,
+            },
+        )
 
     async def delete_collection(self, collection: str) -> bool:
         """
@@ -104,6 +164,7 @@ class ConnectorChroma(ConnectorBase):
         try:
             if self._chroma is None:
                 return False
+            self._collections.pop(collection, None)
             await self._chroma.delete_collection(name=collection)
             return True
         except Exception as e:
@@ -126,12 +187,84 @@ class ConnectorChroma(ConnectorBase):
             self.logger.warning(f"Failed to list collections: {e}")
             return []
 
+    async def embed_texts(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed texts client-side with the same default embedding function the
+        collections use (all-MiniLM-L6-v2), so vectors are interchangeable with
+        the ones Chroma computes for ``documents`` / ``query_texts``.
+
+        Runs in a worker thread; the ONNX model is loaded on first use.
+        :param texts: Texts to embed.
+        :returns: One vector per text, or None if embedding is unavailable.
+        """
+        if not texts:
+            return []
+        started_at = time.perf_counter()
+        try:
+            if self._embedding_function is None:
+                from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+                self._embedding_function = DefaultEmbeddingFunction()
+            vectors = await asyncio.to_thread(self._embedding_function, list(texts))
+            self._record_timing(
+                name="chroma_embed", started_at=started_at, success=True,
+                payload={"count": len(texts)},
+            )
+            return [[float(x) for x in v] for v in vectors]
+        except Exception as e:
+            self.logger.warning(f"Local embedding failed: {e}")
+            self._record_timing(
+                name="chroma_embed", started_at=started_at, success=False,
+                payload={"count": len(texts)},
+                error=str(e),
+            )
+            return None
+
+    async def get_from_chroma(
+        self,
+        collection: str,
+        where: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Fetch stored records (no similarity search).
+        :param collection: Collection name.
+        :param where: Optional metadata filter.
+        :param include: Fields to return, e.g. ``["embeddings", "metadatas", "documents"]``.
+        :returns: ChromaDB get-result dict or None on failure.
+        """
+        if not await self._ensure_ready():
+            return None
+        started_at = time.perf_counter()
+        try:
+            coll = await self.get_or_create_collection(collection)
+            get_kwargs: Dict[str, Any] = {}
+            if where:
+                get_kwargs["where"] = where
+            if include:
+                get_kwargs["include"] = include
+            results = await coll.get(**get_kwargs)
+            self._record_timing(
+                name="chroma_get", started_at=started_at, success=True,
+                payload={"collection": collection},
+            )
+            return results
+        except Exception as e:
+            self.logger.error(f"ChromaDB get failed for collection {collection}: {e}")
+            self.chroma_api_ready = False
+            self._record_timing(
+                name="chroma_get", started_at=started_at, success=False,
+                payload={"collection": collection},
+                error=str(e),
+            )
+            return None
+
     async def add_to_chroma(
         self,
         collection: str,
         ids: List[str],
         metadatas: List[Dict[str, Any]],
         documents: List[str],
+        embeddings: Optional[List[List[float]]] = None,
     ) -> bool:
         """
         Add documents to a collection.
@@ -139,6 +272,7 @@ class ConnectorChroma(ConnectorBase):
         :param ids: Unique IDs for each document.
         :param metadatas: Metadata dicts per document.
         :param documents: Document text strings.
+        :param embeddings: Optional precomputed vectors (skips embedding in Chroma's client).
         :returns: True on success.
         """
         if not await self._ensure_ready():
@@ -152,7 +286,10 @@ class ConnectorChroma(ConnectorBase):
                 operation="chroma_add",
                 payload={"collection": collection, "count": len(documents)},
             )
-            await coll.add(ids=ids, metadatas=sanitized_metadatas, documents=documents)
+            add_kwargs: Dict[str, Any] = {"ids": ids, "metadatas": sanitized_metadatas, "documents": documents}
+            if embeddings is not None:
+                add_kwargs["embeddings"] = embeddings
+            await coll.add(**add_kwargs)
             self._record_timing(
                 name="chroma_add", started_at=started_at, success=True,
                 payload={"collection": collection, "count": len(documents)},
@@ -184,6 +321,7 @@ class ConnectorChroma(ConnectorBase):
         metadatas: List[Dict[str, Any]],
         documents: List[str],
         batch_size: Optional[int] = None,
+        embeddings: Optional[List[List[float]]] = None,
     ) -> bool:
         """
         Add documents in parallel batches using asyncio.gather.
@@ -197,6 +335,7 @@ class ConnectorChroma(ConnectorBase):
         :param metadatas: Metadata dicts per document.
         :param documents: Document text strings.
         :param batch_size: Documents per batch (default PARALLEL_BATCH_SIZE).
+        :param embeddings: Optional precomputed vectors, aligned with ``documents``.
         :returns: True if all batches succeeded.
         """
         if not documents:
@@ -204,7 +343,7 @@ class ConnectorChroma(ConnectorBase):
         bs = batch_size or self.PARALLEL_BATCH_SIZE
         total = len(documents)
         if total <= bs:
-            return await self.add_to_chroma(collection, ids, metadatas, documents)
+            return await self.add_to_chroma(collection, ids, metadatas, documents, embeddings=embeddings)
 
         n_batches = math.ceil(total / bs)
         tasks = []
@@ -217,6 +356,7 @@ class ConnectorChroma(ConnectorBase):
                     ids=ids[start:end],
                     metadatas=metadatas[start:end],
                     documents=documents[start:end],
+                    embeddings=embeddings[start:end] if embeddings is not None else None,
                 )
             )
         results = await asyncio.gather(*tasks, return_exceptions=True)
@@ -239,6 +379,7 @@ class ConnectorChroma(ConnectorBase):
         query_texts: List[str],
         n_results: int = 3,
         where: Optional[Dict[str, Any]] = None,
+        query_embeddings: Optional[List[List[float]]] = None,
     ) -> Optional[Dict[str, Any]]:
         """
         Query a collection for nearest neighbors.
@@ -246,6 +387,7 @@ class ConnectorChroma(ConnectorBase):
         :param query_texts: Query strings.
         :param n_results: Max results per query.
         :param where: Optional metadata filter.
+        :param query_embeddings: Optional precomputed query vectors (used instead of ``query_texts``).
         :returns: ChromaDB result dict or None on failure.
         """
         if not await self._ensure_ready():
@@ -257,7 +399,10 @@ class ConnectorChroma(ConnectorBase):
                 direction="in", operation="chroma_query",
                 payload={"collection": collection, "queries": len(query_texts), "n_results": n_results, "where": where},
             )
-            query_kwargs: Dict[str, Any] = {"query_texts": query_texts, "n_results": n_results}
+            if query_embeddings is not None:
+                query_kwargs: Dict[str, Any] = {"query_embeddings": query_embeddings, "n_results": n_results}
+            else:
+                query_kwargs = {"query_texts": query_texts, "n_results": n_results}
             if where:
                 query_kwargs["where"] = where
             results = await coll.query(**query_kwargs)
@@ -285,6 +430,96 @@ class ConnectorChroma(ConnectorBase):
             )
             return None
 
+    async def query_chroma_split(
+        self,
+        collection: str,
+        query_texts: List[str],
+        n_by_type: Dict[str, int],
+        type_key: str = "memory_type",
+        mode: str = "single",
+        query_embeddings: Optional[List[List[float]]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Nearest neighbours for several metadata types at once, partitioned
+        locally, with at least ``n_by_type[t]`` hits per type when they exist.
+
+        ``single`` issues one over-fetched query filtered to all requested
+        types and partitions rows by ``type_key``; only a type that came up
+        short while the over-fetch was saturated gets a filtered top-up query.
+        ``concurrent`` issues one filtered query per type via ``asyncio.gather``.
+
+        :param collection: Collection name.
+        :param query_texts: Query strings.
+        :param n_by_type: Results wanted per type value.
+        :param type_key: Metadata key holding the type.
+        :param mode: ``single`` or ``concurrent``.
+        :param query_embeddings: Optional precomputed query vectors.
+        :returns: ``{type: chroma-shaped result}`` (empty rows on failure).
+        """
+        types = [t for t, n in n_by_type.items() if n > 0]
+        n_queries = len(query_embeddings) if query_embeddings is not None else len(query_texts)
+        split: Dict[str, Dict[str, Any]] = {t: self._empty_result(n_queries) for t in n_by_type}
+        if not types or not n_queries:
+            return split
+
+        async def _filtered(type_value: str) -> Optional[Dict[str, Any]]:
+            return await self.query_chroma(
+                collection=collection,
+                query_texts=query_texts,
+                n_results=n_by_type[type_value],
+                where={type_key: type_value},
+                query_embeddings=query_embeddings,
+            )
+
+        if mode == "concurrent" or len(types) == 1:
+            results = await asyncio.gather(*(_filtered(t) for t in types))
+            for type_value, result in zip(types, results):
+                if result:
+                    split[type_value] = result
+            return split
+
+        n_total = sum(n_by_type[t] for t in types) * self.SPLIT_OVERFETCH_FACTOR
+        combined = await self.query_chroma(
+            collection=collection,
+            query_texts=query_texts,
+            n_results=n_total,
+            where={type_key: {"$in": types}},
+            query_embeddings=query_embeddings,
+        )
+        if not combined:
+            return split
+        columns = ("ids", "documents", "metadatas", "distances")
+        saturated = False
+        for q in range(n_queries):
+            rows = {}
+            for c in columns:
+                col = combined.get(c) or []
+                rows[c] = (col[q] if q < len(col) else None) or []
+            saturated = saturated or len(rows["ids"]) >= n_total
+            for i, metadata in enumerate(rows["metadatas"]):
+                type_value = (metadata or {}).get(type_key)
+                if type_value not in n_by_type or len(split[type_value]["ids"][q]) >= n_by_type[type_value]:
+                    continue
+                for c in columns:
+                    if i < len(rows[c]):
+                        split[type_value][c][q].append(rows[c][i])
+
+        if saturated:
+            short = [
+                t for t in types
+                if any(len(row) < n_by_type[t] for row in split[t]["ids"])
+            ]
+            if short:
+                topped = await asyncio.gather(*(_filtered(t) for t in short))
+                for type_value, result in zip(short, topped):
+                    if result:
+                        split[type_value] = result
+        return split
+
+    @staticmethod
+    def _empty_result(n_queries: int) -> Dict[str, Any]:
+        return {c: [[] for _ in range(n_queries)] for c in ("ids", "documents", "metadatas", "distances")}
+
     @staticmethod
     def _sanitize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
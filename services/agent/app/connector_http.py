@@ -39,6 +39,7 @@ class ConnectorHttp(ConnectorBase):
     }
 
     PERMANENT_ERROR_CODES = {401, 403, 404, 405, 422}
+    CACHE_HEADERS = ("ETag", "Last-Modified", "Cache-Control")
 
     def __init__(self, config: ConnectorConfig):
         super().__init__(config)
@@ -148,13 +149,21 @@ class ConnectorHttp(ConnectorBase):
                         error_msg = self.HTTP_STATUS_CODES.get(status, "Permanent Error")
                         return RequestResult(status=status, error=True, data=error_msg)
 
+                    # Cache validators and Cache-Control, so the page cache can revalidate
+                    # with a conditional GET and skip responses it must not keep.
+                    validators = {
+                        name: resp.headers[name] for name in self.CACHE_HEADERS if name in resp.headers
+                    }
+                    if status == 304:
+                        return RequestResult(status=status, error=False, data=None, headers=validators)
+
                     if 200 <= status < 300:
                         content_type = resp.headers.get("Content-Type", "")
                         if "application/json" in content_type:
                             response_data = await resp.json()
                         else:
                             response_data = await resp.text()
-                        return RequestResult(status=status, error=False, data=response_data)
+                        return RequestResult(status=status, error=False, data=response_data, headers=validators)
 
                     raise TransientHTTPError(status, self.HTTP_STATUS_CODES.get(status, "HTTP error"))
             except RuntimeError as exc:
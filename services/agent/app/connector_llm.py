@@ -1,5 +1,7 @@
 import asyncio
 import time
+from contextvars import ContextVar
+from types import SimpleNamespace
 from typing import Any, Optional
 
 from openai import APIStatusError
@@ -8,11 +10,26 @@ from shared.connector_config import ConnectorConfig
 from shared.retry import Retry
 from agent.app.connector_base import ConnectorBase
 from agent.app.llm_backends import create_llm_backend, retryable_llm_exceptions
+from agent.app.llm_cache import LLMResponseCache, llm_cache_from_env
+from agent.app.llm_limiter import (
+    CHARS_PER_TOKEN,
+    LLMRateLimiter,
+    classify_outcome,
+    estimate_tokens,
+    shared_llm_limiter,
+)
+
+# Statuses a provider answers with when it does not accept ``stream=True``.
+STREAM_REJECTED_STATUSES = {400, 404, 415, 422}
 
 
 class ConnectorLLM(ConnectorBase):
     """
     LLM connector: delegates wire protocol to a provider backend (OpenAI-compatible or Anthropic).
+
+    ``last_usage`` is task-local like the telemetry session: it lives in a
+    per-context slot that child tasks (``wait_for``, retries) share with the
+    task that opened it, so concurrent mandates never read each other's usage.
     """
 
     def __init__(self, connector_config: ConnectorConfig):
@@ -24,9 +41,21 @@ class ConnectorLLM(ConnectorBase):
         self.model_name = self.config.model_name
         self._backend = create_llm_backend(connector_config, self.logger)
         self.llm_api_ready = True
-        self.last_usage: Optional[dict] = None
-        self.total_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        self._usage_var: ContextVar[Optional[dict]] = ContextVar(
+            f"ConnectorLLM_usage_{id(self)}", default=None
+        )
+        self.total_usage = {
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "cached_prompt_tokens": 0,
+            "cache_write_tokens": 0,
+        }
         self.model_profiles: dict[str, dict] = {}
+        self.response_cache: Optional[LLMResponseCache] = llm_cache_from_env(connector_config)
+        self.limiter: Optional[LLMRateLimiter] = shared_llm_limiter()
+        # Models whose provider rejected a streaming request; they are called plainly from then on.
+        self._stream_unsupported: set[str] = set()
 
     def _reset_client(self) -> None:
         """
@@ -124,17 +153,46 @@ class ConnectorLLM(ConnectorBase):
         if completion_tokens is None:
             completion_tokens = getattr(usage, "output_tokens", None)
         total_tokens = getattr(usage, "total_tokens", None)
+        cached_tokens, cache_write_tokens = self._prompt_cache_tokens(usage)
+        if prompt_tokens is not None and getattr(usage, "prompt_tokens", None) is None:
+            # Anthropic's input_tokens excludes cache reads/writes; OpenAI's prompt_tokens includes them.
+            prompt_tokens = int(prompt_tokens) + cached_tokens + cache_write_tokens
         if prompt_tokens is not None and completion_tokens is not None:
             total_tokens = total_tokens if total_tokens is not None else int(prompt_tokens) + int(completion_tokens)
             self.last_usage = {
                 "prompt_tokens": int(prompt_tokens),
                 "completion_tokens": int(completion_tokens),
                 "total_tokens": int(total_tokens),
+                "cached_prompt_tokens": cached_tokens,
+                "cache_write_tokens": cache_write_tokens,
                 "model": self.model_name,
             }
+            if getattr(usage, "estimated", False) is True:
+                self.last_usage["estimated"] = True
             self.total_usage["prompt_tokens"] += int(prompt_tokens)
             self.total_usage["completion_tokens"] += int(completion_tokens)
             self.total_usage["total_tokens"] += int(total_tokens)
+            self.total_usage["cached_prompt_tokens"] += cached_tokens
+            self.total_usage["cache_write_tokens"] += cache_write_tokens
+
+    @staticmethod
+    def _prompt_cache_tokens(usage: Any) -> tuple[int, int]:
+        """
+        Prompt tokens served from / written to the provider's prompt cache.
+        :param usage: Usage object from API response.
+        :returns: (cached_prompt_tokens, cache_write_tokens).
+        """
+        def _int(value: Any) -> int:
+            return int(value) if isinstance(value, (int, float)) else 0
+
+        details = getattr(usage, "prompt_tokens_details", None)
+        if isinstance(details, dict):
+            cached = _int(details.get("cached_tokens"))
+        else:
+            cached = _int(getattr(details, "cached_tokens", None))
+        cached += _int(getattr(usage, "cache_read_input_tokens", None))
+        write = _int(getattr(usage, "cache_creation_input_tokens", None))
+        return cached, write
 
     async def __aenter__(self):
         """Support async context manager for consistent lifecycle handling."""
@@ -165,18 +223,40 @@ class ConnectorLLM(ConnectorBase):
         payload: dict,
         model_name: Optional[str] = None,
         timeout_seconds: Optional[float] = None,
+        operation: Optional[str] = None,
+        stream_sink: Optional[Any] = None,
     ) -> Optional[str]:
         """
         Sends a chat completion request to the LLM API.
         :param payload: The properly formatted dict payload.
         :param model_name: Optional model override.
         :param timeout_seconds: Optional timeout budget for the full query operation.
+        :param operation: Call site label (``expansion``, ``evaluation``, ``finalize``, ...)
+            selecting the response cache TTL.
+        :param stream_sink: Optional object with ``feed(text)`` and ``reset()`` (e.g.
+            ``JsonArrayStream``). The response is streamed into it as it arrives; it is
+            reset before every attempt. The return value is the same either way. A model
+            whose provider rejects streaming is called without it and the sink gets the
+            whole text at once.
         :return: The response text content, or None if all retries failed.
         """
         if model_name and model_name.strip():
             payload["model"] = model_name.strip()
         payload = self._normalize_payload(payload)
         model_name = str(payload.get("model") or "")
+        # Open the usage slot here so usage recorded inside wait_for's child task reaches the caller.
+        self._usage_slot()
+
+        cache_key = None
+        if self.response_cache is not None and self.response_cache.cacheable(payload, operation):
+            cache_key = self.response_cache.key(payload, model_name)
+            cached = await self.response_cache.get(cache_key)
+            if cached is not None:
+                content = self._serve_cached(cached, model_name, operation)
+                if stream_sink is not None:
+                    stream_sink.reset()
+                    stream_sink.feed(content)
+                return content
 
         messages = payload.get("messages") or []
         prompt_text = "\n".join(str(item.get("content", "")) for item in messages if isinstance(item, dict))
@@ -193,17 +273,97 @@ class ConnectorLLM(ConnectorBase):
         )
 
         max_attempts = 3
-        base_delay = max(1.0, float(self.config.default_delay))
+        # With the limiter on, it paces throttled retries (cooldown + smaller
+        # window); Retry's own backoff would only stack on top of that. Other
+        # failures (500/502, connection resets) still back off in do_call.
+        backoff_delay = max(1.0, float(self.config.default_delay))
+        base_delay = 0.0 if self.limiter is not None else backoff_delay
         jitter = float(self.config.jitter_seconds or 0.0)
         started_at = asyncio.get_event_loop().time()
         perf_started = time.perf_counter()
         retry_types = retryable_llm_exceptions()
 
+        call_usage: dict = {}
+        attempts = {"count": 0, "outcome": None}
+
+        async def complete(safe_payload: dict) -> tuple:
+            if stream_sink is None:
+                return await self._backend.complete(safe_payload, model_name)
+            stream_sink.reset()
+            attempt_started = time.perf_counter()
+            first_chunk = []
+
+            def on_text(text: str) -> None:
+                if not first_chunk:
+                    first_chunk.append(True)
+                    self._record_timing(
+                        name="llm_first_chunk",
+                        started_at=attempt_started,
+                        success=True,
+                        payload={"model": model_name, "operation": operation},
+                    )
+                stream_sink.feed(text)
+
+            if model_name not in self._stream_unsupported:
+                try:
+                    content, usage = await self._backend.complete_stream(safe_payload, model_name, on_text)
+                except Exception as exc:
+                    if first_chunk or getattr(exc, "status_code", None) not in STREAM_REJECTED_STATUSES:
+                        raise
+                    # Some providers/models refuse streaming outright; the plain call still works.
+                    self._stream_unsupported.add(model_name)
+                    self.logger.warning(f"Streaming rejected (model={model_name}): {exc}; falling back to a plain call")
+                else:
+                    if usage is None:
+                        self.logger.warning(
+                            f"Stream ended without usage (model={model_name}); recording an estimate"
+                        )
+                        usage = SimpleNamespace(
+                            prompt_tokens=len(prompt_text) // CHARS_PER_TOKEN,
+                            completion_tokens=len(content) // CHARS_PER_TOKEN,
+                            estimated=True,
+                        )
+                    return content, usage
+            stream_sink.reset()
+            content, usage = await self._backend.complete(safe_payload, model_name)
+            stream_sink.feed(content)
+            return content, usage
+
         async def do_call() -> Optional[str]:
             safe_payload = self._backend.simplify_payload(payload)
-            content, usage = await self._backend.complete(safe_payload, model_name)
-            self._record_usage(usage)
-            return content
+            if self.limiter is None:
+                content, usage = await complete(safe_payload)
+                self._record_usage(usage)
+                call_usage["usage"] = dict(self.last_usage) if self.last_usage else None
+                return content
+            attempts["count"] += 1
+            if attempts["outcome"] == "error":
+                await asyncio.sleep(Retry._compute_backoff(backoff_delay, 2.0, attempts["count"] - 1, jitter, 60.0))
+            reserved = estimate_tokens(len(prompt_text), payload)
+            queued_seconds = await self.limiter.acquire(model_name, reserved, operation)
+            if queued_seconds > 0.01:
+                self._record_timing(
+                    name="llm_limiter_wait",
+                    started_at=time.perf_counter() - queued_seconds,
+                    success=True,
+                    payload={"model": model_name, "operation": operation, **self.limiter.stats().get(model_name, {})},
+                )
+            outcome_exc: Optional[BaseException] = None
+            actual_tokens: Optional[int] = None
+            try:
+                content, usage = await complete(safe_payload)
+                self._record_usage(usage)
+                call_usage["usage"] = dict(self.last_usage) if self.last_usage else None
+                if usage is not None and call_usage["usage"]:
+                    actual_tokens = call_usage["usage"]["total_tokens"]
+                return content
+            except BaseException as exc:
+                # CancelledError included: a cancelled call must not count as "ok".
+                outcome_exc = exc
+                raise
+            finally:
+                attempts["outcome"] = classify_outcome(outcome_exc)
+                self.limiter.release(model_name, attempts["outcome"], reserved, actual_tokens)
 
         def should_retry(result: Optional[str], exc: Optional[BaseException], attempt: int) -> bool:
             if exc is None:
@@ -235,11 +395,16 @@ class ConnectorLLM(ConnectorBase):
                 content = await retry_coro
 
             if self._telemetry and self.last_usage:
-                self._telemetry.record_llm_usage({
+                usage_record = {
                     "model": model_name,
                     "usage": dict(self.last_usage),
                     "duration": max(0.0, asyncio.get_event_loop().time() - started_at),
-                })
+                }
+                if cache_key is not None:
+                    usage_record["cache"] = "miss"
+                self._telemetry.record_llm_usage(usage_record)
+            if cache_key is not None and content:
+                await self.response_cache.set(cache_key, content, call_usage.get("usage"), operation)
 
             self._record_timing(
                 name="llm_call",
@@ -282,6 +447,39 @@ class ConnectorLLM(ConnectorBase):
             )
             return None
 
+    def _serve_cached(self, cached: dict, model_name: str, operation: Optional[str]) -> str:
+        """
+        Answer from the response cache: zero spent tokens, the original usage as saved.
+        :param cached: Cache entry with ``content`` and ``usage``.
+        :param model_name: Resolved model name.
+        :param operation: Operation label.
+        :returns: Cached response text.
+        """
+        content = cached["content"]
+        saved_usage = cached.get("usage") or {}
+        self.last_usage = {
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "model": self.model_name,
+            "cached": True,
+        }
+        if self._telemetry:
+            self._telemetry.record_llm_usage({
+                "model": model_name,
+                "usage": dict(self.last_usage),
+                "saved_usage": dict(saved_usage),
+                "cache": "hit",
+                "duration": 0.0,
+            })
+        self._record_timing(
+            name="llm_call",
+            started_at=time.perf_counter(),
+            success=True,
+            payload={"model": model_name, "completion_chars": len(content), "cache": "hit", "operation": operation},
+        )
+        return content
+
     def set_model(self, model_name: Optional[str]) -> None:
         """
         Update the default model used for requests.
@@ -298,6 +496,31 @@ class ConnectorLLM(ConnectorBase):
         """
         return self.model_name
 
+    @property
+    def last_usage(self) -> Optional[dict]:
+        slot = self._usage_var.get()
+        return slot.get("usage") if slot is not None else None
+
+    @last_usage.setter
+    def last_usage(self, usage: Optional[dict]) -> None:
+        self._usage_slot()["usage"] = usage
+
+    def _usage_slot(self) -> dict:
+        slot = self._usage_var.get()
+        if slot is None:
+            slot = self.begin_usage_scope()
+        return slot
+
+    def begin_usage_scope(self) -> dict:
+        """
+        Give the current task (and tasks it spawns afterwards) its own
+        ``last_usage`` slot.
+        :return: The new, empty slot.
+        """
+        slot: dict = {}
+        self._usage_var.set(slot)
+        return slot
+
     def pop_last_usage(self) -> Optional[dict]:
         """
         Retrieve and clear the most recent token usage.
@@ -124,7 +124,7 @@ def _build(llm, search, http, chroma, model, settings, mandate):
     )
     engine = IdeaDagEngine(io=io, settings=settings, model_name=model)
     engine._current_mandate = mandate
-    engine._memory_manager = MemoryManager(connector_chroma=chroma, namespace=ns)
+    engine._memory_manager = MemoryManager.from_config(connector_chroma=chroma, namespace=ns, cfg=engine._cfg)
     graph = IdeaDag(root_title=mandate[:200], root_details={"mandate": mandate, "memo_namespace": ns})
     return engine, graph
 
@@ -161,6 +161,7 @@ async def _main() -> None:
                 print(f"\n  [WARN] could not generate answer: {exc}\n")
         else:
             print("\n  session ended early.\n")
+        await engine._memory_manager.aclose()
     finally:
         await _shutdown_connectors(llm, search, http, chroma)
 
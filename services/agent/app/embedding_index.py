@@ -0,0 +1,157 @@
+"""
+In-process vector index for small, hot Chroma namespaces.
+
+The per-run ``internal_thought`` memories rarely exceed a few hundred vectors,
+yet every dedup check used to round-trip to the Chroma server. This index keeps
+those vectors in a NumPy matrix (rows L2-normalized) so a top-k lookup is one
+matrix-vector product. Chroma remains the durable store; ``MemoryManager``
+mirrors its writes here.
+
+Distances are reported in the same space Chroma uses for our collections
+(``l2`` by default = squared euclidean), so ``1 - distance`` thresholds tuned
+against Chroma results carry over unchanged.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class LocalEmbeddingIndex:
+    """
+    Append/upsert-only cosine index returning Chroma-shaped query results.
+
+    :param space: Distance space to report: ``l2`` (squared, Chroma's default),
+        ``cosine`` or ``ip``.
+    """
+
+    _GROW_FACTOR = 2
+    _INITIAL_CAPACITY = 64
+
+    def __init__(self, space: str = "l2") -> None:
+        if space not in ("l2", "cosine", "ip"):
+            raise ValueError(f"Unsupported space: {space}")
+        self.space = space
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._ids: List[str] = []
+        self._row_by_id: Dict[str, int] = {}
+        self._metadatas: List[Dict[str, Any]] = []
+        self._documents: List[str] = []
+
+    def __len__(self) -> int:
+        return self._size
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    def _reserve(self, dim: int, extra: int) -> None:
+        if self._matrix is None:
+            capacity = max(self._INITIAL_CAPACITY, extra)
+            self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+            return
+        if self._matrix.shape[1] != dim:
+            raise ValueError(f"Embedding dim {dim} != index dim {self._matrix.shape[1]}")
+        needed = self._size + extra
+        if needed > self._matrix.shape[0]:
+            capacity = max(needed, self._matrix.shape[0] * self._GROW_FACTOR)
+            grown = np.zeros((capacity, dim), dtype=np.float32)
+            grown[: self._size] = self._matrix[: self._size]
+            self._matrix = grown
+
+    def add(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        metadatas: Optional[List[Dict[str, Any]]] = None,
+        documents: Optional[List[str]] = None,
+    ) -> None:
+        """
+        Insert or replace vectors by id.
+
+        :param ids: Record ids (same ids written to Chroma).
+        :param embeddings: One vector per id.
+        :param metadatas: Optional metadata per id.
+        :param documents: Optional document text per id.
+        :returns: None.
+        """
+        if not ids:
+            return
+        vectors = self._normalize(np.asarray(embeddings, dtype=np.float32).reshape(len(ids), -1))
+        self._reserve(vectors.shape[1], len(ids))
+        assert self._matrix is not None
+        for i, record_id in enumerate(ids):
+            metadata = dict(metadatas[i]) if metadatas and i < len(metadatas) else {}
+            document = documents[i] if documents and i < len(documents) else ""
+            row = self._row_by_id.get(record_id)
+            if row is None:
+                row = self._size
+                self._size += 1
+                self._row_by_id[record_id] = row
+                self._ids.append(record_id)
+                self._metadatas.append(metadata)
+                self._documents.append(document)
+            else:
+                self._metadatas[row] = metadata
+                self._documents[row] = document
+            self._matrix[row] = vectors[i]
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5,
+        where: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, List[List[Any]]]:
+        """
+        Top-k nearest neighbours for each query vector.
+
+        :param query_embeddings: Query vectors.
+        :param n_results: Max results per query.
+        :param where: Optional exact-match metadata filter (flat ``{key: value}``).
+        :returns: Dict shaped like a Chroma query result
+            (``ids`` / ``documents`` / ``metadatas`` / ``distances``, one row per query).
+        """
+        n_queries = len(query_embeddings)
+        result: Dict[str, List[List[Any]]] = {
+            "ids": [[] for _ in range(n_queries)],
+            "documents": [[] for _ in range(n_queries)],
+            "metadatas": [[] for _ in range(n_queries)],
+            "distances": [[] for _ in range(n_queries)],
+        }
+        if not n_queries or self._size == 0 or self._matrix is None or n_results <= 0:
+            return result
+
+        rows = np.arange(self._size)
+        if where:
+            rows = np.fromiter(
+                (r for r in range(self._size) if all(self._metadatas[r].get(k) == v for k, v in where.items())),
+                dtype=np.int64,
+            )
+            if rows.size == 0:
+                return result
+
+        queries = self._normalize(np.asarray(query_embeddings, dtype=np.float32).reshape(n_queries, -1))
+        sims = queries @ self._matrix[rows].T
+        k = min(n_results, rows.size)
+        if k < rows.size:
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        else:
+            top = np.tile(np.arange(rows.size), (n_queries, 1))
+        for q in range(n_queries):
+            order = top[q][np.argsort(-sims[q, top[q]])]
+            for col in order:
+                row = int(rows[col])
+                result["ids"][q].append(self._ids[row])
+                result["documents"][q].append(self._documents[row])
+                result["metadatas"][q].append(self._metadatas[row])
+                result["distances"][q].append(self._distance(float(sims[q, col])))
+        return result
+
+    def _distance(self, cosine: float) -> float:
+        if self.space == "l2":
+            return max(0.0, 2.0 - 2.0 * cosine)
+        return 1.0 - cosine
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import math
+import re
+from collections import Counter
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
@@ -14,6 +18,8 @@ from agent.app.idea_policies.config import IdeaConfig
 
 _logger = logging.getLogger(__name__)
 
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
 
 class GoTOperations:
 
@@ -38,12 +44,7 @@ class GoTOperations:
         if not self.memory_manager:
             return False
 
-        content_parts = [f"Thought: {title}"]
-        if goal:
-            content_parts.append(f"Goal: {goal}")
-        if action_type:
-            content_parts.append(f"Action: {action_type}")
-        content = "\n".join(content_parts)
+        content = self._thought_content(title, goal, action_type)
 
         metadata = {
             "memory_type": "internal_thought",
@@ -62,6 +63,38 @@ class GoTOperations:
             memory_type="internal_thought",
         )
 
+    @staticmethod
+    def _thought_content(title: str, goal: str, action_type: Optional[str]) -> str:
+        content_parts = [f"Thought: {title}"]
+        if goal:
+            content_parts.append(f"Goal: {goal}")
+        if action_type:
+            content_parts.append(f"Action: {action_type}")
+        return "\n".join(content_parts)
+
+    def prefetch_candidate(self, candidate: Dict[str, Any]) -> None:
+        """
+        Start the embedding work for a candidate streamed out of an expansion.
+
+        Embeds the candidate's dedup query and its future thought document in
+        the background, so ``filter_duplicate_candidates`` and
+        ``embed_children`` find the vectors ready once the full response is in.
+        Vectors are identical either way; only their timing changes.
+
+        :param candidate: Cleaned expansion candidate (``title`` / ``details``).
+        """
+        if not self.memory_manager:
+            return
+        texts = []
+        if self._cfg.got.dedup_enabled:
+            texts.append(self._candidate_dedup_query(candidate))
+        if self._cfg.got.embed_on_create:
+            title = str(candidate.get("title") or "")
+            details = candidate.get("details") or {}
+            goal = details.get(DetailKey.GOAL.value) or details.get(DetailKey.ORIGINAL_GOAL.value) or title
+            texts.append(self._thought_content(title, goal, details.get(DetailKey.ACTION.value)))
+        self.memory_manager.prewarm_embeddings(texts)
+
     async def embed_children(self, graph: IdeaDag, parent_id: str) -> int:
         if not self._cfg.got.embed_on_create:
             return 0
@@ -69,7 +102,7 @@ class GoTOperations:
         if not parent:
             return 0
 
-        count = 0
+        writes = []
         for child_id in parent.children:
             child = graph.get_node(child_id)
             if not child:
@@ -81,16 +114,17 @@ class GoTOperations:
                 or child.title
             )
             depth = graph.depth(child_id)
-            ok = await self.embed_thought(
+            writes.append(self.embed_thought(
                 node_id=child_id,
                 title=child.title,
                 goal=goal,
                 action_type=action,
                 parent_id=parent_id,
                 depth=depth,
-            )
-            if ok:
-                count += 1
+            ))
+        # Children are independent; with write-behind these only queue.
+        results = await asyncio.gather(*writes, return_exceptions=True)
+        count = sum(1 for ok in results if ok is True)
 
         if count > 0:
             _logger.debug(f"[GoT:EMBED] Embedded {count} child thoughts for parent {parent_id}")
@@ -241,61 +275,163 @@ class GoTOperations:
 
         query = f"{candidate_title} {candidate_goal}"
         try:
+            await self.memory_manager.flush()
             memories = await self.memory_manager.retrieve_relevant_memories(
                 query=query,
                 n_results=n_query,
                 memory_type="internal_thought",
             )
-            if not memories:
-                return False, None
-
-            for mem in memories:
-                distance = mem.get("distance", 1.0)
-                if isinstance(distance, (int, float)):
-                    similarity = 1.0 - distance
-                    if similarity >= threshold:
-                        existing_node_id = (mem.get("metadata") or {}).get("node_id", "unknown")
-                        _logger.info(
-                            f"[GoT:DEDUP] Candidate '{candidate_title[:40]}' is duplicate of node {existing_node_id} "
-                            f"(similarity={similarity:.3f} >= {threshold})"
-                        )
-                        return True, existing_node_id
+            existing_node_id = self._match_existing_thought(memories, threshold, candidate_title)
+            if existing_node_id is not None:
+                return True, existing_node_id
 
         except Exception as exc:
             _logger.warning(f"[GoT:DEDUP] Dedup check failed: {exc}")
 
         return False, None
 
+    @staticmethod
+    def _match_existing_thought(
+        memories: List[Dict[str, Any]],
+        threshold: float,
+        candidate_title: str,
+    ) -> Optional[str]:
+        """
+        First stored thought whose similarity (1 - distance) clears ``threshold``.
+
+        :param memories: Retrieved ``internal_thought`` memories for the candidate.
+        :param threshold: Similarity cutoff.
+        :param candidate_title: For logging only.
+        :returns: Matching node id ("unknown" if untagged), or None.
+        """
+        for mem in memories or []:
+            distance = mem.get("distance", 1.0)
+            if isinstance(distance, (int, float)):
+                similarity = 1.0 - distance
+                if similarity >= threshold:
+                    existing_node_id = (mem.get("metadata") or {}).get("node_id", "unknown")
+                    _logger.info(
+                        f"[GoT:DEDUP] Candidate '{candidate_title[:40]}' is duplicate of node {existing_node_id} "
+                        f"(similarity={similarity:.3f} >= {threshold})"
+                    )
+                    return existing_node_id
+        return None
+
+    @staticmethod
+    def _candidate_dedup_query(candidate: Dict[str, Any]) -> str:
+        title = candidate.get("title", "")
+        details = candidate.get("details", {}) or {}
+        goal = (
+            details.get(DetailKey.GOAL.value)
+            or details.get(DetailKey.ORIGINAL_GOAL.value)
+            or title
+        )
+        return f"{title} {goal}"
+
+    @staticmethod
+    def _embedding_similarity(a: List[float], b: List[float]) -> float:
+        """
+        ``1 - distance`` for two embeddings, with distance in Chroma's ``l2``
+        space (squared euclidean of normalized vectors), so the result is on
+        the same scale as ``_match_existing_thought`` and the dedup threshold.
+        """
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        cosine = dot / norm if norm else 0.0
+        return 1.0 - max(0.0, 2.0 - 2.0 * cosine)
+
+    @staticmethod
+    def _lexical_similarity(a: Counter, b: Counter) -> float:
+        """
+        Cosine similarity of two token-count vectors. Fallback for intra-batch
+        dedup when candidates cannot be embedded.
+        """
+        if not a or not b:
+            return 0.0
+        dot = sum(count * b.get(token, 0) for token, count in a.items())
+        norm = math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values()))
+        return dot / norm if norm else 0.0
+
     async def filter_duplicate_candidates(
         self,
         candidates: List[Dict[str, Any]],
         graph: IdeaDag,
     ) -> List[Dict[str, Any]]:
+        """
+        Drop candidates that duplicate an existing thought or an earlier
+        candidate in the same batch.
+
+        All candidates are checked against stored thoughts with a single
+        batched memory query, so latency does not grow with beam width.
+        Candidates are then compared pairwise (earlier ones win) by embedding
+        similarity with the same adaptive threshold. If they cannot be
+        embedded, a bag-of-words cosine against the much stricter
+        ``dedup_lexical_threshold`` is used instead, so candidates differing
+        only in an entity ("... of France" / "... of Germany") both survive.
+
+        :param candidates: Expansion candidates (``title`` / ``details``).
+        :param graph: Current DAG (drives the adaptive threshold).
+        :returns: Surviving candidates; never empty when input is non-empty.
+        """
         if not self._cfg.got.dedup_enabled:
             return candidates
         if not self.memory_manager:
             return candidates
+        if not candidates:
+            return candidates
+
+        threshold = self._adaptive_dedup_threshold(graph)
+        queries = [self._candidate_dedup_query(c) for c in candidates]
+        try:
+            # Read-your-writes: thoughts embedded for earlier siblings may
+            # still be queued in the write-behind buffer.
+            await self.memory_manager.flush()
+            batches = await self.memory_manager.retrieve_relevant_memories_batch(
+                queries=queries,
+                n_results=self._cfg.got.dedup_max_query,
+                memory_type="internal_thought",
+            )
+        except Exception as exc:
+            _logger.warning(f"[GoT:DEDUP] Dedup check failed: {exc}")
+            batches = [[] for _ in candidates]
+
+        vectors = None
+        embed = getattr(self.memory_manager, "embed_texts", None)
+        if embed is not None and len(candidates) > 1:
+            try:
+                vectors = await embed(queries)
+            except Exception as exc:
+                _logger.debug(f"[GoT:DEDUP] Candidate embedding failed, using lexical fallback: {exc}")
+        if vectors is not None and len(vectors) == len(queries):
+            keys: List[Any] = list(vectors)
+            similarity, cutoff = self._embedding_similarity, threshold
+        else:
+            keys = [Counter(_TOKEN_RE.findall(q.lower())) for q in queries]
+            similarity = self._lexical_similarity
+            cutoff = max(threshold, self._cfg.got.dedup_lexical_threshold)
 
         filtered = []
+        accepted_keys: List[Any] = []
         dedup_count = 0
+        batch_dup_count = 0
 
-        for candidate in candidates:
+        for candidate, key, memories in zip(candidates, keys, batches):
             title = candidate.get("title", "")
-            details = candidate.get("details", {})
-            goal = (
-                details.get(DetailKey.GOAL.value)
-                or details.get(DetailKey.ORIGINAL_GOAL.value)
-                or title
-            )
-
-            is_dup, existing_id = await self.is_duplicate_thought(title, goal, graph)
-            if is_dup:
+            if self._match_existing_thought(memories, threshold, title) is not None:
                 dedup_count += 1
                 continue
+            if any(similarity(key, prev) >= cutoff for prev in accepted_keys):
+                _logger.info(f"[GoT:DEDUP] Candidate '{title[:40]}' duplicates an earlier candidate in this batch")
+                batch_dup_count += 1
+                continue
             filtered.append(candidate)
+            accepted_keys.append(key)
 
-        if dedup_count > 0:
-            _logger.info(f"[GoT:DEDUP] Filtered {dedup_count} duplicate candidates out of {len(candidates)}")
+        if dedup_count or batch_dup_count:
+            _logger.info(
+                f"[GoT:DEDUP] Filtered {dedup_count + batch_dup_count} duplicate candidates out of {len(candidates)} "
+                f"(existing={dedup_count}, intra_batch={batch_dup_count})"
+            )
 
         return filtered if filtered else candidates[:1]
 
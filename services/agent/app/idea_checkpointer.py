@@ -4,9 +4,16 @@ Step-level checkpointing for the GoT engine.
 Snapshots the serialized DAG plus minimal engine state after each step so a
 crashed run can resume where it left off. Two backends: Redis (production)
 and File (dev/tests).
+
+Two modes:
+  full  — every step writes the whole serialized graph (default).
+  delta — every step writes only the nodes added/mutated/removed since the
+          previous save; a compacted base snapshot is written every
+          ``compact_every`` steps. Resume replays deltas over the base.
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 import os
@@ -15,11 +22,159 @@ from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
 
+CHECKPOINT_MODE_FULL = "full"
+CHECKPOINT_MODE_DELTA = "delta"
+
+
+def _node_fingerprint(node: Dict[str, Any]) -> str:
+    """
+    Stable content hash for one serialized node.
+
+    :param node: Node dict as produced by ``IdeaDag.to_dict()["nodes"][id]``.
+    :returns: Hex digest.
+    """
+    encoded = json.dumps(node, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+class GraphDeltaTracker:
+    """
+    Remembers per-node fingerprints of the last saved graph so the next save
+    can carry only the nodes that changed.
+
+    Nodes are mutated in place all over the engine (details, status, score,
+    children), so change detection is by content hash rather than dirty flags.
+    """
+
+    def __init__(self) -> None:
+        self._fingerprints: Dict[str, str] = {}
+        self._pending: Optional[Dict[str, str]] = None
+        self.steps_since_base = 0
+        self.has_base = False
+
+    def reset(self, graph: Dict[str, Any]) -> None:
+        """
+        Record ``graph`` as the new base.
+
+        :param graph: Serialized graph (``IdeaDag.to_dict()``).
+        :returns: None.
+        """
+        nodes = graph.get("nodes") or {}
+        self._fingerprints = {node_id: _node_fingerprint(node) for node_id, node in nodes.items()}
+        self._pending = None
+        self.steps_since_base = 0
+        self.has_base = True
+
+    def commit(self) -> None:
+        """
+        Advance the recorded state to the graph of the last ``diff``, once
+        its delta has been persisted.
+
+        :returns: None.
+        """
+        if self._pending is None:
+            return
+        self._fingerprints = self._pending
+        self._pending = None
+        self.steps_since_base += 1
+
+    def diff(self, graph: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build a graph delta against the last recorded state. The state only
+        advances on ``commit()``, so a delta that fails to persist is sent
+        again (merged with later changes) by the next ``diff``.
+
+        :param graph: Serialized graph (``IdeaDag.to_dict()``).
+        :returns: Delta dict with changed ``nodes``, ``removed_nodes`` and the
+            small graph-level maps copied whole.
+        """
+        nodes = graph.get("nodes") or {}
+        changed: Dict[str, Any] = {}
+        fingerprints: Dict[str, str] = {}
+        for node_id, node in nodes.items():
+            fp = _node_fingerprint(node)
+            fingerprints[node_id] = fp
+            if self._fingerprints.get(node_id) != fp:
+                changed[node_id] = node
+        removed = [node_id for node_id in self._fingerprints if node_id not in nodes]
+        self._pending = fingerprints
+        return {
+            "root_id": graph.get("root_id"),
+            "nodes": changed,
+            "removed_nodes": removed,
+            "executed_actions": graph.get("executed_actions") or {},
+            "blocked_sites": graph.get("blocked_sites") or {},
+        }
+
+
+def apply_graph_delta(graph: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Apply one graph delta to a serialized graph.
+
+    :param graph: Serialized graph to update (not mutated).
+    :param delta: Delta produced by ``GraphDeltaTracker.diff``.
+    :returns: New serialized graph.
+    """
+    nodes = dict(graph.get("nodes") or {})
+    for node_id in delta.get("removed_nodes") or []:
+        nodes.pop(node_id, None)
+    nodes.update(delta.get("nodes") or {})
+    return {
+        "root_id": delta.get("root_id") or graph.get("root_id"),
+        "nodes": nodes,
+        "executed_actions": dict(_graph_map(delta, graph, "executed_actions")),
+        "blocked_sites": dict(_graph_map(delta, graph, "blocked_sites")),
+    }
+
+
+def _graph_map(delta: Dict[str, Any], graph: Dict[str, Any], key: str) -> Dict[str, Any]:
+    # A map present in the delta replaces the old one, even when it is empty.
+    if key in delta:
+        return delta[key] or {}
+    return graph.get(key) or {}
+
+
+def replay_checkpoint_deltas(base: Dict[str, Any], deltas: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Rebuild the latest checkpoint payload from a base snapshot and its deltas.
+
+    Deltas at or below the base step are ignored, so a stale delta left over
+    from before a compaction cannot roll the graph back.
+
+    :param base: Payload returned by ``Checkpointer.load``.
+    :param deltas: Payloads returned by ``Checkpointer.load_deltas``.
+    :returns: Payload shaped like ``base`` at the last delta's step.
+    """
+    base_step = int(base.get("step_index") or 0)
+    snapshot = dict(base.get("snapshot") or {})
+    step_index = base_step
+    saved_at = base.get("saved_at")
+    for entry in sorted(deltas, key=lambda d: int(d.get("step_index") or 0)):
+        entry_step = int(entry.get("step_index") or 0)
+        if entry_step <= step_index:
+            continue
+        delta = entry.get("delta") or {}
+        graph_delta = delta.get("graph") or {}
+        snapshot = {**snapshot, **{k: v for k, v in delta.items() if k != "graph"}}
+        snapshot["graph"] = apply_graph_delta(snapshot.get("graph") or {}, graph_delta)
+        step_index = entry_step
+        saved_at = entry.get("saved_at", saved_at)
+    return {**base, "step_index": step_index, "saved_at": saved_at, "snapshot": snapshot}
+
+
 class Checkpointer(ABC):
     """
-    Abstract checkpointer. Backends implement save/load/list.
+    Abstract checkpointer. Backends implement save/load/list, and
+    save_delta/load_deltas for delta mode.
     """
 
+    mode: str = CHECKPOINT_MODE_FULL
+    compact_every: int = 10
+    bytes_written: int = 0
+
+    def __init__(self) -> None:
+        self._delta_trackers: Dict[str, GraphDeltaTracker] = {}
+
     @abstractmethod
     async def save(self, run_id: str, step_index: int, snapshot: Dict[str, Any]) -> None:
         """
@@ -58,17 +213,89 @@ class Checkpointer(ABC):
         """
         return None
 
+    async def save_delta(self, run_id: str, step_index: int, delta: Dict[str, Any]) -> None:
+        """
+        Persist an incremental delta on top of the latest base snapshot.
+
+        :param run_id: Run identifier.
+        :param step_index: 0-based step number.
+        :param delta: Engine state plus a ``graph`` delta.
+        :returns: None.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support delta checkpoints")
+
+    async def load_deltas(self, run_id: str) -> List[Dict[str, Any]]:
+        """
+        Load deltas recorded since the latest base snapshot, oldest first.
+
+        :param run_id: Run identifier.
+        :returns: List of delta payloads (empty in full mode).
+        """
+        return []
+
+    async def save_step(self, run_id: str, step_index: int, snapshot: Dict[str, Any]) -> None:
+        """
+        Persist a step in the configured mode. In delta mode the first save of a
+        run, and every ``compact_every`` steps after it, writes a full base.
+
+        :param run_id: Run identifier.
+        :param step_index: 0-based step number.
+        :param snapshot: Serialized graph + engine state.
+        :returns: None.
+        """
+        if self.mode != CHECKPOINT_MODE_DELTA:
+            await self.save(run_id, step_index, snapshot)
+            return
+        tracker = self._delta_tracker(run_id)
+        graph = snapshot.get("graph") or {}
+        if not tracker.has_base or tracker.steps_since_base >= max(1, self.compact_every):
+            await self.save(run_id, step_index, snapshot)
+            tracker.reset(graph)
+            return
+        delta = {k: v for k, v in snapshot.items() if k != "graph"}
+        delta["graph"] = tracker.diff(graph)
+        await self.save_delta(run_id, step_index, delta)
+        # Only a persisted delta advances the tracker; after a failed write
+        # the next step re-sends these changes.
+        tracker.commit()
+
+    def _delta_tracker(self, run_id: str) -> GraphDeltaTracker:
+        if run_id not in self._delta_trackers:
+            self._delta_trackers[run_id] = GraphDeltaTracker()
+        return self._delta_trackers[run_id]
+
+    def _forget_tracker(self, run_id: str) -> None:
+        self._delta_trackers.pop(run_id, None)
+
+    def _count_bytes(self, encoded: str) -> None:
+        self.bytes_written += len(encoded.encode("utf-8"))
+
 
 class FileCheckpointer(Checkpointer):
     """
     Stores snapshots as ./.checkpoints/<run_id>/<step>.json plus latest.json.
+    In delta mode, bases only write latest.json and each step writes a small
+    <step>.delta.json; a new base removes the deltas it supersedes.
     """
 
-    def __init__(self, root_dir: str = ".checkpoints") -> None:
+    DELTA_SUFFIX = ".delta.json"
+
+    def __init__(
+        self,
+        root_dir: str = ".checkpoints",
+        mode: str = CHECKPOINT_MODE_FULL,
+        compact_every: int = 10,
+    ) -> None:
         """
         :param root_dir: Directory under which snapshots are stored.
+        :param mode: "full" or "delta".
+        :param compact_every: Delta mode: steps between compacted base snapshots.
         """
+        super().__init__()
         self.root_dir = root_dir
+        self.mode = mode
+        self.compact_every = compact_every
+        self.bytes_written = 0
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def _run_dir(self, run_id: str) -> str:
@@ -83,12 +310,57 @@ class FileCheckpointer(Checkpointer):
             "saved_at": time.time(),
             "snapshot": snapshot,
         }
-        step_path = os.path.join(run_dir, f"{step_index:04d}.json")
+        encoded = json.dumps(payload)
         latest_path = os.path.join(run_dir, "latest.json")
-        with open(step_path, "w", encoding="utf-8") as fh:
-            json.dump(payload, fh)
-        with open(latest_path, "w", encoding="utf-8") as fh:
-            json.dump(payload, fh)
+        if self.mode == CHECKPOINT_MODE_DELTA:
+            self._write(latest_path, encoded)
+            self._remove_deltas(run_dir)
+            return
+        step_path = os.path.join(run_dir, f"{step_index:04d}.json")
+        self._write(step_path, encoded)
+        self._write(latest_path, encoded)
+
+    async def save_delta(self, run_id: str, step_index: int, delta: Dict[str, Any]) -> None:
+        run_dir = self._run_dir(run_id)
+        os.makedirs(run_dir, exist_ok=True)
+        payload = {
+            "run_id": run_id,
+            "step_index": step_index,
+            "saved_at": time.time(),
+            "delta": delta,
+        }
+        self._write(os.path.join(run_dir, f"{step_index:04d}{self.DELTA_SUFFIX}"), json.dumps(payload))
+
+    async def load_deltas(self, run_id: str) -> List[Dict[str, Any]]:
+        run_dir = self._run_dir(run_id)
+        if not os.path.isdir(run_dir):
+            return []
+        deltas: List[Dict[str, Any]] = []
+        for name in sorted(os.listdir(run_dir)):
+            if not name.endswith(self.DELTA_SUFFIX):
+                continue
+            try:
+                with open(os.path.join(run_dir, name), "r", encoding="utf-8") as fh:
+                    deltas.append(json.load(fh))
+            except (OSError, json.JSONDecodeError) as exc:
+                # A torn trailing delta loses one step; later deltas would
+                # build on missing state, so stop replaying here.
+                self.logger.warning("Failed to load checkpoint delta %s/%s: %s", run_id, name, exc)
+                break
+        return deltas
+
+    def _write(self, path: str, encoded: str) -> None:
+        with open(path, "w", encoding="utf-8") as fh:
+            fh.write(encoded)
+        self._count_bytes(encoded)
+
+    def _remove_deltas(self, run_dir: str) -> None:
+        for name in os.listdir(run_dir):
+            if name.endswith(self.DELTA_SUFFIX):
+                try:
+                    os.remove(os.path.join(run_dir, name))
+                except OSError:
+                    pass
 
     async def load(self, run_id: str) -> Optional[Dict[str, Any]]:
         latest_path = os.path.join(self._run_dir(run_id), "latest.json")
@@ -109,6 +381,7 @@ class FileCheckpointer(Checkpointer):
     async def delete(self, run_id: str) -> None:
         import shutil
 
+        self._forget_tracker(run_id)
         run_dir = self._run_dir(run_id)
         if os.path.isdir(run_dir):
             shutil.rmtree(run_dir, ignore_errors=True)
@@ -117,24 +390,41 @@ class FileCheckpointer(Checkpointer):
 class RedisCheckpointer(Checkpointer):
     """
     Stores snapshots as JSON under euglena:checkpoint:<run_id> with a TTL.
-    Only retains the latest snapshot per run (one key per run).
+    Only retains the latest snapshot per run (one key per run). In delta mode
+    deltas are appended to the list euglena:checkpoint:<run_id>:deltas, which
+    is cleared whenever a new base is written.
     """
 
     KEY_PREFIX = "euglena:checkpoint"
     INDEX_KEY = "euglena:checkpoint:_index"
 
-    def __init__(self, redis_client: Any, ttl_seconds: int = 86400) -> None:
+    def __init__(
+        self,
+        redis_client: Any,
+        ttl_seconds: int = 86400,
+        mode: str = CHECKPOINT_MODE_FULL,
+        compact_every: int = 10,
+    ) -> None:
         """
         :param redis_client: An async Redis client (e.g. from connector_redis).
         :param ttl_seconds: TTL applied to each checkpoint key.
+        :param mode: "full" or "delta".
+        :param compact_every: Delta mode: steps between compacted base snapshots.
         """
+        super().__init__()
         self.client = redis_client
         self.ttl_seconds = ttl_seconds
+        self.mode = mode
+        self.compact_every = compact_every
+        self.bytes_written = 0
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def _key(self, run_id: str) -> str:
         return f"{self.KEY_PREFIX}:{run_id}"
 
+    def _delta_key(self, run_id: str) -> str:
+        return f"{self.KEY_PREFIX}:{run_id}:deltas"
+
     async def save(self, run_id: str, step_index: int, snapshot: Dict[str, Any]) -> None:
         payload = {
             "run_id": run_id,
@@ -144,9 +434,38 @@ class RedisCheckpointer(Checkpointer):
         }
         encoded = json.dumps(payload)
         await self.client.set(self._key(run_id), encoded, ex=self.ttl_seconds)
+        self._count_bytes(encoded)
+        if self.mode == CHECKPOINT_MODE_DELTA:
+            await self.client.delete(self._delta_key(run_id))
         await self.client.sadd(self.INDEX_KEY, run_id)
         await self.client.expire(self.INDEX_KEY, self.ttl_seconds)
 
+    async def save_delta(self, run_id: str, step_index: int, delta: Dict[str, Any]) -> None:
+        payload = {
+            "run_id": run_id,
+            "step_index": step_index,
+            "saved_at": time.time(),
+            "delta": delta,
+        }
+        encoded = json.dumps(payload)
+        key = self._delta_key(run_id)
+        await self.client.rpush(key, encoded)
+        await self.client.expire(key, self.ttl_seconds)
+        self._count_bytes(encoded)
+
+    async def load_deltas(self, run_id: str) -> List[Dict[str, Any]]:
+        raw_items = await self.client.lrange(self._delta_key(run_id), 0, -1)
+        deltas: List[Dict[str, Any]] = []
+        for raw in raw_items or []:
+            if isinstance(raw, (bytes, bytearray)):
+                raw = raw.decode("utf-8")
+            try:
+                deltas.append(json.loads(raw))
+            except json.JSONDecodeError as exc:
+                self.logger.warning("Corrupt checkpoint delta for %s: %s", run_id, exc)
+                break
+        return deltas
+
     async def load(self, run_id: str) -> Optional[Dict[str, Any]]:
         raw = await self.client.get(self._key(run_id))
         if raw is None:
@@ -166,7 +485,9 @@ class RedisCheckpointer(Checkpointer):
         return [m.decode("utf-8") if isinstance(m, (bytes, bytearray)) else str(m) for m in members]
 
     async def delete(self, run_id: str) -> None:
+        self._forget_tracker(run_id)
         await self.client.delete(self._key(run_id))
+        await self.client.delete(self._delta_key(run_id))
         await self.client.srem(self.INDEX_KEY, run_id)
 
 
@@ -179,19 +500,34 @@ def create_checkpointer_from_env(redis_client: Any = None) -> Optional[Checkpoin
       IDEA_CHECKPOINT_BACKEND — "redis" | "file" (default file).
       IDEA_CHECKPOINT_DIR — root dir for file backend (default ".checkpoints").
       IDEA_CHECKPOINT_TTL_SECONDS — TTL for redis backend (default 86400).
+      IDEA_CHECKPOINT_MODE — "full" | "delta" (default full).
+      IDEA_CHECKPOINT_COMPACT_EVERY — delta mode: steps between base snapshots (default 10).
 
-    :param redis_client: Optional pre-constructed Redis client for redis backend.
+    :param redis_client: Redis client for the redis backend (default: the shared pooled client).
     :returns: Checkpointer instance or None when disabled.
     """
     if (os.environ.get("IDEA_CHECKPOINT_ENABLED") or "").strip().lower() not in ("1", "true", "yes", "on"):
         return None
     backend = (os.environ.get("IDEA_CHECKPOINT_BACKEND") or "file").strip().lower()
+    mode = (os.environ.get("IDEA_CHECKPOINT_MODE") or CHECKPOINT_MODE_FULL).strip().lower()
+    if mode not in (CHECKPOINT_MODE_FULL, CHECKPOINT_MODE_DELTA):
+        logging.getLogger(__name__).warning("Unknown IDEA_CHECKPOINT_MODE=%s; using full", mode)
+        mode = CHECKPOINT_MODE_FULL
+    compact_every = int(os.environ.get("IDEA_CHECKPOINT_COMPACT_EVERY", "10"))
     if backend == "redis":
+        if redis_client is None:
+            from shared.connector_redis import shared_redis_client
+
+            redis_client = shared_redis_client()
         if redis_client is None:
             logging.getLogger(__name__).warning(
-                "IDEA_CHECKPOINT_BACKEND=redis but no Redis client provided; falling back to file"
+                "IDEA_CHECKPOINT_BACKEND=redis but REDIS_URL is not set; falling back to file"
             )
         else:
             ttl = int(os.environ.get("IDEA_CHECKPOINT_TTL_SECONDS", "86400"))
-            return RedisCheckpointer(redis_client, ttl_seconds=ttl)
-    return FileCheckpointer(os.environ.get("IDEA_CHECKPOINT_DIR") or ".checkpoints")
+            return RedisCheckpointer(redis_client, ttl_seconds=ttl, mode=mode, compact_every=compact_every)
+    return FileCheckpointer(
+        os.environ.get("IDEA_CHECKPOINT_DIR") or ".checkpoints",
+        mode=mode,
+        compact_every=compact_every,
+    )
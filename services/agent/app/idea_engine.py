@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional, List
+from typing import Any, Awaitable, ContextManager, Dict, Optional, List, Set, Tuple
 import asyncio
+import contextlib
 import hashlib
 import logging
 
@@ -25,7 +26,10 @@ from agent.app.idea_policies import (
 from agent.app.idea_finalize import build_final_payload
 from agent.app.idea_branch_pair import BranchPair, find_branch_pair, get_completion_path
 from agent.app.got_operations import GoTOperations
-from agent.app.idea_checkpointer import Checkpointer, create_checkpointer_from_env
+from agent.app.idea_speculation import ExpansionSpeculator
+from agent.app.idea_scheduler import ReadyQueueScheduler
+from agent.app.telemetry import TelemetrySession
+from agent.app.idea_checkpointer import Checkpointer, create_checkpointer_from_env, replay_checkpoint_deltas
 from agent.app.idea_policies.data_contracts import ContractRegistry, default_contract_registry
 from agent.app.idea_policies.post_expansion_hooks import (
     PostExpansionHook,
@@ -75,6 +79,9 @@ class IdeaDagEngine:
         self._step_index = 0
         self._memory_manager: Optional[MemoryManager] = None
         self._got: Optional[GoTOperations] = None
+        self._speculator: Optional[ExpansionSpeculator] = None
+        # Speculation waiting for running actions to store their results: (graph, waiting, running, step).
+        self._deferred_speculation: Optional[Tuple[IdeaDag, Set[str], List[str], int]] = None
         self._checkpointer: Optional[Checkpointer] = create_checkpointer_from_env()
 
     async def run(self, mandate: str, max_steps: int = 50, run_id: Optional[str] = None) -> Dict[str, Any]:
@@ -82,50 +89,166 @@ class IdeaDagEngine:
         self._logger.info(f"[RUN] Starting idea DAG engine with mandate: {mandate_short}..., max_steps={max_steps}, run_id={run_id}")
         namespace = self._memo_namespace(mandate)
         self.settings[DetailKey.MEMO_NAMESPACE.value] = namespace
-        self._memory_manager = MemoryManager(
+        self._memory_manager = MemoryManager.from_config(
             connector_chroma=self.io.connector_chroma,
             namespace=namespace,
+            cfg=self._cfg,
         )
-        self._got = GoTOperations(
-            settings=self.settings,
-            io=self.io,
-            memory_manager=self._memory_manager,
-        )
-        self._current_mandate = mandate
-        root_title = mandate.split("\n\nTask Statement")[0] if "\n\nTask Statement" in mandate else mandate
+        try:
+            self._got = GoTOperations(
+                settings=self.settings,
+                io=self.io,
+                memory_manager=self._memory_manager,
+            )
+            self._speculator = (
+                ExpansionSpeculator(self.expansion, self.io)
+                if self._cfg.engine.speculative_expansion and isinstance(self.expansion, LlmExpansionPolicy)
+                else None
+            )
+            self._current_mandate = mandate
+            root_title = mandate.split("\n\nTask Statement")[0] if "\n\nTask Statement" in mandate else mandate
+
+            graph: Optional[IdeaDag] = None
+            current_id: Optional[str] = None
+            steps = 0
+            telemetry = self._telemetry_session()
+            if telemetry is not None:
+                telemetry.start_loop_monitor()
+            if run_id and self._checkpointer:
+                cp = await self._phase("setup", self._load_checkpoint(run_id))
+                if cp and isinstance(cp.get("snapshot"), dict):
+                    snap = cp["snapshot"]
+                    try:
+                        graph = IdeaDag.from_dict(snap.get("graph") or {})
+                        current_id = snap.get("current_id") or graph.root_id()
+                        steps = int(cp.get("step_index") or 0) + 1
+                        self._step_index = steps
+                        self._parallel_leaves_total = int(snap.get("parallel_leaves_total") or 0)
+                        if self._got and isinstance(snap.get("got_dead_end_count"), int):
+                            self._got.dead_end_count = snap["got_dead_end_count"]
+                        self._logger.info(
+                            f"[RUN] Resumed run_id={run_id} from checkpoint step={steps - 1}, current_id={current_id}"
+                        )
+                    except Exception as exc:  # noqa: BLE001 — corrupt checkpoint should not block a fresh run
+                        self._logger.warning(f"[RUN] Checkpoint restore failed; starting fresh: {exc}")
+                        graph = None
+                        current_id = None
+                        steps = 0
+
+            if graph is None:
+                graph = IdeaDag(root_title=root_title, root_details={"mandate": mandate, "memo_namespace": namespace})
+                current_id = graph.root_id()
+                self._logger.info(f"[RUN] Created graph with root_id={current_id}")
+            scheduler: Optional[ReadyQueueScheduler] = None
+            if self._cfg.engine.scheduler == "ready_queue":
+                scheduler = ReadyQueueScheduler(self, graph, mandate, run_id)
+                steps = await scheduler.run(steps, max_steps)
+            else:
+                steps = await self._run_cursor(graph, current_id, steps, max_steps, mandate, run_id)
+            self._logger.info(f"[RUN] Completed {steps} steps, checking for pending nodes before finalizing")
+            self._deferred_speculation = None
+            if self._speculator:
+                await self._speculator.discard()
+        
+            pending_nodes = self._get_pending_executable_nodes(graph)
+            if pending_nodes:
+                pending_ids = [n.node_id for n in pending_nodes]
+                self._logger.warning(f"[RUN] GUARDRAIL: {len(pending_nodes)} nodes still pending execution: {pending_ids[:5]}...")
+                self._logger.warning(f"[RUN] Cannot finalize with pending nodes. These nodes need action execution:")
+                for node in pending_nodes[:5]:
+                    action = NodeDetailsExtractor.get_action(node.details)
+                    self._logger.warning(f"[RUN]   - {node.node_id}: {node.title[:60]}... (action={action}, status={node.status.value})")
+        
+            final_payload = await self._phase("finalize", build_final_payload(
+                self.io, self.settings, graph, mandate, self.model_name,
+                memory_manager=self._memory_manager,
+            ))
+            final_payload["graph"] = graph.to_dict()
+            final_payload["pending_nodes_count"] = len(pending_nodes) if pending_nodes else 0
+            final_payload["steps"] = steps
+            if pending_nodes:
+                final_payload["warning"] = f"Finalized with {len(pending_nodes)} pending nodes - execution incomplete"
 
-        graph: Optional[IdeaDag] = None
-        current_id: Optional[str] = None
-        steps = 0
-        if run_id and self._checkpointer:
+            if self._got:
+                pruned_count = sum(
+                    1 for n in graph.iter_depth_first()
+                    if n.details.get("_got_pruned")
+                )
+                improved_count = sum(
+                    1 for n in graph.iter_depth_first()
+                    if n.details.get("_got_improve_iterations", 0) > 0
+                )
+                final_payload["got_stats"] = {
+                    "dead_ends_detected": self._got.dead_end_count,
+                    "nodes_pruned": pruned_count,
+                    "nodes_improved": improved_count,
+                    "parallel_leaves_total": getattr(self, "_parallel_leaves_total", 0),
+                }
+            if self._speculator:
+                final_payload["speculation_stats"] = dict(self._speculator.stats)
+            if scheduler is not None:
+                final_payload["scheduler_stats"] = dict(scheduler.stats)
+
+            with self._measure("finalize"):
+                # Grounding verdict for the final answer (substantiation mandates only). Surfaced
+                # in the result so observability/groundedness reflect real visited-page evidence.
+                try:
+                    _req = parse_mandate_requirements(mandate)
+                    if _req.needs_substantiation:
+                        _g = evaluate_grounding(graph, _req)
+                        final_payload["grounded"] = bool(_g.grounded)
+                        final_payload["missing_requirements"] = _g.missing
+                        final_payload["grounding_replans"] = int(getattr(self, "_grounding_replans", 0))
+                        self._record_decision(
+                            "finalize", node_id=graph.root_id(), chosen="finalized",
+                            grounded=_g.grounded, rationale=_g.reason,
+                            metadata={"replans": int(getattr(self, "_grounding_replans", 0)),
+                                      "missing": _g.missing},
+                        )
+                    else:
+                        self._record_decision("finalize", node_id=graph.root_id(), chosen="finalized")
+                except Exception as exc:  # noqa: BLE001 — never crash finalize on grounding
+                    self._logger.warning(f"[GROUNDING] final grounding check failed: {exc}")
+
+            self._logger.info(f"[RUN] Final payload created, graph has {graph.node_count()} nodes, {len(pending_nodes) if pending_nodes else 0} pending")
+            self._maybe_log_dag(graph, steps, force=True)
+            return final_payload
+        finally:
+            # Drain write-behind (and stop its flush timer) even when the run fails,
+            # so nothing queued outlives it.
             try:
-                cp = await self._checkpointer.load(run_id)
-            except Exception as exc:  # noqa: BLE001 — checkpoint load must never crash a run
-                self._logger.warning(f"[RUN] Checkpoint load failed for run_id={run_id}: {exc}")
-                cp = None
+                await self._phase("finalize", self._memory_manager.aclose())
+            except Exception as exc:  # noqa: BLE001 — must not mask the run outcome
+                self._logger.warning(f"[RUN] Memory write-behind drain failed: {exc}")
+            telemetry = self._telemetry_session()
+            if telemetry is not None:
+                await telemetry.stop_loop_monitor()
+
+    async def _load_checkpoint(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Load the checkpoint for ``run_id``, replaying any deltas recorded since its base."""
+        try:
+            cp = await self._checkpointer.load(run_id)
             if cp and isinstance(cp.get("snapshot"), dict):
-                snap = cp["snapshot"]
-                try:
-                    graph = IdeaDag.from_dict(snap.get("graph") or {})
-                    current_id = snap.get("current_id") or graph.root_id()
-                    steps = int(cp.get("step_index") or 0) + 1
-                    self._step_index = steps
-                    self._parallel_leaves_total = int(snap.get("parallel_leaves_total") or 0)
-                    if self._got and isinstance(snap.get("got_dead_end_count"), int):
-                        self._got.dead_end_count = snap["got_dead_end_count"]
-                    self._logger.info(
-                        f"[RUN] Resumed run_id={run_id} from checkpoint step={steps - 1}, current_id={current_id}"
-                    )
-                except Exception as exc:  # noqa: BLE001 — corrupt checkpoint should not block a fresh run
-                    self._logger.warning(f"[RUN] Checkpoint restore failed; starting fresh: {exc}")
-                    graph = None
-                    current_id = None
-                    steps = 0
-
-        if graph is None:
-            graph = IdeaDag(root_title=root_title, root_details={"mandate": mandate, "memo_namespace": namespace})
-            current_id = graph.root_id()
-            self._logger.info(f"[RUN] Created graph with root_id={current_id}")
+                # Delta mode: the base is the last compacted snapshot;
+                # replay the per-step deltas recorded since.
+                deltas = await self._checkpointer.load_deltas(run_id)
+                if deltas:
+                    cp = replay_checkpoint_deltas(cp, deltas)
+            return cp
+        except Exception as exc:  # noqa: BLE001 — checkpoint load must never crash a run
+            self._logger.warning(f"[RUN] Checkpoint load failed for run_id={run_id}: {exc}")
+            return None
+
+    async def _run_cursor(
+        self,
+        graph: IdeaDag,
+        current_id: Optional[str],
+        steps: int,
+        max_steps: int,
+        mandate: str,
+        run_id: Optional[str],
+    ) -> int:
+        """Single-cursor step loop: advance one ``current_id`` per step. Returns the steps used."""
         while steps < max_steps:
             self._logger.info(f"[RUN] === STEP {steps}/{max_steps} ===")
             current_id = await self.step(graph, current_id, steps)
@@ -155,20 +278,7 @@ class IdeaDagEngine:
                     )
                     current_id = target
 
-            if run_id and self._checkpointer:
-                try:
-                    await self._checkpointer.save(
-                        run_id,
-                        steps - 1,
-                        {
-                            "graph": graph.to_dict(),
-                            "current_id": current_id,
-                            "parallel_leaves_total": getattr(self, "_parallel_leaves_total", 0),
-                            "got_dead_end_count": getattr(self._got, "dead_end_count", 0) if self._got else 0,
-                        },
-                    )
-                except Exception as exc:  # noqa: BLE001 — checkpoint save must never crash a run
-                    self._logger.warning(f"[RUN] Checkpoint save failed at step {steps - 1}: {exc}")
+            await self._save_checkpoint(run_id, steps - 1, graph, current_id)
 
             if steps == 1:
                 root = graph.get_node(graph.root_id())
@@ -198,65 +308,30 @@ class IdeaDagEngine:
                     continue
                 self._logger.warning(f"[RUN] Step {steps} returned None, breaking loop")
                 break
-        self._logger.info(f"[RUN] Completed {steps} steps, checking for pending nodes before finalizing")
-        
-        pending_nodes = self._get_pending_executable_nodes(graph)
-        if pending_nodes:
-            pending_ids = [n.node_id for n in pending_nodes]
-            self._logger.warning(f"[RUN] GUARDRAIL: {len(pending_nodes)} nodes still pending execution: {pending_ids[:5]}...")
-            self._logger.warning(f"[RUN] Cannot finalize with pending nodes. These nodes need action execution:")
-            for node in pending_nodes[:5]:
-                action = NodeDetailsExtractor.get_action(node.details)
-                self._logger.warning(f"[RUN]   - {node.node_id}: {node.title[:60]}... (action={action}, status={node.status.value})")
-        
-        final_payload = await build_final_payload(
-            self.io, self.settings, graph, mandate, self.model_name,
-            memory_manager=self._memory_manager,
-        )
-        final_payload["graph"] = graph.to_dict()
-        final_payload["pending_nodes_count"] = len(pending_nodes) if pending_nodes else 0
-        if pending_nodes:
-            final_payload["warning"] = f"Finalized with {len(pending_nodes)} pending nodes - execution incomplete"
+        return steps
 
-        if self._got:
-            pruned_count = sum(
-                1 for n in graph.iter_depth_first()
-                if n.details.get("_got_pruned")
-            )
-            improved_count = sum(
-                1 for n in graph.iter_depth_first()
-                if n.details.get("_got_improve_iterations", 0) > 0
-            )
-            final_payload["got_stats"] = {
-                "dead_ends_detected": self._got.dead_end_count,
-                "nodes_pruned": pruned_count,
-                "nodes_improved": improved_count,
-                "parallel_leaves_total": getattr(self, "_parallel_leaves_total", 0),
-            }
-
-        # Grounding verdict for the final answer (substantiation mandates only). Surfaced
-        # in the result so observability/groundedness reflect real visited-page evidence.
+    async def _save_checkpoint(
+        self,
+        run_id: Optional[str],
+        step_index: int,
+        graph: IdeaDag,
+        current_id: Optional[str],
+    ) -> None:
+        if not (run_id and self._checkpointer):
+            return
         try:
-            _req = parse_mandate_requirements(mandate)
-            if _req.needs_substantiation:
-                _g = evaluate_grounding(graph, _req)
-                final_payload["grounded"] = bool(_g.grounded)
-                final_payload["missing_requirements"] = _g.missing
-                final_payload["grounding_replans"] = int(getattr(self, "_grounding_replans", 0))
-                self._record_decision(
-                    "finalize", node_id=graph.root_id(), chosen="finalized",
-                    grounded=_g.grounded, rationale=_g.reason,
-                    metadata={"replans": int(getattr(self, "_grounding_replans", 0)),
-                              "missing": _g.missing},
-                )
-            else:
-                self._record_decision("finalize", node_id=graph.root_id(), chosen="finalized")
-        except Exception as exc:  # noqa: BLE001 — never crash finalize on grounding
-            self._logger.warning(f"[GROUNDING] final grounding check failed: {exc}")
-
-        self._logger.info(f"[RUN] Final payload created, graph has {graph.node_count()} nodes, {len(pending_nodes) if pending_nodes else 0} pending")
-        self._maybe_log_dag(graph, steps, force=True)
-        return final_payload
+            await self._phase("checkpoint", self._checkpointer.save_step(
+                run_id,
+                step_index,
+                {
+                    "graph": graph.to_dict(),
+                    "current_id": current_id,
+                    "parallel_leaves_total": getattr(self, "_parallel_leaves_total", 0),
+                    "got_dead_end_count": getattr(self._got, "dead_end_count", 0) if self._got else 0,
+                },
+            ))
+        except Exception as exc:  # noqa: BLE001 — checkpoint save must never crash a run
+            self._logger.warning(f"[RUN] Checkpoint save failed at step {step_index}: {exc}")
 
     async def step(self, graph: IdeaDag, current_id: str, step_index: int) -> Optional[str]:
         self._logger.info(f"[STEP {step_index}] Starting step with current_id={current_id}, node_count={graph.node_count()}")
@@ -408,6 +483,7 @@ class IdeaDagEngine:
         
         if not has_result or is_blocked_ready:
             if self._is_action_ready(node, step_index):
+                self._speculate_next_expansion(graph, [node_id], step_index)
                 result = await self._execute_action(graph, node.parent_id or graph.root_id(), node_id)
                 if result is not None:
                     self._handle_action_result(graph, node_id, step_index)
@@ -458,56 +534,17 @@ class IdeaDagEngine:
         if not node:
             return None
         
-        memories = []
-        if self._memory_manager:
-            justification = NodeDetailsExtractor.get_justification(node.details)
-            parent_goal = node.details.get(DetailKey.PARENT_GOAL.value) or ""
-            
-            query_parts = [node.title]
-            if justification:
-                query_parts.append(justification[:100])
-            if parent_goal:
-                query_parts.append(parent_goal[:100])
-            if hasattr(self, '_current_mandate') and self._current_mandate:
-                query_parts.append(self._current_mandate[:100])
-            
-            query = " ".join(query_parts)
-            
-            n_internal = self._cfg.memory.expansion_chroma_internal
-            n_observations = self._cfg.memory.expansion_chroma_observations
-            split_memories = await self._memory_manager.retrieve_memories_split(
-                query=query,
-                node_context={
-                    "title": node.title,
-                    "action": node.details.get(DetailKey.ACTION.value),
-                    "error": node.details.get(DetailKey.ACTION_ERROR.value),
-                    "justification": justification,
-                },
-                n_internal=n_internal,
-                n_observations=n_observations,
-            )
-            memories = split_memories["internal_thoughts"] + split_memories["observations"]
+        memories = await self._expansion_memories(graph, node, step_index)
 
-            if self._got:
-                hybrid_extras = await self._got.hybrid_retrieve(
-                    graph, node_id, query, n_results=3,
-                )
-                seen_ids = {m.get("id") for m in memories if m.get("id")}
-                for extra in hybrid_extras:
-                    if extra.get("id") not in seen_ids:
-                        memories.append(extra)
-                        seen_ids.add(extra.get("id"))
-            self._logger.info(
-                f"[STEP {step_index}] EXPANSION: Retrieved {len(split_memories['internal_thoughts'])} internal thoughts, "
-                f"{len(split_memories['observations'])} observations from vector DB"
-            )
-            if split_memories["observations"]:
-                obs_preview = "\n".join([str(obs.get("content", "") if isinstance(obs, dict) else obs)[:200] for obs in split_memories["observations"][:3]])
-                self._logger.info(f"[STEP {step_index}] Observations preview:\n{obs_preview}")
-        
         self._logger.info(f"[STEP {step_index}] EXPANSION: Calling expansion policy for node '{node.title[:60]}...'")
         try:
-            candidates = await self.expansion.expand(graph, node_id, memories=memories)
+            expand_kwargs: Dict[str, Any] = {"memories": memories}
+            if self._got and self._cfg.expansion.stream:
+                expand_kwargs["on_candidate"] = self._got.prefetch_candidate
+            if self._speculator:
+                speculator = self._speculator
+                expand_kwargs["prefetched"] = lambda messages: speculator.claim(node_id, messages)
+            candidates = await self._phase("expand", self.expansion.expand(graph, node_id, **expand_kwargs))
             self._logger.info(f"[STEP {step_index}] EXPANSION: Policy returned {len(candidates) if candidates else 0} candidates")
             if not candidates:
                 self._logger.error(f"[STEP {step_index}] EXPANSION FAILED: Expansion policy returned no candidates!")
@@ -600,6 +637,59 @@ class IdeaDagEngine:
 
         return node_id
 
+    async def _expansion_memories(self, graph: IdeaDag, node: IdeaNode, step_index: int) -> List[Dict[str, Any]]:
+        """Retrieve the memories an expansion of ``node`` puts in its prompt."""
+        if not self._memory_manager:
+            return []
+        justification = NodeDetailsExtractor.get_justification(node.details)
+        parent_goal = node.details.get(DetailKey.PARENT_GOAL.value) or ""
+        
+        query_parts = [node.title]
+        if justification:
+            query_parts.append(justification[:100])
+        if parent_goal:
+            query_parts.append(parent_goal[:100])
+        if hasattr(self, '_current_mandate') and self._current_mandate:
+            query_parts.append(self._current_mandate[:100])
+        
+        query = " ".join(query_parts)
+        
+        n_internal = self._cfg.memory.expansion_chroma_internal
+        n_observations = self._cfg.memory.expansion_chroma_observations
+        # Read-your-writes: observations from the visit that just finished
+        # may still be queued in the write-behind buffer.
+        await self._memory_manager.flush()
+        split_memories = await self._memory_manager.retrieve_memories_split(
+            query=query,
+            node_context={
+                "title": node.title,
+                "action": node.details.get(DetailKey.ACTION.value),
+                "error": node.details.get(DetailKey.ACTION_ERROR.value),
+                "justification": justification,
+            },
+            n_internal=n_internal,
+            n_observations=n_observations,
+        )
+        memories = split_memories["internal_thoughts"] + split_memories["observations"]
+
+        if self._got:
+            hybrid_extras = await self._got.hybrid_retrieve(
+                graph, node.node_id, query, n_results=3,
+            )
+            seen_ids = {m.get("id") for m in memories if m.get("id")}
+            for extra in hybrid_extras:
+                if extra.get("id") not in seen_ids:
+                    memories.append(extra)
+                    seen_ids.add(extra.get("id"))
+        self._logger.info(
+            f"[STEP {step_index}] EXPANSION: Retrieved {len(split_memories['internal_thoughts'])} internal thoughts, "
+            f"{len(split_memories['observations'])} observations from vector DB"
+        )
+        if split_memories["observations"]:
+            obs_preview = "\n".join([str(obs.get("content", "") if isinstance(obs, dict) else obs)[:200] for obs in split_memories["observations"][:3]])
+            self._logger.info(f"[STEP {step_index}] Observations preview:\n{obs_preview}")
+        return memories
+
     def _record_decision(self, stage: str, **kwargs) -> None:
         """Proxy a decision onto the telemetry thought-process trace (best-effort)."""
         telemetry = getattr(self.io, "telemetry", None)
@@ -610,6 +700,33 @@ class IdeaDagEngine:
             except Exception:  # noqa: BLE001 — tracing must never crash a run
                 pass
 
+    def _telemetry_session(self) -> Optional[TelemetrySession]:
+        telemetry = getattr(self.io, "telemetry", None)
+        return telemetry if isinstance(telemetry, TelemetrySession) else None
+
+    async def _phase(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        """Await engine work as telemetry phase ``name`` (busy/await/CPU split when profiling is on)."""
+        telemetry = self._telemetry_session()
+        if telemetry is None:
+            return await awaitable
+        return await telemetry.phase(name, awaitable)
+
+    def _measure(self, name: str) -> ContextManager[None]:
+        """Synchronous counterpart of ``_phase`` (e.g. selection)."""
+        telemetry = self._telemetry_session()
+        return telemetry.measure(name) if telemetry is not None else contextlib.nullcontext()
+
+    async def _evaluate_children(self, graph: IdeaDag, node_id: str, child_ids: List[str]) -> None:
+        """Score ``child_ids`` of ``node_id``, batched when the policy supports it."""
+        async def evaluate() -> None:
+            if hasattr(self.evaluation, "evaluate_batch"):
+                await self.evaluation.evaluate_batch(graph, node_id, child_ids)
+            else:
+                for child_id in child_ids:
+                    await self.evaluation.evaluate(graph, child_id)
+
+        await self._phase("evaluate", evaluate())
+
     def _grounding_replan(self, graph: IdeaDag, mandate: str, steps: int, max_steps: int) -> bool:
         """Soft grounding gate. Returns True if another pass should run.
 
@@ -824,6 +941,7 @@ class IdeaDagEngine:
                 f"(limit={parallel_limit}, skipping evaluation)"
             )
             semaphore = asyncio.Semaphore(parallel_limit)
+            self._speculate_next_expansion(graph, ready_children, step_index)
 
             async def _run_one(cid: str) -> Optional[Dict[str, Any]]:
                 child = graph.get_node(cid)
@@ -875,11 +993,7 @@ class IdeaDagEngine:
 
         if needs_evaluation:
             self._logger.debug(f"[STEP {step_index}] Evaluating {len(eligible)} children")
-            if hasattr(self.evaluation, "evaluate_batch"):
-                await self.evaluation.evaluate_batch(graph, node_id, list(eligible))
-            else:
-                for child_id in eligible:
-                    await self.evaluation.evaluate(graph, child_id)
+            await self._evaluate_children(graph, node_id, list(eligible))
 
         min_score = self._cfg.engine.min_score_threshold
         allow_unscored = self._cfg.engine.allow_unscored_selection
@@ -908,11 +1022,12 @@ class IdeaDagEngine:
         original_children = list(node.children)
         node.children = scored_eligible
         try:
-            if self._cfg.engine.best_first_global:
-                selected, parent_id = self._select_best_global(graph, min_score, allow_unscored)
-            else:
-                selected = self.selection.select(graph, node_id)
-                parent_id = node_id
+            with self._measure("select"):
+                if self._cfg.engine.best_first_global:
+                    selected, parent_id = self._select_best_global(graph, min_score, allow_unscored)
+                else:
+                    selected = self.selection.select(graph, node_id)
+                    parent_id = node_id
         finally:
             node.children = original_children
 
@@ -932,6 +1047,8 @@ class IdeaDagEngine:
             rationale=(selected.details.get(DetailKey.EVALUATION.value) or {}).get("rationale", ""),
             metadata={"step": step_index, "action": NodeDetailsExtractor.get_action(selected.details)},
         )
+        if NodeDetailsExtractor.get_action(selected.details):
+            self._speculate_next_expansion(graph, [selected.node_id], step_index)
         result = await self._execute_action(graph, parent_id or node_id, selected.node_id)
         if result is not None:
             self._handle_action_result(graph, selected.node_id, step_index)
@@ -951,6 +1068,12 @@ class IdeaDagEngine:
         return node_id
 
     async def _execute_action(self, graph: IdeaDag, parent_id: str, node_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return await self._run_action(graph, parent_id, node_id)
+        finally:
+            self._release_speculation(node_id)
+
+    async def _run_action(self, graph: IdeaDag, parent_id: str, node_id: str) -> Optional[Dict[str, Any]]:
         node = graph.get_node(node_id)
         if not node:
             return None
@@ -1012,7 +1135,8 @@ class IdeaDagEngine:
             },
         )
         node.status = IdeaNodeStatus.ACTIVE
-        result = await action.execute(graph, node_id, self.io)
+        phase = "merge" if action_enum == IdeaActionType.MERGE else "execute"
+        result = await self._phase(phase, action.execute(graph, node_id, self.io))
         sanitized_result = self._sanitize_action_result(result) if result else None
         graph.update_details(node_id, {DetailKey.ACTION_RESULT.value: sanitized_result})
         self._record_decision(
@@ -1285,11 +1409,22 @@ class IdeaDagEngine:
         if node.parent_id:
             self._check_and_create_merge_nodes(graph, node.parent_id, step_index)
 
-    def _select_best_global(self, graph: IdeaDag, min_score: float, allow_unscored: bool) -> tuple[Optional[Any], Optional[str]]:
+    def _select_best_global(
+        self,
+        graph: IdeaDag,
+        min_score: float,
+        allow_unscored: bool,
+        exclude: Optional[set] = None,
+        expandable_only: bool = False,
+    ) -> tuple[Optional[Any], Optional[str]]:
         best = None
         for node in graph.iter_depth_first():
             if node.parent_id is None:
                 continue
+            if exclude and node.node_id in exclude:
+                continue
+            if expandable_only and not self._awaits_expansion(node):
+                continue
             if node.details.get(DetailKey.ACTION_RESULT.value) is not None and node.status == IdeaNodeStatus.DONE:
                 continue
             if not self._is_action_ready(node, self._step_index):
@@ -1307,6 +1442,67 @@ class IdeaDagEngine:
             parent_id = best.parent_ids[0]
         return best, parent_id
 
+    @staticmethod
+    def _awaits_expansion(node: IdeaNode) -> bool:
+        """True for an open sub-problem node the engine will expand when it reaches it."""
+        return (
+            not node.children
+            and not NodeDetailsExtractor.get_action(node.details)
+            and not node.details.get(DetailKey.IS_LEAF.value, False)
+            and node.status not in (IdeaNodeStatus.DONE, IdeaNodeStatus.FAILED, IdeaNodeStatus.SKIPPED)
+        )
+
+    def _predict_expansion_target(self, graph: IdeaDag, running_ids: List[str]) -> Optional[IdeaNode]:
+        """Best-first guess at the next node to be expanded, other than the running ones."""
+        target, _ = self._select_best_global(
+            graph,
+            self._cfg.engine.min_score_threshold,
+            self._cfg.engine.allow_unscored_selection,
+            exclude=set(running_ids),
+            expandable_only=True,
+        )
+        return target
+
+    def _speculate_next_expansion(self, graph: IdeaDag, running_ids: List[str], step_index: int) -> None:
+        """
+        Start expanding the predicted next target while ``running_ids`` execute.
+
+        With memory on, the start waits until those actions have stored their
+        results: the real expansion retrieves them into its prompt, so a guess
+        built before they exist would never match it.
+        """
+        if not self._speculator or self._speculator.pending_node_id is not None:
+            return
+        memory_on = self._memory_manager is not None and self._memory_manager.connector_chroma is not None
+        if memory_on and running_ids:
+            self._deferred_speculation = (graph, set(running_ids), list(running_ids), step_index)
+            return
+        self._start_speculation(graph, running_ids, step_index)
+
+    def _release_speculation(self, node_id: str) -> None:
+        """Start the deferred speculation once the last action it waits on has finished."""
+        deferred = self._deferred_speculation
+        if deferred is None or node_id not in deferred[1]:
+            return
+        deferred[1].discard(node_id)
+        if deferred[1]:
+            return
+        self._deferred_speculation = None
+        graph, _, running_ids, step_index = deferred
+        if self._speculator and self._speculator.pending_node_id is None:
+            # The speculative retrieval flushes write-behind first, like the real one.
+            self._start_speculation(graph, running_ids, step_index)
+
+    def _start_speculation(self, graph: IdeaDag, running_ids: List[str], step_index: int) -> None:
+        target = self._predict_expansion_target(graph, running_ids)
+        if target is None:
+            return
+        self._speculator.start(
+            graph,
+            target.node_id,
+            lambda: self._expansion_memories(graph, target, step_index),
+        )
+
     def _maybe_log_dag(self, graph: IdeaDag, step_index: int, force: bool = False) -> None:
         if not self._cfg.engine.log_dag_ascii:
             return
@@ -224,6 +224,8 @@ async def _retrieve_final_chroma_context(
 ) -> str:
     if not memory_manager:
         return ""
+    # Barrier: every observation written during the run must be queryable.
+    await memory_manager.flush()
 
     seen_ids = set()
     all_memories: List[Dict[str, Any]] = []
@@ -446,6 +448,7 @@ async def build_final_payload(
         model_name=model_name,
         fallback_model=cfg.generation.fallback_model,
         timeout_seconds=final_timeout,
+        operation="finalize",
     )
     _logger.info(f"[FINALIZE] response={len(response) if response else 0}c")
     _logger.debug(f"[FINALIZE] response preview: {response[:500] if response else 'None'}")
@@ -1,8 +1,14 @@
+import asyncio
 import hashlib
 import logging
 import uuid
-from typing import List, Dict, Any, Optional
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
 from agent.app.connector_chroma import ConnectorChroma
+from agent.app.embedding_index import LocalEmbeddingIndex
+
+THOUGHT_MEMORY_TYPE = "internal_thought"
+OBSERVATION_MEMORY_TYPE = "observation"
 
 
 class MemoryManager:
@@ -16,9 +22,27 @@ class MemoryManager:
     :param namespace: Isolation namespace (hashed into collection name).
     :param chunk_size: Max characters per chunk.
     :param chunk_overlap: Overlap characters between consecutive chunks.
+    :param local_thought_index: Mirror ``internal_thought`` writes into an
+        in-process ``LocalEmbeddingIndex`` and serve thought reads (dedup,
+        split retrieval) from it instead of querying Chroma.
+    :param write_behind: Buffer writes and store them in coalesced batches
+        instead of awaiting Chroma per call. ``write_memory`` then returns once
+        the content is chunked and queued; readers that need to see their own
+        writes call ``flush()`` first.
+    :param flush_max_docs: Write-behind: flush once this many chunks are queued.
+    :param flush_max_age_seconds: Write-behind: flush this long after the first
+        chunk is queued.
+    :param split_mode: ``retrieve_memories_split`` strategy passed to
+        ``ConnectorChroma.query_chroma_split``: ``single`` (one over-fetched
+        query partitioned locally) or ``concurrent`` (per-type queries gathered).
     """
 
     PARALLEL_CHUNK_THRESHOLD = 20
+    EMBEDDING_MEMO_SIZE = 512
+    # Write-behind: flushes a failed batch is retried for, and the cap on
+    # chunks held for retry (oldest failed chunks are dropped beyond it).
+    FLUSH_MAX_ATTEMPTS = 3
+    MAX_RETRY_DOCS = 2048
 
     def __init__(
         self,
@@ -26,6 +50,11 @@ class MemoryManager:
         namespace: str,
         chunk_size: int = 800,
         chunk_overlap: int = 100,
+        local_thought_index: bool = False,
+        write_behind: bool = False,
+        flush_max_docs: int = 64,
+        flush_max_age_seconds: float = 0.25,
+        split_mode: str = "single",
     ):
         self.connector_chroma = connector_chroma
         self.namespace = namespace
@@ -34,6 +63,165 @@ class MemoryManager:
         namespace_hash = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:12]
         self.collection_name = f"mem_{namespace_hash}"
         self._logger = logging.getLogger(__name__)
+        self._thought_index: Optional[LocalEmbeddingIndex] = (
+            LocalEmbeddingIndex() if local_thought_index and connector_chroma else None
+        )
+        self._thought_index_hydrated = False
+        self.write_behind = write_behind and connector_chroma is not None
+        self.flush_max_docs = max(1, flush_max_docs)
+        self.flush_max_age_seconds = max(0.0, flush_max_age_seconds)
+        # (memory_type, ids, metadatas, documents, failed flush attempts)
+        self._pending: List[Tuple[str, List[str], List[Dict[str, Any]], List[str], int]] = []
+        self._pending_docs = 0
+        self.dropped_writes = 0
+        self._flush_lock = asyncio.Lock()
+        self._flush_timer: Optional[asyncio.Task] = None
+        self._background_flushes: set = set()
+        self.split_mode = split_mode
+        self._vector_memo: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._prewarming: Dict[str, asyncio.Task] = {}
+
+    @classmethod
+    def from_config(cls, connector_chroma: ConnectorChroma, namespace: str, cfg: Any) -> "MemoryManager":
+        """
+        Build a manager from the engine's typed ``IdeaConfig``.
+        :param connector_chroma: ChromaDB connector instance.
+        :param namespace: Isolation namespace.
+        :param cfg: ``IdeaConfig`` (reads ``got.local_thought_index`` and ``memory.*``).
+        :returns: MemoryManager.
+        """
+        return cls(
+            connector_chroma=connector_chroma,
+            namespace=namespace,
+            local_thought_index=cfg.got.local_thought_index,
+            write_behind=cfg.memory.write_behind_enabled,
+            flush_max_docs=cfg.memory.write_behind_max_docs,
+            flush_max_age_seconds=cfg.memory.write_behind_max_age_seconds,
+            split_mode=cfg.memory.split_mode,
+        )
+
+    def _disable_thought_index(self, reason: str) -> None:
+        if self._thought_index is not None:
+            self._logger.warning(f"Local thought index disabled, falling back to Chroma: {reason}")
+        self._thought_index = None
+
+    async def _embed_for_thought_index(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed texts locally for the thought index. Disables the index when no
+        embedding function is available (the failure is not transient).
+        """
+        if self._thought_index is None:
+            return None
+        pending = {self._prewarming[t] for t in texts if t in self._prewarming}
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+        return await self._embed_missing(texts)
+
+    async def _embed_missing(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed the texts not already in the vector memo and remember the results.
+        """
+        if self._thought_index is None:
+            return None
+        found = {t: self._vector_memo[t] for t in texts if t in self._vector_memo}
+        for text in found:
+            self._vector_memo.move_to_end(text)
+        missing = [t for t in dict.fromkeys(texts) if t not in found]
+        if missing:
+            embed = getattr(self.connector_chroma, "embed_texts", None)
+            vectors = await embed(missing) if embed else None
+            if vectors is None:
+                self._disable_thought_index("embedding unavailable")
+                return None
+            for text, vector in zip(missing, vectors):
+                found[text] = vector
+                self._vector_memo[text] = vector
+            while len(self._vector_memo) > self.EMBEDDING_MEMO_SIZE:
+                self._vector_memo.popitem(last=False)
+        return [found[t] for t in texts]
+
+    async def embed_texts(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Embed texts with the function the collections use, so vectors compare
+        on the same scale as retrieval distances. Reuses memoized and
+        prewarmed vectors when the local thought index is on.
+        :param texts: Texts to embed.
+        :returns: One vector per text, or None if embedding is unavailable.
+        """
+        if not texts:
+            return []
+        if self._thought_index is not None:
+            return await self._embed_for_thought_index(list(texts))
+        embed = getattr(self.connector_chroma, "embed_texts", None)
+        return await embed(list(texts)) if embed else None
+
+    def prewarm_embeddings(self, texts: List[str]) -> None:
+        """
+        Embed texts in the background so a later thought-index read or write
+        for the same text skips the embedding step. No-op without the local
+        thought index (Chroma embeds server-side then).
+        :param texts: Texts about to be queried or stored.
+        """
+        if self._thought_index is None:
+            return
+        todo = [t for t in dict.fromkeys(texts) if t and t not in self._vector_memo and t not in self._prewarming]
+        if not todo:
+            return
+        task = asyncio.get_running_loop().create_task(self._embed_missing(todo))
+        for text in todo:
+            self._prewarming[text] = task
+
+        def _done(finished: asyncio.Task) -> None:
+            for text in todo:
+                if self._prewarming.get(text) is finished:
+                    del self._prewarming[text]
+            if not finished.cancelled() and finished.exception() is not None:
+                self._logger.debug(f"Embedding prewarm failed: {finished.exception()}")
+
+        task.add_done_callback(_done)
+
+    async def _hydrate_thought_index(self) -> None:
+        """
+        Load thoughts already in Chroma (e.g. after a checkpoint resume) into
+        the local index. Runs once; writes mirrored since are upserted over.
+        """
+        if self._thought_index_hydrated or self._thought_index is None:
+            return
+        self._thought_index_hydrated = True
+        get = getattr(self.connector_chroma, "get_from_chroma", None)
+        if get is None:
+            return
+        stored = await get(
+            collection=self.collection_name,
+            where={"memory_type": THOUGHT_MEMORY_TYPE},
+            include=["embeddings", "metadatas", "documents"],
+        )
+        ids = list((stored or {}).get("ids") or [])
+        embeddings = (stored or {}).get("embeddings")
+        if ids and embeddings is not None and len(embeddings) == len(ids):
+            self._thought_index.add(
+                ids=ids,
+                embeddings=embeddings,
+                metadatas=list(stored.get("metadatas") or []),
+                documents=list(stored.get("documents") or []),
+            )
+            self._logger.debug(f"Hydrated local thought index with {len(ids)} vectors")
+
+    async def _query_thought_index(
+        self,
+        queries: List[str],
+        n_results: int,
+    ) -> Optional[List[List[Dict[str, Any]]]]:
+        """
+        Serve an ``internal_thought`` retrieval from the local index.
+        :returns: One memory list per query, or None to fall back to Chroma.
+        """
+        await self._hydrate_thought_index()
+        vectors = await self._embed_for_thought_index(list(queries))
+        if vectors is None or self._thought_index is None:
+            return None
+        results = self._thought_index.query(vectors, n_results=n_results)
+        return [self._parse_query_results(results, i) for i in range(len(queries))]
 
     async def retrieve_relevant_memories(
         self,
@@ -52,47 +240,94 @@ class MemoryManager:
         """
         if not self.connector_chroma:
             return []
-        try:
-            if node_context:
-                parts = []
-                if node_context.get("title"):
-                    parts.append(node_context["title"])
-                if node_context.get("action"):
-                    parts.append(f"action: {node_context['action']}")
-                from agent.app.idea_policies.action_constants import ActionResultKey
-                error = node_context.get(ActionResultKey.ERROR.value) or node_context.get("error")
-                if error:
-                    parts.append(f"error: {error}")
-                if parts:
-                    query = f"{query} {' '.join(parts)}"
+        if node_context:
+            query = self._augment_query(query, node_context)
+        batches = await self.retrieve_relevant_memories_batch(
+            queries=[query],
+            n_results=n_results,
+            memory_type=memory_type,
+        )
+        return batches[0] if batches else []
 
+    async def retrieve_relevant_memories_batch(
+        self,
+        queries: List[str],
+        n_results: int = 5,
+        memory_type: Optional[str] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Retrieve memories for several queries in one Chroma round trip.
+        :param queries: Search texts (one result list per query, same order).
+        :param n_results: Max results per query.
+        :param memory_type: Filter by ``internal_thought`` or ``observation``.
+        :returns: One list of memory dicts per query; empty lists on failure.
+        """
+        empty: List[List[Dict[str, Any]]] = [[] for _ in queries]
+        if not self.connector_chroma or not queries:
+            return empty
+        try:
+            if memory_type == THOUGHT_MEMORY_TYPE and self._thought_index is not None:
+                local = await self._query_thought_index(queries, n_results)
+                if local is not None:
+                    return local
             where = {"memory_type": memory_type} if memory_type else None
             results = await self.connector_chroma.query_chroma(
                 collection=self.collection_name,
-                query_texts=[query],
+                query_texts=list(queries),
                 n_results=n_results,
                 where=where,
             )
             if not results:
-                return []
-
-            memories = []
-            documents = results.get("documents", [[]])[0] or []
-            metadatas = results.get("metadatas", [[]])[0] or []
-            distances = results.get("distances", [[]])[0] or []
-            ids = results.get("ids", [[]])[0] or []
-            for i, doc in enumerate(documents):
-                memories.append({
-                    "content": doc,
-                    "metadata": metadatas[i] if i < len(metadatas) else {},
-                    "distance": distances[i] if i < len(distances) else 1.0,
-                    "id": ids[i] if i < len(ids) else None,
-                })
-            self._logger.debug(f"Retrieved {len(memories)} memories for query: {query[:100]}")
-            return memories
+                return empty
+            batches = [self._parse_query_results(results, i) for i in range(len(queries))]
+            self._logger.debug(
+                f"Retrieved {sum(len(b) for b in batches)} memories for {len(queries)} queries: {queries[0][:100]}"
+            )
+            return batches
         except Exception as e:
             self._logger.warning(f"Failed to retrieve memories: {e}")
-            return []
+            return empty
+
+    @staticmethod
+    def _augment_query(query: str, node_context: Dict[str, Any]) -> str:
+        parts = []
+        if node_context.get("title"):
+            parts.append(node_context["title"])
+        if node_context.get("action"):
+            parts.append(f"action: {node_context['action']}")
+        from agent.app.idea_policies.action_constants import ActionResultKey
+        error = node_context.get(ActionResultKey.ERROR.value) or node_context.get("error")
+        if error:
+            parts.append(f"error: {error}")
+        if parts:
+            query = f"{query} {' '.join(parts)}"
+        return query
+
+    @staticmethod
+    def _parse_query_results(results: Dict[str, Any], index: int) -> List[Dict[str, Any]]:
+        """
+        Flatten one query's slice of a Chroma result dict into memory dicts.
+        :param results: Raw ``query_chroma`` result.
+        :param index: Query position within ``query_texts``.
+        :returns: List of memory dicts with content, metadata, distance, id.
+        """
+        def _column(key: str) -> List[Any]:
+            rows = results.get(key) or []
+            return (rows[index] if index < len(rows) else None) or []
+
+        documents = _column("documents")
+        metadatas = _column("metadatas")
+        distances = _column("distances")
+        ids = _column("ids")
+        memories = []
+        for i, doc in enumerate(documents):
+            memories.append({
+                "content": doc,
+                "metadata": metadatas[i] if i < len(metadatas) else {},
+                "distance": distances[i] if i < len(distances) else 1.0,
+                "id": ids[i] if i < len(ids) else None,
+            })
+        return memories
 
     async def retrieve_memories_split(
         self,
@@ -119,14 +354,31 @@ class MemoryManager:
             if parts:
                 query = f"{query} {' '.join(parts)}"
 
-        internal_thoughts = await self.retrieve_relevant_memories(
-            query=query, node_context=node_context,
-            n_results=n_internal, memory_type="internal_thought",
-        )
-        observations = await self.retrieve_relevant_memories(
-            query=query, node_context=node_context,
-            n_results=n_observations, memory_type="observation",
-        )
+            # The per-type reads have always applied the node_context suffix a
+            # second time; keep the exact query text so results do not shift.
+            query = self._augment_query(query, node_context)
+
+        internal_thoughts: Optional[List[Dict[str, Any]]] = None
+        n_by_type = {THOUGHT_MEMORY_TYPE: n_internal, OBSERVATION_MEMORY_TYPE: n_observations}
+        try:
+            if self._thought_index is not None and n_internal > 0:
+                local = await self._query_thought_index([query], n_internal)
+                if local is not None:
+                    internal_thoughts = local[0]
+                    n_by_type = {OBSERVATION_MEMORY_TYPE: n_observations}
+            split = await self.connector_chroma.query_chroma_split(
+                collection=self.collection_name,
+                query_texts=[query],
+                n_by_type=n_by_type,
+                mode=self.split_mode,
+            )
+        except Exception as e:
+            self._logger.warning(f"Failed to retrieve split memories: {e}")
+            return {"internal_thoughts": internal_thoughts or [], "observations": []}
+
+        if internal_thoughts is None:
+            internal_thoughts = self._parse_query_results(split.get(THOUGHT_MEMORY_TYPE) or {}, 0)
+        observations = self._parse_query_results(split.get(OBSERVATION_MEMORY_TYPE) or {}, 0)
         return {"internal_thoughts": internal_thoughts, "observations": observations}
 
     def _chunk_text(self, text: str) -> List[str]:
@@ -203,9 +455,9 @@ class MemoryManager:
             if not memory_type:
                 from agent.app.idea_policies.base import IdeaActionType
                 if action_type in (IdeaActionType.VISIT.value, IdeaActionType.SEARCH.value):
-                    memory_type = "observation"
+                    memory_type = OBSERVATION_MEMORY_TYPE
                 else:
-                    memory_type = "internal_thought"
+                    memory_type = THOUGHT_MEMORY_TYPE
 
             base_metadata = {
                 "node_id": node_id,
@@ -256,20 +508,11 @@ class MemoryManager:
                 metadatas_list.append(chunk_metadata)
                 documents.append(chunk_with_links)
 
-            if len(chunks) > self.PARALLEL_CHUNK_THRESHOLD:
-                success_flag = await self.connector_chroma.add_to_chroma_parallel(
-                    collection=self.collection_name,
-                    ids=ids,
-                    metadatas=metadatas_list,
-                    documents=documents,
-                )
-            else:
-                success_flag = await self.connector_chroma.add_to_chroma(
-                    collection=self.collection_name,
-                    ids=ids,
-                    metadatas=metadatas_list,
-                    documents=documents,
-                )
+            if self.write_behind:
+                self._enqueue(memory_type, ids, metadatas_list, documents)
+                return True
+
+            success_flag = await self._store(memory_type, ids, metadatas_list, documents)
 
             if success_flag:
                 self._logger.debug(f"Wrote {len(chunks)} chunk(s) for node {node_id}: {node_title[:50]}")
@@ -278,6 +521,161 @@ class MemoryManager:
             self._logger.warning(f"Failed to write memory: {e}")
             return False
 
+    async def _store(
+        self,
+        memory_type: str,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]],
+        documents: List[str],
+    ) -> bool:
+        """
+        Write prepared chunks to Chroma (parallel batches for large sets) and
+        mirror thoughts into the local index.
+        """
+        embeddings = None
+        if memory_type == THOUGHT_MEMORY_TYPE and self._thought_index is not None:
+            # Embed once locally; Chroma stores the same vectors so it
+            # does not embed the documents a second time.
+            embeddings = await self._embed_for_thought_index(documents)
+        extra = {"embeddings": embeddings} if embeddings is not None else {}
+
+        if len(documents) > self.PARALLEL_CHUNK_THRESHOLD:
+            success_flag = await self.connector_chroma.add_to_chroma_parallel(
+                collection=self.collection_name,
+                ids=ids,
+                metadatas=metadatas,
+                documents=documents,
+                **extra,
+            )
+        else:
+            success_flag = await self.connector_chroma.add_to_chroma(
+                collection=self.collection_name,
+                ids=ids,
+                metadatas=metadatas,
+                documents=documents,
+                **extra,
+            )
+
+        if success_flag and embeddings is not None and self._thought_index is not None:
+            self._thought_index.add(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+        return success_flag
+
+    def _enqueue(
+        self,
+        memory_type: str,
+        ids: List[str],
+        metadatas: List[Dict[str, Any]],
+        documents: List[str],
+    ) -> None:
+        """
+        Queue prepared chunks for write-behind and schedule a flush by size
+        or age.
+        """
+        self._pending.append((memory_type, ids, metadatas, documents, 0))
+        self._pending_docs += len(documents)
+        if self._pending_docs >= self.flush_max_docs:
+            self._spawn_flush()
+        else:
+            self._start_flush_timer()
+
+    def _start_flush_timer(self) -> None:
+        if self._flush_timer is None or self._flush_timer.done():
+            self._flush_timer = asyncio.get_running_loop().create_task(self._flush_after_age())
+
+    def _spawn_flush(self) -> None:
+        task = asyncio.get_running_loop().create_task(self.flush())
+        self._background_flushes.add(task)
+        task.add_done_callback(self._background_flushes.discard)
+
+    async def _flush_after_age(self) -> None:
+        await asyncio.sleep(self.flush_max_age_seconds)
+        self._flush_timer = None
+        await self.flush()
+
+    @property
+    def pending_writes(self) -> int:
+        """Chunks queued by write-behind (including failed ones awaiting a retry) and not yet stored."""
+        return self._pending_docs
+
+    async def flush(self) -> bool:
+        """
+        Write-behind barrier: store every queued chunk, coalesced into one
+        batch per memory type, and wait for any flush already in flight.
+
+        A batch that fails goes back on the queue and is retried by later
+        flushes, up to ``FLUSH_MAX_ATTEMPTS``; then (or past ``MAX_RETRY_DOCS``)
+        it is dropped, logged as an error and counted in ``dropped_writes``.
+
+        :returns: True if everything queued so far was stored.
+        """
+        async with self._flush_lock:
+            if not self._pending:
+                return True
+            pending, self._pending = self._pending, []
+            self._pending_docs = 0
+            grouped: Dict[str, Tuple[List[str], List[Dict[str, Any]], List[str]]] = {}
+            attempts: Dict[str, int] = {}
+            for memory_type, ids, metadatas, documents, failed in pending:
+                group = grouped.setdefault(memory_type, ([], [], []))
+                group[0].extend(ids)
+                group[1].extend(metadatas)
+                group[2].extend(documents)
+                attempts[memory_type] = max(attempts.get(memory_type, 0), failed)
+            results = await asyncio.gather(
+                *(self._store(memory_type, *group) for memory_type, group in grouped.items()),
+                return_exceptions=True,
+            )
+            retry: List[Tuple[str, List[str], List[Dict[str, Any]], List[str], int]] = []
+            for memory_type, result in zip(grouped, results):
+                if not isinstance(result, Exception) and result:
+                    continue
+                ids, metadatas, documents = grouped[memory_type]
+                failed = attempts[memory_type] + 1
+                if failed >= self.FLUSH_MAX_ATTEMPTS:
+                    self._drop_writes(len(documents), f"{memory_type} failed {failed} time(s): {result}")
+                else:
+                    self._logger.warning(f"Write-behind flush failed for {memory_type} (attempt {failed}): {result}")
+                    retry.append((memory_type, ids, metadatas, documents, failed))
+            if retry:
+                # Failed batches go ahead of anything queued meanwhile, keeping write order.
+                self._pending = retry + self._pending
+                self._pending_docs = sum(len(entry[3]) for entry in self._pending)
+                while self._pending_docs > self.MAX_RETRY_DOCS and self._pending[0][4] > 0:
+                    memory_type, _, _, documents, failed = self._pending.pop(0)
+                    self._pending_docs -= len(documents)
+                    self._drop_writes(len(documents), f"{memory_type} retry queue over {self.MAX_RETRY_DOCS} chunks")
+                if self._pending:
+                    self._start_flush_timer()
+            self._logger.debug(
+                f"Flushed {sum(len(g[2]) for g in grouped.values())} queued chunk(s) in {len(grouped)} batch(es)"
+            )
+            return all(not isinstance(result, Exception) and result for result in results)
+
+    def _drop_writes(self, count: int, reason: str) -> None:
+        self.dropped_writes += count
+        self._logger.error(f"Write-behind dropped {count} chunk(s) ({reason}); {self.dropped_writes} lost so far")
+
+    async def aclose(self) -> None:
+        """
+        Flush queued writes and stop the age timer.
+        :returns: None.
+        """
+        if self._flush_timer is not None and not self._flush_timer.done():
+            self._flush_timer.cancel()
+        self._flush_timer = None
+        if self._background_flushes:
+            await asyncio.gather(*list(self._background_flushes), return_exceptions=True)
+        if self._prewarming:
+            await asyncio.gather(*set(self._prewarming.values()), return_exceptions=True)
+        # Each failed flush uses up an attempt, so this ends with the batch stored or dropped.
+        while not await self.flush() and self._pending:
+            pass
+        if self._flush_timer is not None and not self._flush_timer.done():
+            self._flush_timer.cancel()
+        self._flush_timer = None
+        if self.dropped_writes:
+            self._logger.error(f"Memory write-behind closed with {self.dropped_writes} chunk(s) never stored")
+
     async def write_node_result(
         self,
         node_id: str,
@@ -214,7 +214,33 @@ class PromptBuilder:
                 PromptKey.CONTENT.value: user_content,
             },
         ]
-    
+
+    @staticmethod
+    def build_prefixed_messages(
+        system_content: str,
+        stable_sections: List[tuple[str, str]],
+        user_content: str,
+    ) -> List[Dict[str, str]]:
+        """
+        Build a system + user prompt laid out for provider prefix caching.
+
+        Everything that is constant for a run (instructions, allowed actions,
+        the mandate) goes into the system message, ahead of the per-node user
+        message, so consecutive calls share the longest possible prefix.
+        OpenAI/OpenRouter cache that prefix automatically; the Anthropic
+        backend marks the system message as a cache breakpoint.
+
+        :param system_content: Static system instructions
+        :param stable_sections: (title, content) sections constant for the run
+        :param user_content: Per-call content (path, candidates, event log, ...)
+        :returns: List of message dicts with role and content
+        """
+        parts = [system_content] if system_content else []
+        for title, content in stable_sections:
+            if content and str(content).strip():
+                parts.append(f"{title}:\n{str(content).strip()}")
+        return PromptBuilder.build_messages(system_content="\n\n".join(parts), user_content=user_content)
+
     @staticmethod
     def system_message(content: str) -> Dict[str, str]:
         """
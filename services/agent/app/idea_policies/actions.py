@@ -9,13 +9,13 @@ from typing import TYPE_CHECKING, Any, Dict, Optional, List, Set, Tuple
 import uuid
 from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, urlencode
 
-from bs4 import BeautifulSoup
 
 if TYPE_CHECKING:
     from agent.app.idea_dag import IdeaDag, IdeaNode
 
 from agent.app.agent_io import AgentIO
-from agent.app.observation import clean_operation
+from agent.app.observation import ParsedPage, parse_page
+from agent.app.parse_pool import parse_page_offloaded
 from agent.app.idea_policies.base import IdeaActionType, DetailKey, IdeaNodeStatus
 from agent.app.idea_policies.config import IdeaConfig
 from agent.app.idea_policies.action_constants import (
@@ -964,7 +964,7 @@ class VisitLeafAction(LeafAction):
         
         return candidate_urls[:link_count]
     
-    def _parse_visit_html(self, raw_html: str, url: str) -> Dict[str, Any]:
+    def _parse_visit_html(self, raw_html: str, url: str, page: Optional[ParsedPage] = None) -> Dict[str, Any]:
         """
         CPU-bound HTML parsing for a visited page. Pure/synchronous so it can be
         offloaded to a thread executor, keeping the event loop responsive while
@@ -972,30 +972,16 @@ class VisitLeafAction(LeafAction):
 
         :param raw_html: Raw page HTML.
         :param url: Source URL (for link resolution).
+        :param page: Already-parsed page (from the parse process pool); parsed here if None.
         :returns: Dict of parsed/derived fields consumed by _visit_single_page.
         """
-        cleaned = clean_operation(raw_html) or ""
-        soup = BeautifulSoup(raw_html, "html.parser")
-        raw_links = []
-        link_contexts = {}
-
-        for tag in soup.find_all("a", href=True):
-            href = tag.get("href")
-            if href:
-                raw_links.append(href)
-                link_text = tag.get_text(strip=True)
-                if link_text:
-                    link_contexts[href] = link_text[:200]
-
-        page_title = ""
-        title_tag = soup.find("title")
-        if title_tag:
-            page_title = title_tag.get_text(strip=True)
-
-        h1_text = ""
-        h1_tag = soup.find("h1")
-        if h1_tag:
-            h1_text = h1_tag.get_text(separator=" ", strip=True)
+        if page is None:
+            page = parse_page(raw_html)
+        cleaned = page.main_text or ""
+        raw_links = [href for href, _ in page.links]
+        link_contexts = {href: text[:200] for href, text in page.links if text}
+        page_title = page.title
+        h1_text = page.h1
 
         cleaned_links = self._filter_and_prioritize_links(raw_links, url)
         cleaned_link_contexts = {}
@@ -1007,7 +993,7 @@ class VisitLeafAction(LeafAction):
         content_payload = self._limit_text(cleaned)
         content_text = content_payload.get("content") or cleaned or ""
         if not content_text or len(content_text.strip()) == 0:
-            content_text = soup.get_text(separator="\n", strip=True)
+            content_text = page.full_text
             if content_text:
                 content_payload = self._limit_text(content_text)
                 content_text = content_payload.get("content") or content_text
@@ -1020,6 +1006,7 @@ class VisitLeafAction(LeafAction):
         content_total_chars = content_payload.get("total_chars", len(final_content))
 
         return {
+            "page": page,
             "cleaned": cleaned,
             "cleaned_links": cleaned_links,
             "cleaned_link_contexts": cleaned_link_contexts,
@@ -1087,12 +1074,25 @@ class VisitLeafAction(LeafAction):
                 {},
             )
         
-        # HTML parsing (clean_operation + BeautifulSoup) is CPU-bound and pure
-        # Python; run it in a thread executor so it doesn't freeze the event
-        # loop while sibling page fetches / LLM calls proceed concurrently.
+        # HTML parsing (observation.parse_page) is CPU-bound and pure
+        # Python. A page the worker's page cache already parsed skips it.
+        # Otherwise large pages go to the parse process pool so parallel visits
+        # don't serialize on the GIL; the rest (and link post-processing) runs
+        # in a thread executor so it doesn't freeze the event loop while
+        # sibling page fetches / LLM calls proceed concurrently.
+        page_cache = getattr(io, "page_cache", None)
+        page = page_cache.parsed(raw_html, str(url)) if page_cache is not None else None
+        if page is None:
+            page = await parse_page_offloaded(
+                raw_html,
+                workers=self._cfg.action.visit_parse_process_workers,
+                min_bytes=self._cfg.action.visit_parse_process_min_bytes,
+            )
         parsed = await asyncio.get_running_loop().run_in_executor(
-            None, self._parse_visit_html, raw_html, str(url)
+            None, self._parse_visit_html, raw_html, str(url), page
         )
+        if page_cache is not None:
+            page_cache.store_parsed(raw_html, parsed["page"], str(url))
         cleaned = parsed["cleaned"]
         cleaned_links = parsed["cleaned_links"]
         cleaned_link_contexts = parsed["cleaned_link_contexts"]
@@ -69,8 +69,9 @@ class GoTConfig:
     """Graph-of-Thought optimisation knobs (the ``got_*`` settings keys).
 
     Several of these keys (``adaptive_policies``, ``dedup_threshold_min/max``,
-    ``beam_target_spread``, ``prune_stddev_factor``) are intentionally absent
-    from ``idea_dag_settings.json`` and rely solely on these defaults.
+    ``dedup_lexical_threshold``, ``beam_target_spread``, ``prune_stddev_factor``)
+    are intentionally absent from ``idea_dag_settings.json`` and rely solely
+    on these defaults.
     """
 
     embed_on_create: bool = True
@@ -83,7 +84,11 @@ class GoTConfig:
     dedup_similarity_threshold: float = 0.85
     dedup_threshold_min: float = 0.75
     dedup_threshold_max: float = 0.92
+    # Bag-of-words fallback for intra-batch dedup when embeddings are
+    # unavailable; strict, since "X of France" / "X of Germany" score ~0.8.
+    dedup_lexical_threshold: float = 0.95
     dedup_max_query: int = 5
+    local_thought_index: bool = True
     dynamic_beam_enabled: bool = True
     beam_min: int = 2
     beam_max: int = 5
@@ -167,6 +172,7 @@ class ExpansionConfig:
     max_tokens: Optional[int] = 8192
     max_context_nodes: int = 5
     max_detail_chars: int = 5000
+    stream: bool = True
 
     _KEYS: ClassVar[dict] = {
         "model": "expansion_model",
@@ -174,6 +180,7 @@ class ExpansionConfig:
         "max_tokens": "expansion_max_tokens",
         "max_context_nodes": "expansion_max_context_nodes",
         "max_detail_chars": "expansion_max_detail_chars",
+        "stream": "expansion_stream",
     }
 
     @classmethod
@@ -189,6 +196,8 @@ class EvaluationConfig:
     max_context_nodes: int = 5
     max_detail_chars: int = 5000
     batch_max_candidates: int = 5
+    cross_parent_window_seconds: float = 0.0
+    cross_parent_max_candidates: int = 12
     no_action_result_base_score: float = 0.4
     no_action_result_score_cap: float = 0.5
     weight_search: float = 1.0
@@ -205,6 +214,8 @@ class EvaluationConfig:
         "max_context_nodes": "evaluation_max_context_nodes",
         "max_detail_chars": "evaluation_max_detail_chars",
         "batch_max_candidates": "evaluation_batch_max_candidates",
+        "cross_parent_window_seconds": "evaluation_cross_parent_window_seconds",
+        "cross_parent_max_candidates": "evaluation_cross_parent_max_candidates",
         "no_action_result_base_score": "evaluation_no_action_result_base_score",
         "no_action_result_score_cap": "evaluation_no_action_result_score_cap",
         "weight_search": "evaluation_weight_search",
@@ -290,6 +301,8 @@ class ActionConfig:
     visit_max_sites_per_action: int = 20
     visit_link_query_top_k: int = 15
     visit_page_concurrency: int = 5
+    visit_parse_process_workers: int = 4
+    visit_parse_process_min_bytes: int = 100000
     visit_link_selection_model: Optional[str] = None
     visit_empty_content_retryable: bool = True
 
@@ -314,8 +327,17 @@ class MemoryConfig:
     default_semantic_results: int = 3
     max_available_links_for_expansion: int = 50
     grep_context_window: int = 80
+    write_behind_enabled: bool = True
+    write_behind_max_docs: int = 64
+    write_behind_max_age_seconds: float = 0.25
+    split_mode: str = "single"
 
-    _KEYS: ClassVar[dict] = {}
+    _KEYS: ClassVar[dict] = {
+        "write_behind_enabled": "memory_write_behind_enabled",
+        "write_behind_max_docs": "memory_write_behind_max_docs",
+        "write_behind_max_age_seconds": "memory_write_behind_max_age_seconds",
+        "split_mode": "memory_split_mode",
+    }
 
     @classmethod
     def from_settings(cls, settings: Mapping[str, Any]) -> "MemoryConfig":
@@ -335,6 +357,11 @@ class EngineConfig:
     allow_unscored_selection: bool = True
     auto_parallel_siblings: bool = True
     parallel_action_limit: int = 4
+    speculative_expansion: bool = False
+    scheduler: str = "cursor"
+    scheduler_max_workers: int = 4
+    scheduler_llm_limit: int = 2
+    scheduler_fetch_limit: int = 4
     sequential_sibling_recovery_enabled: bool = True
     sequential_prune_siblings: bool = False  # absent from JSON
     semantic_dedup_visits_enabled: bool = True  # absent from JSON
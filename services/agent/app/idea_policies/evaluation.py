@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import re
@@ -128,6 +129,7 @@ class LlmEvaluationPolicy(EvaluationPolicy):
                 model_name=model_name,
                 fallback_model=self._cfg.generation.fallback_model,
                 timeout_seconds=self._cfg.timeouts.llm,
+                operation="evaluation",
             )
             self._logger.debug(f"[EVALUATION] LLM response: {content[:200] if content else 'None'}...")
             score, rationale = self._parse_score(content)
@@ -208,7 +210,12 @@ class LlmEvaluationPolicy(EvaluationPolicy):
             ensure_ascii=True,
         )
         from agent.app.idea_policies.action_constants import PromptBuilder
-        return PromptBuilder.build_messages(system_content=system, user_content=user)
+        from agent.app.idea_policies.post_expansion_hooks import extract_mandate
+        return PromptBuilder.build_prefixed_messages(
+            system_content=system,
+            stable_sections=[("MANDATE", extract_mandate(graph, node.node_id))],
+            user_content=user,
+        )
 
     def _parse_score(self, content: Optional[str]) -> tuple[float, str]:
         if not content:
@@ -228,6 +235,14 @@ class LlmEvaluationPolicy(EvaluationPolicy):
         return max(0.0, min(1.0, score))
 
 
+class _PendingEvaluation:
+    def __init__(self, graph: IdeaDag, parent_id: str, candidate_ids: List[str]) -> None:
+        self.graph = graph
+        self.parent_id = parent_id
+        self.candidate_ids = candidate_ids
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
 class LlmBatchEvaluationPolicy(EvaluationPolicy):
     def __init__(self, io: AgentIO, settings: Optional[Dict[str, Any]] = None, model_name: Optional[str] = None):
         super().__init__(settings=settings)
@@ -236,18 +251,138 @@ class LlmBatchEvaluationPolicy(EvaluationPolicy):
         self._logger = logging.getLogger(self.__class__.__name__)
         self.weights = EvaluationWeights.from_settings(settings)
         self._cfg = IdeaConfig.from_settings(self.settings)
+        self._pending: List[_PendingEvaluation] = []
+        self._flush_timer: Optional[asyncio.Task] = None
+        self._flush_tasks: set[asyncio.Task] = set()
 
     async def evaluate(self, graph: IdeaDag, node_id: str) -> float:
         policy = LlmEvaluationPolicy(self.io, settings=self.settings, model_name=self.model_name)
         return await policy.evaluate(graph, node_id)
 
     async def evaluate_batch(self, graph: IdeaDag, parent_id: str, candidate_ids: List[str]) -> Dict[str, float]:
+        """
+        Score a parent's candidates in one LLM call.
+
+        With ``evaluation_cross_parent_window_seconds`` > 0, concurrent calls for
+        different parents are collected for that window (or until
+        ``evaluation_cross_parent_max_candidates``) and scored together in one
+        call with a context block per parent; a parent whose scores cannot be
+        parsed from that response is re-scored on its own.
+        :param graph: Current DAG.
+        :param parent_id: Parent whose children are scored.
+        :param candidate_ids: Children to score (capped at ``evaluation_batch_max_candidates``).
+        :returns: Final score per candidate id.
+        """
         parent = graph.get_node(parent_id)
         if not parent:
             return {}
         max_candidates = self._cfg.evaluation.batch_max_candidates
         candidate_ids = candidate_ids[:max_candidates]
+        if self._cfg.evaluation.cross_parent_window_seconds <= 0:
+            return await self._evaluate_parent(graph, parent_id, candidate_ids)
+        request = _PendingEvaluation(graph, parent_id, candidate_ids)
+        self._pending.append(request)
+        if sum(len(r.candidate_ids) for r in self._pending) >= self._cfg.evaluation.cross_parent_max_candidates:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._track(asyncio.create_task(self._flush(self._take_pending())))
+        elif self._flush_timer is None:
+            self._flush_timer = self._track(asyncio.create_task(self._flush_after_window()))
+        return await request.future
+
+    def _track(self, task: asyncio.Task) -> asyncio.Task:
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+        return task
+
+    def _take_pending(self) -> List[_PendingEvaluation]:
+        batch, self._pending = self._pending, []
+        return batch
+
+    async def _flush_after_window(self) -> None:
+        await asyncio.sleep(self._cfg.evaluation.cross_parent_window_seconds)
+        self._flush_timer = None
+        await self._flush(self._take_pending())
+
+    async def _flush(self, batch: List[_PendingEvaluation]) -> None:
+        by_graph: Dict[int, List[_PendingEvaluation]] = {}
+        for request in batch:
+            by_graph.setdefault(id(request.graph), []).append(request)
+        for requests in by_graph.values():
+            try:
+                if len(requests) == 1:
+                    only = requests[0]
+                    results = {id(only): await self._evaluate_parent(only.graph, only.parent_id, only.candidate_ids)}
+                else:
+                    results = await self._evaluate_cross_parent(requests)
+            except Exception as exc:  # noqa: BLE001 — waiting callers must always be released
+                self._logger.error(f"[EVALUATION_BATCH] Cross-parent flush failed: {exc}", exc_info=True)
+                results = {}
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_result(results.get(id(request), {}))
+
+    async def _evaluate_parent(self, graph: IdeaDag, parent_id: str, candidate_ids: List[str]) -> Dict[str, float]:
+        parent = graph.get_node(parent_id)
+        if not parent:
+            return {}
         messages, candidate_id_map = self._build_messages(graph, parent, candidate_ids)
+        try:
+            content = await self._query(messages, f"{len(candidate_ids)} candidates")
+            scores = self._parse_scores(content, candidate_id_map)
+            self._logger.debug(f"[EVALUATION_BATCH] Parsed {len(scores)} scores")
+            if not scores and content:
+                self._logger.warning(f"[EVALUATION_BATCH] Failed to parse scores from response. Content length: {len(content)}, Content: {content[:1000]}")
+            return self._apply_scores(graph, candidate_ids, scores)
+        except Exception as exc:
+            self._logger.error(f"[EVALUATION_BATCH] Exception during batch evaluation: {exc}", exc_info=True)
+            for node_id in candidate_ids:
+                node = graph.get_node(node_id)
+                if node:
+                    node.details[DetailKey.EVALUATION.value] = {"error": str(exc)}
+            return {}
+
+    async def _evaluate_cross_parent(self, requests: List[_PendingEvaluation]) -> Dict[int, Dict[str, float]]:
+        """
+        Score several parents' candidates in one call; fall back per parent on parse failure.
+        :param requests: Pending evaluations sharing one graph.
+        :returns: Scores keyed by ``id(request)``.
+        """
+        graph = requests[0].graph
+        messages, candidate_id_map = self._build_cross_parent_messages(graph, requests)
+        try:
+            content = await self._query(
+                messages, f"{len(candidate_id_map)} candidates across {len(requests)} parents",
+            )
+            scores = self._parse_scores(content, candidate_id_map)
+        except Exception as exc:  # noqa: BLE001 — fall back to one call per parent
+            self._logger.warning(f"[EVALUATION_BATCH] Cross-parent call failed, scoring per parent: {exc}")
+            scores = {}
+        self._logger.info(
+            f"[EVALUATION_BATCH] Cross-parent batch: {len(requests)} parents, "
+            f"{len(candidate_id_map)} candidates, {len(scores)} scores parsed"
+        )
+        results: Dict[int, Dict[str, float]] = {}
+        fallbacks = []
+        for request in requests:
+            parsed = {nid: scores[nid] for nid in request.candidate_ids if nid in scores}
+            if parsed:
+                results[id(request)] = self._apply_scores(graph, request.candidate_ids, parsed)
+            else:
+                fallbacks.append(request)
+        if fallbacks:
+            self._logger.warning(
+                f"[EVALUATION_BATCH] No scores parsed for {len(fallbacks)} parent(s); falling back to single-parent calls"
+            )
+            fallback_scores = await asyncio.gather(*[
+                self._evaluate_parent(graph, request.parent_id, request.candidate_ids) for request in fallbacks
+            ])
+            for request, parent_scores in zip(fallbacks, fallback_scores):
+                results[id(request)] = parent_scores
+        return results
+
+    async def _query(self, messages: List[Dict[str, str]], label: str) -> Optional[str]:
         model_name = self.model_name or self._cfg.evaluation.model
         json_schema = self.settings.get("evaluation_batch_json_schema")
         reasoning_effort = self._cfg.generation.reasoning_effort
@@ -262,72 +397,61 @@ class LlmBatchEvaluationPolicy(EvaluationPolicy):
             reasoning_effort=reasoning_effort,
             text_verbosity=text_verbosity,
         )
-        try:
-            self._logger.debug(f"[EVALUATION_BATCH] Calling LLM for {len(candidate_ids)} candidates with model={model_name}")
-            content = await self.io.query_llm_with_fallback(
-                payload,
-                model_name=model_name,
-                fallback_model=self._cfg.generation.fallback_model,
-                timeout_seconds=self._cfg.timeouts.llm,
-            )
-            if content:
-                self._logger.debug(f"[EVALUATION_BATCH] Full LLM response: {content}")
-            else:
-                self._logger.warning(f"[EVALUATION_BATCH] LLM returned empty content")
-            scores = self._parse_scores(content, candidate_id_map)
-            self._logger.debug(f"[EVALUATION_BATCH] Parsed {len(scores)} scores")
-            if not scores and content:
-                self._logger.warning(f"[EVALUATION_BATCH] Failed to parse scores from response. Content length: {len(content)}, Content: {content[:1000]}")
-            
-            from agent.app.idea_policies.action_constants import NodeDetailsExtractor
-            for node_id in candidate_ids:
-                node = graph.get_node(node_id)
-                if not node:
-                    continue
+        self._logger.debug(f"[EVALUATION_BATCH] Calling LLM for {label} with model={model_name}")
+        content = await self.io.query_llm_with_fallback(
+            payload,
+            model_name=model_name,
+            fallback_model=self._cfg.generation.fallback_model,
+            timeout_seconds=self._cfg.timeouts.llm,
+            operation="evaluation",
+        )
+        if content:
+            self._logger.debug(f"[EVALUATION_BATCH] Full LLM response: {content}")
+        else:
+            self._logger.warning(f"[EVALUATION_BATCH] LLM returned empty content")
+        return content
 
-                action = NodeDetailsExtractor.get_action(node.details)
-                has_action = action and not NodeDetailsExtractor.is_merge_action(node.details)
-                has_result = node.details.get(DetailKey.ACTION_RESULT.value) is not None
+    def _apply_scores(self, graph: IdeaDag, candidate_ids: List[str], scores: Dict[str, float]) -> Dict[str, float]:
+        from agent.app.idea_policies.action_constants import NodeDetailsExtractor
+        for node_id in candidate_ids:
+            node = graph.get_node(node_id)
+            if not node:
+                continue
 
-                if has_action and not has_result:
-                    if node_id in scores:
-                        scores[node_id] = min(scores[node_id], float(self.weights.no_action_result_score_cap))
-                    else:
-                        scores[node_id] = float(self.weights.no_action_result_base_score)
-                        self._logger.warning(f"[EVALUATION_BATCH] Node {node_id} has action '{action}' but no result - penalizing to base score")
+            action = NodeDetailsExtractor.get_action(node.details)
+            has_action = action and not NodeDetailsExtractor.is_merge_action(node.details)
+            has_result = node.details.get(DetailKey.ACTION_RESULT.value) is not None
 
+            if has_action and not has_result:
                 if node_id in scores:
-                    scores[node_id] = self.weights.apply_action_weight(action, scores[node_id])
-                    scores[node_id] = self._clamp(scores[node_id])
+                    scores[node_id] = min(scores[node_id], float(self.weights.no_action_result_score_cap))
+                else:
+                    scores[node_id] = float(self.weights.no_action_result_base_score)
+                    self._logger.warning(f"[EVALUATION_BATCH] Node {node_id} has action '{action}' but no result - penalizing to base score")
 
-            for node_id, score in scores.items():
-                node = graph.get_node(node_id)
-                if not node:
-                    self._logger.warning(f"[EVALUATION_BATCH] Skipping unknown node_id: {node_id} (not in graph)")
-                    continue
-                try:
-                    graph.evaluate(node_id, score)
-                    node.details[DetailKey.EVALUATION.value] = {"score": score}
-                    _rec = getattr(getattr(self.io, "telemetry", None), "record_decision", None)
-                    if callable(_rec):
-                        _rec(stage="evaluation", node_id=node_id, chosen=node.title[:80],
-                             score=score, metadata={"action": NodeDetailsExtractor.get_action(node.details)})
-                except ValueError as e:
-                    self._logger.warning(f"[EVALUATION_BATCH] Failed to evaluate node {node_id}: {e}")
-            return scores
-        except Exception as exc:
-            self._logger.error(f"[EVALUATION_BATCH] Exception during batch evaluation: {exc}", exc_info=True)
-            for node_id in candidate_ids:
-                node = graph.get_node(node_id)
-                if node:
-                    node.details[DetailKey.EVALUATION.value] = {"error": str(exc)}
-            return {}
+            if node_id in scores:
+                scores[node_id] = self.weights.apply_action_weight(action, scores[node_id])
+                scores[node_id] = self._clamp(scores[node_id])
 
-    def _build_messages(self, graph: IdeaDag, parent: IdeaNode, candidate_ids: List[str]) -> tuple[List[Dict[str, str]], Dict[str, str]]:
-        max_nodes = self._cfg.evaluation.max_context_nodes
+        for node_id, score in scores.items():
+            node = graph.get_node(node_id)
+            if not node:
+                self._logger.warning(f"[EVALUATION_BATCH] Skipping unknown node_id: {node_id} (not in graph)")
+                continue
+            try:
+                graph.evaluate(node_id, score)
+                node.details[DetailKey.EVALUATION.value] = {"score": score}
+                _rec = getattr(getattr(self.io, "telemetry", None), "record_decision", None)
+                if callable(_rec):
+                    _rec(stage="evaluation", node_id=node_id, chosen=node.title[:80],
+                         score=score, metadata={"action": NodeDetailsExtractor.get_action(node.details)})
+            except ValueError as e:
+                self._logger.warning(f"[EVALUATION_BATCH] Failed to evaluate node {node_id}: {e}")
+        return scores
+
+    def _serialize_path(self, graph: IdeaDag, parent: IdeaNode) -> List[Dict[str, Any]]:
         max_detail_chars = self._cfg.evaluation.max_detail_chars
-        path = graph.path_to_root(parent.node_id)
-        path = path[:max_nodes]
+        path = graph.path_to_root(parent.node_id)[:self._cfg.evaluation.max_context_nodes]
         path_serialized = []
         for entry in path:
             details_text = _safe_serialize_details(entry.details)
@@ -342,13 +466,20 @@ class LlmBatchEvaluationPolicy(EvaluationPolicy):
                     "details": details_text,
                 }
             )
+        return path_serialized
+
+    def _serialize_candidates(
+        self, graph: IdeaDag, candidate_ids: List[str], start: int = 1,
+    ) -> tuple[List[Dict[str, Any]], Dict[str, str]]:
+        max_detail_chars = self._cfg.evaluation.max_detail_chars
         candidates = []
         candidate_id_map = {}
-        for idx, candidate_id in enumerate(candidate_ids, start=1):
+        for candidate_id in candidate_ids:
             node = graph.get_node(candidate_id)
             if not node:
                 continue
-            simple_id = str(idx)
+            # Number only serialized nodes: callers chain ``start`` off the map size.
+            simple_id = str(start + len(candidates))
             candidate_id_map[simple_id] = candidate_id
             details_text = _safe_serialize_details(node.details)
             if len(details_text) > max_detail_chars:
@@ -360,14 +491,10 @@ class LlmBatchEvaluationPolicy(EvaluationPolicy):
                     "details": details_text,
                 }
             )
-        from agent.app.idea_policies.base import DetailKey
-        
-        path_json = json.dumps(path_serialized, ensure_ascii=True)
-        candidates_json = json.dumps(candidates, ensure_ascii=True)
-        parent_goal = parent.details.get(DetailKey.PARENT_GOAL.value) or parent.title
-        
+        return candidates, candidate_id_map
+
+    def _system_prompt(self) -> str:
         system_template = self.settings.get("evaluation_batch_system_prompt")
-        user_template = self.settings.get("evaluation_batch_user_prompt")
         system = system_template.format() if system_template else (
             "You are an evaluation function. Score each candidate node based on the path context. "
             "Return JSON with key 'scores' as a list of objects: "
@@ -381,6 +508,16 @@ class LlmBatchEvaluationPolicy(EvaluationPolicy):
         ).strip()
         if planning_addendum:
             system = f"{system}\n\n{planning_addendum}" if system else planning_addendum
+        return system
+
+    def _build_messages(self, graph: IdeaDag, parent: IdeaNode, candidate_ids: List[str]) -> tuple[List[Dict[str, str]], Dict[str, str]]:
+        path_serialized = self._serialize_path(graph, parent)
+        candidates, candidate_id_map = self._serialize_candidates(graph, candidate_ids)
+        path_json = json.dumps(path_serialized, ensure_ascii=True)
+        candidates_json = json.dumps(candidates, ensure_ascii=True)
+        parent_goal = parent.details.get(DetailKey.PARENT_GOAL.value) or parent.title
+
+        user_template = self.settings.get("evaluation_batch_user_prompt")
         user = user_template.format(
             path_json=path_json,
             parent_id=parent.node_id,
@@ -395,10 +532,48 @@ class LlmBatchEvaluationPolicy(EvaluationPolicy):
             },
             ensure_ascii=True,
         )
-        messages = [
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ]
+        from agent.app.idea_policies.action_constants import PromptBuilder
+        from agent.app.idea_policies.post_expansion_hooks import extract_mandate
+        messages = PromptBuilder.build_prefixed_messages(
+            system_content=self._system_prompt(),
+            stable_sections=[("MANDATE", extract_mandate(graph, parent.node_id))],
+            user_content=user,
+        )
+        return messages, candidate_id_map
+
+    def _build_cross_parent_messages(
+        self, graph: IdeaDag, requests: List[_PendingEvaluation],
+    ) -> tuple[List[Dict[str, str]], Dict[str, str]]:
+        groups = []
+        candidate_id_map: Dict[str, str] = {}
+        for request in requests:
+            parent = graph.get_node(request.parent_id)
+            if not parent:
+                continue
+            candidates, id_map = self._serialize_candidates(
+                graph, request.candidate_ids, start=len(candidate_id_map) + 1,
+            )
+            candidate_id_map.update(id_map)
+            groups.append(
+                {
+                    "parent_id": parent.node_id,
+                    "parent_goal": parent.details.get(DetailKey.PARENT_GOAL.value) or parent.title,
+                    "path": self._serialize_path(graph, parent),
+                    "candidates": candidates,
+                }
+            )
+        system = (
+            f"{self._system_prompt()}\n\n"
+            "Candidates are grouped by parent; score each candidate against its own group's path "
+            "and parent goal. Ids are unique across groups; return one flat 'scores' list."
+        )
+        from agent.app.idea_policies.action_constants import PromptBuilder
+        from agent.app.idea_policies.post_expansion_hooks import extract_mandate
+        messages = PromptBuilder.build_prefixed_messages(
+            system_content=system,
+            stable_sections=[("MANDATE", extract_mandate(graph, requests[0].parent_id))],
+            user_content=json.dumps({"groups": groups}, ensure_ascii=True),
+        )
         return messages, candidate_id_map
 
     def _clamp(self, value: float) -> float:
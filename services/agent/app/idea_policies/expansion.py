@@ -3,7 +3,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import TYPE_CHECKING, Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
 
 if TYPE_CHECKING:
     from agent.app.idea_dag import IdeaDag, IdeaNode
@@ -12,6 +12,7 @@ from agent.app.agent_io import AgentIO
 from agent.app.idea_policies.base import ExpansionPolicy, DetailKey, IdeaActionType
 from agent.app.idea_policies.config import IdeaConfig
 from agent.app.idea_dag_settings import load_idea_dag_settings
+from agent.app.json_stream import JsonArrayStream
 
 
 def _safe_serialize_details(details: Dict[str, Any]) -> str:
@@ -31,43 +32,32 @@ class LlmExpansionPolicy(ExpansionPolicy):
         self.model_name = model_name
         self._logger = logging.getLogger(self.__class__.__name__)
 
-    async def expand(self, graph: IdeaDag, node_id: str, memories: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    async def expand(
+        self,
+        graph: IdeaDag,
+        node_id: str,
+        memories: Optional[List[Dict[str, Any]]] = None,
+        on_candidate: Optional[Callable[[Dict[str, Any]], None]] = None,
+        prefetched: Optional[Callable[[List[Dict[str, str]]], Awaitable[Optional[str]]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate child candidates for a node.
+        :param graph: Current DAG.
+        :param node_id: Node to expand.
+        :param memories: Retrieved memories for the prompt.
+        :param on_candidate: With ``expansion_stream`` on, called with each cleaned candidate
+            as soon as it closes in the streamed response (for early dedup/embedding work).
+            The returned list is always parsed from the complete response.
+        :param prefetched: Called with the built messages; returns a response already
+            requested for exactly those messages (speculative expansion), or None to query now.
+        :returns: Cleaned candidates.
+        """
         node = graph.get_node(node_id)
         if not node:
             return []
-        messages = self._build_messages(graph, node, memories=memories)
-        
-        total_prompt_size = sum(len(msg.get("content", "")) for msg in messages)
-        if total_prompt_size > 50000:
-            self._logger.warning(f"[EXPANSION] Large prompt detected ({total_prompt_size} chars) for node {node_id} - may cause slow expansion")
-        
-        model_name = self.model_name or self._cfg.expansion.model
-        json_schema = self.settings.get("expansion_json_schema")
-        reasoning_effort = self._cfg.generation.reasoning_effort
-        text_verbosity = self._cfg.generation.text_verbosity
-        max_tokens = self._cfg.expansion.max_tokens
-
-        payload = self.io.build_llm_payload(
-            messages=messages,
-            json_mode=True,
-            model_name=model_name,
-            temperature=self._cfg.expansion.temperature,
-            max_tokens=max_tokens,
-            json_schema=json_schema,
-            reasoning_effort=reasoning_effort,
-            text_verbosity=text_verbosity,
-        )
+        request = self.prepare_request(graph, node_id, memories=memories)
+        messages = request["messages"]
         try:
-            estimated_tokens = (total_prompt_size // 4) + (max_tokens or 4096)
-            self._logger.debug(f"[EXPANSION] Calling LLM for node {node_id} with model={model_name}, prompt={total_prompt_size} chars, max_tokens={max_tokens}, estimated ~{estimated_tokens} total tokens")
-            
-            default_timeout = self._cfg.timeouts.llm or 120
-            expansion_timeout = self._cfg.timeouts.expansion or default_timeout
-            if total_prompt_size > 50000 or estimated_tokens > 10000:
-                expansion_timeout = max(expansion_timeout, 180)
-            else:
-                expansion_timeout = max(expansion_timeout, 120)
-            
             try:
                 preview = json.dumps(messages, indent=2, ensure_ascii=True)
             except Exception:
@@ -75,12 +65,19 @@ class LlmExpansionPolicy(ExpansionPolicy):
             if len(preview) > 2000:
                 preview = preview[:2000] + "... [truncated]"
             self._logger.debug(f"[EXPANSION] LLM Input preview: {preview}")
-            content = await self.io.query_llm_with_fallback(
-                payload,
-                model_name=model_name,
-                fallback_model=self._cfg.generation.fallback_model,
-                timeout_seconds=expansion_timeout,
-            )
+            stream_sink = None
+            if on_candidate is not None and self._cfg.expansion.stream:
+                stream_sink = JsonArrayStream(
+                    "candidates",
+                    lambda item: self._emit_streamed_candidate(item, graph, node_id, on_candidate),
+                )
+            content = await prefetched(messages) if prefetched is not None else None
+            if content is not None:
+                self._logger.info(f"[EXPANSION] Using speculative response for node {node_id}")
+                if stream_sink is not None:
+                    stream_sink.feed(content)
+            else:
+                content = await self.request_content(request, stream_sink=stream_sink)
             output_preview = content[:2000] + "... [truncated]" if isinstance(content, str) and len(content) > 2000 else content
             self._logger.debug(f"[EXPANSION] LLM Output preview: {output_preview}")
             candidates, meta = self._parse_candidates(content, graph=graph, parent_node_id=node_id)
@@ -104,6 +101,89 @@ class LlmExpansionPolicy(ExpansionPolicy):
             self._logger.error(f"[EXPANSION] Exception during expansion: {e}", exc_info=True)
             return []
 
+    def prepare_request(
+        self,
+        graph: IdeaDag,
+        node_id: str,
+        memories: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Build the expansion call for a node without sending it.
+        :param graph: Current DAG.
+        :param node_id: Node to expand (must exist).
+        :param memories: Retrieved memories for the prompt.
+        :returns: Dict with messages, payload, model_name and timeout_seconds.
+        """
+        node = graph.get_node(node_id)
+        messages = self._build_messages(graph, node, memories=memories)
+
+        total_prompt_size = sum(len(msg.get("content", "")) for msg in messages)
+        if total_prompt_size > 50000:
+            self._logger.warning(f"[EXPANSION] Large prompt detected ({total_prompt_size} chars) for node {node_id} - may cause slow expansion")
+
+        model_name = self.model_name or self._cfg.expansion.model
+        json_schema = self.settings.get("expansion_json_schema")
+        reasoning_effort = self._cfg.generation.reasoning_effort
+        text_verbosity = self._cfg.generation.text_verbosity
+        max_tokens = self._cfg.expansion.max_tokens
+
+        payload = self.io.build_llm_payload(
+            messages=messages,
+            json_mode=True,
+            model_name=model_name,
+            temperature=self._cfg.expansion.temperature,
+            max_tokens=max_tokens,
+            json_schema=json_schema,
+            reasoning_effort=reasoning_effort,
+            text_verbosity=text_verbosity,
+        )
+        estimated_tokens = (total_prompt_size // 4) + (max_tokens or 4096)
+        self._logger.debug(f"[EXPANSION] Calling LLM for node {node_id} with model={model_name}, prompt={total_prompt_size} chars, max_tokens={max_tokens}, estimated ~{estimated_tokens} total tokens")
+
+        default_timeout = self._cfg.timeouts.llm or 120
+        expansion_timeout = self._cfg.timeouts.expansion or default_timeout
+        if total_prompt_size > 50000 or estimated_tokens > 10000:
+            expansion_timeout = max(expansion_timeout, 180)
+        else:
+            expansion_timeout = max(expansion_timeout, 120)
+        return {
+            "messages": messages,
+            "payload": payload,
+            "model_name": model_name,
+            "timeout_seconds": expansion_timeout,
+        }
+
+    async def request_content(self, request: Dict[str, Any], stream_sink: Optional[Any] = None) -> Optional[str]:
+        """
+        Send a request built by ``prepare_request``.
+        :param request: Prepared request.
+        :param stream_sink: Optional receiver for the streamed response text.
+        :returns: Response text or None.
+        """
+        return await self.io.query_llm_with_fallback(
+            request["payload"],
+            model_name=request["model_name"],
+            fallback_model=self._cfg.generation.fallback_model,
+            timeout_seconds=request["timeout_seconds"],
+            operation="expansion",
+            stream_sink=stream_sink,
+        )
+
+    def _emit_streamed_candidate(
+        self,
+        item: Any,
+        graph: IdeaDag,
+        node_id: str,
+        on_candidate: Callable[[Dict[str, Any]], None],
+    ) -> None:
+        candidate = self._clean_candidate(item, graph=graph, parent_node_id=node_id)
+        if candidate is None:
+            return
+        try:
+            on_candidate(candidate)
+        except Exception as e:
+            self._logger.debug(f"[EXPANSION] Streamed candidate callback failed: {e}")
+
     def _enhance_details_with_inline_links(self, details: Dict[str, Any]) -> Dict[str, Any]:
         from agent.app.idea_policies.action_constants import ActionResultKey
         enhanced = dict(details)
@@ -331,7 +411,12 @@ class LlmExpansionPolicy(ExpansionPolicy):
             for k, v in format_kwargs.items():
                 user = user.replace("{" + k + "}", str(v))
         from agent.app.idea_policies.action_constants import PromptBuilder
-        messages = PromptBuilder.build_messages(system_content=system, user_content=user)
+        from agent.app.idea_policies.post_expansion_hooks import extract_mandate
+        messages = PromptBuilder.build_prefixed_messages(
+            system_content=system,
+            stable_sections=[("MANDATE", extract_mandate(graph, node.node_id))],
+            user_content=user,
+        )
         
         total_prompt_size = sum(len(msg.get("content", "")) for msg in messages)
         self._logger.debug(f"[EXPANSION] Prompt size: system={len(system)} chars, user={len(user)} chars, total={total_prompt_size} chars")
@@ -582,99 +667,102 @@ class LlmExpansionPolicy(ExpansionPolicy):
         meta = data.get("meta") or {}
         cleaned: List[Dict[str, Any]] = []
         for candidate in candidates:
-            if not isinstance(candidate, dict):
-                continue
-            action = candidate.get(DetailKey.ACTION.value)
-            title = candidate.get("title") or ""
-            details = candidate.get("details") or {}
-            if action:
-                details = dict(details)
-                details[DetailKey.ACTION.value] = action
-            
-            from agent.app.idea_policies.action_constants import NodeDetailsExtractor
-            justification = NodeDetailsExtractor.get_justification(candidate)
-            if justification:
-                details[DetailKey.JUSTIFICATION.value] = str(justification)
+            item = self._clean_candidate(candidate, graph=graph, parent_node_id=parent_node_id)
+            if item is not None:
+                cleaned.append(item)
+        return cleaned, dict(meta)
 
-            candidate_goal = candidate.get("goal")
-            local_goal: Optional[str] = None
-            if isinstance(candidate_goal, str) and candidate_goal.strip():
-                local_goal = candidate_goal.strip()
-            else:
-                existing_goal = details.get(DetailKey.GOAL.value) or details.get(DetailKey.ORIGINAL_GOAL.value)
-                if isinstance(existing_goal, str) and existing_goal.strip():
-                    local_goal = existing_goal.strip()
-                elif isinstance(title, str) and title.strip():
-                    local_goal = title.strip()
+    def _clean_candidate(self, candidate: Any, graph: Optional[IdeaDag] = None, parent_node_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        if not isinstance(candidate, dict):
+            return None
+        action = candidate.get(DetailKey.ACTION.value)
+        title = candidate.get("title") or ""
+        details = candidate.get("details") or {}
+        if action:
+            details = dict(details)
+            details[DetailKey.ACTION.value] = action
+        
+        from agent.app.idea_policies.action_constants import NodeDetailsExtractor
+        justification = NodeDetailsExtractor.get_justification(candidate)
+        if justification:
+            details[DetailKey.JUSTIFICATION.value] = str(justification)
 
-            if local_goal:
-                details[DetailKey.GOAL.value] = details.get(DetailKey.GOAL.value) or local_goal
-                if not details.get(DetailKey.ORIGINAL_GOAL.value):
-                    details[DetailKey.ORIGINAL_GOAL.value] = local_goal
-            
-            if action == IdeaActionType.VISIT.value:
-                url = (
-                    details.get(DetailKey.URL.value)
-                    or details.get(DetailKey.LINK.value)
-                    or details.get("url")
-                    or details.get("link")
-                    or details.get("optional_url")
-                )
-                if not url or not isinstance(url, str) or not url.startswith(("http://", "https://")):
-                    extracted_url = None
-                    source_node_id = None
-                    
-                    if title:
-                        extracted_url = self._extract_url_from_text(title)
-                    if not extracted_url and justification:
-                        extracted_url = self._extract_url_from_text(str(justification))
-                    if not extracted_url and graph and parent_node_id:
-                        extracted_url, source_node_id = self._extract_url_from_path_context_with_source(graph, parent_node_id, candidate_title=title)
-                    
-                    if extracted_url:
-                        details[DetailKey.URL.value] = extracted_url
-                        if source_node_id:
-                            source_node = graph.get_node(source_node_id)
-                            if source_node:
-                                from agent.app.idea_policies.action_constants import NodeDetailsExtractor
-                                source_action = NodeDetailsExtractor.get_action(source_node.details)
-                                if source_action == IdeaActionType.THINK.value:
-                                    details[DetailKey.REQUIRES_DATA.value] = {
-                                        "type": "url_from_think",
-                                        "source_node_id": source_node_id
-                                    }
-                                else:
-                                    details[DetailKey.REQUIRES_DATA.value] = {
-                                        "type": "urls_from_visit" if self._is_url_from_visit(graph, source_node_id) else "urls_from_search",
-                                        "source_node_id": source_node_id
-                                    }
-                            self._logger.info(f"[EXPANSION] Visit candidate requires data from node {source_node_id}: {extracted_url[:60]}...")
-                        self._logger.info(f"[EXPANSION] Proactively extracted URL for visit candidate '{title[:50]}...': {extracted_url[:60]}...")
-                    else:
-                        # Last resort: recover from a URL named in the mandate (explicit-URL
-                        # tasks otherwise fail — the planner names the page but drops the URL).
-                        recovered = self._match_mandate_url(title, self._mandate_urls(graph))
-                        if recovered:
-                            details[DetailKey.URL.value] = recovered
-                            self._logger.info(f"[EXPANSION] Recovered visit URL from mandate for '{title[:50]}...': {recovered[:60]}...")
-                        else:
-                            # No URL yet — KEEP the node. In a search-driven task the visit's
-                            # URL is resolved at execution time from a sibling search's results
-                            # (VisitLeafAction._extract_urls_from_parent_search_results); dropping
-                            # it here would break the search->visit pipeline (visits=0).
-                            self._logger.warning(f"[EXPANSION] Visit candidate has no URL yet (search-driven?); keeping for runtime resolution: title='{title[:60]}...'")
+        candidate_goal = candidate.get("goal")
+        local_goal: Optional[str] = None
+        if isinstance(candidate_goal, str) and candidate_goal.strip():
+            local_goal = candidate_goal.strip()
+        else:
+            existing_goal = details.get(DetailKey.GOAL.value) or details.get(DetailKey.ORIGINAL_GOAL.value)
+            if isinstance(existing_goal, str) and existing_goal.strip():
+                local_goal = existing_goal.strip()
+            elif isinstance(title, str) and title.strip():
+                local_goal = title.strip()
 
-            if action == IdeaActionType.SEARCH.value:
-                details[DetailKey.PROVIDES_DATA.value] = {"type": "urls_from_search"}
-            
-            cleaned.append(
-                {
-                    "title": str(title),
-                    "details": details,
-                    "score": candidate.get("score"),
-                }
+        if local_goal:
+            details[DetailKey.GOAL.value] = details.get(DetailKey.GOAL.value) or local_goal
+            if not details.get(DetailKey.ORIGINAL_GOAL.value):
+                details[DetailKey.ORIGINAL_GOAL.value] = local_goal
+        
+        if action == IdeaActionType.VISIT.value:
+            url = (
+                details.get(DetailKey.URL.value)
+                or details.get(DetailKey.LINK.value)
+                or details.get("url")
+                or details.get("link")
+                or details.get("optional_url")
             )
-        return cleaned, dict(meta)
+            if not url or not isinstance(url, str) or not url.startswith(("http://", "https://")):
+                extracted_url = None
+                source_node_id = None
+                
+                if title:
+                    extracted_url = self._extract_url_from_text(title)
+                if not extracted_url and justification:
+                    extracted_url = self._extract_url_from_text(str(justification))
+                if not extracted_url and graph and parent_node_id:
+                    extracted_url, source_node_id = self._extract_url_from_path_context_with_source(graph, parent_node_id, candidate_title=title)
+                
+                if extracted_url:
+                    details[DetailKey.URL.value] = extracted_url
+                    if source_node_id:
+                        source_node = graph.get_node(source_node_id)
+                        if source_node:
+                            from agent.app.idea_policies.action_constants import NodeDetailsExtractor
+                            source_action = NodeDetailsExtractor.get_action(source_node.details)
+                            if source_action == IdeaActionType.THINK.value:
+                                details[DetailKey.REQUIRES_DATA.value] = {
+                                    "type": "url_from_think",
+                                    "source_node_id": source_node_id
+                                }
+                            else:
+                                details[DetailKey.REQUIRES_DATA.value] = {
+                                    "type": "urls_from_visit" if self._is_url_from_visit(graph, source_node_id) else "urls_from_search",
+                                    "source_node_id": source_node_id
+                                }
+                        self._logger.info(f"[EXPANSION] Visit candidate requires data from node {source_node_id}: {extracted_url[:60]}...")
+                    self._logger.info(f"[EXPANSION] Proactively extracted URL for visit candidate '{title[:50]}...': {extracted_url[:60]}...")
+                else:
+                    # Last resort: recover from a URL named in the mandate (explicit-URL
+                    # tasks otherwise fail — the planner names the page but drops the URL).
+                    recovered = self._match_mandate_url(title, self._mandate_urls(graph))
+                    if recovered:
+                        details[DetailKey.URL.value] = recovered
+                        self._logger.info(f"[EXPANSION] Recovered visit URL from mandate for '{title[:50]}...': {recovered[:60]}...")
+                    else:
+                        # No URL yet — KEEP the node. In a search-driven task the visit's
+                        # URL is resolved at execution time from a sibling search's results
+                        # (VisitLeafAction._extract_urls_from_parent_search_results); dropping
+                        # it here would break the search->visit pipeline (visits=0).
+                        self._logger.warning(f"[EXPANSION] Visit candidate has no URL yet (search-driven?); keeping for runtime resolution: title='{title[:60]}...'")
+
+        if action == IdeaActionType.SEARCH.value:
+            details[DetailKey.PROVIDES_DATA.value] = {"type": "urls_from_search"}
+        
+        return {
+            "title": str(title),
+            "details": details,
+            "score": candidate.get("score"),
+        }
     
     def _create_fallback_candidate(self, node: "IdeaNode", graph: Optional["IdeaDag"] = None) -> Optional[Dict[str, Any]]:
         import re
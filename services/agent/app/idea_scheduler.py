@@ -0,0 +1,329 @@
+"""
+Ready-queue scheduler for the idea DAG engine (``scheduler: "ready_queue"``).
+
+The default engine loop advances a single ``current_id`` per step, so only the
+children of one parent can run together (``_handle_intermediate_node``). This
+scheduler instead scans the whole graph for work whose prerequisites hold and
+runs it on a bounded pool, so independent subtrees under different parents
+progress concurrently.
+
+Work items, one node each:
+
+- **expand**: an open sub-problem (no action, no children) is expanded through
+  ``_handle_expansion_node``, then its new children are evaluated.
+- **action**: a leaf whose action is ready (``_is_action_ready``) and whose data
+  dependencies are met (``_has_required_data``) runs ``_execute_action``; merge
+  nodes run through ``_handle_merge_node``.
+- **merge**: a parent whose children are all finished
+  (``SimpleMergePolicy.are_children_ready_to_merge``) gets its merge node created
+  and executed (``_handle_merge_creation``); with no merge needed it is marked DONE.
+
+Ready items are dispatched best score first. At most ``scheduler_max_workers``
+items run at once, of which at most ``scheduler_llm_limit`` are LLM-bound
+(expand, merge, think) and ``scheduler_fetch_limit`` fetch-bound (search,
+visit). Siblings with state dependencies (``detect_state_dependencies``) run
+one at a time in ``reorder_for_sequential`` order.
+
+Graph consistency: all mutation happens on the event loop, and a node is never
+dispatched while it or its parent is owned by a running item, so an expansion
+and its children's work never overlap. ``max_steps`` is a work budget: each
+dispatched item uses one step (and advances retry cooldowns like a step would).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from agent.app.idea_dag import IdeaDag
+from agent.app.idea_branch_pair import find_branch_pair
+from agent.app.idea_policies.action_constants import NodeDetailsExtractor
+from agent.app.idea_policies.base import DetailKey, IdeaActionType, IdeaNodeStatus
+
+if TYPE_CHECKING:
+    from agent.app.idea_engine import IdeaDagEngine
+
+_TERMINAL = (IdeaNodeStatus.DONE, IdeaNodeStatus.FAILED, IdeaNodeStatus.SKIPPED)
+_FETCH_ACTIONS = {IdeaActionType.SEARCH.value, IdeaActionType.VISIT.value}
+_LLM_ACTIONS = {IdeaActionType.THINK.value, IdeaActionType.MERGE.value}
+_MAX_EXPAND_ATTEMPTS = 2
+
+
+class ReadyQueueScheduler:
+    """
+    Runs one engine pass over a graph with a dependency-aware ready queue.
+
+    :param engine: Engine whose policies, actions and helpers do the work.
+    :param graph: Graph to advance.
+    :param mandate: Run mandate (for the grounding re-plan gate).
+    :param run_id: Run id for checkpoints, if any.
+    """
+
+    def __init__(self, engine: "IdeaDagEngine", graph: IdeaDag, mandate: str, run_id: Optional[str] = None) -> None:
+        self.engine = engine
+        self.graph = graph
+        self.mandate = mandate
+        self.run_id = run_id
+        cfg = engine._cfg.engine
+        self.max_workers = max(1, cfg.scheduler_max_workers)
+        self.limits = {
+            "llm": max(1, cfg.scheduler_llm_limit),
+            "fetch": max(1, cfg.scheduler_fetch_limit),
+            "other": self.max_workers,
+        }
+        self._in_flight: Dict[asyncio.Task, Tuple[str, str, str]] = {}
+        self._expand_attempts: Dict[str, int] = {}
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self.stats = {"dispatched": 0, "expand": 0, "action": 0, "merge": 0, "max_in_flight": 0}
+
+    async def run(self, steps: int, max_steps: int) -> int:
+        """
+        Dispatch ready work until nothing is ready or running, or the budget is spent.
+        :param steps: Steps already used (resumed runs).
+        :param max_steps: Work budget.
+        :returns: Steps used.
+        """
+        try:
+            return await self._run(steps, max_steps)
+        finally:
+            for task in self._in_flight:
+                task.cancel()
+
+    async def _run(self, steps: int, max_steps: int) -> int:
+        engine = self.engine
+        prune_interval = max(1, engine._cfg.engine.got_prune_interval_steps)
+        while True:
+            if steps < max_steps and self.graph.node_count() < engine._cfg.engine.max_total_nodes:
+                with engine._measure("select"):
+                    ready = self._ready_items()
+                for kind, node_id in ready:
+                    if steps >= max_steps:
+                        break
+                    if not self._has_capacity(kind, node_id):
+                        continue
+                    item_step = max(engine._step_index, steps)
+                    steps += 1
+                    engine._step_index = item_step + 1
+                    self._dispatch(kind, node_id, item_step)
+                    if self._got_prune_due(steps, prune_interval):
+                        self._prune()
+
+            if not self._in_flight:
+                if steps < max_steps and self._advance_cooldown():
+                    continue
+                if engine._grounding_replan(self.graph, self.mandate, steps, max_steps):
+                    continue
+                break
+
+            done, _ = await asyncio.wait(set(self._in_flight), return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                kind, node_id, _ = self._in_flight.pop(task)
+                exc = task.exception()
+                if exc is not None:
+                    self._logger.warning(f"[SCHEDULER] {kind} {node_id[:8]} raised {type(exc).__name__}: {exc}")
+                    node = self.graph.get_node(node_id)
+                    if node and node.status not in _TERMINAL:
+                        node.status = IdeaNodeStatus.FAILED
+                        node.details[DetailKey.ACTION_ERROR.value] = f"{type(exc).__name__}: {exc}"
+            self._complete_parents()
+            engine._maybe_log_dag(self.graph, steps)
+            await engine._save_checkpoint(self.run_id, steps - 1, self.graph, self.graph.root_id())
+
+        self._logger.info(f"[SCHEDULER] Finished after {steps} steps: {self.stats}")
+        return steps
+
+    def _got_prune_due(self, steps: int, interval: int) -> bool:
+        return bool(self.engine._got) and steps % interval == 0
+
+    def _prune(self) -> None:
+        owned = {node_id for _, node_id, _ in self._in_flight.values()}
+        prune_ids = [nid for nid in self.engine._got.identify_prune_candidates(self.graph) if nid not in owned]
+        if prune_ids:
+            self.engine._got.prune_nodes(self.graph, prune_ids)
+
+    def _ready_items(self) -> List[Tuple[str, str]]:
+        """Ready (kind, node_id) pairs, best score first."""
+        engine = self.engine
+        step = engine._step_index
+        owned = {node_id for _, node_id, _ in self._in_flight.values()}
+        min_score = engine._cfg.engine.min_score_threshold
+        allow_unscored = engine._cfg.engine.allow_unscored_selection
+        ready: List[Tuple[float, int, str, str]] = []
+        actions_by_parent: Dict[str, List[str]] = {}
+        for order, node in enumerate(self.graph.iter_depth_first()):
+            if node.node_id in owned or (node.parent_id and node.parent_id in owned):
+                continue
+            if node.status in _TERMINAL or not engine._is_action_ready(node, step):
+                continue
+            is_merge = NodeDetailsExtractor.is_merge_action(node.details)
+            if node.parent_id is not None and not is_merge:
+                if node.score is None and not allow_unscored:
+                    continue
+                if node.score is not None and node.score < min_score:
+                    continue
+            score = node.score or 0.0
+            if engine._awaits_expansion(node):
+                if self._expand_attempts.get(node.node_id, 0) < _MAX_EXPAND_ATTEMPTS:
+                    ready.append((-score, order, "expand", node.node_id))
+            elif NodeDetailsExtractor.get_action(node.details) and not node.children:
+                has_result = node.details.get(DetailKey.ACTION_RESULT.value) is not None
+                if has_result and node.status != IdeaNodeStatus.BLOCKED:
+                    continue
+                if not is_merge and not engine._has_required_data(self.graph, node):
+                    continue
+                ready.append((-score, order, "action", node.node_id))
+                if not is_merge and node.parent_id:
+                    actions_by_parent.setdefault(node.parent_id, []).append(node.node_id)
+        ready.extend(self._merge_items(owned))
+
+        held_back = self._sequential_hold_backs(actions_by_parent, owned)
+        ready.sort()
+        return [(kind, node_id) for _, _, kind, node_id in ready if node_id not in held_back]
+
+    def _merge_items(self, owned: set) -> List[Tuple[float, int, str, str]]:
+        engine = self.engine
+        items = []
+        for order, node in enumerate(self.graph.iter_depth_first()):
+            if node.node_id in owned or node.status in _TERMINAL or not node.children:
+                continue
+            if NodeDetailsExtractor.get_action(node.details):
+                continue
+            if any(cid in owned for cid in node.children):
+                continue
+            if not engine.merge.are_children_ready_to_merge(self.graph, node.node_id):
+                continue
+            if engine.merge.should_create_merge_node(self.graph, node.node_id):
+                items.append((-(node.score or 0.0), order, "merge", node.node_id))
+        return items
+
+    def _sequential_hold_backs(self, actions_by_parent: Dict[str, List[str]], owned: set) -> set:
+        """Siblings with state dependencies run one at a time: hold back all but the next one."""
+        engine = self.engine
+        held = set()
+        for parent_id, ids in actions_by_parent.items():
+            parent = self.graph.get_node(parent_id)
+            running = [cid for cid in (parent.children if parent else []) if cid in owned]
+            if len(ids) + len(running) < 2:
+                continue
+            if not engine._detect_state_dependencies(self.graph, running + ids):
+                continue
+            if running:
+                held.update(ids)
+                continue
+            best = max((self.graph.get_node(cid) for cid in ids), key=lambda n: n.score or 0.0)
+            first = engine._reorder_for_sequential(self.graph, best, ids, engine._step_index) or best
+            held.update(cid for cid in ids if cid != first.node_id)
+        return held
+
+    def _kind_class(self, kind: str, node_id: str) -> str:
+        if kind in ("expand", "merge"):
+            return "llm"
+        node = self.graph.get_node(node_id)
+        action = str(NodeDetailsExtractor.get_action(node.details) or "") if node else ""
+        if action in _FETCH_ACTIONS:
+            return "fetch"
+        if action in _LLM_ACTIONS:
+            return "llm"
+        return "other"
+
+    def _has_capacity(self, kind: str, node_id: str) -> bool:
+        if len(self._in_flight) >= self.max_workers:
+            return False
+        work_class = self._kind_class(kind, node_id)
+        running = sum(1 for _, _, c in self._in_flight.values() if c == work_class)
+        return running < self.limits[work_class]
+
+    def _dispatch(self, kind: str, node_id: str, step_index: int) -> None:
+        runner = {"expand": self._expand, "action": self._act, "merge": self._merge}[kind]
+        task = asyncio.create_task(runner(node_id, step_index))
+        self._in_flight[task] = (kind, node_id, self._kind_class(kind, node_id))
+        self.stats["dispatched"] += 1
+        self.stats[kind] += 1
+        self.stats["max_in_flight"] = max(self.stats["max_in_flight"], len(self._in_flight))
+        self._logger.info(f"[SCHEDULER] step {step_index}: {kind} {node_id[:8]} ({len(self._in_flight)} running)")
+
+    async def _expand(self, node_id: str, step_index: int) -> None:
+        engine = self.engine
+        self._expand_attempts[node_id] = self._expand_attempts.get(node_id, 0) + 1
+        await engine._handle_expansion_node(self.graph, node_id, step_index, None)
+        node = self.graph.get_node(node_id)
+        if node is None:
+            return
+        if not node.children:
+            if self._expand_attempts[node_id] >= _MAX_EXPAND_ATTEMPTS:
+                self._logger.warning(f"[SCHEDULER] Expansion of {node_id[:8]} produced no children; giving up")
+                node.status = IdeaNodeStatus.FAILED
+            return
+        eligible = [
+            cid for cid in node.children
+            if (c := self.graph.get_node(cid)) and c.status not in _TERMINAL and c.score is None
+        ]
+        if not eligible:
+            return
+        await engine._evaluate_children(self.graph, node_id, eligible)
+
+    async def _act(self, node_id: str, step_index: int) -> None:
+        engine = self.engine
+        node = self.graph.get_node(node_id)
+        if node is None:
+            return
+        if NodeDetailsExtractor.is_merge_action(node.details):
+            await engine._handle_merge_node(self.graph, node_id, step_index, None)
+            return
+        action_name = NodeDetailsExtractor.get_action(node.details)
+        timeout_s = engine._action_timeout_for(action_name)
+        parent_id = node.parent_id or self.graph.root_id()
+        try:
+            result = await asyncio.wait_for(engine._execute_action(self.graph, parent_id, node_id), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            self._logger.warning(f"[SCHEDULER] Action timed out after {timeout_s}s (node={node_id}, action={action_name})")
+            node.status = IdeaNodeStatus.FAILED
+            node.details["action_error"] = f"timeout after {timeout_s}s"
+            return
+        if result is None:
+            if node.status not in _TERMINAL:
+                node.status = IdeaNodeStatus.FAILED
+            return
+        engine._handle_action_result(self.graph, node_id, step_index)
+        if node.status == IdeaNodeStatus.DONE and engine._should_chunk_document(self.graph, node):
+            await engine._create_chunk_subproblems(self.graph, node)
+
+    async def _merge(self, node_id: str, step_index: int) -> None:
+        branch_pair = find_branch_pair(self.graph, node_id)
+        await self.engine._handle_merge_creation(self.graph, node_id, step_index, branch_pair)
+
+    def _complete_parents(self) -> None:
+        """Mark finished parents DONE: merged, or all children finished with no merge to make."""
+        engine = self.engine
+        owned = {node_id for _, node_id, _ in self._in_flight.values()}
+        changed = True
+        while changed:
+            changed = False
+            for node in self.graph.iter_depth_first():
+                if node.node_id in owned or node.status in _TERMINAL or not node.children:
+                    continue
+                if NodeDetailsExtractor.get_action(node.details):
+                    continue
+                if not engine.merge.are_children_ready_to_merge(self.graph, node.node_id):
+                    continue
+                has_merge = any(
+                    (c := self.graph.get_node(cid)) and NodeDetailsExtractor.is_merge_action(c.details)
+                    for cid in node.children
+                )
+                if has_merge or not engine.merge.should_create_merge_node(self.graph, node.node_id):
+                    node.status = IdeaNodeStatus.DONE
+                    changed = True
+
+    def _advance_cooldown(self) -> bool:
+        """With nothing running, jump the step clock to the next retry cooldown, if any."""
+        engine = self.engine
+        cooldowns = [
+            node.details.get(DetailKey.ACTION_COOLDOWN_UNTIL.value)
+            for node in self.graph.iter_depth_first()
+            if node.status == IdeaNodeStatus.BLOCKED
+        ]
+        pending = [c for c in cooldowns if isinstance(c, int) and c > engine._step_index]
+        if not pending:
+            return False
+        engine._step_index = min(pending)
+        return True
@@ -0,0 +1,172 @@
+"""
+Speculative expansion for the idea DAG engine.
+
+The engine runs one step at a time: a leaf action is awaited, and only a later
+step calls ``LlmExpansionPolicy.expand`` on the next node. With
+``speculative_expansion`` on, the engine predicts that next expansion target
+(best-first over the graph, see ``IdeaDagEngine._predict_expansion_target``)
+while an action is running and starts its expansion call concurrently.
+
+A speculative response is used only when the prediction holds: the next node the
+engine expands is the predicted one *and* the prompt it builds then is identical
+to the speculative prompt (same path, event log, memories, ...). Otherwise the
+speculative call is cancelled (or its finished response dropped) and the
+expansion runs as usual, so results never differ from the serial engine.
+With memory on, the engine starts the guess only once the running actions have
+stored their results, since the real prompt retrieves those observations.
+
+Outcomes are recorded as ``expansion_speculation`` telemetry events
+(``TelemetrySession.speculation_summary``): hits, misses, hit rate and the
+tokens billed for discarded responses (calls cancelled mid-flight report none).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from agent.app.agent_io import AgentIO
+from agent.app.idea_dag import IdeaDag
+from agent.app.idea_policies.expansion import LlmExpansionPolicy
+
+
+class _Speculation:
+    def __init__(self, node_id: str) -> None:
+        self.node_id = node_id
+        self.prepared: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.usage: Dict[str, Any] = {}
+        self.task: Optional[asyncio.Task] = None
+
+
+class ExpansionSpeculator:
+    """
+    Holds at most one in-flight speculative expansion for a run.
+
+    :param expansion: Expansion policy used for both speculative and real calls.
+    :param io: AgentIO (for per-call usage and telemetry).
+    """
+
+    def __init__(self, expansion: LlmExpansionPolicy, io: AgentIO) -> None:
+        self.expansion = expansion
+        self.io = io
+        self._pending: Optional[_Speculation] = None
+        self._logger = logging.getLogger(self.__class__.__name__)
+        self.stats = {
+            "started": 0,
+            "hits": 0,
+            "misses": 0,
+            "wasted_prompt_tokens": 0,
+            "wasted_completion_tokens": 0,
+        }
+
+    @property
+    def pending_node_id(self) -> Optional[str]:
+        """
+        Node the in-flight speculation targets, if any.
+        """
+        return self._pending.node_id if self._pending else None
+
+    def start(
+        self,
+        graph: IdeaDag,
+        node_id: str,
+        load_memories: Callable[[], Awaitable[List[Dict[str, Any]]]],
+    ) -> bool:
+        """
+        Start expanding ``node_id`` in the background.
+        :param graph: Current DAG.
+        :param node_id: Predicted next expansion target.
+        :param load_memories: Retrieves the prompt memories, as the real expansion would.
+        :returns: True when a speculation was started.
+        """
+        if self._pending is not None or graph.get_node(node_id) is None:
+            return False
+        spec = _Speculation(node_id)
+        spec.task = asyncio.create_task(self._run(spec, graph, load_memories))
+        self._pending = spec
+        self.stats["started"] += 1
+        self._logger.info(f"[SPECULATION] Started expansion of {node_id[:8]} alongside running action")
+        return True
+
+    async def _run(
+        self,
+        spec: _Speculation,
+        graph: IdeaDag,
+        load_memories: Callable[[], Awaitable[List[Dict[str, Any]]]],
+    ) -> Optional[str]:
+        if hasattr(self.io.connector_llm, "begin_usage_scope"):
+            # Own usage slot: the engine's concurrent calls must not overwrite spec.usage.
+            self.io.connector_llm.begin_usage_scope()
+        try:
+            memories = await load_memories()
+            request = self.expansion.prepare_request(graph, spec.node_id, memories=memories)
+        except BaseException:
+            if not spec.prepared.done():
+                spec.prepared.set_result(None)
+            raise
+        spec.prepared.set_result(request["messages"])
+        content = await self.expansion.request_content(request)
+        spec.usage = dict(getattr(self.io.connector_llm, "last_usage", None) or {})
+        return content
+
+    async def claim(self, node_id: str, messages: List[Dict[str, str]]) -> Optional[str]:
+        """
+        Take the speculative response for an expansion that is about to run.
+        :param node_id: Node being expanded.
+        :param messages: Prompt the real expansion built.
+        :returns: Response text on a hit; None (speculation discarded) otherwise.
+        """
+        spec = self._pending
+        if spec is None:
+            return None
+        self._pending = None
+        prepared = await asyncio.shield(spec.prepared)
+        if spec.node_id != node_id or prepared != messages:
+            reason = "other_node" if spec.node_id != node_id else "prompt_changed"
+            await self._discard(spec, reason)
+            return None
+        try:
+            content = await spec.task
+        except Exception:  # noqa: BLE001 — a failed guess falls back to the real call
+            content = None
+        if not content:
+            await self._discard(spec, "no_response")
+            return None
+        self.stats["hits"] += 1
+        self._record(spec, "hit")
+        return content
+
+    async def discard(self, reason: str = "run_end") -> None:
+        """
+        Drop any in-flight speculation.
+        :param reason: Recorded with the miss.
+        """
+        spec, self._pending = self._pending, None
+        if spec is not None:
+            await self._discard(spec, reason)
+
+    async def _discard(self, spec: _Speculation, reason: str) -> None:
+        task = spec.task
+        if task is not None and not task.done():
+            task.cancel()
+        if task is not None:
+            await asyncio.wait({task})
+            if not task.cancelled():
+                task.exception()  # retrieved so a failed guess is not logged as unhandled
+        self.stats["misses"] += 1
+        self.stats["wasted_prompt_tokens"] += int(spec.usage.get("prompt_tokens") or 0)
+        self.stats["wasted_completion_tokens"] += int(spec.usage.get("completion_tokens") or 0)
+        self._logger.info(f"[SPECULATION] Discarded expansion of {spec.node_id[:8]} ({reason})")
+        self._record(spec, "miss", reason=reason)
+
+    def _record(self, spec: _Speculation, outcome: str, **extra: Any) -> None:
+        telemetry = getattr(self.io, "telemetry", None)
+        if telemetry is None:
+            return
+        telemetry.record_event("expansion_speculation", {
+            "node_id": spec.node_id,
+            "outcome": outcome,
+            "prompt_tokens": int(spec.usage.get("prompt_tokens") or 0),
+            "completion_tokens": int(spec.usage.get("completion_tokens") or 0),
+            **extra,
+        })
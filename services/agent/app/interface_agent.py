@@ -3,12 +3,14 @@ import logging
 import os
 import re
 import time
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional, Dict, Any
 import aiohttp
 
 from shared.connector_config import ConnectorConfig
 from shared.connector_rabbitmq import ConnectorRabbitMQ
+from shared.connector_redis import close_shared_redis
 from shared.models import CompletionResult
 from shared.message_contract import (
     StatusEnvelope,
@@ -27,17 +29,41 @@ from agent.app.connector_http import ConnectorHttp
 from agent.app.connector_browser import ConnectorBrowser
 from agent.app.connector_chroma import ConnectorChroma
 from agent.app.agent_io import AgentIO
+from agent.app.llm_hedge import shared_hedge_policy
+from agent.app.page_cache import shared_page_cache
 from agent.app.telemetry import TelemetrySession
 from agent.app.startup_preflight import run_startup_preflight
 from shared.storage import RedisTaskStorage
 
 
+@dataclass
+class TaskContext:
+    """
+    State for one mandate running on an InterfaceAgent worker.
+
+    :param correlation_id: Task correlation id.
+    :param mandate: Task mandate.
+    :param max_ticks: Tick budget for the task.
+    :param telemetry: Telemetry session when tracking is enabled.
+    :param agent: Agent running the mandate (agent mode only).
+    :param heartbeat_task: In-progress status publisher (agent mode only).
+    """
+    correlation_id: str
+    mandate: str
+    max_ticks: int = 50
+    telemetry: Optional[TelemetrySession] = None
+    agent: Optional[Agent] = None
+    heartbeat_task: Optional[asyncio.Task] = None
+
+
 class InterfaceAgent:
     """
     Consumes tasks from RabbitMQ and runs the Agent.
     Publishes status transitions: accepted -> started -> in_progress -> completed | error
-    Creates a new agent for every task, handles 1 task at a time.
-    Connectors are initialized once and reused across all mandates.
+    Creates a new agent for every task and runs up to ``AGENT_MAX_CONCURRENT_TASKS``
+    tasks at once (default 1); each task's state lives in its own ``TaskContext``.
+    Connectors are initialized once and shared by all mandates; their telemetry
+    session is task-local, so concurrent tasks keep separate traces.
     """
 
     def __init__(self, connector_config: ConnectorConfig):
@@ -56,14 +82,11 @@ class InterfaceAgent:
         self.connector_browser = ConnectorBrowser(self.config)
         
         self._consumer_task: Optional[asyncio.Task] = None
-        self._heartbeat_task: Optional[asyncio.Task] = None
         self._presence_task: Optional[asyncio.Task] = None
         self._waiting_task: Optional[asyncio.Task] = None
-        self.agent: Optional[Agent] = None
-        self.correlation_id: Optional[str] = None
-        self.mandate: Optional[str] = None
+        self.max_concurrent_tasks: int = self.config.agent_max_concurrent_tasks
+        self.tasks: Dict[str, TaskContext] = {}
         self.worker_ready: bool = False
-        self._telemetry: Optional[TelemetrySession] = None
 
     async def __aenter__(self):
         await self.start()
@@ -160,11 +183,19 @@ class InterfaceAgent:
         
         self._presence_task = asyncio.create_task(self._presence.run())
         self._consumer_task = asyncio.create_task(
-            self.rabbitmq.consume_queue(self.config.input_queue, self._handle_task)
+            self.rabbitmq.consume_queue(
+                self.config.input_queue,
+                self._handle_task,
+                prefetch_count=self.config.agent_prefetch_count,
+                concurrency=self.max_concurrent_tasks,
+            )
         )
         await self._set_worker_state("free")
         self.worker_ready = True
-        self.logger.info(f"InterfaceAgent started; consuming '{self.config.input_queue}'")
+        self.logger.info(
+            f"InterfaceAgent started; consuming '{self.config.input_queue}' "
+            f"(max_concurrent_tasks={self.max_concurrent_tasks})"
+        )
 
     async def stop(self) -> None:
         """Stops consuming tasks and closes all connections."""
@@ -173,9 +204,10 @@ class InterfaceAgent:
         
         await self._cancel_task(self._consumer_task)
         self._consumer_task = None
-        
-        await self._cancel_task(self._heartbeat_task)
-        self._heartbeat_task = None
+
+        for ctx in list(self.tasks.values()):
+            await self._cancel_task(ctx.heartbeat_task)
+            ctx.heartbeat_task = None
         
         if self._presence_task:
             self._presence.stop()
@@ -196,6 +228,11 @@ class InterfaceAgent:
         except Exception as e:
             self.logger.warning(f"Error disconnecting RabbitMQ: {e}")
 
+        try:
+            await close_shared_redis()
+        except Exception as e:
+            self.logger.debug(f"Error closing Redis pool: {e}")
+
         try:
             await self.connector_search.__aexit__(None, None, None)
         except Exception as e:
@@ -232,12 +269,17 @@ class InterfaceAgent:
 
     async def _set_worker_state(self, state: str, ttl_seconds: Optional[int] = None) -> None:
         """
-        Update worker state in Redis with TTL.
+        Update worker state in Redis with TTL, including running tasks and capacity.
 
         """
         ttl = ttl_seconds if ttl_seconds is not None else self._working_ttl_seconds()
         try:
-            await self._state.set_state(state, ttl_seconds=ttl)
+            await self._state.set_state(
+                state,
+                ttl_seconds=ttl,
+                active=len(self.tasks),
+                capacity=self.max_concurrent_tasks,
+            )
         except Exception:
             pass
 
@@ -334,157 +376,188 @@ class InterfaceAgent:
         return connectivity
 
     async def _handle_task(self, payload: Dict[str, Any]) -> None:
-        """Processes a single task from the queue."""
+        """Processes a single task from the queue (several may run concurrently)."""
 
         self.logger.debug("Received task payload", extra={"payload": payload})
-        self.correlation_id = payload.get(KeyNames.CORRELATION_ID)
-        self.mandate = payload.get(KeyNames.MANDATE)
+        correlation_id = payload.get(KeyNames.CORRELATION_ID)
+        mandate = payload.get(KeyNames.MANDATE)
         max_ticks = int(payload.get(KeyNames.MAX_TICKS, 50))
 
-        if not self.correlation_id or not self.mandate:
+        if not correlation_id or not mandate:
             self.logger.warning("Invalid task payload, missing mandate or correlation_id")
             return
+        if correlation_id in self.tasks:
+            self.logger.warning(
+                "Task already running on this worker; ignoring duplicate delivery",
+                extra={"correlation_id": correlation_id},
+            )
+            return
 
-        self._telemetry = self._build_telemetry()
+        ctx = TaskContext(correlation_id=correlation_id, mandate=mandate, max_ticks=max_ticks)
+        ctx.telemetry = self._build_telemetry(ctx)
+        self.tasks[correlation_id] = ctx
 
         skip_phrase = os.environ.get("AGENT_SKIP_PHRASE", "skipskipskip")
         visit_phrase = os.environ.get("AGENT_VISIT_PHRASE", "visitvisitvisit")
 
-        await self._cancel_waiting_state()
-        await self._set_worker_state("working")
-
-        if visit_phrase and visit_phrase.lower() in self.mandate.lower():
-            self.logger.info(
-                f"VISIT MODE: Mandate contains visit phrase '{visit_phrase}' - performing direct URL visit",
-                extra={
-                    "correlation_id": self.correlation_id,
-                    "mandate": (self.mandate[:200] + "…") if isinstance(self.mandate, str) and len(self.mandate) > 200 else self.mandate,
-                },
-            )
-            await self._publish_status(StatusType.ACCEPTED, max_ticks=max_ticks)
-            await self._publish_status(StatusType.STARTED, max_ticks=max_ticks)
+        try:
+            await self._cancel_waiting_state()
+            await self._set_worker_state("working")
 
-            url_match = re.search(r"https?://\S+", self.mandate or "")
-            default_url = os.environ.get(
-                "AGENT_VISIT_DEFAULT_URL",
-                "https://en.wikipedia.org/wiki/Main_Page",
-            )
-            if url_match:
-                url = url_match.group(0)
+            if visit_phrase and visit_phrase.lower() in mandate.lower():
+                await self._run_visit_mode(ctx, visit_phrase)
+            elif skip_phrase and skip_phrase.lower() in mandate.lower():
+                await self._run_skip_mode(ctx, skip_phrase)
             else:
-                url = default_url
-                self.logger.info(
-                    "VISIT MODE: No URL found in mandate; using default URL",
-                    extra={"correlation_id": self.correlation_id, "default_url": default_url},
-                )
-            visit_timeout = float(os.environ.get("AGENT_VISIT_MODE_TIMEOUT_SECONDS", "20"))
-            self.logger.info(
-                "VISIT MODE: Visiting URL",
-                extra={"correlation_id": self.correlation_id, "url": url, "timeout_seconds": visit_timeout},
-            )
+                await self._run_agent(ctx)
+        finally:
+            self.tasks.pop(correlation_id, None)
+            self._clear_task_telemetry()
+            if self.tasks:
+                await self._set_worker_state("working")
+            else:
+                await self._enter_waiting_state()
 
-            agent_io = AgentIO(
-                connector_llm=self.connector_llm,
-                connector_search=self.connector_search,
-                connector_http=self.connector_http,
-                connector_chroma=self.connector_chroma,
-                connector_browser=self.connector_browser,
-                telemetry=self._telemetry,
-                collection_name=f"agent_visit_{self.correlation_id or 'unknown'}",
-            )
-            try:
-                page_text = await agent_io.visit(url, timeout_seconds=visit_timeout)
-                completion = CompletionResult(
-                    correlation_id=self.correlation_id,
-                    success=True,
-                    deliverables=[page_text],
-                    notes=f"VISIT MODE: Direct visit of {url} completed",
-                )
-                await self._publish_status(
-                    StatusType.COMPLETED,
-                    max_ticks=max_ticks,
-                    result=completion.result(),
-                )
-                self._finalize_telemetry(success=True)
-            except Exception as exc:
-                self.logger.exception(
-                    "VISIT MODE: Direct visit failed",
-                    extra={"correlation_id": self.correlation_id, "url": url},
-                )
-                completion = CompletionResult(
-                    correlation_id=self.correlation_id,
-                    success=False,
-                    deliverables=[],
-                    notes=f"VISIT MODE: Direct visit failed for {url}: {exc}",
-                )
-                await self._publish_status(
-                    StatusType.COMPLETED,
-                    max_ticks=max_ticks,
-                    result=completion.result(),
-                )
-                self._finalize_telemetry(success=False)
+    @staticmethod
+    def _mandate_preview(mandate: str) -> str:
+        return (mandate[:200] + "…") if isinstance(mandate, str) and len(mandate) > 200 else mandate
 
-            self._clear_task_telemetry()
-            await self._enter_waiting_state()
-            return
+    async def _run_visit_mode(self, ctx: TaskContext, visit_phrase: str) -> None:
+        """Visits the URL named in the mandate directly, without running the agent."""
+        max_ticks = ctx.max_ticks
+        self.logger.info(
+            f"VISIT MODE: Mandate contains visit phrase '{visit_phrase}' - performing direct URL visit",
+            extra={
+                "correlation_id": ctx.correlation_id,
+                "mandate": self._mandate_preview(ctx.mandate),
+            },
+        )
+        await self._publish_status(ctx, StatusType.ACCEPTED, max_ticks=max_ticks)
+        await self._publish_status(ctx, StatusType.STARTED, max_ticks=max_ticks)
 
-        if skip_phrase and skip_phrase.lower() in self.mandate.lower():
+        url_match = re.search(r"https?://\S+", ctx.mandate or "")
+        default_url = os.environ.get(
+            "AGENT_VISIT_DEFAULT_URL",
+            "https://en.wikipedia.org/wiki/Main_Page",
+        )
+        if url_match:
+            url = url_match.group(0)
+        else:
+            url = default_url
             self.logger.info(
-                f"SKIP MODE: Mandate contains skip phrase '{skip_phrase}' - testing connectivity only",
-                extra={
-                    "correlation_id": self.correlation_id,
-                    "mandate": (self.mandate[:200] + "…") if isinstance(self.mandate, str) and len(self.mandate) > 200 else self.mandate,
-                },
+                "VISIT MODE: No URL found in mandate; using default URL",
+                extra={"correlation_id": ctx.correlation_id, "default_url": default_url},
             )
-            await self._publish_status(StatusType.ACCEPTED, max_ticks=max_ticks)
-            await self._publish_status(StatusType.STARTED, max_ticks=max_ticks)
-            
-            self.logger.info("=== Testing Connectivity ===")
-            connectivity = await self._test_connectivity()
-            
-            all_connected = all(connectivity.values())
-            status_msg = "All services connected" if all_connected else "Some services not connected"
-            
-            skip_delay_seconds = int(os.environ.get("AGENT_SKIP_DELAY_SECONDS", "10"))
-            self.logger.info(f"SKIP MODE: Waiting {skip_delay_seconds}s to allow queue to fill up for testing...")
-            await asyncio.sleep(skip_delay_seconds)
-            
-            result_msg = f"SKIP MODE: {status_msg}\n"
-            result_msg += f"RabbitMQ: {'[OK]' if connectivity['rabbitmq'] else '[FAIL]'}\n"
-            result_msg += f"Redis: {'[OK]' if connectivity['redis'] else '[FAIL]'}\n"
-            result_msg += f"Chroma: {'[OK]' if connectivity['chroma'] else '[FAIL]'}\n"
-            result_msg += f"External API: {'[OK]' if connectivity['external_api'] else '[FAIL]'}\n"
-            
+        visit_timeout = float(os.environ.get("AGENT_VISIT_MODE_TIMEOUT_SECONDS", "20"))
+        self.logger.info(
+            "VISIT MODE: Visiting URL",
+            extra={"correlation_id": ctx.correlation_id, "url": url, "timeout_seconds": visit_timeout},
+        )
+
+        agent_io = AgentIO(
+            connector_llm=self.connector_llm,
+            connector_search=self.connector_search,
+            connector_http=self.connector_http,
+            connector_chroma=self.connector_chroma,
+            connector_browser=self.connector_browser,
+            telemetry=ctx.telemetry,
+            page_cache=shared_page_cache(),
+            collection_name=f"agent_visit_{ctx.correlation_id or 'unknown'}",
+        )
+        try:
+            page_text = await agent_io.visit(url, timeout_seconds=visit_timeout)
             completion = CompletionResult(
-                correlation_id=self.correlation_id,
-                success=all_connected,
-                deliverables=[result_msg],
-                notes=f"Connectivity test results: {connectivity}"
+                correlation_id=ctx.correlation_id,
+                success=True,
+                deliverables=[page_text],
+                notes=f"VISIT MODE: Direct visit of {url} completed",
             )
-            
-            self.logger.info(f"SKIP MODE: Connectivity test complete - {status_msg}")
             await self._publish_status(
+                ctx,
                 StatusType.COMPLETED,
                 max_ticks=max_ticks,
                 result=completion.result(),
             )
-            self._finalize_telemetry(success=all_connected)
-            self._clear_task_telemetry()
-            await self._enter_waiting_state()
-            return
+            self._finalize_telemetry(ctx, success=True)
+        except Exception as exc:
+            self.logger.exception(
+                "VISIT MODE: Direct visit failed",
+                extra={"correlation_id": ctx.correlation_id, "url": url},
+            )
+            completion = CompletionResult(
+                correlation_id=ctx.correlation_id,
+                success=False,
+                deliverables=[],
+                notes=f"VISIT MODE: Direct visit failed for {url}: {exc}",
+            )
+            await self._publish_status(
+                ctx,
+                StatusType.COMPLETED,
+                max_ticks=max_ticks,
+                result=completion.result(),
+            )
+            self._finalize_telemetry(ctx, success=False)
 
+    async def _run_skip_mode(self, ctx: TaskContext, skip_phrase: str) -> None:
+        """Reports connectivity to every dependency instead of running the agent."""
+        max_ticks = ctx.max_ticks
+        self.logger.info(
+            f"SKIP MODE: Mandate contains skip phrase '{skip_phrase}' - testing connectivity only",
+            extra={
+                "correlation_id": ctx.correlation_id,
+                "mandate": self._mandate_preview(ctx.mandate),
+            },
+        )
+        await self._publish_status(ctx, StatusType.ACCEPTED, max_ticks=max_ticks)
+        await self._publish_status(ctx, StatusType.STARTED, max_ticks=max_ticks)
+
+        self.logger.info("=== Testing Connectivity ===")
+        connectivity = await self._test_connectivity()
+
+        all_connected = all(connectivity.values())
+        status_msg = "All services connected" if all_connected else "Some services not connected"
+
+        skip_delay_seconds = int(os.environ.get("AGENT_SKIP_DELAY_SECONDS", "10"))
+        self.logger.info(f"SKIP MODE: Waiting {skip_delay_seconds}s to allow queue to fill up for testing...")
+        await asyncio.sleep(skip_delay_seconds)
+
+        result_msg = f"SKIP MODE: {status_msg}\n"
+        result_msg += f"RabbitMQ: {'[OK]' if connectivity['rabbitmq'] else '[FAIL]'}\n"
+        result_msg += f"Redis: {'[OK]' if connectivity['redis'] else '[FAIL]'}\n"
+        result_msg += f"Chroma: {'[OK]' if connectivity['chroma'] else '[FAIL]'}\n"
+        result_msg += f"External API: {'[OK]' if connectivity['external_api'] else '[FAIL]'}\n"
+
+        completion = CompletionResult(
+            correlation_id=ctx.correlation_id,
+            success=all_connected,
+            deliverables=[result_msg],
+            notes=f"Connectivity test results: {connectivity}"
+        )
+
+        self.logger.info(f"SKIP MODE: Connectivity test complete - {status_msg}")
+        await self._publish_status(
+            ctx,
+            StatusType.COMPLETED,
+            max_ticks=max_ticks,
+            result=completion.result(),
+        )
+        self._finalize_telemetry(ctx, success=all_connected)
+
+    async def _run_agent(self, ctx: TaskContext) -> None:
+        """Runs the Agent on the mandate and publishes its result."""
+        max_ticks = ctx.max_ticks
         self.logger.info(
             "Starting task",
             extra={
-                "correlation_id": self.correlation_id,
-                "mandate": (self.mandate[:200] + "…") if isinstance(self.mandate, str) and len(self.mandate) > 200 else self.mandate,
+                "correlation_id": ctx.correlation_id,
+                "mandate": self._mandate_preview(ctx.mandate),
                 "max_ticks": max_ticks,
             },
         )
-        await self._publish_status(StatusType.ACCEPTED, max_ticks=max_ticks)
-        await self._publish_status(StatusType.STARTED, max_ticks=max_ticks)
+        await self._publish_status(ctx, StatusType.ACCEPTED, max_ticks=max_ticks)
+        await self._publish_status(ctx, StatusType.STARTED, max_ticks=max_ticks)
 
-        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        ctx.heartbeat_task = asyncio.create_task(self._heartbeat_loop(ctx))
 
         try:
             agent_io = AgentIO(
@@ -493,11 +566,13 @@ class InterfaceAgent:
                 connector_http=self.connector_http,
                 connector_chroma=self.connector_chroma,
                 connector_browser=self.connector_browser,
-                telemetry=self._telemetry,
-                collection_name=f"agent_memory_{self.correlation_id or 'unknown'}",
+                telemetry=ctx.telemetry,
+                page_cache=shared_page_cache(),
+                hedge_policy=shared_hedge_policy(),
+                collection_name=f"agent_memory_{ctx.correlation_id or 'unknown'}",
             )
-            self.agent = Agent(
-                mandate=self.mandate,
+            ctx.agent = Agent(
+                mandate=ctx.mandate,
                 max_ticks=max_ticks,
                 connector_llm=self.connector_llm,
                 connector_search=self.connector_search,
@@ -506,15 +581,15 @@ class InterfaceAgent:
                 connector_browser=self.connector_browser,
                 agent_io=agent_io,
             )
-            async with self.agent:
-                result = await self.agent.run()
+            async with ctx.agent:
+                result = await ctx.agent.run()
 
             success = bool(result.get("success", True)) if isinstance(result, dict) else True
             deliverables = []
             if isinstance(result, dict) and "deliverables" in result:
                 deliverables = result.get("deliverables") or []
-            elif self.agent and getattr(self.agent, "deliverables", None):
-                deliverables = list(self.agent.deliverables)
+            elif ctx.agent and getattr(ctx.agent, "deliverables", None):
+                deliverables = list(ctx.agent.deliverables)
             elif isinstance(result, dict) and result.get("final_deliverable"):
                 deliverables = [result.get("final_deliverable")]
 
@@ -523,7 +598,7 @@ class InterfaceAgent:
                 notes = result.get("notes") or result.get("action_summary") or ""
 
             completion = CompletionResult(
-                correlation_id=self.correlation_id,
+                correlation_id=ctx.correlation_id,
                 success=success,
                 deliverables=deliverables,
                 notes=notes
@@ -532,57 +607,57 @@ class InterfaceAgent:
             self.logger.info(
                 "Task completed",
                 extra={
-                    "correlation_id": self.correlation_id,
+                    "correlation_id": ctx.correlation_id,
                     "success": success,
                     "deliverables_count": len(deliverables),
                 },
             )
             await self._publish_status(
+                ctx,
                 StatusType.COMPLETED,
                 max_ticks=max_ticks,
                 result=completion.result(),
             )
-            self._finalize_telemetry(success=success)
+            self._finalize_telemetry(ctx, success=success)
         except Exception as e:
-            self.logger.exception("Agent execution failed")
+            self.logger.exception("Agent execution failed", extra={"correlation_id": ctx.correlation_id})
             deliverables = []
-            if self.agent and getattr(self.agent, "deliverables", None):
+            if ctx.agent and getattr(ctx.agent, "deliverables", None):
                 try:
-                    deliverables = list(self.agent.deliverables)
+                    deliverables = list(ctx.agent.deliverables)
                 except Exception:
                     deliverables = []
             notes = f"Internal agent error: {str(e)}"
 
             if deliverables:
                 completion = CompletionResult(
-                    correlation_id=self.correlation_id,
+                    correlation_id=ctx.correlation_id,
                     success=False,
                     deliverables=deliverables,
                     notes=notes,
                 )
                 await self._publish_status(
+                    ctx,
                     StatusType.COMPLETED,
                     max_ticks=max_ticks,
                     result=completion.result(),
                 )
             else:
                 await self._publish_status(
+                    ctx,
                     StatusType.ERROR,
                     max_ticks=max_ticks,
                     error=str(e),
                 )
-            self._finalize_telemetry(success=False)
+            self._finalize_telemetry(ctx, success=False)
         finally:
-            await self._cancel_task(self._heartbeat_task)
-            self.agent = None
-            self._clear_task_telemetry()
-            self.correlation_id = None
-            self.mandate = None
-            await self._enter_waiting_state()
+            await self._cancel_task(ctx.heartbeat_task)
+            ctx.heartbeat_task = None
+            ctx.agent = None
 
-    def _build_telemetry(self) -> Optional[TelemetrySession]:
+    def _build_telemetry(self, ctx: TaskContext) -> Optional[TelemetrySession]:
         """
-        Build a telemetry session when tracking is enabled.
+        Build a telemetry session for a task when tracking is enabled.
         """
         if not self.config.enable_tracking:
             return None
@@ -590,25 +665,26 @@ class InterfaceAgent:
         trace_path = None
         if trace_dir:
             ts = time.strftime("%Y%m%d_%H%M%S")
-            filename = f"{ts}_agent_trace_{self.correlation_id or 'unknown'}.jsonl"
+            filename = f"{ts}_agent_trace_{ctx.correlation_id or 'unknown'}.jsonl"
             trace_path = Path(trace_dir) / filename
         return TelemetrySession(
             enabled=True,
-            mandate=self.mandate,
-            correlation_id=self.correlation_id,
+            mandate=ctx.mandate,
+            correlation_id=ctx.correlation_id,
             trace_path=trace_path,
         )
 
-    def _finalize_telemetry(self, success: Optional[bool] = None) -> None:
+    def _finalize_telemetry(self, ctx: TaskContext, success: Optional[bool] = None) -> None:
         """
-        Finalize telemetry if enabled.
+        Finalize a task's telemetry if enabled.
         """
-        if self._telemetry:
-            self._telemetry.finish(success=success)
+        if ctx.telemetry:
+            ctx.telemetry.finish(success=success)
 
     def _clear_task_telemetry(self) -> None:
         """
         Clear telemetry from connectors after a task finishes.
+        Connector telemetry is task-local, so this only detaches the calling task's session.
         """
         if self.connector_llm:
             self.connector_llm.clear_telemetry()
@@ -620,14 +696,13 @@ class InterfaceAgent:
             self.connector_chroma.clear_telemetry()
         if self.connector_browser:
             self.connector_browser.clear_telemetry()
-        self._telemetry = None
 
-    async def _publish_status(self, status_type: StatusType, **kwargs) -> None:
-        """Publishes a status update for the current task."""
+    async def _publish_status(self, ctx: TaskContext, status_type: StatusType, **kwargs) -> None:
+        """Publishes a status update for a task."""
         envelope = StatusEnvelope(
             type=status_type,
-            mandate=self.mandate,
-            correlation_id=self.correlation_id,
+            mandate=ctx.mandate,
+            correlation_id=ctx.correlation_id,
             **kwargs
         )
         try:
@@ -641,7 +716,7 @@ class InterfaceAgent:
             "Publishing status",
             extra={
                 "type": str(status_type),
-                "correlation_id": self.correlation_id,
+                "correlation_id": ctx.correlation_id,
                 "fields": {k: v for k, v in kwargs.items() if k in {"tick", "max_ticks", "error"}},
             },
         )
@@ -653,8 +728,9 @@ class InterfaceAgent:
             updates = {
                 "status": state.value,
             }
-            if self.mandate is not None:
-                updates["mandate"] = self.mandate
+            if ctx.mandate is not None and status_type == StatusType.ACCEPTED:
+                # Only the first write carries the mandate; it never changes afterwards.
+                updates["mandate"] = ctx.mandate
             if "tick" in kwargs and kwargs.get("tick") is not None:
                 updates["tick"] = kwargs.get("tick")
             if "max_ticks" in kwargs and kwargs.get("max_ticks") is not None:
@@ -667,33 +743,35 @@ class InterfaceAgent:
             if "error" in kwargs and kwargs.get("error") is not None:
                 updates["error"] = kwargs.get("error")
 
-            if self.correlation_id:
-                await self.storage.update_task(self.correlation_id, updates)
+            if ctx.correlation_id:
+                await self.storage.update_task(ctx.correlation_id, updates)
         except Exception:
             pass
 
-    async def _heartbeat_loop(self) -> None:
+    async def _heartbeat_loop(self, ctx: TaskContext) -> None:
         """Publishes periodic in-progress status updates while a task is running."""
         interval = self.config.status_time
         try:
             while True:
-                if self.agent is None:
+                agent = ctx.agent
+                if agent is None:
                     return
                 self.logger.debug(
                     "Heartbeat tick",
                     extra={
-                        "correlation_id": self.correlation_id,
-                        "current_tick": getattr(self.agent, "current_tick", None),
-                        "max_ticks": getattr(self.agent, "max_ticks", None),
+                        "correlation_id": ctx.correlation_id,
+                        "current_tick": getattr(agent, "current_tick", None),
+                        "max_ticks": getattr(agent, "max_ticks", None),
                     },
                 )
                 await self._publish_status(
+                    ctx,
                     StatusType.IN_PROGRESS,
-                    tick=self.agent.current_tick,
-                    max_ticks=self.agent.max_ticks,
-                    history_length=len(self.agent.history),
-                    notes_len=len(self.agent.notes),
-                    deliverables_count=len(self.agent.deliverables),
+                    tick=agent.current_tick,
+                    max_ticks=agent.max_ticks,
+                    history_length=len(agent.history),
+                    notes_len=len(agent.notes),
+                    deliverables_count=len(agent.deliverables),
                 )
                 await self._set_worker_state("working")
                 await asyncio.sleep(interval)
@@ -0,0 +1,108 @@
+"""
+Incremental parser for the objects of one array in a streamed JSON response.
+
+Expansion responses look like ``{"candidates": [{...}, {...}], "meta": {...}}``.
+While the completion streams in, ``JsonArrayStream`` tracks string/escape state
+and nesting depth and hands every element of the named top-level array to a
+callback as soon as its closing brace arrives, so work on early candidates can
+start before the rest of the response is generated.
+
+It is a scanner, not a validator: anything outside the target array is only
+tracked for depth and keys, and an element that fails ``json.loads`` is
+skipped. Callers still parse the complete text for their final result.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Callable, List, Optional
+
+_logger = logging.getLogger(__name__)
+
+
+class JsonArrayStream:
+    """
+    Emit the elements of ``{"<key>": [...]}`` as they close.
+
+    :param key: Top-level key holding the array (e.g. ``candidates``).
+    :param on_item: Called with each decoded element, in order.
+    """
+
+    def __init__(self, key: str, on_item: Callable[[Any], None]) -> None:
+        self.key = key
+        self.on_item = on_item
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Forget all state; the next ``feed`` starts a new response (e.g. a retry).
+        """
+        self.emitted = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string: List[str] = []
+        self._last_key: Optional[str] = None
+        self._current_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._done = False
+        self._item: Optional[List[str]] = None
+
+    def feed(self, text: str) -> None:
+        """
+        Consume the next chunk of response text.
+        :param text: Text delta (any length, split anywhere).
+        """
+        if self._done or not text:
+            return
+        for ch in text:
+            if self._item is not None:
+                self._item.append(ch)
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._item is None:
+                        self._last_key = "".join(self._string)
+                elif self._depth == 1 and self._item is None:
+                    self._string.append(ch)
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string = []
+            elif ch == ":":
+                if self._depth == 1:
+                    self._current_key = self._last_key
+            elif ch == ",":
+                if self._depth == 1:
+                    self._current_key = None
+            elif ch in "{[":
+                if (
+                    self._array_depth is not None
+                    and self._depth == self._array_depth
+                    and self._item is None
+                ):
+                    self._item = [ch]
+                self._depth += 1
+                if ch == "[" and self._depth == 2 and self._current_key == self.key and self._array_depth is None:
+                    self._array_depth = self._depth
+            elif ch in "}]":
+                self._depth -= 1
+                if self._array_depth is not None and self._depth == self._array_depth and self._item is not None:
+                    self._emit("".join(self._item))
+                    self._item = None
+                elif self._array_depth is not None and self._depth < self._array_depth:
+                    self._done = True
+                    return
+
+    def _emit(self, raw: str) -> None:
+        try:
+            item = json.loads(raw)
+        except json.JSONDecodeError:
+            _logger.debug(f"Skipping undecodable streamed array element ({len(raw)} chars)")
+            return
+        self.emitted += 1
+        self.on_item(item)
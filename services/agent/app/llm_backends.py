@@ -1,6 +1,7 @@
 """
 LLM transport backends: OpenAI-compatible HTTP API and native Anthropic Messages API.
 Switch via LLM_PROVIDER (openai_compatible | anthropic) and MODEL_API_URL / keys in ConnectorConfig.
+LLM_PROVIDER=simulated answers locally for load tests (see simulated_backends.py).
 """
 from __future__ import annotations
 
@@ -8,7 +9,7 @@ import asyncio
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Tuple
+from typing import Any, Callable, Optional, Tuple
 
 from openai import APIError, APIStatusError, AsyncOpenAI
 from shared.connector_config import ConnectorConfig
@@ -62,6 +63,27 @@ class LLMBackend(ABC):
         :returns: (content, usage) where usage matches OpenAI or exposes input/output token attrs.
         """
 
+    async def complete_stream(
+        self,
+        payload: dict,
+        model_name: str,
+        on_text: Callable[[str], None],
+    ) -> Tuple[str, Any]:
+        """
+        Run one completion, passing text deltas to ``on_text`` as they arrive.
+
+        The return value matches ``complete`` for the same payload. Backends
+        without a streaming transport deliver the whole text as one delta.
+
+        :param payload: Normalized then simplified payload.
+        :param model_name: Resolved model id.
+        :param on_text: Called with each text delta, in order.
+        :returns: (content, usage) as from ``complete``.
+        """
+        content, usage = await self.complete(payload, model_name)
+        on_text(content)
+        return content, usage
+
     @abstractmethod
     def reset_client(self) -> None:
         """
@@ -84,6 +106,10 @@ def create_llm_backend(config: ConnectorConfig, logger: logging.Logger) -> LLMBa
         return AnthropicMessagesBackend(config, logger)
     if provider == "openrouter":
         return OpenRouterBackend(config, logger)
+    if provider == "simulated":
+        from agent.app.simulated_backends import SimulatedLLMBackend
+
+        return SimulatedLLMBackend(config, logger)
     if provider not in ("openai_compatible", "openai", "ollama", "local"):
         logger.warning("Unknown LLM_PROVIDER=%s; using openai_compatible", provider)
     return OpenAICompatibleBackend(config, logger)
@@ -242,6 +268,18 @@ class OpenAICompatibleBackend(LLMBackend):
         message = response.choices[0].message
         content = getattr(message, "content", None)
         finish_reason = getattr(response.choices[0], "finish_reason", None)
+        return self._check_content(content, finish_reason, model_name)
+
+    def _check_content(self, content: Any, finish_reason: Optional[str], model_name: str) -> str:
+        """
+        Validate assistant text from a completion or an assembled stream.
+
+        :param content: Assistant text (or None).
+        :param finish_reason: Finish reason reported by the API.
+        :param model_name: Model id for error messages.
+        :returns: Stripped assistant text.
+        :raises RuntimeError: When content is missing or invalid.
+        """
         if content is None:
             raise RuntimeError(f"LLM returned None content (model={model_name}, finish_reason={finish_reason})")
         if not isinstance(content, str):
@@ -283,6 +321,53 @@ class OpenAICompatibleBackend(LLMBackend):
         text = self._extract_content(response, model_name)
         return text, usage
 
+    async def complete_stream(
+        self,
+        payload: dict,
+        model_name: str,
+        on_text: Callable[[str], None],
+    ) -> Tuple[str, Any]:
+        """
+        Call chat.completions.create with stream=True; usage comes from the final chunk.
+
+        :param payload: Simplified payload from simplify_payload.
+        :param model_name: Model id.
+        :param on_text: Called with each content delta.
+        :returns: (content, usage_object), same as complete().
+        """
+        try:
+            stream = await self.client.chat.completions.create(
+                **payload,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+        except TypeError as e:
+            self.logger.error("LLM API parameter error (model=%s): %s", model_name, e)
+            raise
+        parts: list[str] = []
+        usage = None
+        finish_reason = None
+        saw_choice = False
+        async for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            choices = getattr(chunk, "choices", None)
+            if not choices:
+                continue
+            saw_choice = True
+            choice = choices[0]
+            if getattr(choice, "finish_reason", None):
+                finish_reason = choice.finish_reason
+            delta = getattr(choice, "delta", None)
+            piece = getattr(delta, "content", None) if delta is not None else None
+            if piece:
+                parts.append(piece)
+                on_text(piece)
+        if not saw_choice:
+            raise RuntimeError("Empty response or no choices returned from LLM")
+        text = self._check_content("".join(parts), finish_reason, model_name)
+        return text, usage
+
     def reset_client(self) -> None:
         """
         Recreate the AsyncOpenAI client.
@@ -313,6 +398,29 @@ class OpenRouterBackend(OpenAICompatibleBackend):
         }
         return AsyncOpenAI(api_key=api_key, base_url=base_url, default_headers=default_headers)
 
+    def simplify_payload(self, payload: dict) -> dict:
+        """
+        Remove unsupported parameters and, for Anthropic slugs, mark the system
+        message as a cache breakpoint (OpenRouter forwards ``cache_control``).
+
+        :param payload: Normalized payload.
+        :returns: Payload for chat.completions.create.
+        """
+        safe_payload = super().simplify_payload(payload)
+        model_name = str(safe_payload.get("model") or "")
+        if not getattr(self.config, "llm_prompt_cache", True) or not model_name.startswith("anthropic/"):
+            return safe_payload
+        messages = []
+        for message in safe_payload.get("messages") or []:
+            if isinstance(message, dict) and message.get("role") == "system" and isinstance(message.get("content"), str):
+                message = dict(message)
+                message["content"] = [
+                    {"type": "text", "text": message["content"], "cache_control": {"type": "ephemeral"}},
+                ]
+            messages.append(message)
+        safe_payload["messages"] = messages
+        return safe_payload
+
 
 class AnthropicMessagesBackend(LLMBackend):
     """
@@ -450,13 +558,13 @@ class AnthropicMessagesBackend(LLMBackend):
             )
         return None
 
-    async def complete(self, payload: dict, model_name: str) -> Tuple[str, Any]:
+    def _messages_kwargs(self, payload: dict, model_name: str) -> dict[str, Any]:
         """
-        Call messages.create and return assistant text and usage.
+        Map an OpenAI-shaped payload to messages.create keyword arguments.
 
         :param payload: Full normalized payload (OpenAI-shaped).
         :param model_name: Resolved model id.
-        :returns: (content, usage).
+        :returns: Keyword arguments for messages.create / messages.stream.
         """
         rf = payload.get("response_format")
         json_hint = self._json_instruction_from_response_format(rf)
@@ -476,9 +584,24 @@ class AnthropicMessagesBackend(LLMBackend):
             "messages": anthropic_messages,
         }
         if system_text:
-            kwargs["system"] = system_text
+            if getattr(self.config, "llm_prompt_cache", True):
+                # The system message is the run-stable prefix (see PromptBuilder.build_prefixed_messages).
+                kwargs["system"] = [{"type": "text", "text": system_text, "cache_control": {"type": "ephemeral"}}]
+            else:
+                kwargs["system"] = system_text
         if "temperature" in payload and payload["temperature"] is not None:
             kwargs["temperature"] = float(payload["temperature"])
+        return kwargs
+
+    async def complete(self, payload: dict, model_name: str) -> Tuple[str, Any]:
+        """
+        Call messages.create and return assistant text and usage.
+
+        :param payload: Full normalized payload (OpenAI-shaped).
+        :param model_name: Resolved model id.
+        :returns: (content, usage).
+        """
+        kwargs = self._messages_kwargs(payload, model_name)
         try:
             msg = await self._client.messages.create(**kwargs)
         except TypeError as e:
@@ -488,6 +611,34 @@ class AnthropicMessagesBackend(LLMBackend):
         usage = getattr(msg, "usage", None)
         return text, usage
 
+    async def complete_stream(
+        self,
+        payload: dict,
+        model_name: str,
+        on_text: Callable[[str], None],
+    ) -> Tuple[str, Any]:
+        """
+        Stream messages.create; the returned text is read from the final message.
+
+        :param payload: Full normalized payload (OpenAI-shaped).
+        :param model_name: Resolved model id.
+        :param on_text: Called with each text delta.
+        :returns: (content, usage), same as complete().
+        """
+        kwargs = self._messages_kwargs(payload, model_name)
+        try:
+            async with self._client.messages.stream(**kwargs) as stream:
+                async for piece in stream.text_stream:
+                    if piece:
+                        on_text(piece)
+                msg = await stream.get_final_message()
+        except TypeError as e:
+            self.logger.error("Anthropic API parameter error (model=%s): %s", model_name, e)
+            raise
+        text = self._extract_anthropic_text(msg)
+        usage = getattr(msg, "usage", None)
+        return text, usage
+
     def _extract_anthropic_text(self, msg: Any) -> str:
         """
         Concatenate text blocks from an Anthropic message.
@@ -0,0 +1,354 @@
+"""
+Opt-in response cache for ``ConnectorLLM.query_llm``.
+
+Benchmark reruns (``IdeaTestRunner``), interactive ``DebugSession`` replays and
+checkpoint-resumed runs send byte-identical expansion, evaluation and
+finalization payloads. With the cache on, a repeat of a deterministic payload
+is answered locally instead of by the provider.
+
+The key is a hash of the payload after ``_normalize_payload`` plus the model
+name, so anything that changes the wire request changes the key. Only
+temperature-0 payloads are cached unless ``LLM_CACHE_FORCE`` is set (a payload
+whose temperature was dropped by normalization samples at the provider
+default and is not deterministic either).
+
+Each entry keeps the ``usage`` of the call that filled it. A hit is reported as
+zero-token usage with ``saved_usage`` attached, so priced usage
+(``model_costs.estimate_cost``) reflects what was actually spent while
+``TelemetrySession.summary()`` reports the tokens the cache saved.
+
+Environment:
+
+- ``LLM_CACHE``: ``off`` (default), ``memory``, ``disk`` or ``redis``.
+- ``LLM_CACHE_TTL_SECONDS``: default TTL (86400).
+- ``LLM_CACHE_TTLS``: per-operation overrides, e.g.
+  ``expansion=3600,evaluation=3600,finalize=0`` (0 disables that operation).
+- ``LLM_CACHE_DIR``: directory for the ``disk`` store.
+- ``LLM_CACHE_MAX_ENTRIES``: bound for the ``memory`` and ``disk`` stores
+  (4096); the least recently used entries are evicted past it.
+- ``LLM_CACHE_FORCE``: cache nonzero-temperature payloads too.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from shared.connector_config import ConnectorConfig
+
+_logger = logging.getLogger(__name__)
+
+_TRUTHY = ("1", "true", "yes", "on")
+
+
+class _MemoryStore:
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = (time.time() + ttl_seconds, value)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class _DiskStore:
+    # Seconds between sweeps of expired entries, run from ``set``.
+    SWEEP_INTERVAL_SECONDS = 600.0
+    # Leftover temp files older than this are from a crashed writer.
+    STALE_TEMP_SECONDS = 3600.0
+
+    def __init__(self, directory: Path, max_entries: int) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # key -> expires_at, least recently used first; built from the directory on first use.
+        self._index: Optional["OrderedDict[str, float]"] = None
+        self._last_sweep = 0.0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        index = await self._entries()
+        # Read even without an index entry: another process may share the directory.
+        item = await asyncio.to_thread(self._read, self._path(key))
+        if item is None:
+            index.pop(key, None)
+            return None
+        expires_at = float(item.get("expires_at", 0))
+        if expires_at <= time.time():
+            index.pop(key, None)
+            await asyncio.to_thread(self._unlink, [self._path(key)])
+            return None
+        index[key] = expires_at
+        index.move_to_end(key)
+        return item.get("value")
+
+    async def set(self, key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
+        index = await self._entries()
+        expires_at = time.time() + ttl_seconds
+        try:
+            data = json.dumps({"expires_at": expires_at, "value": value})
+        except (TypeError, ValueError) as exc:
+            _logger.debug(f"LLM cache disk write failed: {exc}")
+            return
+        if not await asyncio.to_thread(self._write, self._path(key), data):
+            return
+        index.pop(key, None)
+        index[key] = expires_at
+        doomed = []
+        while len(index) > self.max_entries:
+            doomed.append(self._path(index.popitem(last=False)[0]))
+        if time.monotonic() - self._last_sweep >= self.SWEEP_INTERVAL_SECONDS:
+            self._last_sweep = time.monotonic()
+            now = time.time()
+            for stale in [k for k, expiry in index.items() if expiry <= now]:
+                del index[stale]
+                doomed.append(self._path(stale))
+        if doomed:
+            await asyncio.to_thread(self._unlink, doomed)
+
+    async def _entries(self) -> "OrderedDict[str, float]":
+        if self._index is None:
+            index = await asyncio.to_thread(self._scan)
+            if self._index is None:
+                self._index = index
+                self._last_sweep = time.monotonic()
+        return self._index
+
+    # The helpers below run in a worker thread and touch the disk only.
+
+    def _scan(self) -> "OrderedDict[str, float]":
+        # Index the directory (oldest write first), dropping expired entries,
+        # unreadable files and temp files left by a crashed writer.
+        now = time.time()
+        found = []
+        for path in self.directory.iterdir():
+            try:
+                mtime = path.stat().st_mtime
+                if path.suffix == ".tmp":
+                    if now - mtime > self.STALE_TEMP_SECONDS:
+                        path.unlink(missing_ok=True)
+                    continue
+                if path.suffix != ".json":
+                    continue
+                item = self._read(path)
+                expires_at = float(item.get("expires_at", 0)) if item is not None else 0.0
+                if expires_at <= now:
+                    path.unlink(missing_ok=True)
+                    continue
+            except OSError:
+                continue
+            found.append((mtime, path.stem, expires_at))
+        found.sort()
+        index: "OrderedDict[str, float]" = OrderedDict((key, expires_at) for _, key, expires_at in found)
+        doomed = []
+        while len(index) > self.max_entries:
+            doomed.append(self._path(index.popitem(last=False)[0]))
+        self._unlink(doomed)
+        return index
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            item = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        return item if isinstance(item, dict) else None
+
+    def _write(self, path: Path, data: str) -> bool:
+        # Write a temp file and rename it over the entry, so readers (and
+        # other processes) never see a partial file.
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    handle.write(data)
+                os.replace(tmp, path)
+            except BaseException:
+                Path(tmp).unlink(missing_ok=True)
+                raise
+        except OSError as exc:
+            _logger.debug(f"LLM cache disk write failed: {exc}")
+            return False
+        return True
+
+    @staticmethod
+    def _unlink(paths: List[Path]) -> None:
+        for path in paths:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as exc:
+                _logger.debug(f"LLM cache disk cleanup failed for {path}: {exc}")
+
+
+class _RedisStore:
+    _PREFIX = "llm_cache:"
+
+    def __init__(self, config: ConnectorConfig) -> None:
+        # Imported lazily so the memory/disk stores don't need redis installed.
+        from shared.connector_redis import ConnectorRedis
+
+        self._redis = ConnectorRedis(config)
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        value = await self._redis.get_json(self._PREFIX + key)
+        return value if isinstance(value, dict) else None
+
+    async def set(self, key: str, value: Dict[str, Any], ttl_seconds: int) -> None:
+        await self._redis.set_json(self._PREFIX + key, value, ex=ttl_seconds)
+
+
+class LLMResponseCache:
+    """
+    Payload-keyed LLM response cache over a memory, disk or Redis store.
+
+    :param store: Backing store (``get``/``set`` coroutines).
+    :param default_ttl_seconds: TTL for operations without an override.
+    :param operation_ttls: Per-operation TTLs; 0 disables caching for that operation.
+    :param force: Cache nonzero-temperature payloads too.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        default_ttl_seconds: int = 86400,
+        operation_ttls: Optional[Dict[str, int]] = None,
+        force: bool = False,
+    ) -> None:
+        self._store = store
+        self.default_ttl_seconds = int(default_ttl_seconds)
+        self.operation_ttls = dict(operation_ttls or {})
+        self.force = bool(force)
+
+    def ttl_for(self, operation: Optional[str]) -> int:
+        """
+        TTL for an operation label.
+        :param operation: e.g. ``expansion``, ``evaluation``, ``finalize``; None = default.
+        :returns: Seconds; 0 means don't cache.
+        """
+        if operation and operation in self.operation_ttls:
+            return self.operation_ttls[operation]
+        return self.default_ttl_seconds
+
+    def cacheable(self, payload: Dict[str, Any], operation: Optional[str] = None) -> bool:
+        """
+        Whether a normalized payload may be served from / written to the cache.
+        :param payload: Normalized request payload.
+        :param operation: Operation label (for its TTL).
+        :returns: True when deterministic (temperature 0) or forced, and TTL > 0.
+        """
+        if self.ttl_for(operation) <= 0:
+            return False
+        if self.force:
+            return True
+        temperature = payload.get("temperature")
+        try:
+            return temperature is not None and float(temperature) == 0.0
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def key(payload: Dict[str, Any], model_name: str) -> str:
+        """
+        Cache key for a normalized payload and model.
+        :param payload: Normalized request payload.
+        :param model_name: Resolved model name.
+        :returns: Hex digest.
+        """
+        raw = json.dumps({"model": model_name, "payload": payload}, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Cached ``{"content", "usage"}`` for ``key``, or None.
+        :param key: Cache key.
+        """
+        try:
+            value = await self._store.get(key)
+        except Exception as exc:
+            _logger.warning(f"LLM cache read failed: {exc}")
+            return None
+        if not isinstance(value, dict) or not isinstance(value.get("content"), str):
+            return None
+        return value
+
+    async def set(self, key: str, content: str, usage: Optional[Dict[str, Any]], operation: Optional[str]) -> None:
+        """
+        Store a response under ``key``.
+        :param key: Cache key.
+        :param content: Response text.
+        :param usage: Usage of the call that produced it.
+        :param operation: Operation label (for its TTL).
+        """
+        try:
+            await self._store.set(key, {"content": content, "usage": usage}, self.ttl_for(operation))
+        except Exception as exc:
+            _logger.warning(f"LLM cache write failed: {exc}")
+
+
+def _parse_operation_ttls(raw: str) -> Dict[str, int]:
+    ttls: Dict[str, int] = {}
+    for part in raw.split(","):
+        name, sep, value = part.partition("=")
+        if not sep or not name.strip():
+            continue
+        try:
+            ttls[name.strip()] = int(float(value))
+        except ValueError:
+            _logger.warning(f"Ignoring bad LLM_CACHE_TTLS entry: {part!r}")
+    return ttls
+
+
+def llm_cache_from_env(config: ConnectorConfig) -> Optional[LLMResponseCache]:
+    """
+    Build the cache selected by ``LLM_CACHE`` (see module docstring).
+    :param config: Connector config (Redis URL for the ``redis`` store).
+    :returns: LLMResponseCache, or None when off.
+    """
+    mode = (os.environ.get("LLM_CACHE") or "off").strip().lower()
+    if mode in ("", "off", "0", "false", "no"):
+        return None
+    max_entries = int(os.environ.get("LLM_CACHE_MAX_ENTRIES", "4096"))
+    if mode == "memory":
+        store: Any = _MemoryStore(max_entries)
+    elif mode == "disk":
+        directory = os.environ.get("LLM_CACHE_DIR", "").strip()
+        if not directory:
+            # services/agent/app/llm_cache.py -> services/agent/idea_test_results/llm_cache
+            directory = str(Path(__file__).resolve().parent.parent / "idea_test_results" / "llm_cache")
+        store = _DiskStore(Path(directory), max_entries)
+    elif mode == "redis":
+        if not config.redis_url:
+            _logger.warning("LLM_CACHE=redis but no REDIS_URL; LLM cache disabled")
+            return None
+        store = _RedisStore(config)
+    else:
+        _logger.warning(f"Unknown LLM_CACHE mode {mode!r}; LLM cache disabled")
+        return None
+    return LLMResponseCache(
+        store,
+        default_ttl_seconds=int(float(os.environ.get("LLM_CACHE_TTL_SECONDS", "86400"))),
+        operation_ttls=_parse_operation_ttls(os.environ.get("LLM_CACHE_TTLS", "")),
+        force=os.environ.get("LLM_CACHE_FORCE", "").strip().lower() in _TRUTHY,
+    )
@@ -0,0 +1,169 @@
+"""
+Hedged LLM requests for tail latency.
+
+A few slow provider responses dominate p99 step latency, and
+``AgentIO.query_llm_with_fallback`` only reaches the fallback model after the
+primary has failed outright. With hedging on, ``AgentIO`` waits for the primary
+call for a learned percentile of recent latencies for that model and operation;
+if it has not answered by then it sends a second request (to the same model or
+to ``fallback_model``), takes whichever answers first and cancels the other.
+
+Latencies are learned per ``(model, operation)`` over a sliding window shared by
+every ``AgentIO`` on the worker; no hedge fires until ``min_samples`` latencies
+are known. Each ``AgentIO`` (one per run) gets ``budget`` hedges, so the extra
+spend per run is bounded.
+
+Environment (read once by ``shared_hedge_policy``):
+
+- ``LLM_HEDGE``: ``off`` (default), ``same`` (hedge to the same model) or
+  ``fallback`` (hedge to ``fallback_model``, the same model when none is set).
+- ``LLM_HEDGE_PERCENTILE``: latency percentile that triggers a hedge (0.95).
+- ``LLM_HEDGE_MIN_SAMPLES``: latencies needed before hedging (20).
+- ``LLM_HEDGE_MIN_DELAY_SECONDS``: never hedge sooner than this (1.0).
+- ``LLM_HEDGE_BUDGET``: hedges per run (10).
+- ``LLM_HEDGE_OPERATIONS``: operations that may hedge (``expansion,evaluation``).
+"""
+from __future__ import annotations
+
+import math
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+
+class LatencyTracker:
+    """
+    Sliding window of successful call latencies per (model, operation).
+
+    :param window: Latencies kept per key.
+    """
+
+    def __init__(self, window: int = 200) -> None:
+        self.window = max(1, int(window))
+        self._samples: Dict[Tuple[str, str], Deque[float]] = {}
+
+    def record(self, model: str, operation: Optional[str], seconds: float) -> None:
+        """
+        Add one latency sample.
+        :param model: Model name.
+        :param operation: Operation label.
+        :param seconds: Observed latency.
+        """
+        key = (model, operation or "")
+        samples = self._samples.get(key)
+        if samples is None:
+            samples = self._samples[key] = deque(maxlen=self.window)
+        samples.append(max(0.0, float(seconds)))
+
+    def count(self, model: str, operation: Optional[str]) -> int:
+        """
+        Number of samples held for a key.
+        """
+        return len(self._samples.get((model, operation or ""), ()))
+
+    def percentile(self, model: str, operation: Optional[str], q: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of the window.
+        :param model: Model name.
+        :param operation: Operation label.
+        :param q: Percentile in (0, 1].
+        :returns: Latency in seconds, or None without samples.
+        """
+        samples = sorted(self._samples.get((model, operation or ""), ()))
+        if not samples:
+            return None
+        rank = min(len(samples), max(1, math.ceil(q * len(samples))))
+        return samples[rank - 1]
+
+
+class HedgePolicy:
+    """
+    When and where to hedge an LLM call.
+
+    :param target: ``same`` or ``fallback`` (see module docstring).
+    :param percentile: Latency percentile that triggers a hedge.
+    :param min_samples: Samples needed before a key may hedge.
+    :param min_delay_seconds: Lower bound on the hedge delay.
+    :param budget: Hedges allowed per run (per ``AgentIO``).
+    :param operations: Operation labels that may hedge.
+    :param tracker: Latency tracker (shared across runs on a worker).
+    """
+
+    def __init__(
+        self,
+        target: str = "same",
+        percentile: float = 0.95,
+        min_samples: int = 20,
+        min_delay_seconds: float = 1.0,
+        budget: int = 10,
+        operations: Iterable[str] = ("expansion", "evaluation"),
+        tracker: Optional[LatencyTracker] = None,
+    ) -> None:
+        self.target = target
+        self.percentile = min(1.0, max(0.01, float(percentile)))
+        self.min_samples = max(1, int(min_samples))
+        self.min_delay_seconds = max(0.0, float(min_delay_seconds))
+        self.budget = max(0, int(budget))
+        self.operations = frozenset(operations)
+        self.tracker = tracker or LatencyTracker()
+
+    def delay_for(self, model: str, operation: Optional[str]) -> Optional[float]:
+        """
+        How long to wait for the primary before hedging.
+        :param model: Primary model name.
+        :param operation: Operation label.
+        :returns: Seconds, or None when this call should not hedge.
+        """
+        if operation not in self.operations:
+            return None
+        if self.tracker.count(model, operation) < self.min_samples:
+            return None
+        latency = self.tracker.percentile(model, operation, self.percentile)
+        if latency is None:
+            return None
+        return max(self.min_delay_seconds, latency)
+
+    def hedge_model(self, model: str, fallback_model: Optional[str]) -> str:
+        """
+        Model to send the hedge request to.
+        :param model: Primary model name.
+        :param fallback_model: Caller's fallback model, if any.
+        :returns: Model name.
+        """
+        if self.target == "fallback" and fallback_model and fallback_model.strip():
+            return fallback_model.strip()
+        return model
+
+    def record(self, model: str, operation: Optional[str], seconds: float) -> None:
+        """
+        Feed one observed latency into the tracker.
+        """
+        self.tracker.record(model, operation, seconds)
+
+
+_shared_lock = threading.Lock()
+_shared: Optional[HedgePolicy] = None
+
+
+def shared_hedge_policy() -> Optional[HedgePolicy]:
+    """
+    Worker-wide hedge policy built from the environment on first use.
+    :returns: The shared policy, or None when ``LLM_HEDGE`` is off.
+    """
+    global _shared
+    mode = (os.environ.get("LLM_HEDGE") or "off").strip().lower()
+    if mode not in ("same", "fallback"):
+        return None
+    with _shared_lock:
+        if _shared is None:
+            operations = os.environ.get("LLM_HEDGE_OPERATIONS", "expansion,evaluation")
+            _shared = HedgePolicy(
+                target=mode,
+                percentile=float(os.environ.get("LLM_HEDGE_PERCENTILE", "0.95")),
+                min_samples=int(os.environ.get("LLM_HEDGE_MIN_SAMPLES", "20")),
+                min_delay_seconds=float(os.environ.get("LLM_HEDGE_MIN_DELAY_SECONDS", "1.0")),
+                budget=int(os.environ.get("LLM_HEDGE_BUDGET", "10")),
+                operations=[op.strip() for op in operations.split(",") if op.strip()],
+            )
+        return _shared
@@ -0,0 +1,320 @@
+"""
+Per-model admission control for LLM calls.
+
+Concurrency used to be whatever ``parallel_action_limit`` and ``asyncio.gather``
+produced, and a 429 storm was absorbed only by ``query_llm``'s exponential
+``Retry``. Every ``ConnectorLLM`` on a worker now admits calls through one
+``LLMRateLimiter``, which per model:
+
+- enforces requests-per-minute and tokens-per-minute token buckets; the token
+  cost of a call is estimated from ``prompt_chars`` (chars / 4) plus its output
+  cap and reconciled with the reported usage when the call returns;
+- caps concurrent calls with an AIMD window: +1/window per success, halved
+  (at most once per cooldown) on a 429/503/504 or timeout, which also pauses
+  new admissions for the cooldown;
+- admits queued calls by operation priority: ``finalize`` before
+  ``evaluation`` before ``expansion`` before unlabelled calls before
+  ``embedding``, FIFO within a priority.
+
+Only asyncio futures created per wait are used (no loop-bound locks), so the
+shared instance is safe across event loops.
+
+Environment (read once by ``shared_llm_limiter``):
+
+- ``LLM_LIMITER``: on by default; ``0`` disables admission control.
+- ``LLM_RPM`` / ``LLM_TPM``: default per-model budgets (0 = unlimited).
+- ``LLM_CONCURRENCY_INITIAL`` (16), ``LLM_CONCURRENCY_MIN`` (1),
+  ``LLM_CONCURRENCY_MAX`` (64): AIMD window.
+- ``LLM_MODEL_LIMITS``: JSON per-model overrides, e.g.
+  ``{"openai/gpt-5-mini": {"rpm": 500, "tpm": 200000, "max_concurrency": 16}}``.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+_logger = logging.getLogger(__name__)
+
+OPERATION_PRIORITY = {"finalize": 0, "evaluation": 1, "expansion": 2, "embedding": 4}
+DEFAULT_PRIORITY = 3
+
+CHARS_PER_TOKEN = 4
+DEFAULT_OUTPUT_TOKENS = 1024
+THROTTLE_STATUSES = {429, 503, 504}
+
+
+def estimate_tokens(prompt_chars: int, payload: Dict[str, Any]) -> int:
+    """
+    Token cost to reserve for a call before it runs.
+    :param prompt_chars: Characters across the prompt messages.
+    :param payload: Normalized payload (for its output cap).
+    :returns: Estimated prompt + completion tokens.
+    """
+    output_cap = payload.get("max_completion_tokens") or payload.get("max_tokens") or DEFAULT_OUTPUT_TOKENS
+    try:
+        output_cap = int(output_cap)
+    except (TypeError, ValueError):
+        output_cap = DEFAULT_OUTPUT_TOKENS
+    return max(1, prompt_chars // CHARS_PER_TOKEN) + max(0, output_cap)
+
+
+def classify_outcome(exc: Optional[BaseException]) -> str:
+    """
+    Map a call's exception to a limiter outcome.
+    :param exc: Exception raised by the backend, or None on success.
+    :returns: ``ok``, ``throttled`` (429/503/504, timeouts), ``cancelled``
+        (hedge losers, caller timeouts; leaves the window unchanged) or ``error``.
+    """
+    if exc is None:
+        return "ok"
+    if isinstance(exc, asyncio.CancelledError):
+        return "cancelled"
+    status = getattr(exc, "status_code", None)
+    if isinstance(status, int) and status in THROTTLE_STATUSES:
+        return "throttled"
+    if isinstance(exc, asyncio.TimeoutError) or "timeout" in type(exc).__name__.lower():
+        return "throttled"
+    return "error"
+
+
+class _TokenBucket:
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class _ModelLimiter:
+    def __init__(
+        self,
+        rpm: float,
+        tpm: float,
+        initial_concurrency: int,
+        min_concurrency: int,
+        max_concurrency: int,
+        cooldown_seconds: float,
+    ) -> None:
+        self.requests = _TokenBucket(rpm) if rpm > 0 else None
+        self.tokens = _TokenBucket(tpm) if tpm > 0 else None
+        self.min_concurrency = max(1, int(min_concurrency))
+        self.max_concurrency = max(self.min_concurrency, int(max_concurrency))
+        self.window = float(min(max(initial_concurrency, self.min_concurrency), self.max_concurrency))
+        self.cooldown_seconds = cooldown_seconds
+        self.in_flight = 0
+        self.throttled = 0
+        self.blocked_until = 0.0
+        self._last_decrease = float("-inf")
+        self._queue: List[Tuple[int, int]] = []
+        self._wakeups: List["asyncio.Future[None]"] = []
+
+    def _admission_wait(self, tokens: int, now: float) -> float:
+        wait = max(0.0, self.blocked_until - now)
+        if self.requests is not None:
+            wait = max(wait, self.requests.wait_time(1, now))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    async def acquire(self, tokens: int, priority: int, seq: int) -> None:
+        entry = (priority, seq)
+        heapq.heappush(self._queue, entry)
+        try:
+            while True:
+                wait: Optional[float] = None
+                if self._queue[0] == entry and self.in_flight < int(self.window):
+                    wait = self._admission_wait(tokens, time.monotonic())
+                    if wait <= 0:
+                        heapq.heappop(self._queue)
+                        self.in_flight += 1
+                        if self.requests is not None:
+                            self.requests.take(1)
+                        if self.tokens is not None:
+                            self.tokens.take(tokens)
+                        self._notify()
+                        return
+                await self._wait_for_change(wait)
+        except BaseException:
+            if entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._notify()
+            raise
+
+    def release(self, outcome: str, reserved_tokens: int, actual_tokens: Optional[int]) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        if self.tokens is not None and actual_tokens is not None:
+            delta = reserved_tokens - actual_tokens
+            if delta > 0:
+                self.tokens.refund(delta)
+            else:
+                self.tokens.take(-delta)
+        now = time.monotonic()
+        if outcome == "throttled":
+            self.throttled += 1
+            self.blocked_until = max(self.blocked_until, now + self.cooldown_seconds)
+            if now - self._last_decrease >= self.cooldown_seconds:
+                self.window = max(float(self.min_concurrency), self.window / 2.0)
+                self._last_decrease = now
+        elif outcome == "ok":
+            self.window = min(float(self.max_concurrency), self.window + 1.0 / self.window)
+        self._notify()
+
+    async def _wait_for_change(self, timeout: Optional[float]) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._wakeups.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            if waiter in self._wakeups:
+                self._wakeups.remove(waiter)
+
+    def _notify(self) -> None:
+        wakeups, self._wakeups = self._wakeups, []
+        for waiter in wakeups:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window": round(self.window, 2),
+            "in_flight": self.in_flight,
+            "queued": len(self._queue),
+            "throttled": self.throttled,
+        }
+
+
+class LLMRateLimiter:
+    """
+    Shared per-model RPM/TPM + AIMD concurrency limiter with priority admission.
+
+    :param rpm: Default requests per minute per model (0 = unlimited).
+    :param tpm: Default tokens per minute per model (0 = unlimited).
+    :param initial_concurrency: Starting concurrency window.
+    :param min_concurrency: Window floor.
+    :param max_concurrency: Window ceiling.
+    :param cooldown_seconds: Pause after a throttle; also the minimum gap between decreases.
+    :param model_limits: Per-model overrides of ``rpm``/``tpm``/``max_concurrency``.
+    """
+
+    def __init__(
+        self,
+        rpm: float = 0,
+        tpm: float = 0,
+        initial_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_concurrency: int = 64,
+        cooldown_seconds: float = 1.0,
+        model_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> None:
+        self.rpm = rpm
+        self.tpm = tpm
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.cooldown_seconds = cooldown_seconds
+        self.model_limits = dict(model_limits or {})
+        self._models: Dict[str, _ModelLimiter] = {}
+        self._seq = itertools.count()
+
+    def _for_model(self, model: str) -> _ModelLimiter:
+        limiter = self._models.get(model)
+        if limiter is None:
+            limits = self.model_limits.get(model) or {}
+            max_concurrency = int(limits.get("max_concurrency", self.max_concurrency))
+            limiter = _ModelLimiter(
+                rpm=float(limits.get("rpm", self.rpm)),
+                tpm=float(limits.get("tpm", self.tpm)),
+                initial_concurrency=min(self.initial_concurrency, max_concurrency),
+                min_concurrency=self.min_concurrency,
+                max_concurrency=max_concurrency,
+                cooldown_seconds=self.cooldown_seconds,
+            )
+            self._models[model] = limiter
+        return limiter
+
+    async def acquire(self, model: str, tokens: int, operation: Optional[str] = None) -> float:
+        """
+        Wait for an admission slot.
+        :param model: Resolved model name.
+        :param tokens: Reserved token cost (``estimate_tokens``).
+        :param operation: Operation label (sets priority).
+        :returns: Seconds spent queued.
+        """
+        started = time.perf_counter()
+        priority = OPERATION_PRIORITY.get(operation or "", DEFAULT_PRIORITY)
+        await self._for_model(model).acquire(tokens, priority, next(self._seq))
+        return time.perf_counter() - started
+
+    def release(self, model: str, outcome: str, reserved_tokens: int, actual_tokens: Optional[int] = None) -> None:
+        """
+        Return a slot and feed the outcome back into the window.
+        :param model: Resolved model name.
+        :param outcome: ``ok``, ``throttled``, ``cancelled`` or ``error``
+            (``classify_outcome``); only ``ok`` and ``throttled`` move the window.
+        :param reserved_tokens: Tokens reserved at ``acquire``.
+        :param actual_tokens: Tokens reported by the provider, if known.
+        """
+        self._for_model(model).release(outcome, reserved_tokens, actual_tokens)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-model window, in-flight, queued and throttle counts.
+        """
+        return {model: limiter.stats() for model, limiter in self._models.items()}
+
+
+_shared_lock = threading.Lock()
+_shared: Optional[LLMRateLimiter] = None
+
+
+def shared_llm_limiter() -> Optional[LLMRateLimiter]:
+    """
+    Worker-wide limiter built from the environment on first use.
+    :returns: The shared limiter, or None when ``LLM_LIMITER`` is off.
+    """
+    global _shared
+    if os.environ.get("LLM_LIMITER", "1").strip().lower() in ("0", "false", "no", "off"):
+        return None
+    with _shared_lock:
+        if _shared is None:
+            try:
+                model_limits = json.loads(os.environ.get("LLM_MODEL_LIMITS") or "{}")
+            except json.JSONDecodeError as exc:
+                _logger.warning(f"Ignoring malformed LLM_MODEL_LIMITS: {exc}")
+                model_limits = {}
+            _shared = LLMRateLimiter(
+                rpm=float(os.environ.get("LLM_RPM", "0")),
+                tpm=float(os.environ.get("LLM_TPM", "0")),
+                initial_concurrency=int(os.environ.get("LLM_CONCURRENCY_INITIAL", "16")),
+                min_concurrency=int(os.environ.get("LLM_CONCURRENCY_MIN", "1")),
+                max_concurrency=int(os.environ.get("LLM_CONCURRENCY_MAX", "64")),
+                model_limits=model_limits if isinstance(model_limits, dict) else {},
+            )
+        return _shared
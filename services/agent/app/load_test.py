@@ -0,0 +1,196 @@
+"""
+Offline load test for the idea DAG engine.
+
+Runs N mandates through ``IdeaDagEngine.run`` concurrently against the
+simulated backends (``simulated_backends.py``): no provider, search API,
+network or Chroma is touched, so the numbers isolate the engine itself. This is
+the regression benchmark for engine-performance changes; compare reports from
+the same profile before and after a change.
+
+Reported: steps/sec, LLM calls and tokens, event-loop lag (how late a 50 ms
+ticker wakes up), CPU time and utilisation, peak RSS, and per-phase busy/await/CPU
+seconds summed over all runs (``runtime_profiler.py``; set
+``TELEMETRY_PROFILE_RATE`` to also list hot functions per run).
+
+Environment
+-----------
+LOAD_TEST_MANDATES      Number of mandates to run (default 8).
+LOAD_TEST_CONCURRENCY   Mandates in flight at once (default: all).
+LOAD_TEST_MAX_STEPS     Engine step cap per mandate (default 40).
+LOAD_TEST_OUTPUT        Optional path; the JSON report is also written there.
+SIM_PROFILE             Simulation profile: JSON text or a path to a JSON file.
+
+Run: ``python -m agent.app.load_test`` from ``services/``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from agent.app.agent_io import AgentIO
+from agent.app.connector_llm import ConnectorLLM
+from agent.app.idea_engine import IdeaDagEngine
+from agent.app.runtime_profiler import LoopLagMonitor, ProfilingOptions
+from agent.app.simulated_backends import FixtureHttp, SimulatedSearch, SimulationProfile
+from agent.app.telemetry import TelemetrySession
+from shared.connector_config import ConnectorConfig
+
+try:
+    import resource
+except ImportError:  # pragma: no cover — not available on Windows
+    resource = None
+
+_logger = logging.getLogger(__name__)
+
+
+def _peak_rss_mb() -> Optional[float]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def default_mandates(count: int) -> List[str]:
+    """
+    :param count: Number of mandates.
+    :returns: Distinct research mandates.
+    """
+    return [f"Research topic {i}: compare the main sources and summarize the key findings." for i in range(count)]
+
+
+async def _run_one(
+    mandate: str,
+    index: int,
+    config: ConnectorConfig,
+    profile: SimulationProfile,
+    settings: Optional[Dict[str, Any]],
+    max_steps: int,
+) -> Dict[str, Any]:
+    llm = ConnectorLLM(config)
+    profiling = ProfilingOptions.from_env()
+    profiling.phases = True
+    telemetry = TelemetrySession(
+        enabled=True, mandate=mandate, correlation_id=f"load_{index}", profiling=profiling,
+    )
+    io = AgentIO(
+        connector_llm=llm,
+        connector_search=SimulatedSearch(config, profile),
+        connector_http=FixtureHttp(config, profile),
+        connector_chroma=None,
+        telemetry=telemetry,
+        collection_name=f"load_{index}",
+    )
+    engine = IdeaDagEngine(io=io, settings=dict(settings or {}), model_name="simulated")
+    started = time.perf_counter()
+    try:
+        result = await engine.run(mandate, max_steps=max_steps)
+        error = None
+    except Exception as exc:  # noqa: BLE001 — one failed run is a data point, not a crash
+        _logger.warning(f"[LOAD_TEST] Mandate {index} failed: {exc}", exc_info=True)
+        result, error = {}, str(exc)
+    return {
+        "steps": int(result.get("steps") or 0),
+        "seconds": time.perf_counter() - started,
+        "llm_calls": len(telemetry.llm_usage),
+        "tokens": int(llm.total_usage["total_tokens"]),
+        "phases": telemetry.phase_summary(),
+        "error": error,
+    }
+
+
+def _merge_phases(runs: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    totals: Dict[str, Dict[str, Any]] = {}
+    for run in runs:
+        for name, stats in run["phases"].items():
+            entry = totals.setdefault(name, {"calls": 0, "wall_s": 0.0, "busy_s": 0.0, "await_s": 0.0, "cpu_s": 0.0, "max_slice_ms": 0.0})
+            for key in ("calls", "wall_s", "busy_s", "await_s", "cpu_s"):
+                entry[key] += stats[key]
+            entry["max_slice_ms"] = max(entry["max_slice_ms"], stats["max_slice_ms"])
+    return {name: {k: round(v, 4) if isinstance(v, float) else v for k, v in entry.items()} for name, entry in totals.items()}
+
+
+async def run_load_test(
+    mandates: List[str],
+    concurrency: Optional[int] = None,
+    max_steps: int = 40,
+    profile: Optional[SimulationProfile] = None,
+    settings: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run mandates concurrently against the simulated backends.
+    :param mandates: Mandates to run.
+    :param concurrency: Max mandates in flight (default: all).
+    :param max_steps: Engine step cap per mandate.
+    :param profile: Simulation profile (default: ``SIM_PROFILE``).
+    :param settings: Idea DAG setting overrides.
+    :returns: Report with throughput, loop lag, per-phase timings, CPU and RSS.
+    """
+    profile = profile or SimulationProfile.from_env()
+    config = ConnectorConfig()
+    config.llm_provider = "simulated"
+    config.sim_profile = profile
+    in_flight = max(1, concurrency or len(mandates) or 1)
+    gate = asyncio.Semaphore(in_flight)
+
+    async def bounded(index: int, mandate: str) -> Dict[str, Any]:
+        async with gate:
+            return await _run_one(mandate, index, config, profile, settings, max_steps)
+
+    monitor = LoopLagMonitor(stall_seconds=ProfilingOptions.from_env().stall_ms / 1000)
+    monitor.start()
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    try:
+        runs = await asyncio.gather(*[bounded(i, m) for i, m in enumerate(mandates)])
+    finally:
+        await monitor.stop()
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+    steps = sum(r["steps"] for r in runs)
+    return {
+        "mandates": len(mandates),
+        "concurrency": in_flight,
+        "failed": sum(1 for r in runs if r["error"]),
+        "wall_seconds": round(wall, 3),
+        "steps": steps,
+        "steps_per_second": round(steps / wall, 3) if wall > 0 else 0.0,
+        "mean_run_seconds": round(statistics.fmean(r["seconds"] for r in runs), 3) if runs else 0.0,
+        "llm_calls": sum(r["llm_calls"] for r in runs),
+        "tokens": sum(r["tokens"] for r in runs),
+        "event_loop_lag": monitor.summary(),
+        "phases": _merge_phases(runs),
+        "cpu_seconds": round(cpu, 3),
+        "cpu_utilisation": round(cpu / wall, 3) if wall > 0 else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "profile": profile.to_dict(),
+    }
+
+
+async def _main() -> None:
+    logging.basicConfig(level=os.environ.get("LOAD_TEST_LOG_LEVEL", "WARNING").upper())
+    count = int(os.environ.get("LOAD_TEST_MANDATES", "8"))
+    concurrency = int(os.environ.get("LOAD_TEST_CONCURRENCY", "0")) or None
+    max_steps = int(os.environ.get("LOAD_TEST_MAX_STEPS", "40"))
+    report = await run_load_test(default_mandates(count), concurrency=concurrency, max_steps=max_steps)
+    text = json.dumps(report, indent=2)
+    print(text)
+    output = os.environ.get("LOAD_TEST_OUTPUT", "").strip()
+    if output:
+        with open(output, "w", encoding="utf-8") as fh:
+            fh.write(text)
+
+
+def main() -> None:
+    asyncio.run(_main())
+
+
+if __name__ == "__main__":
+    main()
@@ -24,14 +24,17 @@ _logger = logging.getLogger(__name__)
 MODEL_PRICING: Dict[str, Dict[str, float]] = {
     "gpt-5.2": {
         "input_per_million": 1.75,
+        "cached_input_per_million": 0.175,
         "output_per_million": 14.00,
     },
     "gpt-5-mini": {
         "input_per_million": 0.25,
+        "cached_input_per_million": 0.025,
         "output_per_million": 2.00,
     },
     "gpt-5-nano": {
         "input_per_million": 0.05,
+        "cached_input_per_million": 0.005,
         "output_per_million": 0.40,
     },
 }
@@ -104,14 +107,21 @@ def _parse_openrouter_models(body: Dict[str, Any]) -> Dict[str, Dict[str, float]
         try:
             prompt = float(pricing.get("prompt") or 0.0) * 1_000_000.0
             completion = float(pricing.get("completion") or 0.0) * 1_000_000.0
+            cache_read = float(pricing.get("input_cache_read") or 0.0) * 1_000_000.0
+            cache_write = float(pricing.get("input_cache_write") or 0.0) * 1_000_000.0
         except (TypeError, ValueError):
             continue
         if prompt <= 0 and completion <= 0:
             continue
-        out[slug] = {
+        entry = {
             "input_per_million": round(prompt, 6),
             "output_per_million": round(completion, 6),
         }
+        if cache_read > 0:
+            entry["cached_input_per_million"] = round(cache_read, 6)
+        if cache_write > 0:
+            entry["cache_write_per_million"] = round(cache_write, 6)
+        out[slug] = entry
     return out
 
 
@@ -186,18 +196,35 @@ def estimate_cost(
     model: str,
     input_tokens: int = 0,
     output_tokens: int = 0,
+    cached_input_tokens: int = 0,
+    cache_write_tokens: int = 0,
 ) -> Optional[float]:
     """
     Estimate USD cost for a given model and token counts.
+
+    ``input_tokens`` is the full prompt (OpenAI convention); the cached and
+    cache-write parts of it are priced at ``cached_input_per_million`` /
+    ``cache_write_per_million`` when the model has those rates, else at the
+    input rate.
     :param model: Model name (e.g. "gpt-5-mini" or "openai/gpt-5-mini").
-    :param input_tokens: Number of input (prompt) tokens.
+    :param input_tokens: Number of input (prompt) tokens, cached ones included.
     :param output_tokens: Number of output (completion) tokens.
+    :param cached_input_tokens: Prompt tokens read from the provider's prompt cache.
+    :param cache_write_tokens: Prompt tokens written to the provider's prompt cache.
     :returns: Estimated cost in USD, or None if model pricing unknown.
     """
     pricing = _lookup_pricing(model)
     if pricing is None:
         return None
-    input_cost = (input_tokens / 1_000_000) * pricing["input_per_million"]
+    input_rate = pricing["input_per_million"]
+    cached_input_tokens = max(0, min(cached_input_tokens, input_tokens))
+    cache_write_tokens = max(0, min(cache_write_tokens, input_tokens - cached_input_tokens))
+    uncached = input_tokens - cached_input_tokens - cache_write_tokens
+    input_cost = (
+        uncached * input_rate
+        + cached_input_tokens * pricing.get("cached_input_per_million", input_rate)
+        + cache_write_tokens * pricing.get("cache_write_per_million", input_rate)
+    ) / 1_000_000
     output_cost = (output_tokens / 1_000_000) * pricing["output_per_million"]
     return round(input_cost + output_cost, 6)
 
@@ -1,6 +1,256 @@
+"""
+Page-content extraction for visited HTML.
+
+``parse_page`` builds ONE parse tree and walks it once, collecting links (with
+anchor text), the title and the first ``h1`` while deciding which subtrees are
+boilerplate; the boilerplate is then dropped and the main text taken from the
+narrowest content container. ``clean_operation`` is the text-only view.
+
+The tree builder is chosen at import time: ``lxml`` when it is installed
+(several times faster than the pure-Python parser), else ``html.parser``.
+``OBSERVATION_HTML_PARSER`` overrides the choice.
+"""
+import os
 import re
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+from bs4 import BeautifulSoup, Tag
+
+
+def _pick_parser() -> str:
+    requested = (os.environ.get("OBSERVATION_HTML_PARSER") or "").strip().lower()
+    if requested in ("html.parser", "lxml"):
+        return requested
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return "html.parser"
+    return "lxml"
+
+
+HTML_PARSER = _pick_parser()
+
+# ── Boilerplate selectors ─────────────────────────────────────────────
+_STRIP_TAGS = frozenset({
+    "script", "style", "noscript", "iframe", "svg",
+    "nav", "footer", "aside", "header",
+    "button", "input", "label", "select", "textarea", "form",
+    "img", "figure", "figcaption", "picture", "source", "video", "audio",
+})
+
+_STRIP_ROLES = frozenset({"navigation", "banner", "search", "complementary", "contentinfo"})
+
+# Every element carrying one of these ids is dropped, not only the first:
+# ids are not unique on real pages (templated sidebars, injected banners).
+_REMOVE_IDS = frozenset({
+    # Wikipedia (Vector 2022 + legacy)
+    "mw-navigation", "mw-head", "mw-panel", "mw-panel-toc",
+    "mw-sidebar-button", "mw-sidebar-checkbox",
+    "p-navigation", "p-search", "p-interaction", "p-tb", "p-lang",
+    "p-personal", "p-cactions", "p-views", "p-namespaces",
+    "footer", "catlinks", "siteSub", "jump-to-nav",
+    "contentSub", "contentSub2", "mw-head-base", "mw-page-base",
+    "toc", "vector-toc", "mw-toc",
+    "mw-fr-revisiontag", "mw-indicator-mw-helplink",
+    # Generic
+    "cookie-notice", "cookie-banner", "gdpr-banner",
+})
+
+# Also remove elements whose id starts with known prefixes
+_REMOVE_ID_PREFIX = re.compile(r"^(vector-|mw-sidebar|p-)")
+
+_REMOVE_CLASSES = frozenset({
+    # Wikipedia navigation / boilerplate
+    "sidebar", "navbox", "navbar", "navigation", "nav-links",
+    "mw-jump-link", "noprint", "mw-editsection",
+    "reference", "reflist", "refbegin", "mw-indicators",
+    "toc", "toccolours", "mw-body-header",
+    "vector-header", "vector-menu", "vector-column-start",
+    "vector-body-before-content", "vector-page-toolbar",
+    "mw-footer", "mw-portlet",
+    # Wikipedia language / interlanguage links
+    "interlanguage-links-list", "interlanguage-link",
+    # Wikipedia metadata / hidden elements
+    "shortdescription", "mw-empty-elt",
+    "mw-authority-control", "catlinks",
+    "sistersitebox",  # "Python Programming at Wikibooks" etc.
+    # Generic
+    "cookie-banner", "site-header", "site-footer",
+    "footer", "skip-link", "screen-reader-text",
+})
+
+# Main-content containers, narrowest first. For Wikipedia, .mw-parser-output
+# is the actual rendered wikitext.
+_MAIN_SLOTS = 9
+_MAIN_BY_CLASS = {"mw-parser-output": 0, "main-content": 7}
+_MAIN_BY_ID = {"mw-content-text": 2, "bodyContent": 3, "content": 4, "main-content": 6}
+_MAIN_BY_TAG = {"main": 1, "article": 5}
+_MAIN_ROLE_SLOT = 8
+
+# Remove common leftover navigation / UI phrases (line-level)
+_JUNK_LINE_PATTERNS = [
+    r"^Jump to content\s*$",
+    r"^Main menu\s*$",
+    r"^move to sidebar\s*$",
+    r"^hide\s*$",
+    r"^Toggle.*subsection\s*$",
+    r"^Toggle the table of contents\s*$",
+    r"^\d+ languages?\s*$",           # "117 languages"
+    r"^Edit links\s*$",
+    r"^From Wikipedia, the free encyclopedia\s*$",
+    r"^Article\s*$",
+    r"^Talk\s*$",
+    r"^Read\s*$",
+    r"^View (source|history)\s*$",
+    r"^Tools\s*$",
+    r"^Actions\s*$",
+    r"^General\s*$",
+    r"^Appearance\s*$",
+    r"^Donate\s*$",
+    r"^Create account\s*$",
+    r"^Log in\s*$",
+    r"^Personal tools\s*$",
+    r"^Contents\s*$",
+    r"^Search\s*$",
+    r"^Navigation\s*$",
+    r"^Contribute\s*$",
+    r"^Print/export\s*$",
+    r"^In other projects\s*$",
+    r"^What links here\s*$",
+    r"^Related changes\s*$",
+    r"^Upload file\s*$",
+    r"^Permanent link\s*$",
+    r"^Page information\s*$",
+    r"^Cite this page\s*$",
+    r"^Get shortened URL\s*$",
+    r"^Download QR code\s*$",
+    r"^Download as PDF\s*$",
+    r"^Printable version\s*$",
+    r"^Special pages\s*$",
+    r"^Current events\s*$",
+    r"^Random article\s*$",
+    r"^About Wikipedia\s*$",
+    r"^Contact us\s*$",
+    r"^Help\s*$",
+    r"^Learn to edit\s*$",
+    r"^Community portal\s*$",
+    r"^Recent changes\s*$",
+    r"^Main page\s*$",
+]
+
+_JUNK_LINES = re.compile("|".join(_JUNK_LINE_PATTERNS), flags=re.MULTILINE)
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+
+@dataclass
+class ParsedPage:
+    """
+    Everything the visit path needs from one page.
+
+    :param main_text: Cleaned main-content text (what ``clean_operation`` returns).
+    :param links: ``(href, anchor_text)`` for every ``<a href>``, document order.
+    :param title: ``<title>`` text.
+    :param h1: First ``<h1>`` text.
+    :param full_text: Whole-document text; only filled when ``main_text`` is empty.
+    """
+
+    main_text: str
+    links: List[Tuple[str, str]] = field(default_factory=list)
+    title: str = ""
+    h1: str = ""
+    full_text: str = ""
+
 
-from bs4 import BeautifulSoup
+def _is_boilerplate(tag: Tag) -> bool:
+    if tag.name in _STRIP_TAGS:
+        return True
+    attrs = tag.attrs
+    if attrs.get("role") in _STRIP_ROLES:
+        return True
+    elem_id = attrs.get("id")
+    if elem_id and (elem_id in _REMOVE_IDS or _REMOVE_ID_PREFIX.match(elem_id)):
+        return True
+    classes = attrs.get("class")
+    return bool(classes) and not _REMOVE_CLASSES.isdisjoint(classes)
+
+
+def _main_slot(tag: Tag) -> int:
+    """Priority of ``tag`` as a main-content container (lower wins), or -1."""
+    best = _MAIN_BY_TAG.get(tag.name, -1)
+    attrs = tag.attrs
+    elem_id = attrs.get("id")
+    if elem_id in _MAIN_BY_ID:
+        slot = _MAIN_BY_ID[elem_id]
+        best = slot if best < 0 else min(best, slot)
+    for cls in attrs.get("class") or ():
+        slot = _MAIN_BY_CLASS.get(cls, -1)
+        if slot >= 0:
+            best = slot if best < 0 else min(best, slot)
+    if attrs.get("role") == "main" and best < 0:
+        best = _MAIN_ROLE_SLOT
+    return best
+
+
+def parse_page(html: str) -> ParsedPage:
+    """
+    Parse ``html`` once and extract main text, links, title and h1.
+
+    :param html: Raw page HTML.
+    :returns: ParsedPage.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    links: List[Tuple[str, str]] = []
+    title = ""
+    h1 = ""
+    seen_title = seen_h1 = False
+    boilerplate: List[Tag] = []
+    main: List = [None] * _MAIN_SLOTS
+
+    # Pre-order walk; ``dropped`` marks subtrees under a boilerplate element.
+    # Links/title/h1 are collected from the whole document, main-content
+    # candidates only from what survives the boilerplate strip.
+    stack: List[Tuple[Tag, bool]] = [(child, False) for child in reversed(soup.contents) if isinstance(child, Tag)]
+    while stack:
+        tag, dropped = stack.pop()
+        name = tag.name
+        if name == "a":
+            href = tag.get("href")
+            if href:
+                links.append((href, tag.get_text(strip=True)))
+        elif name == "title" and not seen_title:
+            seen_title = True
+            title = tag.get_text(strip=True)
+        elif name == "h1" and not seen_h1:
+            seen_h1 = True
+            h1 = tag.get_text(separator=" ", strip=True)
+
+        if not dropped:
+            if _is_boilerplate(tag):
+                boilerplate.append(tag)
+                dropped = True
+            else:
+                slot = _main_slot(tag)
+                if slot >= 0 and main[slot] is None:
+                    main[slot] = tag
+        stack.extend((child, dropped) for child in reversed(tag.contents) if isinstance(child, Tag))
+
+    for tag in boilerplate:
+        tag.decompose()
+
+    target = next((tag for tag in main if tag is not None), soup)
+    main_text = target.get_text(separator="\n", strip=True)
+    main_text = _BLANK_RUNS.sub("\n\n", main_text)
+    main_text = _JUNK_LINES.sub("", main_text)
+    # Collapse any blank lines created by removals
+    main_text = _BLANK_RUNS.sub("\n\n", main_text).strip()
+
+    full_text = ""
+    if not main_text:
+        # Rare (nothing left after the strip): the tree is already pruned, so
+        # re-parse for the whole-document fallback text.
+        full_text = BeautifulSoup(html, HTML_PARSER).get_text(separator="\n", strip=True)
+    return ParsedPage(main_text=main_text, links=links, title=title, h1=h1, full_text=full_text)
 
 
 def clean_operation(html: str) -> str:
@@ -14,152 +264,4 @@ def clean_operation(html: str) -> str:
     toggles, table of contents, edit sections, reference lists) and generic
     site chrome (cookie banners, headers, footers).
     """
-    soup = BeautifulSoup(html, "html.parser")
-
-    # ── Phase 1: remove non-content tags ──────────────────────────────
-    _STRIP_TAGS = [
-        "script", "style", "noscript", "iframe", "svg",
-        "nav", "footer", "aside", "header",
-        "button", "input", "label", "select", "textarea", "form",
-        "img", "figure", "figcaption", "picture", "source", "video", "audio",
-    ]
-    for tag_name in _STRIP_TAGS:
-        for tag in soup.find_all(tag_name):
-            tag.decompose()
-
-    # ── Phase 2: remove by ARIA role ──────────────────────────────────
-    for role in ("navigation", "banner", "search", "complementary", "contentinfo"):
-        for tag in soup.find_all(attrs={"role": role}):
-            tag.decompose()
-
-    # ── Phase 3: remove by element ID ─────────────────────────────────
-    _REMOVE_IDS = {
-        # Wikipedia (Vector 2022 + legacy)
-        "mw-navigation", "mw-head", "mw-panel", "mw-panel-toc",
-        "mw-sidebar-button", "mw-sidebar-checkbox",
-        "p-navigation", "p-search", "p-interaction", "p-tb", "p-lang",
-        "p-personal", "p-cactions", "p-views", "p-namespaces",
-        "footer", "catlinks", "siteSub", "jump-to-nav",
-        "contentSub", "contentSub2", "mw-head-base", "mw-page-base",
-        "toc", "vector-toc", "mw-toc",
-        "mw-fr-revisiontag", "mw-indicator-mw-helplink",
-        # Generic
-        "cookie-notice", "cookie-banner", "gdpr-banner",
-    }
-    for elem_id in _REMOVE_IDS:
-        tag = soup.find(id=elem_id)
-        if tag:
-            tag.decompose()
-
-    # Also remove elements whose id starts with known prefixes
-    for tag in soup.find_all(id=re.compile(r"^(vector-|mw-sidebar|p-)")):
-        tag.decompose()
-
-    # ── Phase 4: remove by CSS class ──────────────────────────────────
-    _REMOVE_CLASSES = {
-        # Wikipedia navigation / boilerplate
-        "sidebar", "navbox", "navbar", "navigation", "nav-links",
-        "mw-jump-link", "noprint", "mw-editsection",
-        "reference", "reflist", "refbegin", "mw-indicators",
-        "toc", "toccolours", "mw-body-header",
-        "vector-header", "vector-menu", "vector-column-start",
-        "vector-body-before-content", "vector-page-toolbar",
-        "mw-footer", "mw-portlet",
-        # Wikipedia language / interlanguage links
-        "interlanguage-links-list", "interlanguage-link",
-        # Wikipedia metadata / hidden elements
-        "shortdescription", "mw-empty-elt",
-        "mw-authority-control", "catlinks",
-        "sistersitebox",  # "Python Programming at Wikibooks" etc.
-        # Generic
-        "cookie-banner", "site-header", "site-footer",
-        "footer", "skip-link", "screen-reader-text",
-    }
-    for cls in _REMOVE_CLASSES:
-        for tag in soup.find_all(class_=cls):
-            tag.decompose()
-
-    # ── Phase 5: find the main content area ───────────────────────────
-    # For Wikipedia, prefer the narrowest container: .mw-parser-output
-    main_content = None
-
-    # Wikipedia: parser output is the actual rendered wikitext
-    mw_parser = soup.find(class_="mw-parser-output")
-    if mw_parser:
-        main_content = mw_parser
-    else:
-        main_content = (
-            soup.find("main")
-            or soup.find(id="mw-content-text")
-            or soup.find(id="bodyContent")
-            or soup.find(id="content")
-            or soup.find("article")
-            or soup.find(id="main-content")
-            or soup.find(class_="main-content")
-            or soup.find(role="main")
-        )
-
-    target = main_content if main_content else soup
-
-    # ── Phase 6: extract and clean text ───────────────────────────────
-    main_text = target.get_text(separator="\n", strip=True)
-
-    # Collapse runs of blank lines to at most one
-    main_text = re.sub(r"\n{3,}", "\n\n", main_text)
-
-    # Remove common leftover navigation / UI phrases (line-level)
-    _JUNK_LINE_PATTERNS = [
-        r"^Jump to content\s*$",
-        r"^Main menu\s*$",
-        r"^move to sidebar\s*$",
-        r"^hide\s*$",
-        r"^Toggle.*subsection\s*$",
-        r"^Toggle the table of contents\s*$",
-        r"^\d+ languages?\s*$",           # "117 languages"
-        r"^Edit links\s*$",
-        r"^From Wikipedia, the free encyclopedia\s*$",
-        r"^Article\s*$",
-        r"^Talk\s*$",
-        r"^Read\s*$",
-        r"^View (source|history)\s*$",
-        r"^Tools\s*$",
-        r"^Actions\s*$",
-        r"^General\s*$",
-        r"^Appearance\s*$",
-        r"^Donate\s*$",
-        r"^Create account\s*$",
-        r"^Log in\s*$",
-        r"^Personal tools\s*$",
-        r"^Contents\s*$",
-        r"^Search\s*$",
-        r"^Navigation\s*$",
-        r"^Contribute\s*$",
-        r"^Print/export\s*$",
-        r"^In other projects\s*$",
-        r"^What links here\s*$",
-        r"^Related changes\s*$",
-        r"^Upload file\s*$",
-        r"^Permanent link\s*$",
-        r"^Page information\s*$",
-        r"^Cite this page\s*$",
-        r"^Get shortened URL\s*$",
-        r"^Download QR code\s*$",
-        r"^Download as PDF\s*$",
-        r"^Printable version\s*$",
-        r"^Special pages\s*$",
-        r"^Current events\s*$",
-        r"^Random article\s*$",
-        r"^About Wikipedia\s*$",
-        r"^Contact us\s*$",
-        r"^Help\s*$",
-        r"^Learn to edit\s*$",
-        r"^Community portal\s*$",
-        r"^Recent changes\s*$",
-        r"^Main page\s*$",
-    ]
-    combined_junk = "|".join(_JUNK_LINE_PATTERNS)
-    main_text = re.sub(combined_junk, "", main_text, flags=re.MULTILINE)
-
-    # Collapse any blank lines created by removals
-    main_text = re.sub(r"\n{3,}", "\n\n", main_text)
-    return main_text.strip()
+    return parse_page(html).main_text
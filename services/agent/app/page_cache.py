@@ -0,0 +1,579 @@
+"""
+Content-addressed page cache shared by every task on a worker.
+
+Sibling branches of one DAG, and separate tasks on the same worker, keep
+visiting the same Wikipedia and docs pages. ``AgentIO.visit`` / ``fetch_url``
+consult this cache before ``ConnectorHttp.request`` and
+``ConnectorBrowser.fetch_page``; a fresh hit skips the network, and the parsed
+``ParsedPage`` stored next to the body lets the visit path skip parsing too.
+
+Layout: normalized URL -> entry (digest, status, ETag/Last-Modified, stored_at),
+and sha256 digest -> body (+ parsed page). Identical bodies served under
+different URLs (redirect aliases, mobile/desktop) share one copy and one parse.
+
+- TTL: entries younger than ``ttl_seconds`` (capped by ``Cache-Control:
+  max-age``; zero for ``no-cache``) are served without a request. Older
+  entries with validators are revalidated with ``If-None-Match`` /
+  ``If-Modified-Since``; a 304 refreshes them in place. Older entries without
+  validators are refetched.
+- ``no-store`` / ``private`` responses are never stored, and JSON API
+  responses only when the server marks them cacheable: the cache is shared
+  across tasks.
+- Budget: bodies are kept in an LRU bounded by ``max_bytes`` (characters of
+  body + parsed text).
+- Spill: with ``spill_dir`` set, evicted bodies are written to disk and loaded
+  back on the next hit instead of being dropped. The directory is bounded by
+  ``max_spill_bytes`` (oldest files go first, with their URLs). Disk reads
+  and writes run in a worker thread, never under the lock on the event loop;
+  an evicted body stays in memory until its file is written.
+
+Configured from the environment by ``shared_page_cache`` (``PAGE_CACHE_*``),
+which ``InterfaceAgent`` hands to every task's ``AgentIO``. Disabled while
+``web_fixtures`` record/replay is active so benchmark evidence stays
+byte-for-byte what the fixtures hold.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from agent.app import web_fixtures
+from agent.app.observation import ParsedPage
+
+_logger = logging.getLogger(__name__)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical cache key for a URL: lowercase scheme/host, default port and
+    fragment dropped, query params sorted, empty path -> ``/``.
+    :param url: Raw URL.
+    :returns: Normalized URL.
+    """
+    parts = urlsplit(str(url).strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    netloc = host if port is None or _DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, netloc, parts.path or "/", query, ""))
+
+
+def cache_directives(cache_control: Optional[str]) -> Dict[str, Optional[str]]:
+    """
+    Parse a ``Cache-Control`` header.
+    :param cache_control: Header value, or None.
+    :returns: Lowercased directive -> argument (None for bare directives).
+    """
+    directives: Dict[str, Optional[str]] = {}
+    for part in (cache_control or "").split(","):
+        name, _, value = part.partition("=")
+        name = name.strip().lower()
+        if name:
+            directives[name] = value.strip().strip('"') or None
+    return directives
+
+
+def _digest(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _parsed_size(page: ParsedPage) -> int:
+    return (
+        len(page.main_text) + len(page.full_text) + len(page.title) + len(page.h1)
+        + sum(len(href) + len(text) for href, text in page.links)
+    )
+
+
+@dataclass
+class CachedPage:
+    """
+    A cache lookup result.
+
+    :param url: Normalized URL.
+    :param body: Page body (HTML, or JSON text for JSON responses).
+    :param status: HTTP status of the response that filled the entry.
+    :param etag: ``ETag`` validator, if the server sent one.
+    :param last_modified: ``Last-Modified`` validator, if the server sent one.
+    :param fresh: True when younger than the TTL (serve without a request).
+    """
+
+    url: str
+    body: str
+    status: Optional[int]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fresh: bool
+
+    def validator_headers(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers: Dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+@dataclass
+class _UrlEntry:
+    digest: str
+    status: Optional[int]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    ttl: float
+
+
+@dataclass
+class _Blob:
+    body: str
+    parsed: Optional[ParsedPage] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + (_parsed_size(self.parsed) if self.parsed is not None else 0)
+
+
+class PageCache:
+    """
+    URL-indexed, content-addressed page cache with TTL, byte budget and spill.
+
+    :param ttl_seconds: Age below which an entry is served without a request.
+    :param max_bytes: Budget for in-memory bodies + parsed text (characters).
+    :param max_entries: Cap on the URL index (oldest entries dropped first).
+    :param spill_dir: Directory for evicted bodies; None keeps memory only.
+    :param max_spill_bytes: Budget for the spill files (bytes on disk).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600.0,
+        max_bytes: int = 64_000_000,
+        max_entries: int = 10_000,
+        spill_dir: Optional[Path] = None,
+        max_spill_bytes: int = 512_000_000,
+    ) -> None:
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_bytes = int(max_bytes)
+        self.max_entries = int(max_entries)
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.max_spill_bytes = int(max_spill_bytes)
+        self._lock = threading.Lock()
+        self._urls: "OrderedDict[str, _UrlEntry]" = OrderedDict()
+        self._blobs: "OrderedDict[str, _Blob]" = OrderedDict()
+        self._refs: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        # Spill bookkeeping: evicted blobs waiting for their file, files on
+        # disk (digest -> size, oldest first) and files to delete.
+        self._pending_spills: Dict[str, _Blob] = {}
+        self._spilled: "OrderedDict[str, int]" = OrderedDict()
+        self._spill_bytes = 0
+        self._pending_unlinks: Set[str] = set()
+        # Files left by an earlier process are unreachable (the index lives in memory).
+        self._swept = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._hits = 0
+        self._misses = 0
+        self._revalidations = 0
+        self._parse_hits = 0
+
+    async def lookup(self, url: str) -> Optional[CachedPage]:
+        """
+        Cached page for ``url``, fresh or stale-but-revalidatable.
+        :param url: Page URL (normalized here).
+        :returns: CachedPage, or None on a miss.
+        """
+        try:
+            return await self._lookup(normalize_url(url))
+        finally:
+            # Drops and reloads above may have queued spill files to delete or write.
+            self._schedule_flush()
+
+    async def _lookup(self, key: str) -> Optional[CachedPage]:
+        with self._lock:
+            entry = self._urls.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            fresh = time.monotonic() - entry.stored_at < entry.ttl
+            if not fresh and not (entry.etag or entry.last_modified):
+                self._drop_url(key)
+                self._misses += 1
+                return None
+            blob = self._resident_blob(entry.digest)
+            if blob is None and entry.digest not in self._spilled:
+                self._drop_url(key)
+                self._misses += 1
+                return None
+        if blob is None:
+            blob = await asyncio.to_thread(self._read_spill, entry.digest)
+            with self._lock:
+                if self._urls.get(key) is not entry:
+                    blob = None
+                elif blob is None:
+                    self._drop_url(key)
+                else:
+                    blob = self._resident_blob(entry.digest) or self._add_loaded(entry.digest, blob)
+                if blob is None:
+                    self._misses += 1
+                    return None
+        with self._lock:
+            if key in self._urls:
+                self._urls.move_to_end(key)
+            if fresh:
+                self._hits += 1
+        return CachedPage(
+            url=key,
+            body=blob.body,
+            status=entry.status,
+            etag=entry.etag,
+            last_modified=entry.last_modified,
+            fresh=fresh,
+        )
+
+    def store(
+        self,
+        url: str,
+        body: str,
+        status: Optional[int] = 200,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        cache_control: Optional[str] = None,
+        api_response: bool = False,
+    ) -> bool:
+        """
+        Cache a fetched body under ``url``.
+        :param url: Page URL (normalized here).
+        :param body: Page body text.
+        :param status: HTTP status.
+        :param etag: ``ETag`` response header.
+        :param last_modified: ``Last-Modified`` response header.
+        :param cache_control: ``Cache-Control`` response header. ``no-store`` and
+            ``private`` responses are not kept and drop any earlier copy;
+            ``max-age`` caps the TTL and ``no-cache`` revalidates on every use.
+        :param api_response: JSON/API response; kept only with validators,
+            ``max-age`` or ``public``.
+        :returns: True when the body was cached.
+        """
+        key = normalize_url(url)
+        directives = cache_directives(cache_control)
+        ttl = self._entry_ttl(directives)
+        storable = not ({"no-store", "private"} & directives.keys())
+        if api_response and not (etag or last_modified or "max-age" in directives or "public" in directives):
+            storable = False
+        if ttl <= 0 and not (etag or last_modified):
+            # Could never be served: stale on arrival and nothing to revalidate with.
+            storable = False
+        digest = _digest(body) if storable else ""
+        with self._lock:
+            previous = self._urls.get(key)
+            if previous is not None and previous.digest != digest:
+                self._drop_url(key)
+            if storable:
+                if self._resident_blob(digest) is None:
+                    self._add_blob(digest, _Blob(body=body))
+                self._urls.pop(key, None)
+                self._urls[key] = _UrlEntry(
+                    digest=digest, status=status, etag=etag, last_modified=last_modified,
+                    stored_at=time.monotonic(), ttl=ttl,
+                )
+                self._refs.setdefault(digest, set()).add(key)
+                while len(self._urls) > self.max_entries:
+                    self._drop_url(next(iter(self._urls)))
+                self._evict()
+        self._schedule_flush()
+        return storable
+
+    def revalidated(self, url: str) -> None:
+        """
+        Mark ``url`` fresh again after a 304 Not Modified.
+        :param url: Page URL (normalized here).
+        """
+        key = normalize_url(url)
+        with self._lock:
+            entry = self._urls.get(key)
+            if entry is not None:
+                entry.stored_at = time.monotonic()
+                self._urls.move_to_end(key)
+                self._revalidations += 1
+
+    def parsed(self, body: str, url: Optional[str] = None) -> Optional[ParsedPage]:
+        """
+        Parsed page stored for ``body``.
+        :param body: Page body.
+        :param url: URL the body was fetched from; lets a cached body be
+            matched by identity instead of hashing it again.
+        :returns: ParsedPage, or None if not parsed yet / not cached.
+        """
+        with self._lock:
+            digest = self._digest_for(body, url)
+            blob = self._blobs.get(digest) or self._pending_spills.get(digest)
+            if blob is None or blob.parsed is None:
+                return None
+            self._parse_hits += 1
+            return blob.parsed
+
+    def store_parsed(self, body: str, page: ParsedPage, url: Optional[str] = None) -> None:
+        """
+        Attach a parse result to a cached body (no-op when the body isn't cached).
+        :param body: Page body that was parsed.
+        :param page: Parse result.
+        :param url: URL the body was fetched from (see ``parsed``).
+        """
+        with self._lock:
+            digest = self._digest_for(body, url)
+            blob = self._blobs.get(digest)
+            if blob is None or blob.parsed is not None:
+                return
+            self._bytes -= blob.size
+            blob.parsed = page
+            self._bytes += blob.size
+            self._evict()
+        self._schedule_flush()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Cache counters.
+        :returns: Dict with hits, misses, revalidations, parse_hits, entries, blobs,
+            bytes, spilled and spill_bytes.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "revalidations": self._revalidations,
+                "parse_hits": self._parse_hits,
+                "entries": len(self._urls),
+                "blobs": len(self._blobs),
+                "bytes": self._bytes,
+                "spilled": len(self._spilled),
+                "spill_bytes": self._spill_bytes,
+            }
+
+    async def flush(self) -> None:
+        """
+        Write pending spill files and delete dropped ones, in a worker thread.
+        Runs on its own after every change; await it to wait for the disk.
+        """
+        while True:
+            work = self._take_disk_work()
+            if work is None:
+                return
+            written = await asyncio.to_thread(self._write_spills, *work)
+            self._finish_disk_work(work[0], written)
+
+    def _digest_for(self, body: str, url: Optional[str]) -> str:
+        if url is not None:
+            entry = self._urls.get(normalize_url(url))
+            if entry is not None:
+                blob = self._blobs.get(entry.digest)
+                if blob is not None and blob.body is body:
+                    return entry.digest
+        return _digest(body)
+
+    def _entry_ttl(self, directives: Dict[str, Optional[str]]) -> float:
+        if "no-cache" in directives:
+            return 0.0
+        try:
+            return min(self.ttl_seconds, float(directives.get("max-age") or "inf"))
+        except ValueError:
+            return self.ttl_seconds
+
+    def _add_blob(self, digest: str, blob: _Blob) -> None:
+        self._blobs[digest] = blob
+        self._bytes += blob.size
+
+    def _resident_blob(self, digest: str) -> Optional[_Blob]:
+        """In-memory blob (LRU or waiting to be spilled), marked most recently used."""
+        blob = self._blobs.get(digest)
+        if blob is not None:
+            self._blobs.move_to_end(digest)
+            return blob
+        blob = self._pending_spills.pop(digest, None)
+        if blob is not None:
+            self._add_loaded(digest, blob)
+        return blob
+
+    def _add_loaded(self, digest: str, blob: _Blob) -> _Blob:
+        self._add_blob(digest, blob)
+        self._evict(keep=digest)
+        return blob
+
+    def _read_spill(self, digest: str) -> Optional[_Blob]:
+        # Worker thread: touches the disk only, never the cache state.
+        path = self.spill_dir / f"{digest}.json"
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        parsed = payload.get("parsed")
+        if parsed is not None:
+            parsed["links"] = [tuple(link) for link in parsed.get("links") or []]
+            parsed = ParsedPage(**parsed)
+        return _Blob(body=payload.get("body") or "", parsed=parsed)
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        while self._bytes > self.max_bytes and self._blobs:
+            digest = next(iter(self._blobs))
+            if digest == keep:
+                if len(self._blobs) == 1:
+                    break
+                self._blobs.move_to_end(digest)
+                continue
+            blob = self._blobs.pop(digest)
+            self._bytes -= blob.size
+            if self.spill_dir is not None:
+                self._pending_spills[digest] = blob
+            else:
+                self._drop_refs(digest)
+
+    def _drop_refs(self, digest: str) -> None:
+        for key in list(self._refs.get(digest, ())):
+            self._drop_url(key)
+
+    def _schedule_flush(self) -> None:
+        with self._lock:
+            if not (self._pending_spills or self._pending_unlinks):
+                return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to block: do the disk work inline.
+            while (work := self._take_disk_work()) is not None:
+                self._finish_disk_work(work[0], self._write_spills(*work))
+            return
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self.flush())
+
+    def _take_disk_work(self) -> Optional[Tuple[Dict[str, _Blob], Set[str], bool]]:
+        with self._lock:
+            spills = dict(self._pending_spills)
+            unlinks = set(self._pending_unlinks)
+            self._pending_unlinks.clear()
+            sweep = not self._swept and bool(spills)
+            self._swept = self._swept or sweep
+        if not (spills or unlinks):
+            return None
+        return spills, unlinks, sweep
+
+    def _write_spills(
+        self, spills: Dict[str, _Blob], unlinks: Iterable[str], sweep: bool,
+    ) -> Dict[str, Optional[int]]:
+        """
+        Worker thread: delete then write spill files.
+        :returns: Digest -> bytes written, or None when the write failed.
+        """
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        stale = set(unlinks)
+        if sweep:
+            stale.update(path.stem for path in self.spill_dir.glob("*.json") if path.stem not in spills)
+        for digest in stale:
+            try:
+                (self.spill_dir / f"{digest}.json").unlink(missing_ok=True)
+            except OSError:
+                pass
+        written: Dict[str, Optional[int]] = {}
+        for digest, blob in spills.items():
+            payload = {"body": blob.body, "parsed": asdict(blob.parsed) if blob.parsed is not None else None}
+            try:
+                data = json.dumps(payload).encode("utf-8", "surrogatepass")
+                (self.spill_dir / f"{digest}.json").write_bytes(data)
+                written[digest] = len(data)
+            except (OSError, TypeError, ValueError) as exc:
+                _logger.debug(f"Page cache spill failed for {digest[:12]}: {exc}")
+                written[digest] = None
+        return written
+
+    def _finish_disk_work(self, spills: Dict[str, _Blob], written: Dict[str, Optional[int]]) -> None:
+        with self._lock:
+            for digest, size in written.items():
+                still_pending = self._pending_spills.get(digest) is spills[digest]
+                if still_pending:
+                    del self._pending_spills[digest]
+                if size is None:
+                    if still_pending:
+                        self._drop_refs(digest)
+                    continue
+                if digest not in self._refs:
+                    # Dropped while the file was being written.
+                    self._pending_unlinks.add(digest)
+                    continue
+                self._spill_bytes += size - self._spilled.pop(digest, 0)
+                self._spilled[digest] = size
+            while self._spill_bytes > self.max_spill_bytes and self._spilled:
+                digest = next(iter(self._spilled))
+                if digest not in self._blobs:
+                    # Disk held the only copy; a body also in memory just loses its file.
+                    self._drop_refs(digest)
+                self._forget_spill(digest)
+
+    def _forget_spill(self, digest: str) -> None:
+        size = self._spilled.pop(digest, None)
+        if size is not None:
+            self._spill_bytes -= size
+            self._pending_unlinks.add(digest)
+
+    def _drop_url(self, key: str) -> None:
+        entry = self._urls.pop(key, None)
+        if entry is None:
+            return
+        refs = self._refs.get(entry.digest)
+        if refs is not None:
+            refs.discard(key)
+            if refs:
+                return
+            del self._refs[entry.digest]
+        blob = self._blobs.pop(entry.digest, None)
+        if blob is not None:
+            self._bytes -= blob.size
+        self._pending_spills.pop(entry.digest, None)
+        self._forget_spill(entry.digest)
+
+
+_shared_lock = threading.Lock()
+_shared: Optional[PageCache] = None
+
+
+def shared_page_cache() -> Optional[PageCache]:
+    """
+    Worker-wide page cache built from the environment on first use.
+
+    ``PAGE_CACHE_ENABLED`` (default on), ``PAGE_CACHE_TTL_SECONDS`` (3600),
+    ``PAGE_CACHE_MAX_BYTES`` (64000000), ``PAGE_CACHE_MAX_ENTRIES`` (10000),
+    ``PAGE_CACHE_SPILL_DIR`` (unset = no spill), ``PAGE_CACHE_SPILL_MAX_BYTES``
+    (512000000).
+
+    :returns: The shared cache, or None when disabled or fixtures are active.
+    """
+    global _shared
+    if os.environ.get("PAGE_CACHE_ENABLED", "1").strip().lower() not in ("1", "true", "yes", "on"):
+        return None
+    if web_fixtures.fixture_mode() != "off":
+        return None
+    with _shared_lock:
+        if _shared is None:
+            spill_dir = os.environ.get("PAGE_CACHE_SPILL_DIR", "").strip()
+            _shared = PageCache(
+                ttl_seconds=float(os.environ.get("PAGE_CACHE_TTL_SECONDS", "3600")),
+                max_bytes=int(os.environ.get("PAGE_CACHE_MAX_BYTES", "64000000")),
+                max_entries=int(os.environ.get("PAGE_CACHE_MAX_ENTRIES", "10000")),
+                spill_dir=Path(spill_dir) if spill_dir else None,
+                max_spill_bytes=int(os.environ.get("PAGE_CACHE_SPILL_MAX_BYTES", "512000000")),
+            )
+        return _shared
@@ -0,0 +1,105 @@
+"""
+Process pool for CPU-bound page parsing.
+
+``observation.parse_page`` is pure Python, so in the default thread executor
+large pages still serialize on the GIL and stall the event loop's fetch and
+LLM coroutines while ``parallel_action_limit`` visits land at once. Pages at or
+above a size cutover are parsed in worker processes instead: raw HTML goes in,
+a compact ``ParsedPage`` (text + links) comes back.
+
+One pool is shared per process and sized on first use. Workers are spawned
+(not forked; the parent runs an event loop and threads) and warmed at
+creation so the first large page does not pay interpreter + bs4 start-up.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from agent.app.observation import ParsedPage, parse_page
+
+_logger = logging.getLogger(__name__)
+
+_WARMUP_HTML = "<html><head><title>w</title></head><body><main><p>w</p><a href='/w'>w</a></main></body></html>"
+
+_lock = threading.Lock()
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def _warm_worker() -> None:
+    """Worker initializer: import and exercise the parser once."""
+    parse_page(_WARMUP_HTML)
+
+
+def _noop() -> None:
+    return None
+
+
+def get_parse_executor(workers: int) -> Optional[ProcessPoolExecutor]:
+    """
+    Shared parse pool, created (and warmed) on first call.
+
+    :param workers: Max worker processes; ``<= 0`` disables the pool.
+    :returns: The executor, or None when disabled or it could not start.
+    """
+    global _executor
+    if workers <= 0:
+        return None
+    with _lock:
+        if _executor is not None:
+            return _executor
+        try:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_warm_worker,
+            )
+            # Workers start on demand; one task per slot starts all of them now.
+            for _ in range(workers):
+                executor.submit(_noop)
+        except (OSError, ValueError) as exc:
+            _logger.warning(f"Parse process pool unavailable, parsing in threads: {exc}")
+            return None
+        _executor = executor
+        return _executor
+
+
+def shutdown_parse_executor() -> None:
+    """Stop the shared pool (next ``get_parse_executor`` starts a fresh one)."""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+atexit.register(shutdown_parse_executor)
+
+
+async def parse_page_offloaded(html: str, workers: int, min_bytes: int) -> Optional[ParsedPage]:
+    """
+    Parse ``html`` in the process pool when it is large enough to be worth it.
+
+    :param html: Raw page HTML.
+    :param workers: Pool size (``<= 0`` disables the pool).
+    :param min_bytes: Cutover; smaller pages return None and stay in-process.
+    :returns: ParsedPage, or None when the caller should parse in-process.
+    """
+    if len(html) < min_bytes:
+        return None
+    executor = get_parse_executor(workers)
+    if executor is None:
+        return None
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, parse_page, html)
+    except BrokenProcessPool as exc:
+        # A worker died (OOM, signal); drop the pool so the next call rebuilds it.
+        _logger.warning(f"Parse process pool broken, falling back to in-process parse: {exc}")
+        shutdown_parse_executor()
+        return None
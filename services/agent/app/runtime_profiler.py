@@ -0,0 +1,350 @@
+"""
+Event-loop lag and per-phase CPU profiling for one engine run.
+
+``TelemetrySession.record_timing`` gives wall time per connector call, which
+cannot tell a slow provider from a starved event loop. This module measures the
+loop itself:
+
+- ``LoopLagMonitor``: a ticker that records how late each periodic sleep wakes
+  up. Lag above ``stall_ms`` means some synchronous work held the loop.
+- ``PhaseProfiler``: wraps engine phases (expand, evaluate, select, execute,
+  merge, checkpoint). For each phase it splits wall time into *busy* time and
+  *await* time. Busy time is the synchronous slices run between suspensions,
+  which block every other task on the loop. Await time is spent suspended on
+  I/O or timers. It also keeps the CPU time and the longest slice. A slice
+  longer than ``stall_ms`` is reported as a ``loop_stall`` telemetry event
+  naming the phase.
+- A sampled fraction (``profile_rate``) of phase runs is also profiled with
+  ``cProfile`` while its slices run. The summary lists the hottest functions
+  per phase.
+
+Everything is off by default. ``TelemetrySession`` reads these settings from
+the environment when it is created, so each run can be toggled without code
+changes:
+
+- ``TELEMETRY_LOOP_LAG``: ``on`` to sample loop lag (``off``).
+- ``TELEMETRY_LOOP_LAG_INTERVAL_MS``: sampler period (50).
+- ``TELEMETRY_STALL_MS``: lag or slice length reported as a stall (100).
+- ``TELEMETRY_PHASES``: ``on`` for per-phase busy/await/CPU breakdowns (``off``).
+- ``TELEMETRY_PROFILE_RATE``: fraction of phase runs profiled with cProfile (0).
+  Any value above 0 also turns phase timing on.
+- ``TELEMETRY_PROFILE_TOP``: functions listed per profiled phase (15).
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import cProfile
+import os
+import pstats
+import random
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+
+StallCallback = Callable[[Dict[str, Any]], None]
+
+# cProfile hooks are per thread and do not nest; the outermost profiled phase wins.
+_active_profile: Optional[cProfile.Profile] = None
+
+
+def _env_on(name: str) -> bool:
+    return os.environ.get(name, "off").strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass
+class ProfilingOptions:
+    """
+    What a ``TelemetrySession`` measures about the event loop and engine phases.
+    """
+    loop_lag: bool = False
+    loop_lag_interval_ms: float = 50.0
+    stall_ms: float = 100.0
+    phases: bool = False
+    profile_rate: float = 0.0
+    profile_top: int = 15
+
+    @classmethod
+    def from_env(cls) -> "ProfilingOptions":
+        """
+        :returns: Options from the ``TELEMETRY_*`` variables (see module docstring).
+        """
+        profile_rate = min(1.0, max(0.0, float(os.environ.get("TELEMETRY_PROFILE_RATE", "0") or 0)))
+        return cls(
+            loop_lag=_env_on("TELEMETRY_LOOP_LAG"),
+            loop_lag_interval_ms=float(os.environ.get("TELEMETRY_LOOP_LAG_INTERVAL_MS", "50")),
+            stall_ms=float(os.environ.get("TELEMETRY_STALL_MS", "100")),
+            phases=_env_on("TELEMETRY_PHASES") or profile_rate > 0,
+            profile_rate=profile_rate,
+            profile_top=int(os.environ.get("TELEMETRY_PROFILE_TOP", "15")),
+        )
+
+
+class LoopLagMonitor:
+    """
+    Samples event-loop lag: how much later than requested a periodic sleep wakes up.
+
+    :param interval: Ticker period in seconds.
+    :param stall_seconds: Lag reported through ``on_stall``.
+    :param on_stall: Called with ``{"source": "sampler", "ms": ...}`` per stall.
+    """
+
+    def __init__(
+        self,
+        interval: float = 0.05,
+        stall_seconds: Optional[float] = None,
+        on_stall: Optional[StallCallback] = None,
+    ) -> None:
+        self.interval = interval
+        self.stall_seconds = stall_seconds
+        self.on_stall = on_stall
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """
+        Start sampling on the running loop (no-op when already started).
+        """
+        if self._task is None:
+            self._task = asyncio.create_task(self._tick())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _tick(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - started - self.interval)
+            self.samples.append(lag)
+            if self.on_stall and self.stall_seconds is not None and lag >= self.stall_seconds:
+                self.on_stall({"source": "sampler", "ms": round(lag * 1000, 2)})
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        :returns: Sample count, mean, p95 and max lag in milliseconds, and stalls.
+        """
+        if not self.samples:
+            return {"samples": 0, "mean_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0, "stalls": 0}
+        ordered = sorted(self.samples)
+        stalls = sum(1 for s in ordered if self.stall_seconds is not None and s >= self.stall_seconds)
+        return {
+            "samples": len(ordered),
+            "mean_ms": round(statistics.fmean(ordered) * 1000, 2),
+            "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2),
+            "stalls": stalls,
+        }
+
+
+class _PhaseStats:
+    __slots__ = ("calls", "wall", "busy", "cpu", "max_slice", "slow_slices", "profiled")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall = 0.0
+        self.busy = 0.0
+        self.cpu = 0.0
+        self.max_slice = 0.0
+        self.slow_slices = 0
+        self.profiled = 0
+
+
+class _SliceClock:
+    """Accumulates the synchronous slices of one phase run."""
+
+    def __init__(self, profile: Optional[cProfile.Profile]) -> None:
+        self.profile = profile
+        self.busy = 0.0
+        self.cpu = 0.0
+        self.max_slice = 0.0
+        self.slow: List[float] = []
+
+    @contextlib.contextmanager
+    def slice(self, stall_seconds: float) -> Iterator[None]:
+        global _active_profile
+        profile = self.profile if _active_profile is None else None
+        if profile is not None:
+            _active_profile = profile
+            profile.enable()
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - wall_start
+            self.cpu += time.thread_time() - cpu_start
+            if profile is not None:
+                profile.disable()
+                _active_profile = None
+            self.busy += elapsed
+            self.max_slice = max(self.max_slice, elapsed)
+            if elapsed >= stall_seconds:
+                self.slow.append(elapsed)
+
+
+class _TimedAwaitable:
+    """Drives an awaitable, timing each synchronous step it runs on the loop."""
+
+    def __init__(self, awaitable: Awaitable[Any], clock: _SliceClock, stall_seconds: float) -> None:
+        self._awaitable = awaitable
+        self._clock = clock
+        self._stall_seconds = stall_seconds
+
+    def __await__(self):
+        iterator = self._awaitable.__await__()
+        send_value: Any = None
+        throw: Optional[BaseException] = None
+        while True:
+            with self._clock.slice(self._stall_seconds):
+                try:
+                    if throw is not None:
+                        yielded = iterator.throw(throw)
+                    else:
+                        yielded = iterator.send(send_value)
+                except StopIteration as stop:
+                    return stop.value
+            try:
+                send_value = yield yielded
+                throw = None
+            except BaseException as exc:  # noqa: BLE001 — forwarded into the wrapped awaitable
+                send_value = None
+                throw = exc
+
+
+class PhaseProfiler:
+    """
+    Per-phase busy/await/CPU accounting and sampled cProfile for one run.
+
+    :param options: What to measure.
+    :param on_stall: Called with a ``loop_stall`` payload for each slow slice.
+    :param on_phase: Called with each phase run's record (for the trace).
+    """
+
+    def __init__(
+        self,
+        options: ProfilingOptions,
+        on_stall: Optional[StallCallback] = None,
+        on_phase: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ) -> None:
+        self.options = options
+        self.on_stall = on_stall
+        self.on_phase = on_phase
+        self.stats: Dict[str, _PhaseStats] = {}
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self._rng = random.Random()
+
+    @property
+    def stall_seconds(self) -> float:
+        return self.options.stall_ms / 1000.0
+
+    def _sampled_profile(self, name: str) -> Optional[cProfile.Profile]:
+        if self.options.profile_rate <= 0 or self._rng.random() >= self.options.profile_rate:
+            return None
+        profile = self.profiles.get(name)
+        if profile is None:
+            profile = self.profiles[name] = cProfile.Profile()
+        return profile
+
+    async def run(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        """
+        Await ``awaitable`` as phase ``name``.
+        :param name: Phase name.
+        :param awaitable: Phase work.
+        :returns: The awaitable's result.
+        """
+        if not self.options.phases:
+            return await awaitable
+        clock = _SliceClock(self._sampled_profile(name))
+        started = time.perf_counter()
+        try:
+            return await _TimedAwaitable(awaitable, clock, self.stall_seconds)
+        finally:
+            self._finish(name, clock, time.perf_counter() - started)
+
+    @contextlib.contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """
+        Time a synchronous phase; all of it is busy time.
+        :param name: Phase name.
+        """
+        if not self.options.phases:
+            yield
+            return
+        clock = _SliceClock(self._sampled_profile(name))
+        started = time.perf_counter()
+        try:
+            with clock.slice(self.stall_seconds):
+                yield
+        finally:
+            self._finish(name, clock, time.perf_counter() - started)
+
+    def _finish(self, name: str, clock: _SliceClock, wall: float) -> None:
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = _PhaseStats()
+        stats.calls += 1
+        stats.wall += wall
+        stats.busy += clock.busy
+        stats.cpu += clock.cpu
+        stats.max_slice = max(stats.max_slice, clock.max_slice)
+        stats.slow_slices += len(clock.slow)
+        stats.profiled += 1 if clock.profile is not None else 0
+        if self.on_stall:
+            for elapsed in clock.slow:
+                self.on_stall({"source": "phase", "phase": name, "ms": round(elapsed * 1000, 2)})
+        if self.on_phase:
+            self.on_phase({
+                "phase": name,
+                "wall_s": round(wall, 6),
+                "busy_s": round(clock.busy, 6),
+                "cpu_s": round(clock.cpu, 6),
+                "max_slice_ms": round(clock.max_slice * 1000, 3),
+            })
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        :returns: Per phase: calls, wall/busy/await/CPU seconds, longest slice,
+            slow slices, and the hottest functions when profiled.
+        """
+        out: Dict[str, Any] = {}
+        for name, stats in sorted(self.stats.items()):
+            entry: Dict[str, Any] = {
+                "calls": stats.calls,
+                "wall_s": round(stats.wall, 4),
+                "busy_s": round(stats.busy, 4),
+                "await_s": round(max(0.0, stats.wall - stats.busy), 4),
+                "cpu_s": round(stats.cpu, 4),
+                "max_slice_ms": round(stats.max_slice * 1000, 2),
+                "slow_slices": stats.slow_slices,
+            }
+            if name in self.profiles and stats.profiled:
+                entry["profiled_calls"] = stats.profiled
+                entry["hot_functions"] = self._hot_functions(self.profiles[name])
+            out[name] = entry
+        return out
+
+    def _hot_functions(self, profile: cProfile.Profile) -> List[Dict[str, Any]]:
+        try:
+            raw = pstats.Stats(profile).stats
+        except TypeError:  # never enabled long enough to collect anything
+            return []
+        rows = sorted(raw.items(), key=lambda item: item[1][2], reverse=True)[: self.options.profile_top]
+        return [
+            {
+                "function": f"{os.path.basename(file)}:{line}({func})",
+                "calls": calls,
+                "self_s": round(tottime, 5),
+                "cumulative_s": round(cumtime, 5),
+            }
+            for (file, line, func), (_, calls, tottime, cumtime, _) in rows
+        ]
@@ -0,0 +1,428 @@
+"""
+Simulated LLM, search and web backends for offline load tests.
+
+Engine throughput can't be measured against paid providers, and the
+``web_fixtures`` replay only covers HTTP. These stand-ins replace every remote
+dependency of an engine run with a local one that has configurable latency,
+failure rate and token counts:
+
+- ``SimulatedLLMBackend`` (``LLM_PROVIDER=simulated``) answers each engine
+  operation (expansion, evaluation, merge, verify, final synthesis, ...) with a
+  scripted response of the shape the engine parses, so runs grow realistic DAGs:
+  ``depth`` levels of ``branching`` open sub-problems (expanded further by the
+  ready-queue scheduler), then a search + visit leaf pair per facet.
+- ``SimulatedSearch`` returns generated results for any query.
+- ``FixtureHttp`` serves pages from the ``web_fixtures`` cache when a fixture
+  exists for the request and generates a page otherwise.
+
+The profile comes from ``SIM_PROFILE`` (JSON text or a path to a JSON file), see
+``SimulationProfile``. ``load_test.py`` drives concurrent engine runs on top.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import re
+from dataclasses import asdict, dataclass, field, fields
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
+
+from agent.app import web_fixtures
+from agent.app.connector_http import ConnectorHttp
+from agent.app.connector_search import ConnectorSearch
+from agent.app.llm_backends import LLMBackend
+from shared.connector_config import ConnectorConfig
+from shared.request_result import RequestResult
+
+SIM_HOST = "https://sim.example"
+
+_instances = itertools.count()
+
+_FACETS = (
+    "history and background", "current market leaders", "pricing and costs",
+    "technical limitations", "regulation and policy", "future outlook",
+    "expert criticism", "adoption statistics",
+)
+
+
+@dataclass
+class LatencyDistribution:
+    """
+    Log-normal latency: ``median_ms * exp(sigma * N(0, 1))``; ``sigma=0`` is fixed.
+    """
+    median_ms: float = 0.0
+    sigma: float = 0.0
+
+    @classmethod
+    def from_value(cls, value: Any) -> "LatencyDistribution":
+        """
+        :param value: Milliseconds (fixed) or ``{"median_ms": .., "sigma": ..}``.
+        :returns: Distribution.
+        """
+        if isinstance(value, LatencyDistribution):
+            return value
+        if isinstance(value, Mapping):
+            return cls(float(value.get("median_ms", 0.0)), float(value.get("sigma", 0.0)))
+        return cls(float(value or 0.0))
+
+    def sample(self, rng: random.Random) -> float:
+        """
+        :param rng: Random source.
+        :returns: Latency in seconds.
+        """
+        if self.median_ms <= 0:
+            return 0.0
+        return self.median_ms * math.exp(self.sigma * rng.gauss(0.0, 1.0)) / 1000.0
+
+
+@dataclass
+class SimulationProfile:
+    """
+    Latency, failure and DAG-shape knobs for the simulated backends.
+
+    Failure rates are per call in [0, 1]. LLM token counts are the text length
+    divided by ``chars_per_token``; ``completion_tokens`` > 0 reports that many
+    completion tokens per call instead.
+    """
+    seed: int = 0
+    llm_latency: LatencyDistribution = field(default_factory=lambda: LatencyDistribution(800.0, 0.4))
+    search_latency: LatencyDistribution = field(default_factory=lambda: LatencyDistribution(300.0, 0.3))
+    http_latency: LatencyDistribution = field(default_factory=lambda: LatencyDistribution(250.0, 0.5))
+    llm_failure_rate: float = 0.0
+    search_failure_rate: float = 0.0
+    http_failure_rate: float = 0.0
+    chars_per_token: float = 4.0
+    completion_tokens: int = 0
+    branching: int = 2
+    depth: int = 0
+    search_results: int = 5
+    page_chars: int = 4000
+    use_fixtures: bool = True
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "SimulationProfile":
+        """
+        :param data: Profile fields; unknown keys are ignored.
+        :returns: Profile.
+        """
+        kwargs: Dict[str, Any] = {}
+        for f in fields(cls):
+            if f.name not in data:
+                continue
+            value = data[f.name]
+            if f.name.endswith("_latency"):
+                kwargs[f.name] = LatencyDistribution.from_value(value)
+            else:
+                kwargs[f.name] = type(getattr(cls(), f.name))(value)
+        return cls(**kwargs)
+
+    @classmethod
+    def load(cls, spec: Union["SimulationProfile", Mapping[str, Any], str, None]) -> "SimulationProfile":
+        """
+        :param spec: A profile, a mapping, JSON text, a path to a JSON file, or empty for defaults.
+        :returns: Profile.
+        """
+        if isinstance(spec, SimulationProfile):
+            return spec
+        if isinstance(spec, Mapping):
+            return cls.from_dict(spec)
+        text = (spec or "").strip()
+        if not text:
+            return cls()
+        if not text.startswith("{"):
+            text = Path(text).read_text(encoding="utf-8")
+        return cls.from_dict(json.loads(text))
+
+    @classmethod
+    def from_env(cls) -> "SimulationProfile":
+        """
+        :returns: Profile from ``SIM_PROFILE``.
+        """
+        return cls.load(os.environ.get("SIM_PROFILE"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def rng(self, component: str) -> random.Random:
+        """
+        Independent, seeded random source per backend instance.
+        :param component: Backend name.
+        :returns: Random source.
+        """
+        return random.Random(f"{self.seed}:{component}:{next(_instances)}")
+
+
+def _slug(text: str, limit: int = 40) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", (text or "").lower()).strip("-")
+    return slug[:limit] or "page"
+
+
+def _json_field(text: str, key: str) -> Any:
+    """
+    Decode the JSON value of the first ``"key":`` in ``text`` that parses.
+    Prompts embed JSON in templates that aren't JSON as a whole.
+    """
+    decoder = json.JSONDecoder()
+    for match in re.finditer(rf'"{re.escape(key)}"\s*:\s*', text):
+        try:
+            value, _ = decoder.raw_decode(text, match.end())
+        except ValueError:
+            continue
+        return value
+    return None
+
+
+class ScriptedResponder:
+    """
+    Builds the JSON response the engine expects for a prompt.
+
+    The operation is recognised from the output contract in the system prompt.
+
+    :param profile: DAG shape knobs.
+    :param rng: Random source for scores.
+    """
+
+    def __init__(self, profile: SimulationProfile, rng: random.Random) -> None:
+        self.profile = profile
+        self.rng = rng
+
+    @staticmethod
+    def operation(system: str) -> str:
+        """
+        :param system: System prompt text.
+        :returns: Operation name.
+        """
+        rules = (
+            ("deliverable", "final"),
+            ("goal_achieved", "merge"),
+            ("improved_title", "improve"),
+            ("scores", "evaluation_batch"),
+            ("'selected'", "select_links"),
+            ("candidates", "expansion"),
+            ("verdict", "verify"),
+            ("score", "evaluation"),
+        )
+        for needle, name in rules:
+            if needle in system:
+                return name
+        return "generic"
+
+    def respond(self, messages: List[Dict[str, Any]]) -> str:
+        """
+        :param messages: Chat messages of the request.
+        :returns: Response text.
+        """
+        system = "\n".join(str(m.get("content") or "") for m in messages if m.get("role") == "system")
+        user = str(messages[-1].get("content") or "") if messages else ""
+        operation = self.operation(system)
+        handler = getattr(self, f"_{operation}")
+        return json.dumps(handler(user), ensure_ascii=True)
+
+    def _expansion(self, user: str) -> Dict[str, Any]:
+        path = _json_field(user, "path")
+        depth = max(0, len(path) - 1) if isinstance(path, list) else 0
+        title = str(_json_field(user, "parent_title") or "topic")
+        topic = " ".join(title.split()[:4])
+        facets = self._facets(title)
+        if depth < self.profile.depth:
+            return {
+                "candidates": [
+                    {
+                        "title": f"{facet.capitalize()} of {topic}",
+                        "details": {"goal": f"Research the {facet} of {topic}"},
+                        "justification": "Independent sub-problem.",
+                    }
+                    for facet in facets
+                ],
+                "meta": {"execute_all_children": False},
+            }
+        candidates = []
+        for facet in facets:
+            url = f"{SIM_HOST}/{_slug(facet)}/{_slug(topic)}"
+            candidates.append({
+                "title": f"Search {facet} of {topic}",
+                "action": "search",
+                "details": {"query": f"{topic} {facet}", "count": self.profile.search_results},
+                "justification": "Find sources.",
+            })
+            candidates.append({
+                "title": f"Read {url}",
+                "action": "visit",
+                "details": {"optional_url": url},
+                "justification": "Read the primary source.",
+            })
+        return {"candidates": candidates, "meta": {"execute_all_children": True}}
+
+    def _facets(self, title: str) -> List[str]:
+        start = int(hashlib.sha256(title.encode("utf-8")).hexdigest(), 16) % len(_FACETS)
+        return [_FACETS[(start + i) % len(_FACETS)] for i in range(max(1, min(self.profile.branching, len(_FACETS))))]
+
+    def _scores(self, candidates: Any) -> List[Dict[str, Any]]:
+        ids = [str(c.get("id")) for c in candidates or [] if isinstance(c, dict) and c.get("id") is not None]
+        return [{"id": cid, "score": round(self.rng.uniform(0.4, 0.95), 3)} for cid in ids]
+
+    def _evaluation_batch(self, user: str) -> Dict[str, Any]:
+        groups = _json_field(user, "groups")
+        if isinstance(groups, list):
+            candidates = [c for g in groups if isinstance(g, dict) for c in g.get("candidates") or []]
+        else:
+            candidates = _json_field(user, "candidates")
+        return {"scores": self._scores(candidates)}
+
+    def _evaluation(self, user: str) -> Dict[str, Any]:
+        return {"score": round(self.rng.uniform(0.4, 0.95), 3), "rationale": "simulated"}
+
+    def _merge(self, user: str) -> Dict[str, Any]:
+        return {
+            "summary": "Simulated merge of child results.",
+            "key_findings": ["simulated finding"],
+            "goal_achieved": True,
+            "goal_evaluation": "All children completed.",
+            "missing_requirements": [],
+        }
+
+    def _verify(self, user: str) -> Dict[str, Any]:
+        return {
+            "verdict": "TRUE", "confidence": 0.9, "supporting_url": f"{SIM_HOST}/page/0",
+            "contradicting_url": "", "quote": "simulated", "reasoning": "simulated",
+        }
+
+    def _improve(self, user: str) -> Dict[str, Any]:
+        return {"improved_title": "refined", "improved_details": {}, "refinement_rationale": "simulated"}
+
+    def _select_links(self, user: str) -> Dict[str, Any]:
+        return {"selected": re.findall(r"https?://\S+", user)[:1]}
+
+    def _final(self, user: str) -> Dict[str, Any]:
+        return {"deliverable": "Simulated final answer.", "summary": "simulated"}
+
+    def _generic(self, user: str) -> Dict[str, Any]:
+        return {}
+
+
+class SimulatedLLMBackend(LLMBackend):
+    """
+    LLM backend that answers locally with scripted responses after a sampled delay.
+
+    Failed calls raise ``TimeoutError`` so ConnectorLLM retries them like a provider timeout.
+
+    :param config: Shared connector configuration (``sim_profile`` is read from it).
+    :param logger: Logger for this backend.
+    """
+
+    def __init__(self, config: ConnectorConfig, logger: logging.Logger):
+        super().__init__(config, logger)
+        self.profile = SimulationProfile.load(getattr(config, "sim_profile", None))
+        self.rng = self.profile.rng("llm")
+        self.responder = ScriptedResponder(self.profile, self.rng)
+
+    def normalize_payload(self, payload: dict, default_model: str, model_profiles: dict[str, dict]) -> dict:
+        normalized = dict(payload)
+        normalized["model"] = normalized.get("model") or default_model or "simulated"
+        return normalized
+
+    def simplify_payload(self, payload: dict) -> dict:
+        return payload
+
+    def _tokens(self, text: str) -> int:
+        return max(1, int(len(text) / max(0.1, self.profile.chars_per_token)))
+
+    async def complete(self, payload: dict, model_name: str) -> Tuple[str, Any]:
+        await asyncio.sleep(self.profile.llm_latency.sample(self.rng))
+        if self.rng.random() < self.profile.llm_failure_rate:
+            raise TimeoutError("simulated LLM failure")
+        messages = payload.get("messages") or []
+        content = self.responder.respond(messages)
+        prompt_tokens = self._tokens("".join(str(m.get("content") or "") for m in messages))
+        completion_tokens = self.profile.completion_tokens or self._tokens(content)
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        )
+        return content, usage
+
+    def reset_client(self) -> None:
+        return None
+
+
+class SimulatedSearch(ConnectorSearch):
+    """
+    Search connector returning generated results for any query.
+
+    :param connector_config: Shared connector configuration.
+    :param profile: Simulation profile (defaults to ``SIM_PROFILE``).
+    """
+
+    def __init__(self, connector_config: ConnectorConfig, profile: Optional[SimulationProfile] = None):
+        super().__init__(connector_config)
+        self.profile = profile or SimulationProfile.load(getattr(connector_config, "sim_profile", None))
+        self.rng = self.profile.rng("search")
+        self.search_api_ready = True
+
+    async def init_search_api(self) -> bool:
+        return True
+
+    async def query_search(self, query: str, count: int = 10) -> Optional[List[Dict[str, str]]]:
+        await asyncio.sleep(self.profile.search_latency.sample(self.rng))
+        if self.rng.random() < self.profile.search_failure_rate:
+            raise RuntimeError("Search API query failed: status=503 data=simulated failure")
+        slug = _slug(query)
+        return [
+            {
+                "title": f"{query[:60]} - result {i}",
+                "url": f"{SIM_HOST}/{slug}/{i}",
+                "description": f"Simulated snippet {i} about {query[:80]}.",
+            }
+            for i in range(min(count, self.profile.search_results))
+        ]
+
+
+class FixtureHttp(ConnectorHttp):
+    """
+    HTTP connector serving ``web_fixtures`` pages, or generated pages on a miss.
+
+    :param config: Shared connector configuration.
+    :param profile: Simulation profile (defaults to ``SIM_PROFILE``).
+    """
+
+    def __init__(self, config: ConnectorConfig, profile: Optional[SimulationProfile] = None):
+        super().__init__(config)
+        self.profile = profile or SimulationProfile.load(getattr(config, "sim_profile", None))
+        self.rng = self.profile.rng("http")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return None
+
+    async def request(self, method: str, url: str, retries: int = 2, **kwargs) -> RequestResult:
+        await asyncio.sleep(self.profile.http_latency.sample(self.rng))
+        if self.rng.random() < self.profile.http_failure_rate:
+            return RequestResult(status=503, error=True, data="simulated failure")
+        if self.profile.use_fixtures:
+            cached = web_fixtures.load(web_fixtures.make_key(method, url, kwargs.get("params")))
+            if cached is not None:
+                return cached
+        return RequestResult(status=200, error=False, data=self._page(url))
+
+    def _page(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        words = [digest[i:i + 6] for i in range(0, len(digest), 6)]
+        sentence = " ".join(f"fact-{w}" for w in words) + "."
+        body: List[str] = []
+        size = 0
+        while size < self.profile.page_chars:
+            body.append(f"<p>{sentence}</p>")
+            size += len(sentence)
+        base = url.rsplit("/", 1)[0]
+        links = "".join(f'<a href="{base}/{i}">related {i}</a>' for i in range(3))
+        return f"<html><head><title>{url}</title></head><body><h1>{url}</h1>{''.join(body)}{links}</body></html>"
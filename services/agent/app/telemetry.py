@@ -1,9 +1,11 @@
 import os
 import time
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Awaitable, Dict, Iterator, List, Optional
 
+from agent.app.runtime_profiler import LoopLagMonitor, PhaseProfiler, ProfilingOptions
 from agent.app.trace_recorder import TraceRecorder
 
 
@@ -37,6 +39,7 @@ class TelemetrySession:
         mandate: Optional[str] = None,
         correlation_id: Optional[str] = None,
         trace_path: Optional[Path] = None,
+        profiling: Optional[ProfilingOptions] = None,
     ) -> None:
         """
         Initialize a telemetry session.
@@ -44,6 +47,7 @@ class TelemetrySession:
         :param mandate: Mandate string.
         :param correlation_id: Correlation ID.
         :param trace_path: Optional path to JSONL trace file.
+        :param profiling: Loop-lag and phase profiling options (default: ``TELEMETRY_*`` env).
         """
         self.enabled = bool(enabled)
         self.mandate = mandate or ""
@@ -60,6 +64,14 @@ class TelemetrySession:
         self.events: List[Dict[str, Any]] = []
         self.decisions: List[Dict[str, Any]] = []
 
+        self.profiling = profiling or ProfilingOptions.from_env()
+        self._loop_monitor: Optional[LoopLagMonitor] = None
+        self._phases = PhaseProfiler(
+            self.profiling,
+            on_stall=lambda payload: self.record_event("loop_stall", payload),
+            on_phase=self._trace_phase,
+        )
+
     def record_decision(
         self,
         stage: Any,
@@ -201,6 +213,139 @@ class TelemetrySession:
         if self._trace:
             self._trace.record("llm_usage", payload)
 
+    def llm_cache_summary(self) -> Dict[str, Any]:
+        """
+        LLM response cache stats from the recorded usage.
+        :returns: Lookups, hits, hit_rate and saved prompt/completion/total tokens.
+        """
+        hits = 0
+        lookups = 0
+        saved = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+        for record in self.llm_usage:
+            state = record.get("cache")
+            if state not in ("hit", "miss"):
+                continue
+            lookups += 1
+            if state == "hit":
+                hits += 1
+                saved_usage = record.get("saved_usage") or {}
+                for field_name in saved:
+                    saved[field_name] += int(saved_usage.get(field_name) or 0)
+        return {
+            "lookups": lookups,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "saved_prompt_tokens": saved["prompt_tokens"],
+            "saved_completion_tokens": saved["completion_tokens"],
+            "saved_tokens": saved["total_tokens"],
+        }
+
+    def llm_hedge_summary(self) -> Dict[str, Any]:
+        """
+        Hedged LLM request stats from the recorded ``llm_hedge`` events.
+        :returns: Hedges fired, wins by side, hedge win rate and tokens spent on losing calls.
+        """
+        hedges = [e.get("payload") or {} for e in self.events if e.get("event") == "llm_hedge"]
+        winners = [h.get("winner") for h in hedges]
+        hedge_wins = winners.count("hedge")
+        return {
+            "fired": len(winners),
+            "hedge_wins": hedge_wins,
+            "primary_wins": winners.count("primary"),
+            "hedge_win_rate": round(hedge_wins / len(winners), 4) if winners else 0.0,
+            "wasted_tokens": sum(
+                int(h.get("wasted_prompt_tokens") or 0) + int(h.get("wasted_completion_tokens") or 0)
+                for h in hedges
+            ),
+        }
+
+    def speculation_summary(self) -> Dict[str, Any]:
+        """
+        Speculative expansion stats from the recorded ``expansion_speculation`` events.
+        :returns: Hits, misses, hit rate and tokens spent on discarded responses.
+        """
+        hits = 0
+        misses = 0
+        wasted = 0
+        for entry in self.events:
+            if entry.get("event") != "expansion_speculation":
+                continue
+            payload = entry.get("payload") or {}
+            if payload.get("outcome") == "hit":
+                hits += 1
+            else:
+                misses += 1
+                wasted += int(payload.get("prompt_tokens") or 0) + int(payload.get("completion_tokens") or 0)
+        resolved = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / resolved, 4) if resolved else 0.0,
+            "wasted_tokens": wasted,
+        }
+
+    def _trace_phase(self, record: Dict[str, Any]) -> None:
+        if self._trace:
+            self._trace.record("phase", record)
+
+    def start_loop_monitor(self) -> None:
+        """
+        Start sampling event-loop lag on the running loop when ``profiling.loop_lag`` is set.
+        :returns: None
+        """
+        if not (self.enabled and self.profiling.loop_lag):
+            return
+        if self._loop_monitor is None:
+            self._loop_monitor = LoopLagMonitor(
+                interval=self.profiling.loop_lag_interval_ms / 1000.0,
+                stall_seconds=self.profiling.stall_ms / 1000.0,
+                on_stall=lambda payload: self.record_event("loop_stall", payload),
+            )
+        self._loop_monitor.start()
+
+    async def stop_loop_monitor(self) -> None:
+        """
+        Stop the loop-lag sampler; collected samples stay in the summary.
+        :returns: None
+        """
+        if self._loop_monitor is not None:
+            await self._loop_monitor.stop()
+
+    async def phase(self, name: str, awaitable: Awaitable[Any]) -> Any:
+        """
+        Await an engine phase, splitting its wall time into busy (on-loop) and await time.
+        :param name: Phase name (expand, evaluate, execute, merge, checkpoint, ...).
+        :param awaitable: Phase work.
+        :returns: The awaitable's result.
+        """
+        if not self.enabled:
+            return await awaitable
+        return await self._phases.run(name, awaitable)
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        """
+        Time a synchronous engine phase (e.g. select).
+        :param name: Phase name.
+        """
+        if not self.enabled:
+            yield
+            return
+        with self._phases.measure(name):
+            yield
+
+    def loop_lag_summary(self) -> Dict[str, Any]:
+        """
+        :returns: Loop-lag sample stats (empty when the sampler never ran).
+        """
+        return self._loop_monitor.summary() if self._loop_monitor is not None else {}
+
+    def phase_summary(self) -> Dict[str, Any]:
+        """
+        :returns: Per-phase wall/busy/await/CPU seconds and sampled hot functions.
+        """
+        return self._phases.summary()
+
     def summary(self) -> Dict[str, Any]:
         """
         Build a summary payload for the session.
@@ -215,6 +360,11 @@ class TelemetrySession:
             "chroma_stored": self.chroma_stored,
             "chroma_retrieved": self.chroma_retrieved,
             "llm_usage": self.llm_usage,
+            "llm_cache": self.llm_cache_summary(),
+            "llm_hedge": self.llm_hedge_summary(),
+            "expansion_speculation": self.speculation_summary(),
+            "loop_lag": self.loop_lag_summary(),
+            "phases": self.phase_summary(),
             "timings": self.timings,
             "events": self.events,
             "decisions": self.decisions,
@@ -310,9 +310,10 @@ async def run_test_execution(
     engine.settings["memo_namespace"] = namespace
     engine._current_mandate = mandate
     from agent.app.idea_memory import MemoryManager
-    engine._memory_manager = MemoryManager(
+    engine._memory_manager = MemoryManager.from_config(
         connector_chroma=connector_chroma,
         namespace=namespace,
+        cfg=engine._cfg,
     )
     
     graph = IdeaDag(root_title=mandate, root_details={"mandate": mandate, "memo_namespace": namespace})
@@ -362,6 +363,7 @@ async def run_test_execution(
         )
     else:
         output = {}
+    await engine._memory_manager.aclose()
 
     # Grounding verdict for the final answer (substantiation mandates only) — surfaced on
     # the result so observability/groundedness reflect real visited-page evidence.
@@ -44,6 +44,8 @@ def summarize_observability(result: Dict[str, Any], telemetry, model_name: str =
     llm_completion_words = 0
     llm_prompt_tokens = 0
     llm_completion_tokens = 0
+    llm_cached_prompt_tokens = 0
+    llm_cache_write_tokens = 0
     llm_calls = 0
     
     for entry in telemetry.events:
@@ -63,6 +65,8 @@ def summarize_observability(result: Dict[str, Any], telemetry, model_name: str =
         usage_payload = usage.get("usage") or {}
         llm_prompt_tokens += int(usage_payload.get("prompt_tokens", 0))
         llm_completion_tokens += int(usage_payload.get("completion_tokens", 0))
+        llm_cached_prompt_tokens += int(usage_payload.get("cached_prompt_tokens", 0))
+        llm_cache_write_tokens += int(usage_payload.get("cache_write_tokens", 0))
     
     chroma_store_chars = 0
     chroma_store_words = 0
@@ -185,7 +189,13 @@ def summarize_observability(result: Dict[str, Any], telemetry, model_name: str =
         cost_prompt_tokens = int(llm_prompt_chars / _CHARS_PER_TOKEN)
         cost_completion_tokens = int(llm_completion_chars / _CHARS_PER_TOKEN)
     cost_usd = (
-        estimate_cost(model_name, cost_prompt_tokens, cost_completion_tokens)
+        estimate_cost(
+            model_name,
+            cost_prompt_tokens,
+            cost_completion_tokens,
+            cached_input_tokens=llm_cached_prompt_tokens,
+            cache_write_tokens=llm_cache_write_tokens,
+        )
         if model_name
         else None
     )
@@ -203,6 +213,8 @@ def summarize_observability(result: Dict[str, Any], telemetry, model_name: str =
                 "words": llm_prompt_words,
                 "kilobytes": round(llm_prompt_chars / 1024, 2),
                 "tokens": llm_prompt_tokens,
+                "cached_tokens": llm_cached_prompt_tokens,
+                "cache_write_tokens": llm_cache_write_tokens,
             },
             "completion": {
                 "chars": llm_completion_chars,
@@ -218,6 +230,7 @@ def summarize_observability(result: Dict[str, Any], telemetry, model_name: str =
             "usd_str": format_cost(cost_usd),
             "estimated": cost_estimated,
             "prompt_tokens": cost_prompt_tokens,
+            "cached_prompt_tokens": llm_cached_prompt_tokens,
             "completion_tokens": cost_completion_tokens,
         },
         "chroma": {
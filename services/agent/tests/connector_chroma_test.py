@@ -0,0 +1,96 @@
+"""
+Unit tests for ConnectorChroma's collection handle cache. The Chroma client is
+replaced with an in-memory fake; no server required.
+"""
+from __future__ import annotations
+
+import pytest
+
+from shared.connector_config import ConnectorConfig
+from agent.app.connector_chroma import ConnectorChroma
+
+
+class FakeCollection:
+    def __init__(self, name):
+        self.name = name
+        self.added = 0
+
+    async def add(self, **kwargs):
+        self.added += len(kwargs["ids"])
+
+    async def query(self, **kwargs):
+        return {"documents": [[]]}
+
+
+class FakeClient:
+    def __init__(self):
+        self.get_or_create_calls = 0
+        self.deleted = []
+
+    async def get_or_create_collection(self, name):
+        self.get_or_create_calls += 1
+        return FakeCollection(name)
+
+    async def delete_collection(self, name):
+        self.deleted.append(name)
+
+
+class RecordingTelemetry:
+    def __init__(self):
+        self.timings = []
+
+    def record_timing(self, name, started_at, success, payload, error=None):
+        self.timings.append({"name": name, "payload": payload})
+
+    def record_event(self, event, payload):
+        pass
+
+
+def _connector():
+    connector = ConnectorChroma(ConnectorConfig())
+    connector._chroma = FakeClient()
+    connector.chroma_api_ready = True
+    return connector
+
+
+@pytest.mark.asyncio
+async def test_collection_handle_reused_across_operations():
+    connector = _connector()
+    telemetry = RecordingTelemetry()
+    connector.set_telemetry(telemetry)
+    await connector.add_to_chroma("c", ids=["1"], metadatas=[{}], documents=["d"])
+    await connector.query_chroma("c", query_texts=["q"])
+    await connector.add_to_chroma("c", ids=["2"], metadatas=[{}], documents=["d"])
+    assert connector._chroma.get_or_create_calls == 1
+    assert connector.collection_cache_stats() == {"hits": 2, "misses": 1, "size": 1}
+    cache_timings = [t for t in telemetry.timings if t["name"] == "chroma_collection_cache"]
+    assert [t["payload"]["hit"] for t in cache_timings] == [False, True, True]
+    assert cache_timings[-1]["payload"]["hit_rate"] == pytest.approx(2 / 3, abs=1e-3)
+
+
+@pytest.mark.asyncio
+async def test_delete_collection_invalidates_handle():
+    connector = _connector()
+    await connector.get_or_create_collection("c")
+    assert await connector.delete_collection("c") is True
+    await connector.get_or_create_collection("c")
+    assert connector._chroma.get_or_create_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_connection_reset_clears_cache():
+    connector = _connector()
+    await connector.get_or_create_collection("a")
+    connector.chroma_api_ready = False
+    assert connector.collection_cache_stats()["size"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used(monkeypatch):
+    connector = _connector()
+    monkeypatch.setattr(ConnectorChroma, "COLLECTION_CACHE_SIZE", 2)
+    await connector.get_or_create_collection("a")
+    await connector.get_or_create_collection("b")
+    await connector.get_or_create_collection("a")
+    await connector.get_or_create_collection("c")
+    assert list(connector._collections) == ["a", "c"]
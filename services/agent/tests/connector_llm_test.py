@@ -118,6 +118,25 @@ def test_record_usage_handles_anthropic_field_names():
     assert connector.last_usage["total_tokens"] == 35
 
 
+def test_record_usage_reports_prompt_cache_tokens():
+    connector, _ = _make_connector_with_mock_backend()
+    openai_usage = SimpleNamespace(
+        prompt_tokens=1000, completion_tokens=10, total_tokens=1010,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=768),
+    )
+    connector._record_usage(openai_usage)
+    assert connector.last_usage["cached_prompt_tokens"] == 768
+    # Anthropic reports cache reads/writes outside input_tokens; prompt_tokens is the full prompt.
+    anthropic_usage = SimpleNamespace(
+        input_tokens=40, output_tokens=5, cache_read_input_tokens=900, cache_creation_input_tokens=60,
+    )
+    connector._record_usage(anthropic_usage)
+    assert connector.last_usage["prompt_tokens"] == 1000
+    assert connector.last_usage["cached_prompt_tokens"] == 900
+    assert connector.last_usage["cache_write_tokens"] == 60
+    assert connector.total_usage["cached_prompt_tokens"] == 1668
+
+
 def test_record_usage_ignores_none():
     connector, _ = _make_connector_with_mock_backend()
     connector._record_usage(None)
@@ -152,8 +171,186 @@ async def test_query_llm_records_usage_and_returns_content():
 
 
 @pytest.mark.asyncio
-async def test_query_llm_returns_none_on_unrecoverable_error():
+async def test_query_llm_returns_none_on_unrecoverable_error(monkeypatch):
     connector, mock_backend = _make_connector_with_mock_backend()
     mock_backend.complete.side_effect = RuntimeError("boom")
+    monkeypatch.setattr("agent.app.connector_llm.asyncio.sleep", AsyncMock())
     out = await connector.query_llm({"messages": [{"role": "user", "content": "hi"}], "model": "openai/gpt-5-mini"})
     assert out is None
+
+
+@pytest.mark.asyncio
+async def test_limiter_backs_off_only_for_unthrottled_errors(monkeypatch):
+    from agent.app.llm_limiter import LLMRateLimiter
+
+    connector, mock_backend = _make_connector_with_mock_backend()
+    connector.limiter = LLMRateLimiter(cooldown_seconds=0.0)
+    sleeps = []
+
+    async def fake_sleep(delay):
+        sleeps.append(delay)
+
+    monkeypatch.setattr("agent.app.connector_llm.asyncio.sleep", fake_sleep)
+    bad_gateway = RuntimeError("bad gateway")
+    bad_gateway.status_code = 502
+    mock_backend.complete.side_effect = [bad_gateway, bad_gateway, ("ok", None)]
+    assert await connector.query_llm(_payload()) == "ok"
+    # Retry itself only adds jitter (< 1 s) while the limiter is on.
+    backoffs = [d for d in sleeps if d >= 1.0]
+    assert len(backoffs) == 2 and backoffs[1] > backoffs[0]
+
+    sleeps.clear()
+    throttled = RuntimeError("rate limited")
+    throttled.status_code = 429
+    mock_backend.complete.side_effect = [throttled, ("ok", None)]
+    assert await connector.query_llm(_payload()) == "ok"
+    assert all(d < 1.0 for d in sleeps)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_releases_limiter_without_growing_window():
+    import asyncio
+    from agent.app.llm_limiter import LLMRateLimiter
+
+    connector, mock_backend = _make_connector_with_mock_backend()
+    connector.limiter = LLMRateLimiter(initial_concurrency=4)
+    started = asyncio.Event()
+
+    async def hang(*_):
+        started.set()
+        await asyncio.sleep(10)
+
+    mock_backend.complete.side_effect = hang
+    task = asyncio.create_task(connector.query_llm(_payload()))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    stats = connector.limiter.stats()["openai/gpt-5-mini"]
+    assert stats["in_flight"] == 0 and stats["window"] == 4
+
+
+def _make_cached_connector(monkeypatch, **env):
+    monkeypatch.setenv("LLM_CACHE", "memory")
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    connector, mock_backend = _make_connector_with_mock_backend()
+    mock_backend.complete.return_value = (
+        "cached answer",
+        SimpleNamespace(prompt_tokens=100, completion_tokens=20, total_tokens=120),
+    )
+    return connector, mock_backend
+
+
+def _payload(temperature=0.0):
+    return {"messages": [{"role": "user", "content": "hi"}], "model": "openai/gpt-5-mini", "temperature": temperature}
+
+
+@pytest.mark.asyncio
+async def test_response_cache_serves_repeat_with_zero_spent_tokens(monkeypatch):
+    from agent.app.telemetry import TelemetrySession
+
+    connector, mock_backend = _make_cached_connector(monkeypatch)
+    telemetry = TelemetrySession(enabled=True)
+    connector.set_telemetry(telemetry)
+    assert await connector.query_llm(_payload(), operation="evaluation") == "cached answer"
+    assert await connector.query_llm(_payload(), operation="evaluation") == "cached answer"
+    assert mock_backend.complete.await_count == 1
+    assert connector.last_usage["total_tokens"] == 0 and connector.last_usage["cached"]
+    stats = telemetry.summary()["llm_cache"]
+    assert stats["lookups"] == 2 and stats["hits"] == 1 and stats["hit_rate"] == 0.5
+    assert stats["saved_tokens"] == 120
+
+
+@pytest.mark.asyncio
+async def test_response_cache_skips_nonzero_temperature_unless_forced(monkeypatch):
+    connector, mock_backend = _make_cached_connector(monkeypatch)
+    await connector.query_llm(_payload(0.5))
+    await connector.query_llm(_payload(0.5))
+    assert mock_backend.complete.await_count == 2
+
+    forced, forced_backend = _make_cached_connector(monkeypatch, LLM_CACHE_FORCE="1")
+    await forced.query_llm(_payload(0.5))
+    await forced.query_llm(_payload(0.5))
+    assert forced_backend.complete.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_response_cache_operation_ttl_zero_disables(monkeypatch):
+    connector, mock_backend = _make_cached_connector(monkeypatch, LLM_CACHE_TTLS="finalize=0")
+    await connector.query_llm(_payload(), operation="finalize")
+    await connector.query_llm(_payload(), operation="finalize")
+    assert mock_backend.complete.await_count == 2
+
+
+class _Sink:
+    def __init__(self):
+        self.text = ""
+        self.resets = 0
+
+    def feed(self, text):
+        self.text += text
+
+    def reset(self):
+        self.resets += 1
+        self.text = ""
+
+
+@pytest.mark.asyncio
+async def test_stream_sink_receives_deltas_and_result_is_unchanged():
+    connector, mock_backend = _make_connector_with_mock_backend()
+
+    async def complete_stream(payload, model_name, on_text):
+        for piece in ('{"candidates": [', '{"title": "a"}', "]}"):
+            on_text(piece)
+        return '{"candidates": [{"title": "a"}]}', SimpleNamespace(prompt_tokens=3, completion_tokens=4, total_tokens=7)
+
+    mock_backend.complete_stream.side_effect = complete_stream
+    sink = _Sink()
+    out = await connector.query_llm(_payload(), stream_sink=sink)
+    assert out == sink.text == '{"candidates": [{"title": "a"}]}'
+    assert sink.resets == 1
+    assert mock_backend.complete.await_count == 0
+    assert connector.last_usage["total_tokens"] == 7
+
+
+class _StreamRejected(Exception):
+    status_code = 400
+
+
+@pytest.mark.asyncio
+async def test_rejected_stream_falls_back_to_a_plain_call_once():
+    connector, mock_backend = _make_connector_with_mock_backend()
+    mock_backend.complete_stream.side_effect = _StreamRejected("stream not supported")
+    mock_backend.complete.return_value = ("full answer", SimpleNamespace(prompt_tokens=3, completion_tokens=4, total_tokens=7))
+    for _ in range(2):
+        sink = _Sink()
+        assert await connector.query_llm(_payload(), stream_sink=sink) == sink.text == "full answer"
+    assert mock_backend.complete_stream.await_count == 1
+    assert mock_backend.complete.await_count == 2
+    assert connector.last_usage["total_tokens"] == 7
+
+
+@pytest.mark.asyncio
+async def test_stream_without_usage_records_an_estimate():
+    connector, mock_backend = _make_connector_with_mock_backend()
+
+    async def complete_stream(payload, model_name, on_text):
+        on_text("x" * 40)
+        return "x" * 40, None
+
+    mock_backend.complete_stream.side_effect = complete_stream
+    await connector.query_llm(_payload(), stream_sink=_Sink())
+    assert connector.last_usage["completion_tokens"] == 10
+    assert connector.last_usage["estimated"] is True
+    assert connector.total_usage["total_tokens"] > 0
+
+
+@pytest.mark.asyncio
+async def test_stream_sink_fed_from_response_cache(monkeypatch):
+    connector, mock_backend = _make_cached_connector(monkeypatch)
+    assert await connector.query_llm(_payload()) == "cached answer"
+    sink = _Sink()
+    assert await connector.query_llm(_payload(), stream_sink=sink) == "cached answer"
+    assert sink.text == "cached answer"
+    assert mock_backend.complete_stream.await_count == 0
@@ -0,0 +1,57 @@
+"""
+Unit tests for LocalEmbeddingIndex: top-k ordering, upsert, filters, distance space.
+"""
+from __future__ import annotations
+
+import pytest
+
+from agent.app.embedding_index import LocalEmbeddingIndex
+
+
+def test_query_returns_nearest_first():
+    index = LocalEmbeddingIndex()
+    index.add(ids=["a", "b", "c"], embeddings=[[1, 0], [0, 1], [0.9, 0.1]], documents=["A", "B", "C"])
+    result = index.query([[1, 0]], n_results=2)
+    assert result["ids"] == [["a", "c"]]
+    assert result["documents"] == [["A", "C"]]
+    assert result["distances"][0][0] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_l2_space_matches_chroma_squared_euclidean():
+    index = LocalEmbeddingIndex(space="l2")
+    index.add(ids=["x"], embeddings=[[0, 1]])
+    # Orthogonal unit vectors: squared L2 distance = 2.
+    assert index.query([[1, 0]], n_results=1)["distances"][0][0] == pytest.approx(2.0)
+    cosine = LocalEmbeddingIndex(space="cosine")
+    cosine.add(ids=["x"], embeddings=[[0, 1]])
+    assert cosine.query([[1, 0]], n_results=1)["distances"][0][0] == pytest.approx(1.0)
+
+
+def test_upsert_replaces_vector_without_growing():
+    index = LocalEmbeddingIndex()
+    index.add(ids=["a"], embeddings=[[1, 0]], metadatas=[{"v": 1}])
+    index.add(ids=["a"], embeddings=[[0, 1]], metadatas=[{"v": 2}])
+    assert len(index) == 1
+    result = index.query([[0, 1]], n_results=5)
+    assert result["metadatas"] == [[{"v": 2}]]
+    assert result["distances"][0][0] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_grows_past_initial_capacity_and_filters():
+    index = LocalEmbeddingIndex()
+    n = 200
+    index.add(
+        ids=[f"id{i}" for i in range(n)],
+        embeddings=[[1.0, float(i)] for i in range(n)],
+        metadatas=[{"parity": i % 2} for i in range(n)],
+    )
+    assert len(index) == n
+    result = index.query([[1.0, 0.0], [0.0, 1.0]], n_results=3, where={"parity": 1})
+    assert len(result["ids"]) == 2
+    assert all(m["parity"] == 1 for row in result["metadatas"] for m in row)
+    assert result["ids"][0][0] == "id1"
+
+
+def test_empty_index_returns_empty_rows():
+    index = LocalEmbeddingIndex()
+    assert index.query([[1, 0]], n_results=3)["ids"] == [[]]
@@ -0,0 +1,107 @@
+"""
+Unit tests for cross-parent batched evaluation in LlmBatchEvaluationPolicy.
+"""
+import asyncio
+import json
+
+import pytest
+
+from agent.app.idea_dag import IdeaDag
+from agent.app.idea_policies.evaluation import LlmBatchEvaluationPolicy
+
+
+class ScriptedIO:
+    telemetry = None
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.calls = []
+
+    def build_llm_payload(self, **kwargs):
+        return kwargs
+
+    async def query_llm_with_fallback(self, payload, **kwargs):
+        user = json.loads(payload["messages"][-1]["content"])
+        self.calls.append(user)
+        return self.respond(user)
+
+
+def _score_all(user):
+    groups = user.get("groups") or [user]
+    return json.dumps({"scores": [
+        {"id": c["id"], "score": 0.1 * int(c["id"])} for g in groups for c in g["candidates"]
+    ]})
+
+
+def _graph():
+    graph = IdeaDag(root_title="root")
+    parents = [graph.add_child(graph.root_id(), title) for title in ("p1", "p2")]
+    children = {
+        p.node_id: [graph.add_child(p.node_id, f"{p.title}-c{i}").node_id for i in range(2)]
+        for p in parents
+    }
+    return graph, children
+
+
+def _policy(io, **settings):
+    return LlmBatchEvaluationPolicy(io, settings={
+        "evaluation_cross_parent_window_seconds": 0.05, "evaluation_weight_default": 1.0, **settings,
+    })
+
+
+@pytest.mark.asyncio
+async def test_concurrent_parents_share_one_call():
+    io = ScriptedIO(_score_all)
+    policy = _policy(io)
+    graph, children = _graph()
+    results = await asyncio.gather(*[
+        policy.evaluate_batch(graph, parent_id, ids) for parent_id, ids in children.items()
+    ])
+    assert len(io.calls) == 1
+    assert [g["parent_id"] for g in io.calls[0]["groups"]] == list(children)
+    first, second = children.values()
+    assert results[0] == pytest.approx({first[0]: 0.1, first[1]: 0.2})
+    assert results[1] == pytest.approx({second[0]: 0.3, second[1]: 0.4})
+    assert graph.get_node(second[1]).score == pytest.approx(0.4)
+
+
+@pytest.mark.asyncio
+async def test_unparsed_parent_falls_back_to_its_own_call():
+    # The shared response only scores the first parent's candidates.
+    io = ScriptedIO(lambda user: json.dumps({"scores": [{"id": "1", "score": 0.9}]}) if "groups" in user else _score_all(user))
+    policy = _policy(io, evaluation_cross_parent_max_candidates=4)
+    graph, children = _graph()
+    results = await asyncio.gather(*[
+        policy.evaluate_batch(graph, parent_id, ids) for parent_id, ids in children.items()
+    ])
+    assert len(io.calls) == 2 and "groups" not in io.calls[1]
+    assert io.calls[1]["parent_id"] == list(children)[1]
+    assert results[0] == pytest.approx({list(children.values())[0][0]: 0.9})
+    assert results[1] == pytest.approx(dict(zip(list(children.values())[1], (0.1, 0.2))))
+
+
+@pytest.mark.asyncio
+async def test_zero_window_keeps_one_call_per_parent():
+    io = ScriptedIO(_score_all)
+    policy = _policy(io, evaluation_cross_parent_window_seconds=0)
+    graph, children = _graph()
+    await asyncio.gather(*[policy.evaluate_batch(graph, parent_id, ids) for parent_id, ids in children.items()])
+    assert len(io.calls) == 2
+    assert all("groups" not in call for call in io.calls)
+
+
+@pytest.mark.asyncio
+async def test_missing_candidate_does_not_shift_later_group_ids():
+    io = ScriptedIO(_score_all)
+    policy = _policy(io)
+    graph, children = _graph()
+    first, second = children.values()
+    requests = [
+        (parent_id, [ids[0], "pruned-node", ids[1]] if parent_id == list(children)[0] else ids)
+        for parent_id, ids in children.items()
+    ]
+    results = await asyncio.gather(*[policy.evaluate_batch(graph, pid, ids) for pid, ids in requests])
+    ids = [c["id"] for g in io.calls[0]["groups"] for c in g["candidates"]]
+    assert ids == ["1", "2", "3", "4"]
+    assert results[1] == pytest.approx({second[0]: 0.3, second[1]: 0.4})
+    assert graph.get_node(first[1]).score == pytest.approx(0.2)
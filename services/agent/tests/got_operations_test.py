@@ -115,3 +115,104 @@ def test_prune_respects_terminal_status():
     pruned = ops.prune_nodes(g, [n.node_id])
     assert pruned == 0
     assert n.status == IdeaNodeStatus.DONE
+
+
+class _BatchMemory:
+    """Fake MemoryManager: canned distances per query, records batch calls."""
+
+    def __init__(self, distances_by_query=None):
+        self.distances_by_query = distances_by_query or {}
+        self.batch_calls = []
+        self.flushes = 0
+
+    async def flush(self):
+        self.flushes += 1
+        return True
+
+    async def retrieve_relevant_memories_batch(self, queries, n_results=5, memory_type=None):
+        self.batch_calls.append(list(queries))
+        return [
+            [{"distance": d, "metadata": {"node_id": "old"}} for d in self.distances_by_query.get(q, [])]
+            for q in queries
+        ]
+
+
+def _candidate(title, goal):
+    return {"title": title, "details": {"goal": goal}}
+
+
+@pytest.mark.asyncio
+async def test_filter_duplicates_issues_one_batched_query():
+    ops = _make_ops(got_adaptive_policies=False, got_dedup_similarity_threshold=0.85)
+    memory = _BatchMemory({"Visit B page b": [0.05]})
+    ops.memory_manager = memory
+    candidates = [
+        _candidate("Search A", "find a"),
+        _candidate("Visit B", "page b"),
+        _candidate("Search C", "find c"),
+    ]
+    kept = await ops.filter_duplicate_candidates(candidates, IdeaDag(root_title="root"))
+    assert len(memory.batch_calls) == 1
+    assert len(memory.batch_calls[0]) == 3
+    assert memory.flushes == 1
+    assert [c["title"] for c in kept] == ["Search A", "Search C"]
+
+
+@pytest.mark.asyncio
+async def test_filter_duplicates_collapses_near_identical_batch_members():
+    ops = _make_ops(got_adaptive_policies=False, got_dedup_similarity_threshold=0.85)
+    ops.memory_manager = _BatchMemory()
+    candidates = [
+        _candidate("Search axolotl habitat", "find axolotl habitat"),
+        _candidate("Search Axolotl habitat", "find axolotl habitat"),
+        _candidate("Visit the Lake Xochimilco page", "read lake xochimilco"),
+    ]
+    kept = await ops.filter_duplicate_candidates(candidates, IdeaDag(root_title="root"))
+    assert [c["title"] for c in kept] == ["Search axolotl habitat", "Visit the Lake Xochimilco page"]
+
+
+@pytest.mark.asyncio
+async def test_filter_duplicates_never_returns_empty():
+    ops = _make_ops(got_adaptive_policies=False, got_dedup_similarity_threshold=0.85)
+    ops.memory_manager = _BatchMemory({"A a": [0.0]})
+    candidates = [_candidate("A", "a")]
+    kept = await ops.filter_duplicate_candidates(candidates, IdeaDag(root_title="root"))
+    assert kept == candidates
+
+
+@pytest.mark.asyncio
+async def test_filter_duplicates_lexical_fallback_keeps_entity_variants():
+    ops = _make_ops()
+    ops.memory_manager = _BatchMemory()
+    candidates = [
+        _candidate("Find the population of France", "population of France"),
+        _candidate("Find the population of Germany", "population of Germany"),
+    ]
+    kept = await ops.filter_duplicate_candidates(candidates, IdeaDag(root_title="root"))
+    assert kept == candidates
+
+
+class _EmbeddingMemory(_BatchMemory):
+    def __init__(self, vectors):
+        super().__init__()
+        self.vectors = vectors
+
+    async def embed_texts(self, texts):
+        return [self.vectors[t] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_filter_duplicates_compares_batch_members_by_embedding():
+    ops = _make_ops(got_adaptive_policies=False, got_dedup_similarity_threshold=0.85)
+    ops.memory_manager = _EmbeddingMemory({
+        "Search axolotl habitat find axolotl habitat": [1.0, 0.0, 0.0],
+        "Look up where axolotls live axolotl range": [0.99, 0.05, 0.0],
+        "Search axolotl diet find axolotl diet": [0.6, 0.8, 0.0],
+    })
+    candidates = [
+        _candidate("Search axolotl habitat", "find axolotl habitat"),
+        _candidate("Look up where axolotls live", "axolotl range"),
+        _candidate("Search axolotl diet", "find axolotl diet"),
+    ]
+    kept = await ops.filter_duplicate_candidates(candidates, IdeaDag(root_title="root"))
+    assert [c["title"] for c in kept] == ["Search axolotl habitat", "Search axolotl diet"]
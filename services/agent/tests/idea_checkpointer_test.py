@@ -69,3 +69,101 @@ def test_create_checkpointer_file_when_enabled(monkeypatch, tmp_path):
     cp = create_checkpointer_from_env()
     assert isinstance(cp, FileCheckpointer)
     assert cp.root_dir == str(tmp_path)
+
+
+def _graph(nodes):
+    return {"root_id": "r", "nodes": nodes, "executed_actions": {}, "blocked_sites": {}}
+
+
+@pytest.mark.asyncio
+async def test_file_checkpointer_delta_mode_replays_to_latest(tmp_path):
+    from agent.app.idea_checkpointer import replay_checkpoint_deltas
+
+    cp = FileCheckpointer(root_dir=str(tmp_path), mode="delta", compact_every=10)
+    nodes = {"r": {"node_id": "r", "title": "root", "children": []}}
+    await cp.save_step("run-d", 0, {"graph": _graph(dict(nodes)), "current_id": "r"})
+    nodes["a"] = {"node_id": "a", "title": "child", "content_full": "x" * 1000}
+    nodes["r"] = {"node_id": "r", "title": "root", "children": ["a"]}
+    await cp.save_step("run-d", 1, {"graph": _graph(dict(nodes)), "current_id": "a"})
+    nodes["b"] = {"node_id": "b", "title": "sibling"}
+    await cp.save_step("run-d", 2, {"graph": _graph(dict(nodes)), "current_id": "b"})
+
+    deltas = await cp.load_deltas("run-d")
+    assert [d["step_index"] for d in deltas] == [1, 2]
+    # Step 2 only carries the new node; the large unchanged child is not rewritten.
+    assert set(deltas[1]["delta"]["graph"]["nodes"]) == {"b"}
+
+    restored = replay_checkpoint_deltas(await cp.load("run-d"), deltas)
+    assert restored["step_index"] == 2
+    assert restored["snapshot"]["current_id"] == "b"
+    assert restored["snapshot"]["graph"]["nodes"] == nodes
+
+
+@pytest.mark.asyncio
+async def test_file_checkpointer_delta_mode_compacts(tmp_path):
+    cp = FileCheckpointer(root_dir=str(tmp_path), mode="delta", compact_every=2)
+    for step in range(4):
+        nodes = {f"n{i}": {"node_id": f"n{i}"} for i in range(step + 1)}
+        nodes["r"] = {"node_id": "r"}
+        await cp.save_step("run-c", step, {"graph": _graph(nodes)})
+    # Bases at steps 0 and 3; step 3 removed the deltas it superseded.
+    assert await cp.load_deltas("run-c") == []
+    assert (await cp.load("run-c"))["step_index"] == 3
+    assert not (tmp_path / "run-c" / "0003.json").exists()
+
+
+def test_replay_handles_removed_nodes():
+    from agent.app.idea_checkpointer import GraphDeltaTracker, replay_checkpoint_deltas
+
+    tracker = GraphDeltaTracker()
+    base_graph = _graph({"r": {"node_id": "r"}, "x": {"node_id": "x"}})
+    tracker.reset(base_graph)
+    delta = tracker.diff(_graph({"r": {"node_id": "r", "children": []}}))
+    assert delta["removed_nodes"] == ["x"]
+    restored = replay_checkpoint_deltas(
+        {"step_index": 0, "snapshot": {"graph": base_graph}},
+        [{"step_index": 1, "delta": {"graph": delta}}],
+    )
+    assert set(restored["snapshot"]["graph"]["nodes"]) == {"r"}
+
+
+def test_create_checkpointer_delta_mode(monkeypatch, tmp_path):
+    monkeypatch.setenv("IDEA_CHECKPOINT_ENABLED", "1")
+    monkeypatch.setenv("IDEA_CHECKPOINT_DIR", str(tmp_path))
+    monkeypatch.setenv("IDEA_CHECKPOINT_MODE", "delta")
+    monkeypatch.setenv("IDEA_CHECKPOINT_COMPACT_EVERY", "5")
+    cp = create_checkpointer_from_env()
+    assert cp.mode == "delta"
+    assert cp.compact_every == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_delta_write_is_resent_next_step(tmp_path):
+    from agent.app.idea_checkpointer import replay_checkpoint_deltas
+
+    cp = FileCheckpointer(root_dir=str(tmp_path), mode="delta", compact_every=10)
+    await cp.save_step("run-f", 0, {"graph": _graph({"r": {"node_id": "r"}})})
+    original_save_delta = cp.save_delta
+
+    async def failing_save_delta(run_id, step_index, delta):
+        raise OSError("disk full")
+
+    cp.save_delta = failing_save_delta
+    with pytest.raises(OSError):
+        await cp.save_step("run-f", 1, {"graph": _graph({"r": {"node_id": "r"}, "a": {"node_id": "a"}})})
+    cp.save_delta = original_save_delta
+    nodes = {"r": {"node_id": "r"}, "a": {"node_id": "a"}, "b": {"node_id": "b"}}
+    await cp.save_step("run-f", 2, {"graph": _graph(nodes)})
+    [entry] = await cp.load_deltas("run-f")
+    assert set(entry["delta"]["graph"]["nodes"]) == {"a", "b"}
+    restored = replay_checkpoint_deltas(await cp.load("run-f"), await cp.load_deltas("run-f"))
+    assert set(restored["snapshot"]["graph"]["nodes"]) == set(nodes)
+
+
+def test_apply_delta_keeps_empty_graph_maps():
+    from agent.app.idea_checkpointer import apply_graph_delta
+
+    graph = {"root_id": "r", "nodes": {}, "executed_actions": {"k": 1}, "blocked_sites": {"x.com": 1}}
+    updated = apply_graph_delta(graph, {"nodes": {}, "executed_actions": {}, "blocked_sites": {}})
+    assert updated["executed_actions"] == {} and updated["blocked_sites"] == {}
+    assert apply_graph_delta(graph, {"nodes": {}})["executed_actions"] == {"k": 1}
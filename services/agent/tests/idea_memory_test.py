@@ -0,0 +1,327 @@
+"""
+Unit tests for MemoryManager routing: batched retrieval and the local
+internal_thought index. Uses an in-memory fake Chroma connector.
+"""
+from __future__ import annotations
+
+import pytest
+
+from agent.app.connector_chroma import ConnectorChroma
+from agent.app.idea_memory import MemoryManager
+
+
+class FakeChroma:
+    """Records calls; embeds by hashing words into a tiny bag-of-words vector."""
+
+    VOCAB = ["axolotl", "habitat", "lake", "search", "visit", "page", "goal", "thought"]
+
+    SPLIT_OVERFETCH_FACTOR = ConnectorChroma.SPLIT_OVERFETCH_FACTOR
+    query_chroma_split = ConnectorChroma.query_chroma_split
+    _empty_result = staticmethod(ConnectorChroma._empty_result)
+
+    def __init__(self, stored=None, in_types=None):
+        self.added = []
+        self.queries = []
+        self.gets = 0
+        self.stored = stored
+        # Type of each row returned for a ``$in`` query (cycled); defaults to the filter list.
+        self.in_types = in_types
+
+    async def embed_texts(self, texts):
+        return [[float(t.lower().count(w)) + 0.01 for w in self.VOCAB] for t in texts]
+
+    async def add_to_chroma(self, collection, ids, metadatas, documents, embeddings=None):
+        self.added.append({"ids": ids, "metadatas": metadatas, "embeddings": embeddings})
+        return True
+
+    async def query_chroma(self, collection, query_texts, n_results=3, where=None, query_embeddings=None):
+        self.queries.append({"query_texts": query_texts, "where": where, "n_results": n_results})
+        type_filter = (where or {}).get("memory_type")
+        if isinstance(type_filter, dict):
+            cycle = self.in_types or type_filter["$in"]
+            types = [cycle[i % len(cycle)] for i in range(n_results)]
+        else:
+            types = [type_filter]
+        return {
+            "documents": [[f"doc for {q}" for _ in types] for q in query_texts],
+            "metadatas": [[{"memory_type": t} for t in types] for _ in query_texts],
+            "distances": [[0.5 for _ in types] for _ in query_texts],
+            "ids": [[f"id-{i}-{j}" for j, _ in enumerate(types)] for i, _ in enumerate(query_texts)],
+        }
+
+    async def get_from_chroma(self, collection, where=None, include=None):
+        self.gets += 1
+        return self.stored or {"ids": [], "embeddings": [], "metadatas": [], "documents": []}
+
+
+@pytest.mark.asyncio
+async def test_batch_retrieval_is_one_query():
+    chroma = FakeChroma()
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns")
+    batches = await mm.retrieve_relevant_memories_batch(["q1", "q2"], n_results=1, memory_type="observation")
+    assert len(chroma.queries) == 1
+    assert [b[0]["content"] for b in batches] == ["doc for q1", "doc for q2"]
+
+
+@pytest.mark.asyncio
+async def test_local_index_serves_thought_reads_without_chroma_query():
+    chroma = FakeChroma()
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", local_thought_index=True)
+    await mm.write_memory("Thought: search axolotl habitat", node_id="n1", node_title="t1", memory_type="internal_thought")
+    await mm.write_memory("Thought: visit lake page", node_id="n2", node_title="t2", memory_type="internal_thought")
+    # Chroma received the same vectors the index holds.
+    assert chroma.added[0]["embeddings"] is not None
+
+    memories = await mm.retrieve_relevant_memories("axolotl habitat", n_results=2, memory_type="internal_thought")
+    assert chroma.queries == []
+    assert memories[0]["metadata"]["node_id"] == "n1"
+    assert memories[0]["distance"] < memories[1]["distance"]
+
+    split = await mm.retrieve_memories_split("lake page", n_internal=1, n_observations=1)
+    assert split["internal_thoughts"][0]["metadata"]["node_id"] == "n2"
+    # Observations still go to Chroma.
+    assert [q["where"] for q in chroma.queries] == [{"memory_type": "observation"}]
+
+
+@pytest.mark.asyncio
+async def test_local_index_hydrates_from_chroma_once():
+    stored = {
+        "ids": ["old_00"],
+        "embeddings": [[1.0, 1.0, 0, 0, 0, 0, 0, 0]],
+        "metadatas": [{"node_id": "old", "memory_type": "internal_thought"}],
+        "documents": ["Thought: axolotl habitat"],
+    }
+    chroma = FakeChroma(stored=stored)
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", local_thought_index=True)
+    first = await mm.retrieve_relevant_memories("axolotl habitat", n_results=1, memory_type="internal_thought")
+    await mm.retrieve_relevant_memories("axolotl", n_results=1, memory_type="internal_thought")
+    assert chroma.gets == 1
+    assert first[0]["id"] == "old_00"
+
+
+@pytest.mark.asyncio
+async def test_local_index_falls_back_when_embedding_unavailable():
+    chroma = FakeChroma()
+
+    async def _no_embed(texts):
+        return None
+
+    chroma.embed_texts = _no_embed
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", local_thought_index=True)
+    memories = await mm.retrieve_relevant_memories("q", n_results=1, memory_type="internal_thought")
+    assert len(chroma.queries) == 1
+    assert memories[0]["content"] == "doc for q"
+
+
+@pytest.mark.asyncio
+async def test_split_retrieval_is_one_round_trip():
+    chroma = FakeChroma()
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns")
+    split = await mm.retrieve_memories_split("q", n_internal=2, n_observations=1)
+    assert [q["where"] for q in chroma.queries] == [{"memory_type": {"$in": ["internal_thought", "observation"]}}]
+    assert [m["metadata"]["memory_type"] for m in split["internal_thoughts"]] == ["internal_thought"] * 2
+    assert [m["metadata"]["memory_type"] for m in split["observations"]] == ["observation"]
+
+
+@pytest.mark.asyncio
+async def test_split_retrieval_tops_up_a_crowded_out_type():
+    # The over-fetch comes back full of observations: thoughts need a filtered follow-up.
+    chroma = FakeChroma(in_types=["observation"])
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns")
+    split = await mm.retrieve_memories_split("q", n_internal=1, n_observations=1)
+    assert [q["where"] for q in chroma.queries][1:] == [{"memory_type": "internal_thought"}]
+    assert len(split["internal_thoughts"]) == 1
+    assert len(split["observations"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_split_retrieval_concurrent_mode_queries_per_type():
+    chroma = FakeChroma()
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", split_mode="concurrent")
+    split = await mm.retrieve_memories_split("q", n_internal=1, n_observations=1)
+    assert sorted(q["where"]["memory_type"] for q in chroma.queries) == ["internal_thought", "observation"]
+    assert len(split["internal_thoughts"]) == len(split["observations"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_write_behind_coalesces_writes_until_flush():
+    chroma = FakeChroma()
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", write_behind=True, flush_max_age_seconds=60)
+    for i in range(3):
+        assert await mm.write_memory(f"Thought {i}", node_id=f"n{i}", node_title="t", memory_type="internal_thought")
+    await mm.write_memory("Visited page", node_id="v", node_title="v", memory_type="observation")
+    assert chroma.added == []
+    assert mm.pending_writes == 4
+
+    assert await mm.flush() is True
+    # One batch per memory type, not one per write.
+    assert sorted(len(a["ids"]) for a in chroma.added) == [1, 3]
+    assert mm.pending_writes == 0
+    await mm.aclose()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_on_size():
+    import asyncio
+
+    chroma = FakeChroma()
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", write_behind=True, flush_max_docs=2, flush_max_age_seconds=60)
+    await mm.write_memory("a", node_id="a", node_title="a", memory_type="internal_thought")
+    await mm.write_memory("b", node_id="b", node_title="b", memory_type="internal_thought")
+    await asyncio.sleep(0.01)
+    assert [a["ids"] for a in chroma.added] == [["a_00", "b_00"]]
+    await mm.aclose()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_flushes_on_age():
+    import asyncio
+
+    chroma = FakeChroma()
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", write_behind=True, flush_max_age_seconds=0.01)
+    await mm.write_memory("c", node_id="c", node_title="c", memory_type="internal_thought")
+    assert chroma.added == []
+    await asyncio.sleep(0.05)
+    assert [a["ids"] for a in chroma.added] == [["c_00"]]
+    await mm.aclose()
+
+
+class FlakyChroma(FakeChroma):
+    """Fails the first ``failures`` writes."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    async def add_to_chroma(self, collection, ids, metadatas, documents, embeddings=None):
+        if self.failures:
+            self.failures -= 1
+            return False
+        return await super().add_to_chroma(collection, ids, metadatas, documents, embeddings)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_retries_a_failed_batch():
+    chroma = FlakyChroma(failures=1)
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", write_behind=True, flush_max_age_seconds=60)
+    await mm.write_memory("a", node_id="a", node_title="a", memory_type="internal_thought")
+    assert await mm.flush() is False
+    assert mm.pending_writes == 1
+    await mm.write_memory("b", node_id="b", node_title="b", memory_type="internal_thought")
+    assert await mm.flush() is True
+    assert [a["ids"] for a in chroma.added] == [["a_00", "b_00"]]
+    assert mm.pending_writes == 0 and mm.dropped_writes == 0
+    await mm.aclose()
+
+
+@pytest.mark.asyncio
+async def test_write_behind_drops_after_retry_cap_and_reports_it(monkeypatch):
+    chroma = FlakyChroma(failures=100)
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", write_behind=True, flush_max_age_seconds=60)
+    errors = []
+    monkeypatch.setattr(mm._logger, "error", errors.append)
+    await mm.write_memory("a", node_id="a", node_title="a", memory_type="internal_thought")
+    await mm.aclose()
+    assert chroma.failures == 100 - MemoryManager.FLUSH_MAX_ATTEMPTS
+    assert mm.pending_writes == 0
+    assert mm.dropped_writes == 1
+    assert any("never stored" in e for e in errors)
+
+
+@pytest.mark.asyncio
+async def test_write_behind_bounds_the_retry_queue(monkeypatch):
+    monkeypatch.setattr(MemoryManager, "MAX_RETRY_DOCS", 2)
+    chroma = FlakyChroma(failures=100)
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", write_behind=True, flush_max_age_seconds=60)
+    await mm.write_memory("a", node_id="a", node_title="a", memory_type="internal_thought")
+    await mm.write_memory("b", node_id="b", node_title="b", memory_type="observation")
+    await mm.write_memory("c", node_id="c", node_title="c", memory_type="plan")
+    assert await mm.flush() is False
+    assert mm.pending_writes == 2
+    assert mm.dropped_writes == 1
+    chroma.failures = 0
+    await mm.aclose()
+    assert mm.dropped_writes == 1
+
+
+@pytest.mark.asyncio
+async def test_write_behind_thoughts_visible_to_index_after_flush():
+    chroma = FakeChroma()
+    mm = MemoryManager(
+        connector_chroma=chroma, namespace="ns",
+        local_thought_index=True, write_behind=True, flush_max_age_seconds=60,
+    )
+    await mm.write_memory("Thought: search axolotl habitat", node_id="n1", node_title="t1", memory_type="internal_thought")
+    await mm.flush()
+    memories = await mm.retrieve_relevant_memories("axolotl habitat", n_results=1, memory_type="internal_thought")
+    assert memories[0]["metadata"]["node_id"] == "n1"
+    await mm.aclose()
+
+
+@pytest.mark.asyncio
+async def test_prewarmed_embeddings_are_reused_by_thought_reads_and_writes():
+    chroma = FakeChroma()
+    embedded = []
+    original = chroma.embed_texts
+
+    async def counting_embed(texts):
+        embedded.extend(texts)
+        return await original(texts)
+
+    chroma.embed_texts = counting_embed
+    mm = MemoryManager(connector_chroma=chroma, namespace="ns", local_thought_index=True)
+    mm.prewarm_embeddings(["axolotl habitat", "Thought: visit lake page"])
+    await mm.retrieve_relevant_memories("axolotl habitat", n_results=1, memory_type="internal_thought")
+    await mm.write_memory("Thought: visit lake page", node_id="n1", node_title="t1", memory_type="internal_thought")
+    assert embedded == ["axolotl habitat", "Thought: visit lake page"]
+    assert chroma.added[0]["embeddings"] == await chroma.embed_texts(["Thought: visit lake page"])
+
+
+class _RecordingMemory:
+    """Stand-in MemoryManager recording barrier order for engine tests."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def flush(self):
+        self.calls.append("flush")
+        return True
+
+    async def retrieve_memories_split(self, **kwargs):
+        self.calls.append("retrieve")
+        return {"internal_thoughts": [], "observations": []}
+
+    async def aclose(self):
+        self.calls.append("aclose")
+
+
+@pytest.mark.asyncio
+async def test_engine_flushes_write_behind_before_expansion_retrieval():
+    from unittest.mock import MagicMock
+    from agent.app.idea_dag import IdeaDag
+    from agent.app.idea_engine import IdeaDagEngine
+
+    engine = IdeaDagEngine(io=MagicMock(), settings={"got_dedup_enabled": False})
+    engine._memory_manager = _RecordingMemory()
+    engine._got = None
+    graph = IdeaDag(root_title="root")
+    await engine._expansion_memories(graph, graph.get_node(graph.root_id()), 0)
+    assert engine._memory_manager.calls == ["flush", "retrieve"]
+
+
+@pytest.mark.asyncio
+async def test_engine_drains_write_behind_when_run_fails(monkeypatch):
+    from unittest.mock import MagicMock
+    from agent.app import idea_engine as engine_module
+
+    memory = _RecordingMemory()
+    monkeypatch.setattr(engine_module.MemoryManager, "from_config", classmethod(lambda cls, **_: memory))
+    engine = engine_module.IdeaDagEngine(io=MagicMock(), settings={"scheduler": "cursor"})
+
+    async def boom(*args, **kwargs):
+        raise RuntimeError("step failed")
+
+    monkeypatch.setattr(engine, "_run_cursor", boom)
+    with pytest.raises(RuntimeError):
+        await engine.run("mandate", max_steps=1)
+    assert memory.calls == ["aclose"]
@@ -0,0 +1,115 @@
+"""
+Unit tests for the ready-queue scheduler: cross-parent concurrency, merges, work budget.
+"""
+import asyncio
+
+import pytest
+
+from agent.app.idea_dag import IdeaDag
+from agent.app.idea_engine import IdeaDagEngine
+from agent.app.idea_policies import SimpleMergePolicy
+from agent.app.idea_policies.actions import LeafAction
+from agent.app.idea_policies.base import DetailKey, EvaluationPolicy, ExpansionPolicy, IdeaActionType, IdeaNodeStatus
+from agent.app.idea_scheduler import ReadyQueueScheduler
+
+
+class DummyIO:
+    telemetry = None
+
+
+class OneSearchExpansion(ExpansionPolicy):
+    running = 0
+    peak = 0
+
+    async def expand(self, graph: IdeaDag, node_id: str, **kwargs):
+        OneSearchExpansion.running += 1
+        OneSearchExpansion.peak = max(OneSearchExpansion.peak, OneSearchExpansion.running)
+        try:
+            await asyncio.sleep(0.02)
+        finally:
+            OneSearchExpansion.running -= 1
+        title = graph.get_node(node_id).title
+        return [{"title": f"search {title}", "details": {DetailKey.ACTION.value: IdeaActionType.SEARCH.value, "query": title}}]
+
+
+class FixedEvaluation(EvaluationPolicy):
+    async def evaluate(self, graph: IdeaDag, node_id: str) -> float:
+        graph.evaluate(node_id, 0.6)
+        return 0.6
+
+    async def evaluate_batch(self, graph: IdeaDag, parent_id: str, candidate_ids):
+        return {cid: await self.evaluate(graph, cid) for cid in candidate_ids}
+
+
+class SlowAction(LeafAction):
+    running = 0
+    peak = 0
+
+    async def execute(self, graph: IdeaDag, node_id: str, io):
+        SlowAction.running += 1
+        SlowAction.peak = max(SlowAction.peak, SlowAction.running)
+        try:
+            await asyncio.sleep(0.05)
+        finally:
+            SlowAction.running -= 1
+        action = graph.get_node(node_id).details.get(DetailKey.ACTION.value)
+        return {"action": action, "success": True, "results": [{"url": "https://x.test"}]}
+
+
+class SlowRegistry:
+    def get(self, action_type):
+        return SlowAction(settings={})
+
+
+def _engine(**settings):
+    settings = {"scheduler": "ready_queue", "semantic_dedup_visits_enabled": False, **settings}
+    return IdeaDagEngine(
+        io=DummyIO(),
+        settings=settings,
+        expansion=OneSearchExpansion(settings),
+        evaluation=FixedEvaluation(settings),
+        merge=SimpleMergePolicy(settings=settings),
+        actions=SlowRegistry(),
+        post_expansion_hooks=[],
+    )
+
+
+def _graph():
+    graph = IdeaDag(root_title="compare two things")
+    for title in ("first subproblem", "second subproblem"):
+        graph.evaluate(graph.add_child(graph.root_id(), title).node_id, 0.5)
+    return graph
+
+
+@pytest.mark.asyncio
+async def test_branches_under_different_parents_run_concurrently_and_merge():
+    SlowAction.peak = 0
+    engine = _engine()
+    graph = _graph()
+    scheduler = ReadyQueueScheduler(engine, graph, mandate="compare two things")
+    steps = await scheduler.run(0, max_steps=20)
+    # 2 expansions + 2 searches + 1 root merge.
+    assert steps == 5
+    assert scheduler.stats["expand"] == 2 and scheduler.stats["action"] == 2 and scheduler.stats["merge"] == 1
+    assert SlowAction.peak == 2
+    assert all(n.status == IdeaNodeStatus.DONE for n in graph.iter_depth_first())
+
+
+@pytest.mark.asyncio
+async def test_max_steps_is_a_work_budget():
+    engine = _engine()
+    graph = _graph()
+    assert await ReadyQueueScheduler(engine, graph, mandate="m").run(0, max_steps=2) == 2
+    searches = [n for n in graph.iter_depth_first() if n.details.get(DetailKey.ACTION.value) == "search"]
+    assert len(searches) == 2
+    assert all(n.details.get(DetailKey.ACTION_RESULT.value) is None for n in searches)
+
+
+@pytest.mark.asyncio
+async def test_llm_limit_caps_concurrent_llm_work():
+    for limit, expected_peak in ((1, 1), (2, 2)):
+        OneSearchExpansion.peak = 0
+        scheduler = ReadyQueueScheduler(_engine(scheduler_llm_limit=limit), _graph(), mandate="m")
+        await scheduler.run(0, max_steps=20)
+        assert scheduler.stats["expand"] == 2
+        assert OneSearchExpansion.peak == expected_peak
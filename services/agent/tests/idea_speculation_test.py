@@ -0,0 +1,156 @@
+"""
+Unit tests for speculative expansion: prediction, commit on a matching prompt, discard otherwise.
+"""
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from agent.app.connector_chroma import ConnectorChroma
+from agent.app.idea_dag import IdeaDag
+from agent.app.idea_engine import IdeaDagEngine
+from agent.app.idea_memory import MemoryManager
+from agent.app.idea_policies.base import DetailKey, IdeaActionType
+from agent.app.idea_speculation import ExpansionSpeculator
+from agent.app.telemetry import TelemetrySession
+
+
+class FakeExpansion:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = []
+        self.cancelled = []
+
+    def prepare_request(self, graph, node_id, memories=None):
+        return {"node_id": node_id, "messages": [{"role": "user", "content": f"{node_id}:{memories}"}]}
+
+    async def request_content(self, request, stream_sink=None):
+        self.requests.append(request["node_id"])
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(request["node_id"])
+            raise
+        return '{"candidates": []}'
+
+
+def _speculator(expansion):
+    io = SimpleNamespace(
+        connector_llm=SimpleNamespace(last_usage={"prompt_tokens": 90, "completion_tokens": 10}),
+        telemetry=TelemetrySession(enabled=True),
+    )
+    return ExpansionSpeculator(expansion, io), io
+
+
+async def _memories():
+    return ["m1"]
+
+
+@pytest.mark.asyncio
+async def test_matching_prompt_commits_speculative_response():
+    graph = IdeaDag(root_title="root")
+    node = graph.add_child(graph.root_id(), "open question")
+    expansion = FakeExpansion()
+    speculator, io = _speculator(expansion)
+    assert speculator.start(graph, node.node_id, _memories)
+    messages = expansion.prepare_request(graph, node.node_id, ["m1"])["messages"]
+    assert await speculator.claim(node.node_id, messages) == '{"candidates": []}'
+    assert speculator.pending_node_id is None and speculator.stats["hits"] == 1
+    assert io.telemetry.summary()["expansion_speculation"] == {
+        "hits": 1, "misses": 0, "hit_rate": 1.0, "wasted_tokens": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_changed_prompt_or_other_node_discards():
+    graph = IdeaDag(root_title="root")
+    a = graph.add_child(graph.root_id(), "a")
+    b = graph.add_child(graph.root_id(), "b")
+    expansion = FakeExpansion(delay=1.0)
+    speculator, io = _speculator(expansion)
+    speculator.start(graph, a.node_id, _memories)
+    changed = expansion.prepare_request(graph, a.node_id, ["m1", "new observation"])["messages"]
+    assert await speculator.claim(a.node_id, changed) is None
+    assert expansion.cancelled == [a.node_id]
+
+    expansion.delay = 0.0
+    speculator.start(graph, a.node_id, _memories)
+    await asyncio.sleep(0.01)
+    assert await speculator.claim(b.node_id, []) is None
+    summary = io.telemetry.speculation_summary()
+    assert summary["misses"] == 2 and summary["hit_rate"] == 0.0
+    # Only the finished (billed) response counts as waste.
+    assert summary["wasted_tokens"] == 100
+
+
+def test_prediction_picks_best_open_subproblem_outside_running_set():
+    engine = IdeaDagEngine(io=MagicMock(), settings={"speculative_expansion": True})
+    graph = IdeaDag(root_title="root")
+    running = graph.add_child(graph.root_id(), "visit", details={DetailKey.ACTION.value: IdeaActionType.VISIT.value})
+    low = graph.add_child(graph.root_id(), "low")
+    high = graph.add_child(graph.root_id(), "high")
+    leaf = graph.add_child(graph.root_id(), "search", details={DetailKey.ACTION.value: IdeaActionType.SEARCH.value})
+    for node, score in ((running, 0.99), (low, 0.3), (high, 0.8), (leaf, 0.95)):
+        graph.evaluate(node.node_id, score)
+    assert engine._predict_expansion_target(graph, [running.node_id]).node_id == high.node_id
+    assert engine._predict_expansion_target(graph, [high.node_id]).node_id == low.node_id
+
+
+class StoringChroma:
+    """Returns whatever was stored, so a write changes later retrievals."""
+
+    SPLIT_OVERFETCH_FACTOR = ConnectorChroma.SPLIT_OVERFETCH_FACTOR
+    query_chroma_split = ConnectorChroma.query_chroma_split
+    _empty_result = staticmethod(ConnectorChroma._empty_result)
+
+    def __init__(self):
+        self.rows = []
+
+    async def embed_texts(self, texts):
+        return None
+
+    async def add_to_chroma(self, collection, ids, metadatas, documents, embeddings=None):
+        self.rows.extend(zip(ids, metadatas, documents))
+        return True
+
+    async def query_chroma(self, collection, query_texts, n_results=3, where=None, query_embeddings=None):
+        wanted = (where or {}).get("memory_type")
+        types = set(wanted["$in"]) if isinstance(wanted, dict) else {wanted}
+        rows = [r for r in self.rows if r[1].get("memory_type") in types][:n_results]
+        return {
+            "documents": [[doc for _, _, doc in rows] for _ in query_texts],
+            "metadatas": [[meta for _, meta, _ in rows] for _ in query_texts],
+            "distances": [[0.1 for _ in rows] for _ in query_texts],
+            "ids": [[rid for rid, _, _ in rows] for _ in query_texts],
+        }
+
+
+@pytest.mark.asyncio
+async def test_speculation_with_memory_waits_for_the_action_result_and_hits(monkeypatch):
+    engine = IdeaDagEngine(io=MagicMock(), settings={"speculative_expansion": True})
+    engine._memory_manager = MemoryManager(connector_chroma=StoringChroma(), namespace="ns", write_behind=True)
+    expansion = FakeExpansion()
+    engine._speculator, _ = _speculator(expansion)
+    graph = IdeaDag(root_title="root")
+    visit = graph.add_child(graph.root_id(), "visit", details={DetailKey.ACTION.value: IdeaActionType.VISIT.value})
+    target = graph.add_child(graph.root_id(), "axolotl habitat")
+    graph.evaluate(target.node_id, 0.8)
+
+    async def run_action(graph, parent_id, node_id):
+        assert engine._speculator.pending_node_id is None
+        result = {"action": "visit", "success": True, "url": "https://lake.example", "content": "Axolotls live in lakes."}
+        await engine._memory_manager.write_node_result(node_id, "visit", IdeaActionType.VISIT.value, result)
+        return result
+
+    monkeypatch.setattr(engine, "_run_action", run_action)
+    engine._speculate_next_expansion(graph, [visit.node_id], 1)
+    await engine._execute_action(graph, graph.root_id(), visit.node_id)
+    assert engine._speculator.pending_node_id == target.node_id
+
+    memories = await engine._expansion_memories(graph, target, 2)
+    assert any("Axolotls live in lakes." in m["content"] for m in memories)
+    messages = expansion.prepare_request(graph, target.node_id, memories)["messages"]
+    assert await engine._speculator.claim(target.node_id, messages) == '{"candidates": []}'
+    assert engine._speculator.stats["hits"] == 1
+
@@ -0,0 +1,108 @@
+"""
+Unit tests for running several tasks at once inside one InterfaceAgent worker.
+"""
+import asyncio
+
+import pytest
+
+from agent.app import interface_agent as interface_module
+from agent.app.connector_base import ConnectorBase
+from agent.app.interface_agent import InterfaceAgent
+from shared.connector_config import ConnectorConfig
+from shared.message_contract import KeyNames
+
+
+class FakeRabbit:
+    def __init__(self):
+        self.statuses = []
+
+    async def publish_status(self, payload):
+        self.statuses.append(payload)
+
+
+class FakeStorage:
+    async def update_task(self, correlation_id, updates):
+        return True
+
+
+class FakeState:
+    def __init__(self):
+        self.states = []
+
+    async def set_state(self, state, ttl_seconds, active=None, capacity=None):
+        self.states.append((state, active, capacity))
+        return True
+
+
+class FakeAgent:
+    """Records which telemetry session the shared LLM connector sees mid-run."""
+    seen = {}
+    usage = {}
+    running = 0
+    peak = 0
+
+    def __init__(self, mandate, max_ticks, agent_io, **_):
+        self.mandate = mandate
+        self.io = agent_io
+        self.max_ticks = max_ticks
+        self.current_tick = 0
+        self.history, self.notes, self.deliverables = [], [], []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def run(self):
+        FakeAgent.running += 1
+        FakeAgent.peak = max(FakeAgent.peak, FakeAgent.running)
+        self.io.connector_llm.last_usage = {"mandate": self.mandate}
+        await asyncio.sleep(0.05)
+        FakeAgent.seen[self.mandate] = self.io.connector_llm._telemetry
+        FakeAgent.usage[self.mandate] = self.io.pop_last_llm_usage()
+        FakeAgent.running -= 1
+        return {"success": True, "deliverables": [self.mandate]}
+
+
+@pytest.fixture
+def worker(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "simulated")
+    monkeypatch.setenv("AGENT_MAX_CONCURRENT_TASKS", "3")
+    monkeypatch.setenv("AGENT_ENABLE_TRACKING", "true")
+    monkeypatch.setenv("AGENT_IDLE_WAIT_SECONDS", "60")
+    monkeypatch.setattr(interface_module, "Agent", FakeAgent)
+    agent = InterfaceAgent(ConnectorConfig())
+    agent.rabbitmq, agent.storage, agent._state = FakeRabbit(), FakeStorage(), FakeState()
+    return agent
+
+
+@pytest.mark.asyncio
+async def test_tasks_run_concurrently_with_separate_telemetry(worker):
+    assert worker.max_concurrent_tasks == 3 and worker.config.agent_prefetch_count == 3
+    payloads = [{KeyNames.CORRELATION_ID: f"c{i}", KeyNames.MANDATE: f"mandate {i}"} for i in range(3)]
+    await asyncio.gather(*[worker._handle_task(p) for p in payloads])
+
+    assert FakeAgent.peak == 3
+    assert {m: t.correlation_id for m, t in FakeAgent.seen.items()} == {f"mandate {i}": f"c{i}" for i in range(3)}
+    assert {m: u["mandate"] for m, u in FakeAgent.usage.items()} == {f"mandate {i}": f"mandate {i}" for i in range(3)}
+    completed = [s for s in worker.rabbitmq.statuses if s.get("type") == "completed"]
+    assert sorted(s["correlation_id"] for s in completed) == ["c0", "c1", "c2"]
+    assert ("working", 3, 3) in worker._state.states
+    assert worker.tasks == {} and worker._state.states[-1][0] == "waiting"
+    await worker._cancel_waiting_state()
+
+
+def test_connector_telemetry_is_task_local():
+    connector = ConnectorBase(ConnectorConfig())
+
+    async def attach(session):
+        connector.set_telemetry(session)
+        await asyncio.sleep(0.01)
+        return connector._telemetry
+
+    async def main():
+        return await asyncio.gather(attach("a"), attach("b")), connector._telemetry
+
+    (seen, outer) = asyncio.run(main())
+    assert seen == ["a", "b"] and outer is None
@@ -0,0 +1,54 @@
+"""
+Unit tests for JsonArrayStream: candidates emitted as they close, for any chunking.
+"""
+from __future__ import annotations
+
+import json
+
+from agent.app.json_stream import JsonArrayStream
+
+RESPONSE = json.dumps({
+    "meta": {"execute_all_children": False, "candidates": "not this one"},
+    "candidates": [
+        {"title": "Search {braces} and \"quotes\"", "action": "search", "details": {"query": "a]b}c"}},
+        {"title": "Visit", "action": "visit", "details": {"optional_url": "https://x.test/\\path", "tags": [1, [2]]}},
+        "not an object",
+        {"title": "Think", "action": "think", "details": {}},
+    ],
+    "trailing": [{"title": "ignored"}],
+})
+EXPECTED = [c for c in json.loads(RESPONSE)["candidates"] if isinstance(c, dict)]
+
+
+def _collect(chunks):
+    items = []
+    stream = JsonArrayStream("candidates", items.append)
+    for chunk in chunks:
+        stream.feed(chunk)
+    return items
+
+
+def test_items_match_full_parse_for_every_split_point():
+    for split in range(len(RESPONSE) + 1):
+        assert _collect([RESPONSE[:split], RESPONSE[split:]]) == EXPECTED
+
+
+def test_items_emitted_as_soon_as_their_object_closes():
+    items = []
+    stream = JsonArrayStream("candidates", items.append)
+    first_end = RESPONSE.index('"a]b}c"}}') + len('"a]b}c"}}')
+    stream.feed(RESPONSE[:first_end - 1])
+    assert items == []
+    stream.feed(RESPONSE[first_end - 1:first_end])
+    assert items == EXPECTED[:1]
+
+
+def test_reset_starts_over_for_a_retried_response():
+    items = []
+    stream = JsonArrayStream("candidates", items.append)
+    stream.feed(RESPONSE[: len(RESPONSE) // 2])
+    stream.reset()
+    items.clear()
+    for ch in RESPONSE:
+        stream.feed(ch)
+    assert items == EXPECTED and stream.emitted == len(EXPECTED)
@@ -94,3 +94,65 @@ def test_max_completion_tokens_recognizes_slug(monkeypatch):
     assert b._get_max_completion_tokens_limit("openai/gpt-5-mini") == 128000
     assert b._get_max_completion_tokens_limit("gpt-5-mini") == 128000
     assert b._get_max_completion_tokens_limit("anthropic/claude-opus-4.7") == 64000
+
+
+@pytest.mark.asyncio
+async def test_openai_stream_assembles_same_text_as_complete(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-x")
+    from types import SimpleNamespace
+    from shared.connector_config import ConnectorConfig
+    from agent.app.llm_backends import OpenAICompatibleBackend
+
+    def _chunk(content=None, finish_reason=None, usage=None, choices=True):
+        choice = SimpleNamespace(delta=SimpleNamespace(content=content), finish_reason=finish_reason)
+        return SimpleNamespace(choices=[choice] if choices else [], usage=usage)
+
+    usage = SimpleNamespace(prompt_tokens=5, completion_tokens=3, total_tokens=8)
+    chunks = [_chunk(" {\"a\":"), _chunk(" 1} "), _chunk(finish_reason="stop"), _chunk(usage=usage, choices=False)]
+    captured = {}
+
+    async def _stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def _create(**kwargs):
+        captured.update(kwargs)
+        return _stream()
+
+    b = OpenAICompatibleBackend(ConnectorConfig(), logging.getLogger("t"))
+    b.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=_create)))
+    deltas = []
+    text, got_usage = await b.complete_stream({"model": "m", "messages": []}, "m", deltas.append)
+    assert text == '{"a": 1}'
+    assert deltas == [' {"a":', " 1} "]
+    assert got_usage is usage
+    assert captured["stream"] is True and captured["stream_options"] == {"include_usage": True}
+
+
+def test_anthropic_system_prompt_is_cache_breakpoint(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "anthropic")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "sk-ant")
+    from shared.connector_config import ConnectorConfig
+    from agent.app.llm_backends import AnthropicMessagesBackend
+
+    b = AnthropicMessagesBackend(ConnectorConfig(), logging.getLogger("t"))
+    payload = {"messages": [{"role": "system", "content": "SYS"}, {"role": "user", "content": "hi"}]}
+    kwargs = b._messages_kwargs(payload, "claude-x")
+    assert kwargs["system"] == [{"type": "text", "text": "SYS", "cache_control": {"type": "ephemeral"}}]
+    monkeypatch.setenv("LLM_PROMPT_CACHE", "false")
+    b = AnthropicMessagesBackend(ConnectorConfig(), logging.getLogger("t"))
+    assert b._messages_kwargs(payload, "claude-x")["system"] == "SYS"
+
+
+def test_openrouter_marks_system_cache_control_for_anthropic_slugs(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "openrouter")
+    monkeypatch.setenv("OPENROUTER_API_KEY", "sk-or-x")
+    from shared.connector_config import ConnectorConfig
+    from agent.app.llm_backends import OpenRouterBackend
+
+    b = OpenRouterBackend(ConnectorConfig(), logging.getLogger("t"))
+    messages = [{"role": "system", "content": "SYS"}, {"role": "user", "content": "hi"}]
+    out = b.simplify_payload({"model": "anthropic/claude-sonnet-4.5", "messages": messages})
+    assert out["messages"][0]["content"] == [{"type": "text", "text": "SYS", "cache_control": {"type": "ephemeral"}}]
+    assert out["messages"][1] == messages[1] and messages[0]["content"] == "SYS"
+    assert b.simplify_payload({"model": "openai/gpt-5-mini", "messages": messages})["messages"] == messages
@@ -0,0 +1,65 @@
+"""
+Unit tests for the LLM response cache's disk store: off-loop I/O, atomic
+writes, the entry cap and the expiry sweep.
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from agent.app.llm_cache import _DiskStore
+
+
+@pytest.mark.asyncio
+async def test_disk_store_round_trip_runs_file_io_off_the_loop(tmp_path, monkeypatch):
+    calls = []
+    real_to_thread = asyncio.to_thread
+
+    async def recording_to_thread(func, *args, **kwargs):
+        calls.append(func.__name__)
+        return await real_to_thread(func, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", recording_to_thread)
+    store = _DiskStore(tmp_path, max_entries=10)
+    await store.set("k", {"content": "answer"}, ttl_seconds=60)
+    assert await store.get("k") == {"content": "answer"}
+    assert calls == ["_scan", "_write", "_read"]
+    # Written through a temp file that was renamed into place.
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["k.json"]
+
+
+@pytest.mark.asyncio
+async def test_disk_store_evicts_least_recently_used_past_the_cap(tmp_path):
+    store = _DiskStore(tmp_path, max_entries=2)
+    await store.set("a", {"content": "a"}, ttl_seconds=60)
+    await store.set("b", {"content": "b"}, ttl_seconds=60)
+    assert await store.get("a") == {"content": "a"}
+    await store.set("c", {"content": "c"}, ttl_seconds=60)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.json", "c.json"]
+    assert await store.get("b") is None
+
+
+@pytest.mark.asyncio
+async def test_disk_store_sweeps_expired_entries(tmp_path, monkeypatch):
+    store = _DiskStore(tmp_path, max_entries=10)
+    await store.set("old", {"content": "old"}, ttl_seconds=0)
+    assert (tmp_path / "old.json").exists()
+    monkeypatch.setattr(_DiskStore, "SWEEP_INTERVAL_SECONDS", 0.0)
+    await store.set("new", {"content": "new"}, ttl_seconds=60)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["new.json"]
+
+
+@pytest.mark.asyncio
+async def test_disk_store_startup_scan_drops_expired_and_stale_temp_files(tmp_path):
+    first = _DiskStore(tmp_path, max_entries=10)
+    await first.set("live", {"content": "live"}, ttl_seconds=60)
+    await first.set("dead", {"content": "dead"}, ttl_seconds=0)
+    stale = tmp_path / "crashed.tmp"
+    stale.write_text("{", encoding="utf-8")
+    old = time.time() - 2 * _DiskStore.STALE_TEMP_SECONDS
+    os.utime(stale, (old, old))
+
+    second = _DiskStore(tmp_path, max_entries=10)
+    assert await second.get("live") == {"content": "live"}
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["live.json"]
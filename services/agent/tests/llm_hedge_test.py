@@ -0,0 +1,156 @@
+"""
+Unit tests for hedged LLM requests: learned delay, winner selection, per-run budget.
+"""
+import asyncio
+from contextvars import ContextVar
+from unittest.mock import MagicMock
+
+import pytest
+
+from agent.app.agent_io import AgentIO
+from agent.app.llm_hedge import HedgePolicy, LatencyTracker
+from agent.app.telemetry import TelemetrySession
+
+
+def test_percentile_and_min_samples():
+    tracker = LatencyTracker()
+    policy = HedgePolicy(percentile=0.9, min_samples=10, min_delay_seconds=0.0, tracker=tracker)
+    for i in range(1, 10):
+        tracker.record("m", "evaluation", i / 10)
+    assert policy.delay_for("m", "evaluation") is None
+    tracker.record("m", "evaluation", 1.0)
+    assert policy.delay_for("m", "evaluation") == pytest.approx(0.9)
+    assert policy.delay_for("m", "finalize") is None
+
+
+def test_hedge_model_targets_fallback_only_when_configured():
+    assert HedgePolicy(target="same").hedge_model("m", "fb") == "m"
+    assert HedgePolicy(target="fallback").hedge_model("m", "fb") == "fb"
+    assert HedgePolicy(target="fallback").hedge_model("m", None) == "m"
+
+
+def _make_io(latencies, budget=1):
+    calls = []
+
+    async def query_llm(payload, model_name=None, operation=None, stream_sink=None):
+        calls.append(model_name)
+        try:
+            await asyncio.sleep(latencies[model_name])
+        except asyncio.CancelledError:
+            calls.append(f"cancelled:{model_name}")
+            raise
+        return f"answer from {model_name}"
+
+    llm = MagicMock()
+    llm.query_llm = query_llm
+    llm.last_usage = None
+    policy = HedgePolicy(target="fallback", min_samples=3, min_delay_seconds=0.0, budget=budget)
+    for _ in range(3):
+        policy.record("slow", "evaluation", 0.02)
+    io = AgentIO(
+        connector_llm=llm,
+        connector_search=MagicMock(),
+        connector_http=MagicMock(),
+        connector_chroma=MagicMock(),
+        telemetry=TelemetrySession(enabled=True),
+        hedge_policy=policy,
+    )
+    return io, calls
+
+
+@pytest.mark.asyncio
+async def test_slow_primary_is_hedged_and_cancelled():
+    io, calls = _make_io({"slow": 1.0, "fast": 0.01})
+    payload = {"messages": [{"role": "user", "content": "x" * 400}]}
+    out = await io.query_llm_with_fallback(payload, model_name="slow", fallback_model="fast", operation="evaluation")
+    assert out == "answer from fast"
+    await asyncio.sleep(0)
+    assert calls == ["slow", "fast", "cancelled:slow"]
+    assert io.hedge_stats["hedge_wins"] == 1 and io.hedge_budget == 0
+    assert io.telemetry.summary()["llm_hedge"] == {
+        "fired": 1, "hedge_wins": 1, "primary_wins": 0, "hedge_win_rate": 1.0, "wasted_tokens": 100,
+    }
+    event = next(e["payload"] for e in io.telemetry.events if e["event"] == "llm_hedge")
+    assert event["wasted_tokens_estimated"] is True
+
+
+class _ScopedUsageLLM:
+    """Connector stand-in with ConnectorLLM's task-local ``last_usage`` slots."""
+
+    def __init__(self, replies):
+        self._replies = replies
+        self._slot = ContextVar("usage", default=None)
+
+    def begin_usage_scope(self):
+        slot = {}
+        self._slot.set(slot)
+        return slot
+
+    @property
+    def last_usage(self):
+        slot = self._slot.get()
+        return slot.get("usage") if slot is not None else None
+
+    @last_usage.setter
+    def last_usage(self, usage):
+        if self._slot.get() is None:
+            self.begin_usage_scope()
+        self._slot.get()["usage"] = usage
+
+    def pop_last_usage(self):
+        usage, self.last_usage = self.last_usage, None
+        return usage
+
+    def get_model(self):
+        return "slow"
+
+    def set_telemetry(self, telemetry):
+        pass
+
+    async def query_llm(self, payload, model_name=None, operation=None, stream_sink=None):
+        delay, text, usage = self._replies[model_name]
+        await asyncio.sleep(delay)
+        self.last_usage = usage
+        return text
+
+
+@pytest.mark.asyncio
+async def test_hedge_sides_keep_their_own_usage_and_loser_tokens_are_recorded():
+    llm = _ScopedUsageLLM({
+        "slow": (0.05, "", {"prompt_tokens": 100, "completion_tokens": 5}),
+        "fast": (0.1, "answer", {"prompt_tokens": 7, "completion_tokens": 3}),
+    })
+    policy = HedgePolicy(target="fallback", min_samples=3, min_delay_seconds=0.0, budget=1)
+    for _ in range(3):
+        policy.record("slow", "evaluation", 0.02)
+    io = AgentIO(
+        connector_llm=llm,
+        connector_search=MagicMock(),
+        connector_http=MagicMock(),
+        connector_chroma=MagicMock(),
+        telemetry=TelemetrySession(enabled=True),
+        hedge_policy=policy,
+    )
+    out = await io.query_llm_with_fallback({}, model_name="slow", fallback_model="fast", operation="evaluation")
+    assert out == "answer"
+    assert io.pop_last_llm_usage() == {"prompt_tokens": 7, "completion_tokens": 3}
+    event = next(e["payload"] for e in io.telemetry.events if e["event"] == "llm_hedge")
+    assert (event["winner"], event["wasted_prompt_tokens"], event["wasted_completion_tokens"]) == ("hedge", 100, 5)
+    assert event["wasted_tokens_estimated"] is False
+    assert io.telemetry.llm_hedge_summary()["wasted_tokens"] == 105
+
+
+@pytest.mark.asyncio
+async def test_budget_exhausted_waits_for_primary():
+    io, calls = _make_io({"slow": 0.1, "fast": 0.01}, budget=0)
+    out = await io.query_llm_with_fallback({}, model_name="slow", fallback_model="fast", operation="evaluation")
+    assert out == "answer from slow"
+    assert calls == ["slow"]
+    assert io.hedge_stats == {"fired": 0, "primary_wins": 0, "hedge_wins": 0, "budget_exhausted": 1}
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_does_not_hedge():
+    io, calls = _make_io({"slow": 0.0, "fast": 0.0})
+    assert await io.query_llm_with_fallback({}, model_name="slow", operation="evaluation") == "answer from slow"
+    assert calls == ["slow"] and io.hedge_stats["fired"] == 0
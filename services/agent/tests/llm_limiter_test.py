@@ -0,0 +1,78 @@
+"""
+Unit tests for LLMRateLimiter: AIMD window, priority admission, RPM/TPM buckets.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from agent.app.llm_limiter import LLMRateLimiter, classify_outcome, estimate_tokens
+
+
+def test_estimate_tokens_uses_prompt_chars_and_output_cap():
+    assert estimate_tokens(4000, {"max_tokens": 200}) == 1200
+    assert estimate_tokens(400, {"max_completion_tokens": 50}) == 150
+
+
+def test_classify_outcome():
+    assert classify_outcome(None) == "ok"
+    assert classify_outcome(SimpleNamespace(status_code=429)) == "throttled"
+    assert classify_outcome(asyncio.TimeoutError()) == "throttled"
+    assert classify_outcome(ValueError("bad json")) == "error"
+    assert classify_outcome(asyncio.CancelledError()) == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_window_halves_on_throttle_and_grows_on_success():
+    limiter = LLMRateLimiter(initial_concurrency=8, cooldown_seconds=0.0)
+    await limiter.acquire("m", 10)
+    limiter.release("m", "throttled", 10)
+    assert limiter.stats()["m"]["window"] == 4
+    await limiter.acquire("m", 10)
+    limiter.release("m", "ok", 10)
+    assert limiter.stats()["m"]["window"] == 4.25
+
+
+@pytest.mark.asyncio
+async def test_queued_calls_admitted_by_operation_priority():
+    limiter = LLMRateLimiter(initial_concurrency=1, max_concurrency=1)
+    await limiter.acquire("m", 1)
+    order = []
+
+    async def call(operation):
+        await limiter.acquire("m", 1, operation)
+        order.append(operation)
+        limiter.release("m", "error", 1)
+
+    tasks = [asyncio.create_task(call(op)) for op in ("embedding", "evaluation", None, "finalize")]
+    await asyncio.sleep(0.01)
+    assert limiter.stats()["m"]["queued"] == 4
+    limiter.release("m", "error", 1)
+    await asyncio.gather(*tasks)
+    assert order == ["finalize", "evaluation", None, "embedding"]
+
+
+@pytest.mark.asyncio
+async def test_rpm_bucket_delays_calls_past_budget():
+    limiter = LLMRateLimiter(rpm=600)  # 10/s, burst of 600
+    limiter._for_model("m").requests.level = 1
+    await limiter.acquire("m", 1)
+    limiter.release("m", "ok", 1)
+    started = time.monotonic()
+    await limiter.acquire("m", 1)
+    assert time.monotonic() - started >= 0.08
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_leaves_queue():
+    limiter = LLMRateLimiter(initial_concurrency=1, max_concurrency=1)
+    await limiter.acquire("m", 1)
+    waiter = asyncio.create_task(limiter.acquire("m", 1))
+    await asyncio.sleep(0.01)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.stats()["m"]["queued"] == 0
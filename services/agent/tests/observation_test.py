@@ -0,0 +1,52 @@
+"""
+Unit tests for single-pass page extraction (observation.parse_page).
+"""
+from agent.app.observation import clean_operation, parse_page
+
+
+WIKI_HTML = (
+    "<html><head><title>Axolotl - Wikipedia</title></head><body>"
+    "<a class='mw-jump-link' href='#content'>Jump to content</a>"
+    "<nav id='p-navigation'><a href='/wiki/Main_Page'>Main page</a></nav>"
+    "<main id='content'><h1>The <i>Axolotl</i></h1>"
+    "<div class='mw-parser-output'>"
+    "<p>The axolotl is a <a href='/wiki/Salamander'>salamander</a>.</p>"
+    "<span class='mw-editsection'>[edit]</span>"
+    "<div class='navbox'><a href='/wiki/Amphibians'>Amphibians</a></div>"
+    "</div></main><footer id='footer'>Footer text</footer></body></html>"
+)
+
+
+def test_parse_page_extracts_everything_from_one_tree():
+    page = parse_page(WIKI_HTML)
+    assert page.title == "Axolotl - Wikipedia"
+    assert page.h1 == "The Axolotl"
+    assert "salamander" in page.main_text
+    for junk in ("Jump to content", "Main page", "[edit]", "Amphibians", "Footer text", "The\nAxolotl"):
+        assert junk not in page.main_text
+    # Links come from the whole page, boilerplate included, in document order.
+    assert page.links == [
+        ("#content", "Jump to content"),
+        ("/wiki/Main_Page", "Main page"),
+        ("/wiki/Salamander", "salamander"),
+        ("/wiki/Amphibians", "Amphibians"),
+    ]
+    assert page.full_text == ""
+    assert clean_operation(WIKI_HTML) == page.main_text
+
+
+def test_parse_page_full_text_fallback_when_everything_is_boilerplate():
+    page = parse_page("<html><body><nav><a href='/x'>Only nav</a></nav></body></html>")
+    assert page.main_text == ""
+    assert page.full_text == "Only nav"
+    assert page.links == [("/x", "Only nav")]
+
+
+def test_every_element_with_a_removable_id_is_dropped():
+    html = (
+        "<html><body><div id='toc'>Contents one</div><p>Body text.</p>"
+        "<div id='toc'>Contents two</div></body></html>"
+    )
+    text = parse_page(html).main_text
+    assert "Body text." in text
+    assert "Contents" not in text
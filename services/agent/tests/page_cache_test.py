@@ -0,0 +1,166 @@
+"""
+Unit tests for PageCache: URL normalization, TTL/revalidation, byte budget,
+spill, and AgentIO serving visits from the cache.
+"""
+import asyncio
+import threading
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from shared.request_result import RequestResult
+from agent.app.observation import ParsedPage
+from agent.app.page_cache import PageCache, normalize_url
+
+
+HTML = "<html><head><title>T</title></head><body><main><p>Cached body</p></main></body></html>"
+
+
+def test_normalize_url_drops_fragment_default_port_and_sorts_query():
+    assert normalize_url("HTTPS://En.Wikipedia.org:443/wiki/X?b=2&a=1#Hist") == "https://en.wikipedia.org/wiki/X?a=1&b=2"
+    assert normalize_url("http://example.com") == "http://example.com/"
+
+
+def test_identical_bodies_share_one_blob_and_parse():
+    cache = PageCache()
+    cache.store("https://a.example/x", HTML)
+    cache.store("https://b.example/y", HTML)
+    cache.store_parsed(HTML, ParsedPage(main_text="Cached body"), "https://a.example/x")
+    assert cache.stats()["blobs"] == 1
+    assert cache.parsed(HTML, "https://b.example/y").main_text == "Cached body"
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_without_validators_is_a_miss():
+    cache = PageCache(ttl_seconds=0.05)
+    cache.store("https://example.com/", HTML)
+    await asyncio.sleep(0.06)
+    assert await cache.lookup("https://example.com/") is None
+
+
+@pytest.mark.asyncio
+async def test_expired_entry_with_validators_is_revalidatable():
+    cache = PageCache(ttl_seconds=0)
+    cache.store("https://example.com/", HTML, etag='"v1"')
+    stale = await cache.lookup("https://example.com/")
+    assert stale is not None and not stale.fresh
+    assert stale.validator_headers() == {"If-None-Match": '"v1"'}
+
+
+@pytest.mark.asyncio
+async def test_budget_evicts_least_recently_used_body():
+    cache = PageCache(max_bytes=(len(HTML) + 1) * 2)
+    cache.store("https://example.com/1", HTML + "1")
+    cache.store("https://example.com/2", HTML + "2")
+    await cache.lookup("https://example.com/1")
+    cache.store("https://example.com/3", HTML + "3")
+    assert await cache.lookup("https://example.com/2") is None
+    assert (await cache.lookup("https://example.com/1")).body == HTML + "1"
+
+
+@pytest.mark.asyncio
+async def test_evicted_bodies_spill_to_disk_and_reload(tmp_path):
+    cache = PageCache(max_bytes=len(HTML) + 1, spill_dir=tmp_path)
+    cache.store("https://example.com/1", HTML + "1")
+    cache.store_parsed(HTML + "1", ParsedPage(main_text="one", links=[("/a", "A")]))
+    cache.store("https://example.com/2", HTML + "2")
+    await cache.flush()
+    assert list(tmp_path.iterdir())
+    assert (await cache.lookup("https://example.com/1")).body == HTML + "1"
+    assert cache.parsed(HTML + "1").links == [("/a", "A")]
+
+
+def _make_io(http_result, cache):
+    from agent.app.agent_io import AgentIO
+
+    mock_http = MagicMock()
+    mock_http.set_telemetry = MagicMock()
+    mock_http.request = AsyncMock(return_value=http_result)
+    io = AgentIO(
+        connector_llm=MagicMock(),
+        connector_search=MagicMock(),
+        connector_http=mock_http,
+        connector_chroma=MagicMock(),
+        page_cache=cache,
+    )
+    return io, mock_http
+
+
+@pytest.mark.asyncio
+async def test_fresh_hit_skips_fetch_and_parse():
+    cache = PageCache()
+    io, mock_http = _make_io(RequestResult(status=200, data=HTML, error=False), cache)
+    first = await io.visit("https://example.com/page")
+    second = await io.visit("https://example.com/page#section")
+    assert first == second
+    mock_http.request.assert_awaited_once()
+    assert cache.stats()["parse_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_not_modified_serves_cached_body():
+    cache = PageCache(ttl_seconds=0)
+    cache.store("https://example.com/page", HTML, etag='"v1"')
+    io, mock_http = _make_io(RequestResult(status=304, data=None, error=False), cache)
+    assert await io.fetch_url("https://example.com/page") == HTML
+    assert mock_http.request.await_args.kwargs["headers"] == {"If-None-Match": '"v1"'}
+    assert cache.stats()["revalidations"] == 1
+
+
+def test_no_store_and_private_responses_are_not_kept():
+    cache = PageCache()
+    assert cache.store("https://example.com/a", HTML)
+    assert not cache.store("https://example.com/a", HTML + "x", cache_control="no-store")
+    assert not cache.store("https://example.com/b", HTML, cache_control="Private, max-age=60")
+    assert cache.stats()["entries"] == 0 and cache.stats()["blobs"] == 0
+
+
+@pytest.mark.asyncio
+async def test_max_age_caps_the_ttl_and_no_cache_always_revalidates():
+    cache = PageCache(ttl_seconds=3600)
+    cache.store("https://example.com/a", HTML, cache_control="max-age=0", etag='"a"')
+    cache.store("https://example.com/b", HTML, cache_control="no-cache", etag='"b"')
+    cache.store("https://example.com/c", HTML, cache_control="public, max-age=600")
+    assert not (await cache.lookup("https://example.com/a")).fresh
+    assert not (await cache.lookup("https://example.com/b")).fresh
+    assert (await cache.lookup("https://example.com/c")).fresh
+    assert not cache.store("https://example.com/d", HTML, cache_control="no-cache")
+
+
+@pytest.mark.asyncio
+async def test_api_responses_are_cached_only_when_marked_cacheable():
+    cache = PageCache()
+    io, mock_http = _make_io(RequestResult(status=200, data={"answer": 42}, error=False), cache)
+    await io.fetch_url("https://api.example/v1/items")
+    await io.fetch_url("https://api.example/v1/items")
+    assert mock_http.request.await_count == 2 and cache.stats()["entries"] == 0
+    mock_http.request.return_value = RequestResult(
+        status=200, data={"answer": 42}, error=False, headers={"Cache-Control": "public, max-age=60"},
+    )
+    await io.fetch_url("https://api.example/v1/other")
+    await io.fetch_url("https://api.example/v1/other")
+    assert mock_http.request.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_spill_dir_is_bounded_and_disk_io_runs_off_the_loop(tmp_path, monkeypatch):
+    (tmp_path / ("0" * 64 + ".json")).write_text("{}")
+    cache = PageCache(max_bytes=len(HTML) + 1, spill_dir=tmp_path, max_spill_bytes=(len(HTML) + 40) * 2)
+    threads = []
+    for name in ("_read_spill", "_write_spills"):
+        original = getattr(cache, name)
+
+        def recording(*args, _original=original):
+            threads.append(threading.current_thread() is threading.main_thread())
+            return _original(*args)
+
+        monkeypatch.setattr(cache, name, recording)
+    for i in range(5):
+        cache.store(f"https://example.com/{i}", HTML + str(i))
+        await cache.flush()
+    assert len(list(tmp_path.iterdir())) == 2
+    assert cache.stats()["spill_bytes"] <= cache.max_spill_bytes
+    assert await cache.lookup("https://example.com/0") is None
+    assert (await cache.lookup("https://example.com/3")).body == HTML + "3"
+    assert threads and not any(threads)
+
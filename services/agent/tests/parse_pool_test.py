@@ -0,0 +1,25 @@
+"""
+Unit tests for the parse process pool (parse_pool.parse_page_offloaded).
+"""
+import pytest
+
+from agent.app import parse_pool
+from agent.app.observation import parse_page
+
+
+PAGE = "<html><head><title>T</title></head><body><main><p>Body text</p><a href='/a'>A</a></main></body></html>"
+
+
+@pytest.mark.asyncio
+async def test_small_pages_and_disabled_pool_stay_in_process():
+    assert await parse_pool.parse_page_offloaded(PAGE, workers=1, min_bytes=len(PAGE) + 1) is None
+    assert await parse_pool.parse_page_offloaded(PAGE, workers=0, min_bytes=0) is None
+
+
+@pytest.mark.asyncio
+async def test_large_pages_parse_in_worker_process():
+    try:
+        page = await parse_pool.parse_page_offloaded(PAGE, workers=1, min_bytes=0)
+    finally:
+        parse_pool.shutdown_parse_executor()
+    assert page == parse_page(PAGE)
@@ -109,3 +109,32 @@ class TestConfigAndSettings:
             settings = json.load(f)
         assert settings.get("visit_page_concurrency", 0) >= 1
         assert settings.get("auto_parallel_siblings") is True
+
+
+class TestPromptPrefixCaching:
+    """Run-stable prompt sections lead the request; cached prompt tokens are priced lower."""
+
+    def test_stable_sections_go_into_system_message(self):
+        from agent.app.idea_policies.action_constants import PromptBuilder
+
+        messages = PromptBuilder.build_prefixed_messages(
+            system_content="SYSTEM",
+            stable_sections=[("MANDATE", "  find x  "), ("EMPTY", "")],
+            user_content="NODE",
+        )
+        assert messages == [
+            {"role": "system", "content": "SYSTEM\n\nMANDATE:\nfind x"},
+            {"role": "user", "content": "NODE"},
+        ]
+
+    def test_estimate_cost_prices_cached_prompt_tokens(self):
+        from agent.app.model_costs import estimate_cost
+
+        full = estimate_cost("gpt-5-mini", input_tokens=1_000_000)
+        cached = estimate_cost("gpt-5-mini", input_tokens=1_000_000, cached_input_tokens=800_000)
+        assert full == pytest.approx(0.25)
+        assert cached == pytest.approx(0.2 * 0.25 + 0.8 * 0.025)
+        # Cache counts never exceed the prompt they are part of.
+        assert estimate_cost("gpt-5-mini", input_tokens=10, cached_input_tokens=50) == estimate_cost(
+            "gpt-5-mini", input_tokens=10, cached_input_tokens=10
+        )
@@ -0,0 +1,90 @@
+"""
+Unit tests for loop-lag sampling and per-phase profiling in TelemetrySession.
+"""
+import asyncio
+import json
+import time
+
+import pytest
+
+from agent.app.runtime_profiler import ProfilingOptions
+from agent.app.telemetry import TelemetrySession
+
+
+def _block(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def _busy_then_wait():
+    _block(0.03)
+    await asyncio.sleep(0.05)
+    return "done"
+
+
+def test_options_from_env(monkeypatch):
+    assert not ProfilingOptions.from_env().phases
+    monkeypatch.setenv("TELEMETRY_LOOP_LAG", "on")
+    monkeypatch.setenv("TELEMETRY_PROFILE_RATE", "0.5")
+    options = ProfilingOptions.from_env()
+    assert options.loop_lag and options.phases and options.profile_rate == 0.5
+
+
+@pytest.mark.asyncio
+async def test_phase_splits_busy_and_await_time_and_reports_stalls(tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    telemetry = TelemetrySession(
+        enabled=True, trace_path=trace,
+        profiling=ProfilingOptions(phases=True, stall_ms=20, profile_rate=1.0),
+    )
+    assert await telemetry.phase("expand", _busy_then_wait()) == "done"
+    with telemetry.measure("select"):
+        _block(0.005)
+    phases = telemetry.summary()["phases"]
+    expand = phases["expand"]
+    assert expand["calls"] == 1 and expand["slow_slices"] == 1
+    assert expand["busy_s"] == pytest.approx(0.03, abs=0.015)
+    assert expand["await_s"] >= 0.04
+    assert any("_block" in row["function"] for row in expand["hot_functions"])
+    assert phases["select"]["await_s"] == pytest.approx(0.0, abs=0.001)
+    assert [e["payload"] for e in telemetry.events if e["event"] == "loop_stall"][0]["phase"] == "expand"
+    telemetry.finish()
+    kinds = [json.loads(line).get("event") for line in trace.read_text().splitlines()]
+    assert "phase" in kinds and "loop_stall" in kinds
+
+
+@pytest.mark.asyncio
+async def test_phase_propagates_exceptions_and_cancellation():
+    telemetry = TelemetrySession(enabled=True, profiling=ProfilingOptions(phases=True))
+
+    async def fail():
+        await asyncio.sleep(0)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await telemetry.phase("execute", fail())
+    task = asyncio.create_task(telemetry.phase("execute", asyncio.sleep(10)))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert telemetry.phase_summary()["execute"]["calls"] == 2
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_samples_lag_only_when_enabled():
+    off = TelemetrySession(enabled=True, profiling=ProfilingOptions())
+    off.start_loop_monitor()
+    assert off.summary()["loop_lag"] == {}
+    telemetry = TelemetrySession(
+        enabled=True, profiling=ProfilingOptions(loop_lag=True, loop_lag_interval_ms=5, stall_ms=30),
+    )
+    telemetry.start_loop_monitor()
+    await asyncio.sleep(0.02)
+    _block(0.06)
+    await asyncio.sleep(0.02)
+    await telemetry.stop_loop_monitor()
+    lag = telemetry.summary()["loop_lag"]
+    assert lag["samples"] > 0 and lag["max_ms"] >= 30 and lag["stalls"] >= 1
+    assert any(e["payload"]["source"] == "sampler" for e in telemetry.events if e["event"] == "loop_stall")
@@ -0,0 +1,93 @@
+"""
+Unit tests for the offline load-test stack: simulated backends and the load-test driver.
+"""
+import json
+import logging
+
+import pytest
+
+from agent.app.llm_backends import create_llm_backend
+from agent.app import load_test
+from agent.app.load_test import default_mandates, run_load_test
+from agent.app.runtime_profiler import LoopLagMonitor
+from agent.app.simulated_backends import (
+    FixtureHttp,
+    ScriptedResponder,
+    SimulatedLLMBackend,
+    SimulatedSearch,
+    SimulationProfile,
+)
+from shared.connector_config import ConnectorConfig
+
+FAST = {"llm_latency": 0, "search_latency": 0, "http_latency": 0}
+
+
+def _config(profile=None):
+    config = ConnectorConfig()
+    config.llm_provider = "simulated"
+    config.sim_profile = profile
+    return config
+
+
+def test_profile_loads_json_and_latency_forms(tmp_path):
+    path = tmp_path / "profile.json"
+    path.write_text(json.dumps({"llm_latency": {"median_ms": 500, "sigma": 0.2}, "http_latency": 40, "branching": 3}))
+    profile = SimulationProfile.load(str(path))
+    assert profile.llm_latency.median_ms == 500 and profile.llm_latency.sigma == 0.2
+    assert profile.http_latency.sample(profile.rng("http")) == pytest.approx(0.04)
+    assert profile.branching == 3 and profile.search_latency.median_ms == 300
+    assert SimulationProfile.load('{"seed": 7}').seed == 7
+
+
+@pytest.mark.asyncio
+async def test_simulated_llm_answers_each_operation_with_usage():
+    backend = create_llm_backend(_config(SimulationProfile.load({**FAST, "completion_tokens": 50})), logging.getLogger("t"))
+    assert isinstance(backend, SimulatedLLMBackend)
+    user = json.dumps({"path": [{"node_id": "r"}], "parent_title": "Solar panels in Europe", "candidates": [{"id": "1"}, {"id": "2"}]})
+    content, usage = await backend.complete(
+        {"messages": [{"role": "system", "content": "Output: JSON {candidates: [...]}"}, {"role": "user", "content": user}]},
+        "simulated",
+    )
+    candidates = json.loads(content)["candidates"]
+    assert [c["action"] for c in candidates] == ["search", "visit", "search", "visit"]
+    assert usage.completion_tokens == 50 and usage.prompt_tokens > 0
+    content, _ = await backend.complete(
+        {"messages": [{"role": "system", "content": 'Return JSON: {"scores": [...]}'}, {"role": "user", "content": user}]},
+        "simulated",
+    )
+    assert [s["id"] for s in json.loads(content)["scores"]] == ["1", "2"]
+    assert ScriptedResponder.operation("Return JSON: {summary, goal_achieved: boolean}") == "merge"
+
+
+@pytest.mark.asyncio
+async def test_failure_rates_surface_like_real_failures():
+    profile = SimulationProfile.load({**FAST, "llm_failure_rate": 1, "search_failure_rate": 1, "http_failure_rate": 1})
+    config = _config(profile)
+    with pytest.raises(TimeoutError):
+        await SimulatedLLMBackend(config, logging.getLogger("t")).complete({"messages": []}, "simulated")
+    with pytest.raises(RuntimeError):
+        await SimulatedSearch(config).query_search("anything")
+    result = await FixtureHttp(config).request("GET", "https://sim.example/a/b")
+    assert result.error and result.status == 503
+
+
+@pytest.mark.asyncio
+async def test_load_test_runs_concurrent_mandates_offline(monkeypatch):
+    monitors = []
+
+    class RecordingMonitor(LoopLagMonitor):
+        def __init__(self, **kwargs):
+            super().__init__(**kwargs)
+            monitors.append(self)
+
+    monkeypatch.setattr(load_test, "LoopLagMonitor", RecordingMonitor)
+    monkeypatch.setenv("TELEMETRY_STALL_MS", "250")
+    report = await run_load_test(
+        default_mandates(2), concurrency=2, max_steps=12, profile=SimulationProfile.load(FAST),
+    )
+    assert report["failed"] == 0 and report["steps"] > 0 and report["llm_calls"] > 0
+    assert report["steps_per_second"] > 0
+    assert {"mean_ms", "p95_ms", "max_ms"} <= set(report["event_loop_lag"])
+    assert report["phases"]["expand"]["calls"] > 0 and report["phases"]["execute"]["calls"] > 0
+    assert report["phases"]["finalize"]["calls"] > 0
+    assert [m.stall_seconds for m in monitors] == [0.25]
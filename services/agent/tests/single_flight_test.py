@@ -0,0 +1,112 @@
+"""
+Unit tests for AgentIO single-flight coalescing of visits, fetches and searches.
+"""
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from shared.request_result import RequestResult
+from agent.app.agent_io import AgentIO
+
+
+HTML = "<html><body><main><p>Shared page</p></main></body></html>"
+
+
+def _make_io(delay: float = 0.05):
+    calls = {"http": 0, "search": 0}
+
+    async def request(method, url, retries=2, **kwargs):
+        calls["http"] += 1
+        await asyncio.sleep(delay)
+        return RequestResult(status=200, data=HTML, error=False)
+
+    async def query_search(query, count=10):
+        calls["search"] += 1
+        await asyncio.sleep(delay)
+        return [{"title": "T", "url": "https://example.com", "description": "D"}]
+
+    http = MagicMock()
+    http.request = request
+    search = MagicMock()
+    search.query_search = query_search
+    io = AgentIO(
+        connector_llm=MagicMock(),
+        connector_search=search,
+        connector_http=http,
+        connector_chroma=MagicMock(),
+    )
+    return io, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_visits_and_fetches_share_one_request():
+    io, calls = _make_io()
+    results = await asyncio.gather(
+        io.visit("https://example.com/page"),
+        io.visit("https://example.com/page#top"),
+        io.fetch_url("https://example.com/page"),
+    )
+    assert calls["http"] == 1
+    assert results[0] == results[1]
+    assert results[2] == HTML
+    assert io.coalesced_counts == {"page": 2}
+    assert not io._inflight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_searches_share_one_query_but_not_result_lists():
+    io, calls = _make_io()
+    first, second = await asyncio.gather(io.search("q", count=5), io.search("q", count=5))
+    assert calls["search"] == 1
+    assert first == second and first is not second
+    await io.search("q", count=5)
+    assert calls["search"] == 2
+
+
+@pytest.mark.asyncio
+async def test_every_search_caller_gets_its_own_result_dicts():
+    io, _ = _make_io()
+    served = [{"title": "T", "url": "https://example.com", "description": "D"}]
+
+    async def query_search(query, count=10):
+        await asyncio.sleep(0.01)
+        return served
+
+    io.connector_search.query_search = query_search
+    leader, joiner = await asyncio.gather(io.search("q"), io.search("q"))
+    leader[0]["title"] = "edited by leader"
+    joiner[0]["title"] = "edited by joiner"
+    assert served[0]["title"] == "T"
+
+
+@pytest.mark.asyncio
+async def test_joiner_timeout_does_not_cancel_leader():
+    io, calls = _make_io(delay=0.1)
+    leader = asyncio.ensure_future(io.fetch_url("https://example.com/slow"))
+    await asyncio.sleep(0)
+    with pytest.raises(asyncio.TimeoutError):
+        await io.fetch_url("https://example.com/slow", timeout_seconds=0.01)
+    assert await leader == HTML
+    assert calls["http"] == 1
+
+
+@pytest.mark.asyncio
+async def test_caller_after_last_waiter_leaves_starts_new_flight():
+    io, _ = _make_io()
+    started = []
+
+    async def slow_to_cancel():
+        started.append(True)
+        try:
+            await asyncio.sleep(0.05)
+            return "fresh"
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.02)
+            raise
+
+    with pytest.raises(asyncio.TimeoutError):
+        await io._single_flight(("page", "u"), slow_to_cancel, None, leader_timeout_seconds=0.01)
+    result, coalesced = await io._single_flight(("page", "u"), slow_to_cancel, None)
+    assert (result, coalesced) == ("fresh", False)
+    assert len(started) == 2
@@ -3,19 +3,22 @@ import os
 from datetime import datetime
 from typing import Optional
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, APIRouter, Depends, HTTPException, status
+from fastapi import FastAPI, APIRouter, Depends, Header, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from shared.connector_config import ConnectorConfig
 from shared.connector_rabbitmq import ConnectorRabbitMQ
 from shared.models import TaskRequest, TaskResponse
+from shared.message_contract import TaskState, to_dict
 from shared.storage import RedisTaskStorage, SupabaseTaskStorage
 from gateway.app.task_registrar import GatewayTaskRegistrar
 from shared.pretty_log import setup_service_logger, log_connection_status
 from shared.startup_message import log_startup_message, log_shutdown_message
 from shared.health import HealthMonitor
 from gateway.app.gateway_service import GatewayService
+from gateway.app.status_stream import format_sse
 from gateway.app.supabase_auth import SupabaseUser, get_current_supabase_user
 from shared.user_quota import SupabaseUserTickManager
 from shared.versioning import get_version_info
@@ -263,6 +266,51 @@ def create_app(service: Optional[GatewayService] = None) -> FastAPI:
     ) -> TaskResponse:
         return await _service.get_task(correlation_id)
 
+    @router.get("/tasks/{correlation_id}/events")
+    async def stream_task_events(
+        correlation_id: str,
+        request: Request,
+        user: SupabaseUser = Depends(get_current_supabase_user),
+        last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    ) -> StreamingResponse:
+        """
+        Stream task status updates as Server-Sent Events.
+        Replays buffered events after ``Last-Event-ID`` on reconnect; when the
+        gateway has seen nothing for the task yet, a single ``snapshot`` event
+        is read from storage first. The stream ends after a terminal status.
+        :param correlation_id: Identifier of the task.
+        :param last_event_id: Id of the last event the client received.
+        :returns: ``text/event-stream`` response.
+        """
+        keepalive_s = float(os.environ.get("GATEWAY_STATUS_STREAM_KEEPALIVE", "15"))
+        try:
+            resume_from = int(last_event_id) if last_event_id else None
+        except ValueError:
+            resume_from = None
+        terminal_states = {TaskState.COMPLETED.value, TaskState.FAILED.value}
+
+        async def events():
+            async with _service.status_hub.subscribe(correlation_id, resume_from) as subscription:
+                if not subscription.has_history:
+                    snapshot = await _service.get_task(correlation_id)
+                    yield format_sse(to_dict(snapshot), event="snapshot")
+                    if snapshot.status in terminal_states:
+                        return
+                while not await request.is_disconnected():
+                    event = await subscription.next(timeout=keepalive_s)
+                    if event is None:
+                        yield ": keepalive\n\n"
+                        continue
+                    yield format_sse(event.data, event=event.type, event_id=event.id)
+                    if event.terminal:
+                        return
+
+        return StreamingResponse(
+            events(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
     app.include_router(router)
 
     return app
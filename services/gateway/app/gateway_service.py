@@ -1,12 +1,14 @@
 import asyncio
 import logging
 import os
+import time
 import uuid
 from datetime import datetime
 from typing import Optional
 
 from shared.connector_config import ConnectorConfig
 from shared.connector_rabbitmq import ConnectorRabbitMQ
+from shared.connector_redis import close_shared_redis
 from shared.models import TaskRequest, TaskResponse, TaskRecord
 from shared.message_contract import (
     TaskEnvelope,
@@ -17,6 +19,7 @@ from shared.message_contract import (
 )
 from shared.storage import RedisTaskStorage, SupabaseTaskStorage
 from gateway.app.task_registrar import GatewayTaskRegistrar
+from gateway.app.status_stream import TaskStatusHub
 
 
 class GatewayService:
@@ -53,6 +56,8 @@ class GatewayService:
         self._running = False
         self._queue_depth_task: Optional[asyncio.Task] = None
         self._status_sync_task: Optional[asyncio.Task] = None
+        self._status_stream_task: Optional[asyncio.Task] = None
+        self.status_hub = TaskStatusHub()
         self._queue_depths: dict[str, Optional[int]] = {}
 
     async def start(self) -> None:
@@ -71,6 +76,10 @@ class GatewayService:
         self._queue_depth_task = asyncio.create_task(self._queue_depth_loop())
         self._status_sync_task = asyncio.create_task(self._status_sync_loop())
         self.logger.info("Gateway status sync loop started")
+
+        if os.environ.get("GATEWAY_STATUS_STREAM_ENABLED", "true").lower() in ("1", "true", "yes"):
+            self._status_stream_task = asyncio.create_task(self._status_stream_loop())
+            self.logger.info("Gateway status stream consumer started")
     
     async def _init_redis_background(self) -> None:
         """
@@ -99,6 +108,12 @@ class GatewayService:
                 await self._status_sync_task
             except asyncio.CancelledError:
                 pass
+        if self._status_stream_task and not self._status_stream_task.done():
+            self._status_stream_task.cancel()
+            try:
+                await self._status_stream_task
+            except asyncio.CancelledError:
+                pass
         
         await self.rabbitmq.disconnect()
         if hasattr(self.redis_storage, 'connector'):
@@ -106,6 +121,10 @@ class GatewayService:
                 await self.redis_storage.connector.disconnect()
             except Exception as e:
                 self.logger.debug(f"Error disconnecting Redis: {e}")
+        try:
+            await close_shared_redis()
+        except Exception as e:
+            self.logger.debug(f"Error closing Redis pool: {e}")
         self.logger.info("GatewayService stopped")
     
     async def _queue_depth_loop(self) -> None:
@@ -176,14 +195,34 @@ class GatewayService:
     async def _status_sync_loop(self) -> None:
         """
         Periodically sync Redis task statuses into Supabase.
+
+        Each tick drains the change feed (only tasks and fields written since
+        the last tick). A full scan runs every ``GATEWAY_STATUS_FULL_SYNC_INTERVAL``
+        seconds (0 disables) to pick up records written without change tracking.
         :returns: None
         """
         interval_s = float(os.environ.get("GATEWAY_STATUS_SYNC_INTERVAL", str(self.config.status_time)))
-        self.logger.info("Status sync interval configured", extra={"interval_s": interval_s})
+        full_interval_s = float(os.environ.get("GATEWAY_STATUS_FULL_SYNC_INTERVAL", "300"))
+        batch_size = int(os.environ.get("GATEWAY_STATUS_SYNC_BATCH", "100"))
+        concurrency = int(os.environ.get("GATEWAY_STATUS_SYNC_CONCURRENCY", "8"))
+        self.logger.info(
+            "Status sync interval configured",
+            extra={
+                "interval_s": interval_s,
+                "full_interval_s": full_interval_s,
+                "batch_size": batch_size,
+                "concurrency": concurrency,
+            },
+        )
+        last_full_sync = 0.0
         try:
             while self._running:
                 try:
-                    await self.registrar.sync_from_redis_once()
+                    now = time.monotonic()
+                    if full_interval_s > 0 and (last_full_sync == 0.0 or now - last_full_sync >= full_interval_s):
+                        last_full_sync = now
+                        await self.registrar.sync_from_redis_once()
+                    await self.registrar.sync_changes_once(batch_size=batch_size, concurrency=concurrency)
                 except asyncio.CancelledError:
                     raise
                 except Exception as e:
@@ -199,6 +238,31 @@ class GatewayService:
         except Exception as e:
             self.logger.error(f"Status sync loop fatal error: {e}", exc_info=True)
 
+    async def _status_stream_loop(self) -> None:
+        """
+        Feed the status hub from the agent status queue.
+        Reconnects after ``GATEWAY_STATUS_STREAM_RETRY`` seconds if consuming fails.
+        :returns: None
+        """
+        retry_s = float(os.environ.get("GATEWAY_STATUS_STREAM_RETRY", "5"))
+        prefetch = int(os.environ.get("GATEWAY_STATUS_STREAM_PREFETCH", "50"))
+        try:
+            while self._running:
+                try:
+                    await self.rabbitmq.consume_status_updates(self.status_hub.publish, prefetch_count=prefetch)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    self.logger.warning(
+                        "Status stream consumer error",
+                        extra={"error": str(e), "error_type": type(e).__name__},
+                        exc_info=True,
+                    )
+                await asyncio.sleep(retry_s)
+        except asyncio.CancelledError:
+            self.logger.info("Status stream consumer stopped")
+            raise
+
     async def create_task(self, req: TaskRequest, user_id: str, access_token: str) -> TaskResponse:
         """
         Create a new task record and publish an envelope to the input queue.
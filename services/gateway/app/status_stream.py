@@ -0,0 +1,199 @@
+"""
+In-process fan-out of worker status envelopes to streaming API subscribers.
+
+The gateway consumes the agent status queue and hands every envelope to a
+``TaskStatusHub``. Each task keeps a short replay buffer so a client that
+reconnects with ``Last-Event-ID`` receives what it missed without touching
+Supabase.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Set
+
+from shared.message_contract import KeyNames, StatusType
+
+TERMINAL_TYPES = {StatusType.COMPLETED.value, StatusType.ERROR.value}
+
+
+@dataclass
+class StatusEvent:
+    """One status envelope with its per-task stream id."""
+    id: int
+    type: str
+    data: Dict[str, Any]
+
+    @property
+    def terminal(self) -> bool:
+        return self.type in TERMINAL_TYPES
+
+
+@dataclass
+class _TaskChannel:
+    """Replay buffer and live subscriber queues for one task."""
+    buffer: Deque[StatusEvent]
+    subscribers: Set[asyncio.Queue] = field(default_factory=set)
+    last_id: int = 0
+    touched: float = field(default_factory=time.monotonic)
+
+
+class TaskStatusHub:
+    """
+    Fans status envelopes out to per-task subscribers.
+
+    Channels are tracked in LRU order; idle channels without subscribers are
+    evicted once ``max_tasks`` is exceeded or ``ttl_seconds`` has passed.
+    """
+
+    def __init__(
+        self,
+        replay_size: Optional[int] = None,
+        max_tasks: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        subscriber_queue_size: Optional[int] = None,
+    ) -> None:
+        """
+        :param replay_size: Events kept per task for reconnects (GATEWAY_STATUS_REPLAY_SIZE).
+        :param max_tasks: Tasks tracked at once (GATEWAY_STATUS_STREAM_MAX_TASKS).
+        :param ttl_seconds: Idle seconds before a task is forgotten (GATEWAY_STATUS_STREAM_TTL).
+        :param subscriber_queue_size: Pending events per subscriber before the oldest is dropped.
+        """
+        self.replay_size = max(1, replay_size or int(os.environ.get("GATEWAY_STATUS_REPLAY_SIZE", "20")))
+        self.max_tasks = max(1, max_tasks or int(os.environ.get("GATEWAY_STATUS_STREAM_MAX_TASKS", "1000")))
+        self.ttl_seconds = ttl_seconds or float(os.environ.get("GATEWAY_STATUS_STREAM_TTL", "900"))
+        self.subscriber_queue_size = max(1, subscriber_queue_size or 100)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._channels: "OrderedDict[str, _TaskChannel]" = OrderedDict()
+
+    def _channel(self, correlation_id: str) -> _TaskChannel:
+        channel = self._channels.get(correlation_id)
+        if channel is None:
+            channel = _TaskChannel(buffer=deque(maxlen=self.replay_size))
+            self._channels[correlation_id] = channel
+        self._channels.move_to_end(correlation_id)
+        channel.touched = time.monotonic()
+        self._evict()
+        return channel
+
+    def _evict(self) -> None:
+        """Drop idle channels past the TTL or beyond the task cap (oldest first)."""
+        now = time.monotonic()
+        for cid in list(self._channels):
+            if len(self._channels) <= self.max_tasks and now - self._channels[cid].touched < self.ttl_seconds:
+                break
+            if not self._channels[cid].subscribers:
+                del self._channels[cid]
+
+    async def publish(self, payload: Dict[str, Any]) -> Optional[StatusEvent]:
+        """
+        Record a status envelope and deliver it to the task's subscribers.
+        Used directly as the ``consume_status_updates`` callback.
+        :param payload: Status envelope as published by the agent.
+        :returns: The recorded event, or None when the payload has no correlation id.
+        """
+        correlation_id = payload.get(KeyNames.CORRELATION_ID)
+        if not correlation_id:
+            self.logger.debug("Dropping status without correlation id", extra={"payload": payload})
+            return None
+        channel = self._channel(str(correlation_id))
+        channel.last_id += 1
+        event = StatusEvent(id=channel.last_id, type=str(payload.get("type", "")), data=payload)
+        channel.buffer.append(event)
+        for queue in list(channel.subscribers):
+            if queue.full():
+                # A slow reader loses its oldest pending event rather than stalling the consumer.
+                queue.get_nowait()
+            queue.put_nowait(event)
+        return event
+
+    def replay(self, correlation_id: str, last_event_id: Optional[int] = None) -> List[StatusEvent]:
+        """
+        Buffered events newer than ``last_event_id``.
+        An id ahead of the buffer (e.g. after a gateway restart) replays everything kept.
+        :param correlation_id: Task identifier.
+        :param last_event_id: Last id the client saw, if any.
+        :returns: Events in publish order.
+        """
+        channel = self._channels.get(correlation_id)
+        if channel is None:
+            return []
+        if last_event_id is None or last_event_id > channel.last_id:
+            return list(channel.buffer)
+        return [event for event in channel.buffer if event.id > last_event_id]
+
+    @asynccontextmanager
+    async def subscribe(
+        self,
+        correlation_id: str,
+        last_event_id: Optional[int] = None,
+    ) -> AsyncIterator["Subscription"]:
+        """
+        Subscribe to a task's status events, starting with the replay buffer.
+        :param correlation_id: Task identifier.
+        :param last_event_id: Last id the client saw, if reconnecting.
+        :returns: Subscription yielding replayed then live events.
+        """
+        channel = self._channel(correlation_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.subscriber_queue_size)
+        subscription = Subscription(self.replay(correlation_id, last_event_id), queue, channel.last_id > 0)
+        channel.subscribers.add(queue)
+        try:
+            yield subscription
+        finally:
+            channel.subscribers.discard(queue)
+            channel.touched = time.monotonic()
+
+    def subscriber_count(self) -> int:
+        """
+        :returns: Live subscribers across all tasks.
+        """
+        return sum(len(channel.subscribers) for channel in self._channels.values())
+
+
+class Subscription:
+    """Replayed events first, then live events from the hub."""
+
+    def __init__(self, replayed: List[StatusEvent], queue: asyncio.Queue, has_history: bool) -> None:
+        """
+        :param replayed: Buffered events to deliver before live ones.
+        :param queue: Live event queue registered with the hub.
+        :param has_history: Whether the hub had seen any event for the task.
+        """
+        self._pending = deque(replayed)
+        self._queue = queue
+        self.has_history = has_history
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[StatusEvent]:
+        """
+        Wait for the next event.
+        :param timeout: Seconds to wait before returning None.
+        :returns: The next event, or None on timeout.
+        """
+        if self._pending:
+            return self._pending.popleft()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+def format_sse(data: Dict[str, Any], event: Optional[str] = None, event_id: Optional[int] = None) -> str:
+    """
+    Encode one Server-Sent Events message.
+    :param data: JSON payload.
+    :param event: Optional event name.
+    :param event_id: Optional id echoed back by clients as ``Last-Event-ID``.
+    :returns: SSE frame terminated by a blank line.
+    """
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
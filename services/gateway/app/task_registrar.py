@@ -1,6 +1,7 @@
+import asyncio
 import logging
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 from shared.storage import RedisTaskStorage, SupabaseTaskStorage
 from shared.models import TaskRequest
@@ -97,75 +98,125 @@ class GatewayTaskRegistrar:
         data = getattr(response, "data", None)
         return bool(data)
 
-    async def sync_from_redis_once(self) -> int:
+    # Fields mirrored from Redis task records into Supabase rows.
+    _SYNCED_FIELDS = ("status", "updated_at", "mandate", "tick", "max_ticks", "result", "error")
+
+    def _build_updates(self, data: dict, fields: Optional[set] = None) -> dict:
         """
-        Sync Redis task statuses into Supabase and prune terminal tasks from Redis.
-        :return: Count of synced tasks
+        Build the Supabase update for a Redis task record.
+        :param data: Redis task record
+        :param fields: Changed field names; None sends every synced field present
+        :return: Update payload (always carries updated_at)
         """
-        tasks = await self.redis_storage.list_tasks()
-        synced = 0
-        deleted = 0
-        missing = 0
-        for data in tasks:
-            if not isinstance(data, dict):
-                continue
-            correlation_id = data.get("correlation_id")
-            if not correlation_id:
-                continue
-            status = self._normalize_status(data.get("status"))
-            updates = {
-                "status": status,
-                "updated_at": data.get("updated_at") or datetime.utcnow().isoformat(),
-            }
-            if "mandate" in data:
-                updates["mandate"] = data.get("mandate")
-            if "tick" in data:
-                updates["tick"] = data.get("tick")
-            if "max_ticks" in data:
-                updates["max_ticks"] = data.get("max_ticks")
-            if "result" in data:
-                updates["result"] = data.get("result")
-            if "error" in data:
-                updates["error"] = data.get("error")
+        wanted = [f for f in self._SYNCED_FIELDS if f in data and (fields is None or f in fields)]
+        updates = {field: data.get(field) for field in wanted}
+        if "status" in updates or fields is None:
+            updates["status"] = self._normalize_status(data.get("status"))
+        updates["updated_at"] = data.get("updated_at") or datetime.utcnow().isoformat()
+        return updates
 
+    async def _sync_task(self, correlation_id: str, updates: dict, stats: Dict[str, int]) -> bool:
+        """
+        Write one task's updates to Supabase and prune it from Redis once terminal.
+        :param correlation_id: Task correlation id
+        :param updates: Update payload
+        :param stats: Counters updated in place (synced, deleted, missing)
+        :return: False when the Supabase write failed (caller may retry)
+        """
+        try:
+            updated = await self._update_supabase(correlation_id, updates)
+        except Exception as e:
+            self.logger.warning(
+                "Supabase task update failed",
+                extra={"correlation_id": correlation_id, "error": str(e)},
+            )
+            return False
+        if not updated:
+            self.logger.warning(
+                "Supabase task row not found for Redis update",
+                extra={"correlation_id": correlation_id},
+            )
+            stats["missing"] += 1
+            return True
+        stats["synced"] += 1
+        status = updates.get("status")
+        self.logger.info(
+            "Supabase task updated",
+            extra={"correlation_id": correlation_id, "status": status, "fields": sorted(updates)},
+        )
+
+        if status in (TaskState.COMPLETED.value, TaskState.FAILED.value):
             try:
-                updated = await self._update_supabase(correlation_id, updates)
-                if not updated:
-                    self.logger.warning(
-                        "Supabase task row not found for Redis update",
-                        extra={"correlation_id": correlation_id},
-                    )
-                    missing += 1
-                    continue
-                synced += 1
+                await self.redis_storage.delete_task(correlation_id)
+                stats["deleted"] += 1
                 self.logger.info(
-                    "Supabase task updated",
-                    extra={"correlation_id": correlation_id, "status": updates.get("status")},
+                    "Redis task removed after terminal status",
+                    extra={"correlation_id": correlation_id, "status": status},
                 )
             except Exception as e:
-                self.logger.warning(
-                    "Supabase task update failed",
+                self.logger.debug(
+                    "Failed to delete Redis task after completion",
                     extra={"correlation_id": correlation_id, "error": str(e)},
                 )
-                continue
+        return True
 
-            if status in (TaskState.COMPLETED.value, TaskState.FAILED.value):
+    async def sync_changes_once(self, batch_size: int = 100, concurrency: int = 8, max_batches: int = 10) -> int:
+        """
+        Sync only the tasks (and fields) changed in Redis since the last call.
+
+        Drains the storage change feed in batches of ``batch_size`` and writes
+        each task's changed fields with at most ``concurrency`` Supabase calls
+        in flight. Failed writes are re-queued for the next call.
+        :param batch_size: Tasks drained per batch
+        :param concurrency: Concurrent Supabase writes
+        :param max_batches: Batches per call, bounding one sync pass
+        :return: Count of synced tasks
+        """
+        stats = {"synced": 0, "deleted": 0, "missing": 0, "retried": 0}
+        gate = asyncio.Semaphore(max(1, concurrency))
+        seen = 0
+
+        async def sync_one(correlation_id: str, record: dict, fields: Optional[set]) -> None:
+            async with gate:
+                ok = await self._sync_task(correlation_id, self._build_updates(record, fields), stats)
+            if not ok:
+                stats["retried"] += 1
                 try:
-                    await self.redis_storage.delete_task(correlation_id)
-                    deleted += 1
-                    self.logger.info(
-                        "Redis task removed after terminal status",
-                        extra={"correlation_id": correlation_id, "status": status},
-                    )
+                    await self.redis_storage.mark_changed(correlation_id, fields)
                 except Exception as e:
                     self.logger.debug(
-                        "Failed to delete Redis task after completion",
+                        "Failed to re-queue task change",
                         extra={"correlation_id": correlation_id, "error": str(e)},
                     )
-        if tasks:
-            self.logger.info(
-                "Redis status sync complete",
-                extra={"seen": len(tasks), "synced": synced, "deleted": deleted, "missing": missing},
-            )
-        return synced
 
+        for _ in range(max(1, max_batches)):
+            changes = await self.redis_storage.drain_changes(batch_size)
+            if not changes:
+                break
+            seen += len(changes)
+            await asyncio.gather(*[sync_one(cid, record, fields) for cid, record, fields in changes])
+            if len(changes) < batch_size:
+                break
+        if seen:
+            self.logger.info("Redis change sync complete", extra={"changed": seen, **stats})
+        return stats["synced"]
+
+    async def sync_from_redis_once(self) -> int:
+        """
+        Full sync: push every Redis task into Supabase and prune terminal tasks from Redis.
+        Safety net for records written without change tracking; the regular path is
+        ``sync_changes_once``.
+        :return: Count of synced tasks
+        """
+        tasks = await self.redis_storage.list_tasks()
+        stats = {"synced": 0, "deleted": 0, "missing": 0}
+        for data in tasks:
+            if not isinstance(data, dict):
+                continue
+            correlation_id = data.get("correlation_id")
+            if not correlation_id:
+                continue
+            await self._sync_task(correlation_id, self._build_updates(data), stats)
+        if tasks:
+            self.logger.info("Redis status sync complete", extra={"seen": len(tasks), **stats})
+        return stats["synced"]
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+
+from gateway.app.status_stream import TaskStatusHub, format_sse
+
+
+def _status(cid, kind, **extra):
+    return {"type": kind, "mandate": "m", "correlation_id": cid, **extra}
+
+
+@pytest.mark.asyncio
+async def test_subscribers_get_replay_then_live_events():
+    hub = TaskStatusHub(replay_size=3)
+    await hub.publish(_status("a", "accepted"))
+    await hub.publish(_status("b", "accepted"))
+    async with hub.subscribe("a") as first, hub.subscribe("a") as second:
+        assert first.has_history and hub.subscriber_count() == 2
+        await hub.publish(_status("a", "in_progress", tick=1))
+        for sub in (first, second):
+            assert [(await sub.next(timeout=0.1)).type for _ in range(2)] == ["accepted", "in_progress"]
+            assert await sub.next(timeout=0.01) is None
+    assert hub.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_reconnect_resumes_after_last_event_id():
+    hub = TaskStatusHub(replay_size=2)
+    for tick in range(4):
+        await hub.publish(_status("a", "in_progress", tick=tick))
+    await hub.publish(_status("a", "completed"))
+    assert [e.id for e in hub.replay("a", last_event_id=3)] == [4, 5]
+    assert [e.id for e in hub.replay("a", last_event_id=99)] == [4, 5]
+    async with hub.subscribe("a", last_event_id=4) as sub:
+        event = await sub.next(timeout=0.1)
+        assert event.id == 5 and event.terminal
+    async with hub.subscribe("unknown") as sub:
+        assert not sub.has_history and await sub.next(timeout=0.01) is None
+
+
+@pytest.mark.asyncio
+async def test_idle_tasks_are_evicted_but_subscribed_ones_kept():
+    hub = TaskStatusHub(max_tasks=2)
+    async with hub.subscribe("watched"):
+        for cid in ("x", "y", "z"):
+            await hub.publish(_status(cid, "accepted"))
+        assert hub.replay("x") == [] and hub.replay("z")
+        assert "watched" in hub._channels
+    assert await hub.publish({"type": "accepted"}) is None
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_drops_oldest_instead_of_blocking():
+    hub = TaskStatusHub(subscriber_queue_size=2)
+    async with hub.subscribe("a") as sub:
+        for tick in range(5):
+            await asyncio.wait_for(hub.publish(_status("a", "in_progress", tick=tick)), 0.1)
+        assert [(await sub.next(timeout=0.1)).id for _ in range(2)] == [4, 5]
+
+
+def test_format_sse_frame():
+    frame = format_sse({"status": "completed"}, event="completed", event_id=7)
+    lines = frame.split("\n")
+    assert lines[:2] == ["id: 7", "event: completed"]
+    assert json.loads(lines[2][len("data: "):]) == {"status": "completed"}
+    assert frame.endswith("\n\n")
@@ -0,0 +1,61 @@
+import pytest
+
+from gateway.app.task_registrar import GatewayTaskRegistrar
+
+
+class FeedStorage:
+    """Redis storage stand-in exposing the change feed."""
+
+    def __init__(self, changes):
+        self.changes = list(changes)
+        self.requeued = []
+        self.deleted = []
+
+    async def drain_changes(self, limit):
+        batch, self.changes = self.changes[:limit], self.changes[limit:]
+        return batch
+
+    async def mark_changed(self, correlation_id, fields=None):
+        self.requeued.append((correlation_id, fields))
+
+    async def delete_task(self, correlation_id):
+        self.deleted.append(correlation_id)
+        return True
+
+
+class RecordingRegistrar(GatewayTaskRegistrar):
+    def __init__(self, storage, fail=()):
+        super().__init__(storage, supabase_storage=None)
+        self.writes = []
+        self.fail = set(fail)
+
+    async def _update_supabase(self, correlation_id, updates):
+        if correlation_id in self.fail:
+            raise RuntimeError("supabase unavailable")
+        self.writes.append((correlation_id, updates))
+        return True
+
+
+@pytest.mark.asyncio
+async def test_change_sync_sends_only_changed_fields():
+    record = {"correlation_id": "a", "status": "in_progress", "mandate": "m", "tick": 7,
+              "result": {"big": "x"}, "updated_at": "t1"}
+    registrar = RecordingRegistrar(FeedStorage([("a", record, {"tick", "updated_at"})]))
+    assert await registrar.sync_changes_once() == 1
+    assert registrar.writes == [("a", {"tick": 7, "updated_at": "t1"})]
+
+
+@pytest.mark.asyncio
+async def test_change_sync_batches_prunes_terminal_and_requeues_failures():
+    changes = [
+        (f"t{i}", {"correlation_id": f"t{i}", "status": "completed", "result": i, "updated_at": "t"},
+         {"status", "result", "updated_at"})
+        for i in range(5)
+    ]
+    storage = FeedStorage(changes)
+    registrar = RecordingRegistrar(storage, fail={"t3"})
+    assert await registrar.sync_changes_once(batch_size=2, concurrency=2) == 4
+    assert {cid for cid, _ in registrar.writes} == {"t0", "t1", "t2", "t4"}
+    assert all(update["status"] == "completed" for _, update in registrar.writes)
+    assert sorted(storage.deleted) == ["t0", "t1", "t2", "t4"]
+    assert storage.requeued == [("t3", {"status", "result", "updated_at"})]
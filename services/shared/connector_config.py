@@ -10,6 +10,10 @@ class ConnectorConfig:
     def __init__(self):
         self.logger = logging.getLogger(self.__class__.__name__)
         self.redis_url = os.environ.get("REDIS_URL")
+        self.redis_pool_size = int(os.environ.get("REDIS_POOL_SIZE", "32"))
+        self.redis_pool_timeout = float(os.environ.get("REDIS_POOL_TIMEOUT", "5"))
+        self.redis_health_check_interval = int(os.environ.get("REDIS_HEALTH_CHECK_INTERVAL", "30"))
+        self.redis_socket_timeout = float(os.environ.get("REDIS_SOCKET_TIMEOUT", "5"))
         self.chroma_url = os.environ.get("CHROMA_URL")
         self.model_name = os.environ.get("MODEL_NAME")
         self.llm_provider = (os.environ.get("LLM_PROVIDER") or "openai_compatible").strip().lower()
@@ -18,7 +22,12 @@ class ConnectorConfig:
         self.llm_api_url = self._resolve_llm_api_url()
         self.openrouter_http_referer = os.environ.get("OPENROUTER_HTTP_REFERER") or "https://euglena.vercel.app"
         self.openrouter_x_title = os.environ.get("OPENROUTER_X_TITLE") or "Euglena"
+        # Mark the stable prompt prefix as cacheable where the provider needs it
+        # (Anthropic cache_control); OpenAI-style prefix caching is automatic.
+        self.llm_prompt_cache = os.environ.get("LLM_PROMPT_CACHE", "true").lower() in ("1", "true", "yes", "on")
         self.search_api_key = os.environ.get("SEARCH_API_KEY")
+        # Offline load-test profile for LLM_PROVIDER=simulated (JSON text or file path).
+        self.sim_profile = os.environ.get("SIM_PROFILE", "")
 
         self.default_delay = int(os.environ.get("DEFAULT_DELAY", "2"))
         self.default_timeout = int(os.environ.get("DEFAULT_TIMEOUT", "5"))
@@ -32,6 +41,10 @@ class ConnectorConfig:
         self.input_queue = os.environ.get("AGENT_INPUT_QUEUE", "agent.mandates")
         self.status_queue = os.environ.get("AGENT_STATUS_QUEUE", "agent.status")
         self.status_time = float(os.environ.get("AGENT_STATUS_TIME", "10"))
+        self.agent_max_concurrent_tasks = max(1, int(os.environ.get("AGENT_MAX_CONCURRENT_TASKS", "1")))
+        self.agent_prefetch_count = max(
+            1, int(os.environ.get("AGENT_PREFETCH_COUNT", "0") or 0) or self.agent_max_concurrent_tasks
+        )
         self.gateway_debug_queue_name = os.environ.get("GATEWAY_DEBUG_QUEUE_NAME", "gateway.debug")
 
         tracking_value = os.environ.get("AGENT_ENABLE_TRACKING", "false").lower()
@@ -1,6 +1,7 @@
+import asyncio
 import json
 import logging
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Set
 import aio_pika
 from shared.connector_config import ConnectorConfig
 from shared.retry import Retry
@@ -305,51 +306,100 @@ class ConnectorRabbitMQ:
             self,
             queue_name: str,
             callback: Callable[[Dict[str, Any]], Any],
+            prefetch_count: int = 1,
+            concurrency: int = 1,
     ) -> None:
         """
         Start consuming messages from a queue.
-        Ensures only one unacknowledged message at a time (prefetch=1).
+        At most ``prefetch_count`` messages are unacknowledged at a time (default 1).
+        With ``concurrency`` > 1, up to that many callbacks run at once, each
+        message acknowledged when its own callback finishes.
         :param queue_name: Name of the queue to consume from.
         :param callback: Async function to handle each message.
+        :param prefetch_count: Broker-side limit on unacknowledged deliveries.
+        :param concurrency: Callbacks allowed to run concurrently.
         """
         if not await self.init_rabbitmq():
             raise RuntimeError("RabbitMQ not connected")
 
         self.logger.info(f"Preparing consumer for queue={queue_name}")
-        
-        await self.channel.set_qos(prefetch_count=1)
-        self.logger.debug(f"Set QoS prefetch=1 for queue={queue_name}")
-        
+
+        prefetch_count = max(1, int(prefetch_count), int(concurrency))
+        await self.channel.set_qos(prefetch_count=prefetch_count)
+        self.logger.debug(f"Set QoS prefetch={prefetch_count} for queue={queue_name}")
+
         queue = await self.channel.declare_queue(queue_name, durable=True)
 
-        self.logger.info(f"Consuming from {queue_name}")
-
-        async with queue.iterator() as queue_iter:
-            async for message in queue_iter:
-                async with message.process():
-                    try:
-                        raw = message.body.decode("utf-8", errors="ignore")
-                        self.logger.debug(
-                            "Received message",
-                            extra={
-                                "queue": queue_name,
-                                "correlation_id": getattr(message, "correlation_id", None),
-                                "size": len(message.body or b""),
-                                "preview": raw[:256],
-                            },
-                        )
-                        data = json.loads(raw)
-                        await callback(data)
-                        self.logger.debug(
-                            "Callback processed message",
-                            extra={
-                                "queue": queue_name,
-                                "correlation_id": getattr(message, "correlation_id", None),
-                            },
-                        )
-                    except Exception as e:
-                        self.logger.exception(f"Error processing message from {queue_name}: {e}")
-
-    async def consume_status_updates(self, callback: Callable[[dict], Any]) -> None:
-        """Consume status updates from workers."""
-        await self.consume_queue(self.config.status_queue, callback)
+        self.logger.info(f"Consuming from {queue_name} (concurrency={max(1, concurrency)})")
+
+        if concurrency <= 1:
+            async with queue.iterator() as queue_iter:
+                async for message in queue_iter:
+                    await self._process_message(queue_name, message, callback)
+            return
+
+        slots = asyncio.Semaphore(concurrency)
+        in_flight: Set[asyncio.Task] = set()
+
+        async def run(message: aio_pika.abc.AbstractIncomingMessage) -> None:
+            try:
+                await self._process_message(queue_name, message, callback)
+            finally:
+                slots.release()
+
+        try:
+            async with queue.iterator() as queue_iter:
+                async for message in queue_iter:
+                    await slots.acquire()
+                    task = asyncio.create_task(run(message))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _process_message(
+            self,
+            queue_name: str,
+            message: aio_pika.abc.AbstractIncomingMessage,
+            callback: Callable[[Dict[str, Any]], Any],
+    ) -> None:
+        """
+        Decode one message, run the callback and acknowledge it.
+        :param queue_name: Queue the message came from (for logging).
+        :param message: Incoming message.
+        :param callback: Async function to handle the decoded payload.
+        """
+        async with message.process():
+            try:
+                raw = message.body.decode("utf-8", errors="ignore")
+                self.logger.debug(
+                    "Received message",
+                    extra={
+                        "queue": queue_name,
+                        "correlation_id": getattr(message, "correlation_id", None),
+                        "size": len(message.body or b""),
+                        "preview": raw[:256],
+                    },
+                )
+                data = json.loads(raw)
+                await callback(data)
+                self.logger.debug(
+                    "Callback processed message",
+                    extra={
+                        "queue": queue_name,
+                        "correlation_id": getattr(message, "correlation_id", None),
+                    },
+                )
+            except Exception as e:
+                self.logger.exception(f"Error processing message from {queue_name}: {e}")
+
+    async def consume_status_updates(self, callback: Callable[[dict], Any], prefetch_count: int = 1) -> None:
+        """
+        Consume status updates from workers.
+        :param callback: Async function to handle each status envelope.
+        :param prefetch_count: Broker-side limit on unacknowledged deliveries.
+        """
+        await self.consume_queue(self.config.status_queue, callback, prefetch_count=prefetch_count)
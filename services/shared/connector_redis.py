@@ -1,22 +1,128 @@
 import json
 import logging
-from typing import Any, Optional
+import weakref
+from typing import Any, Dict, Optional, Tuple
 from shared.connector_config import ConnectorConfig
 from shared.retry import Retry
-from redis.asyncio import Redis
+from redis.asyncio import BlockingConnectionPool, Redis
 import asyncio
 
+# One pooled client per Redis URL, bound to the event loop that first used it.
+_shared_clients: Dict[str, Tuple[Optional[asyncio.AbstractEventLoop], Redis]] = {}
+# Live connectors, so a retired shared client can be detached from them.
+_connectors: "weakref.WeakSet[ConnectorRedis]" = weakref.WeakSet()
+
+
+def _detach_connectors(client: Redis) -> None:
+    for connector in list(_connectors):
+        if connector._redis is client:
+            connector._redis = None
+            connector.redis_ready = False
+
+
+def _close_stale_client(owner: Optional[asyncio.AbstractEventLoop], client: Redis) -> None:
+    """
+    Close a shared client replaced because the running loop changed.
+    :param owner: Loop the client's connections belong to.
+    :param client: Replaced client.
+    """
+    _detach_connectors(client)
+    pool = client.connection_pool
+    if owner is not None and owner.is_running() and not owner.is_closed():
+        # Still serving another thread: close the connections on their own loop.
+        asyncio.run_coroutine_threadsafe(pool.disconnect(), owner)
+        return
+    # The owning loop has stopped, so nothing can await these connections and
+    # their transports can no longer schedule a close; close the sockets now.
+    for connection in [*pool._available_connections, *pool._in_use_connections]:
+        transport = getattr(getattr(connection, "_writer", None), "transport", None)
+        sock = getattr(transport, "_sock", None)
+        if sock is not None:
+            sock.close()
+        connection._reader = connection._writer = None
+    pool.reset()
+
+
+def shared_redis_client(config: Optional[ConnectorConfig] = None) -> Optional[Redis]:
+    """
+    Process-wide pooled Redis client for ``config.redis_url``.
+
+    Every ConnectorRedis (task storage, worker state and presence, quotas, the
+    LLM cache) and the Redis checkpointer share it, so the process holds one
+    connection pool instead of one client per component. The pool blocks up to
+    ``REDIS_POOL_TIMEOUT`` seconds for a free connection
+    (``REDIS_POOL_SIZE``) and pings connections idle longer than
+    ``REDIS_HEALTH_CHECK_INTERVAL`` before reuse; broken connections are
+    replaced on the next command. Connections belong to one event loop, so a
+    new client is built when the running loop changes and the old one is
+    closed.
+
+    :param config: Connector configuration (default: from the environment).
+    :returns: Shared client, or None when ``REDIS_URL`` is not set.
+    """
+    config = config or ConnectorConfig()
+    url = config.redis_url
+    if not url:
+        return None
+    try:
+        loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    entry = _shared_clients.get(url)
+    if entry is not None:
+        owner, client = entry
+        if owner is None or owner is loop or loop is None:
+            if owner is None and loop is not None:
+                _shared_clients[url] = (loop, client)
+            return client
+        _close_stale_client(owner, client)
+    pool = BlockingConnectionPool.from_url(
+        url,
+        max_connections=max(1, config.redis_pool_size),
+        timeout=config.redis_pool_timeout,
+        health_check_interval=config.redis_health_check_interval,
+        socket_connect_timeout=config.redis_socket_timeout,
+        socket_timeout=config.redis_socket_timeout,
+        socket_keepalive=True,
+        retry_on_timeout=True,
+    )
+    client = Redis(connection_pool=pool)
+    _shared_clients[url] = (loop, client)
+    return client
+
+
+async def close_shared_redis() -> None:
+    """
+    Close every shared Redis pool owned by the running loop (service shutdown).
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    for url, (owner, client) in list(_shared_clients.items()):
+        if owner is not None and owner is not loop:
+            continue
+        _shared_clients.pop(url, None)
+        _detach_connectors(client)
+        try:
+            await client.connection_pool.disconnect()
+        except Exception:
+            pass
+
 
 class ConnectorRedis:
     """
     Async Redis connector managed by ConnectorConfig.
 
-    Persistent, lazy-initialized client:
-    - First access creates a single Redis client and verifies connectivity.
-    - Subsequent accesses reuse the same client for the lifetime of the instance.
-    - The async context manager does not close the connection on exit to avoid
-      reconnect churn during frequent operations; call disconnect() explicitly
-      at service shutdown if needed.
+    Lazy-initialized view over the process-wide pooled client
+    (``shared_redis_client``):
+    - First access verifies connectivity with retries.
+    - Every instance in the process shares one connection pool, so opening a
+      connector or entering its context manager costs no connection setup.
+    - disconnect() only detaches this instance; call close_shared_redis() at
+      service shutdown to close the pool. Closing or replacing the shared
+      client detaches every connector using it (``redis_ready`` turns False),
+      so the next access verifies the new client.
     """
 
     def __init__(self, config: ConnectorConfig):
@@ -24,6 +130,7 @@ class ConnectorRedis:
         self.logger = logging.getLogger(self.__class__.__name__)
         self._redis: Optional[Redis] = None
         self.redis_ready = False
+        _connectors.add(self)
 
     async def __aenter__(self):
         return await self.connect()
@@ -51,7 +158,7 @@ class ConnectorRedis:
             return False
 
         try:
-            self._redis = Redis.from_url(redis_url)
+            self._redis = shared_redis_client(self.config)
             await self._redis.ping()
             self.logger.info("Redis OPERATIONAL")
             self.redis_ready = True
@@ -85,34 +192,30 @@ class ConnectorRedis:
 
     async def disconnect(self):
         """
-        Close the Redis client explicitly. This is typically called during
-        application shutdown; regular operations keep the connection open.
+        Detach this connector from the shared pool. The pool itself stays open
+        for other components; close_shared_redis() closes it at shutdown.
         """
         if self._redis is not None:
-            try:
-                await self._redis.aclose()
-            except AttributeError:
-                await self._redis.close()
-            except Exception:
-                pass
             self._redis = None
             self.redis_ready = False
-            self.logger.debug("Redis connection closed")
+            self.logger.debug("Redis connector detached")
 
     async def get_client(self) -> Any:
         """
-        Accessor for the underlying Redis client.
+        Accessor for the shared pooled Redis client.
         """
         if not await self.init_redis():
             self.logger.warning("Redis not ready.")
             return None
+        self._redis = shared_redis_client(self.config) or self._redis
         return self._redis
 
     async def quick_ping(self, timeout_s: float = 1.0) -> bool:
         """
         Quick Redis connectivity probe without retries.
 
-        :param timeout_s: Timeout in seconds for connect+ping.
+        Uses the shared pool, so a healthy process pays no connection setup.
+        :param timeout_s: Timeout in seconds for acquiring a connection and ping.
         :returns: True when ping succeeds, False otherwise.
         """
         redis_url = self.config.redis_url
@@ -121,22 +224,8 @@ class ConnectorRedis:
             return False
 
         async def _do() -> bool:
-            client = Redis.from_url(
-                redis_url,
-                socket_connect_timeout=timeout_s,
-                socket_timeout=timeout_s,
-            )
-            try:
-                await client.ping()
-                return True
-            finally:
-                try:
-                    await client.aclose()
-                except Exception:
-                    try:
-                        await client.close()
-                    except Exception:
-                        pass
+            client = shared_redis_client(self.config)
+            return bool(await client.ping())
 
         try:
             ok = await asyncio.wait_for(_do(), timeout=timeout_s)
@@ -1,5 +1,6 @@
 class RequestResult:
-    def __init__(self, status, data, error: bool=False):
+    def __init__(self, status, data, error: bool=False, headers: dict | None=None):
         self.status = status
         self.error: bool = error
         self.data = data
+        self.headers: dict = headers or {}
@@ -5,6 +5,8 @@ from datetime import datetime
 import json
 import asyncio
 
+from redis.exceptions import ResponseError, WatchError
+
 from shared.connector_redis import ConnectorRedis
 from shared.connector_config import ConnectorConfig
 from supabase import Client
@@ -41,12 +43,26 @@ class TaskStorage(ABC):
 
 
 class RedisTaskStorage(TaskStorage):
-    """Redis-backed task storage using JSON serialization.
+    """Redis-backed task storage: one hash per task, one JSON-encoded value per field.
 
     Uses ConnectorRedis for connection lifecycle.
     Keys are stored under the prefix 'task:{correlation_id}'.
+
+    ``update_task`` writes only the changed fields with a single pipelined
+    ``HSET``, so a heartbeat never re-encodes a large ``result`` and
+    concurrent writers (heartbeat vs terminal status) cannot overwrite each
+    other's fields. Records written by older versions as one JSON string are
+    still read, and are converted to a hash on their first update.
+
+    Every write also records which fields changed: the task id joins the set
+    ``task_sync:dirty`` and the field names join ``task_sync:fields:{id}``
+    (same pipeline, no extra round trip). ``drain_changes`` hands those to the
+    gateway's Supabase sync, so it only touches tasks and fields that changed.
     """
 
+    DIRTY_KEY = "task_sync:dirty"
+    FIELDS_PREFIX = "task_sync:fields:"
+
     def __init__(self, config: Optional[ConnectorConfig] = None):
         self.config = config or ConnectorConfig()
         self.connector = ConnectorRedis(self.config)
@@ -56,38 +72,133 @@ class RedisTaskStorage(TaskStorage):
     def _key(self, correlation_id: str) -> str:
         return f"{self._prefix}{correlation_id}"
 
+    def _fields_key(self, correlation_id: str) -> str:
+        return f"{self.FIELDS_PREFIX}{correlation_id}"
+
+    def _mark_changed(self, pipe, correlation_id: str, fields) -> None:
+        fields = list(fields)
+        if fields:
+            pipe.sadd(self._fields_key(correlation_id), *fields)
+        pipe.sadd(self.DIRTY_KEY, correlation_id)
+
+    @staticmethod
+    def _encode_fields(data: dict) -> dict:
+        encoded = {}
+        for field, value in data.items():
+            try:
+                encoded[str(field)] = json.dumps(value)
+            except (TypeError, ValueError):
+                encoded[str(field)] = json.dumps(str(value))
+        return encoded
+
+    @staticmethod
+    def _decode_value(value):
+        text = value.decode("utf-8") if isinstance(value, (bytes, bytearray)) else value
+        try:
+            return json.loads(text)
+        except Exception:
+            return text
+
+    @classmethod
+    def _decode_hash(cls, raw: dict) -> dict:
+        return {
+            (k.decode("utf-8") if isinstance(k, (bytes, bytearray)) else k): cls._decode_value(v)
+            for k, v in raw.items()
+        }
+
+    @classmethod
+    def _decode_legacy(cls, raw) -> Optional[dict]:
+        """Decode a pre-hash record stored as one JSON string."""
+        if raw is None:
+            return None
+        value = cls._decode_value(raw)
+        return value if isinstance(value, dict) else {"raw": value}
+
+    @staticmethod
+    def _is_wrong_type(exc: Exception) -> bool:
+        return isinstance(exc, ResponseError) and "WRONGTYPE" in str(exc)
+
     async def create_task(self, correlation_id: str, task_data: dict) -> None:
-        """Create a task record in Redis.
+        """Create a task record in Redis, replacing any existing record.
 
         Args:
             correlation_id: Unique identifier used as the redis key suffix
             task_data: JSON-serializable dictionary describing the task
         """
+        data = dict(task_data or {})
+        data.setdefault("correlation_id", correlation_id)
         async with self.connector as conn:
-            await conn.set_json(self._key(correlation_id), task_data)
+            client = await conn.get_client()
+            if client is None:
+                return
+            key = self._key(correlation_id)
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.delete(key)
+                pipe.hset(key, mapping=self._encode_fields(data))
+                self._mark_changed(pipe, correlation_id, data.keys())
+                await pipe.execute()
             self.logger.info(f"Created task {correlation_id} (redis)")
 
     async def get_task(self, correlation_id: str) -> Optional[dict]:
-        """Get a task record from Redis (already JSON-decoded by the connector)."""
+        """Get a task record from Redis, decoding per-field values (or a legacy JSON record)."""
         async with self.connector as conn:
-            return await conn.get_json(self._key(correlation_id))
+            client = await conn.get_client()
+            if client is None:
+                return None
+            key = self._key(correlation_id)
+            try:
+                raw = await client.hgetall(key)
+            except ResponseError as exc:
+                if not self._is_wrong_type(exc):
+                    raise
+                return self._decode_legacy(await client.get(key))
+            return self._decode_hash(raw) if raw else None
 
     async def update_task(self, correlation_id: str, updates: dict) -> None:
-        """Apply partial updates to a task record and update the timestamp."""
+        """Atomically set the given fields and the timestamp (one pipelined round trip)."""
         async with self.connector as conn:
+            client = await conn.get_client()
+            if client is None:
+                return
             key = self._key(correlation_id)
-            existing = await conn.get_json(key) or {}
-            if not isinstance(existing, dict):
-                # Preserve any unexpected existing content under 'raw'
-                existing = {"raw": existing}
+            fields = dict(updates or {})
+            fields["updated_at"] = datetime.utcnow().isoformat()
+            encoded = self._encode_fields(fields)
+            try:
+                await self._hset_fields(client, key, correlation_id, encoded)
+            except ResponseError as exc:
+                if not self._is_wrong_type(exc):
+                    raise
+                await self._migrate_legacy(client, key, correlation_id)
+                await self._hset_fields(client, key, correlation_id, encoded)
+
+    async def _hset_fields(self, client, key: str, correlation_id: str, encoded: dict) -> None:
+        async with client.pipeline(transaction=True) as pipe:
+            pipe.hsetnx(key, "correlation_id", json.dumps(correlation_id))
+            pipe.hset(key, mapping=encoded)
+            self._mark_changed(pipe, correlation_id, encoded.keys())
+            await pipe.execute()
+
+    async def _migrate_legacy(self, client, key: str, correlation_id: str) -> None:
+        """Rewrite a legacy JSON-string record as a hash, unless another writer already did."""
+        async with client.pipeline(transaction=True) as pipe:
+            await pipe.watch(key)
+            if await pipe.type(key) not in (b"string", "string"):
+                return
+            existing = self._decode_legacy(await pipe.get(key)) or {}
             existing.setdefault("correlation_id", correlation_id)
-            existing.update(updates)
-            existing["updated_at"] = datetime.utcnow().isoformat()
-            await conn.set_json(key, existing)
+            pipe.multi()
+            pipe.delete(key)
+            pipe.hset(key, mapping=self._encode_fields(existing))
+            try:
+                await pipe.execute()
+            except WatchError:
+                pass
+        self.logger.info(f"Migrated task {correlation_id} to hash storage (redis)")
 
     async def list_tasks(self) -> list[dict]:
         """
-        List all task records currently stored in Redis.
+        List all task records currently stored in Redis (pipelined HGETALL per scan page).
         """
         async with self.connector as conn:
             client = await conn.get_client()
@@ -97,28 +208,98 @@ class RedisTaskStorage(TaskStorage):
             while True:
                 cursor, keys = await client.scan(cursor=cursor, match=pattern, count=100)
                 if keys:
-                    vals = await client.mget(keys)
-                    for v in vals:
-                        if v is None:
+                    async with client.pipeline(transaction=False) as pipe:
+                        for key in keys:
+                            pipe.hgetall(key)
+                        results = await pipe.execute(raise_on_error=False)
+                    legacy_keys = []
+                    for key, raw in zip(keys, results):
+                        if isinstance(raw, Exception):
+                            if self._is_wrong_type(raw):
+                                legacy_keys.append(key)
                             continue
-                        try:
-                            tasks.append(json.loads(v))
-                        except Exception:
-                            try:
-                                tasks.append({"raw": v.decode("utf-8")})
-                            except Exception:
-                                tasks.append({"raw": str(v)})
+                        if raw:
+                            tasks.append(self._decode_hash(raw))
+                    if legacy_keys:
+                        for raw in await client.mget(legacy_keys):
+                            record = self._decode_legacy(raw)
+                            if record is not None:
+                                tasks.append(record)
                 if cursor == 0:
                     break
             return tasks
 
+    async def drain_changes(self, limit: int = 100) -> list[tuple[str, dict, Optional[set]]]:
+        """
+        Pop up to ``limit`` changed tasks with the fields changed since the last drain.
+
+        ``SPOP`` claims the ids; their field names and values are then read,
+        and their dirty flags cleared, in one transaction. Writes are atomic
+        too, so one landing between the pop and that transaction is included
+        in this drain, and one landing after it marks the task dirty again.
+        :param limit: Maximum number of tasks to return.
+        :return: ``(correlation_id, record, changed_fields)`` per task; ``changed_fields``
+            is None when the writer did not record field names (send the whole record).
+        """
+        async with self.connector as conn:
+            client = await conn.get_client()
+            if client is None:
+                return []
+            ids = await client.spop(self.DIRTY_KEY, max(1, int(limit)))
+            if not ids:
+                return []
+            ids = [i.decode("utf-8") if isinstance(i, (bytes, bytearray)) else str(i) for i in ids]
+            async with client.pipeline(transaction=True) as pipe:
+                for correlation_id in ids:
+                    pipe.smembers(self._fields_key(correlation_id))
+                    pipe.delete(self._fields_key(correlation_id))
+                    pipe.hgetall(self._key(correlation_id))
+                # A write after the pop re-added the id; its fields are read here.
+                pipe.srem(self.DIRTY_KEY, *ids)
+                results = await pipe.execute(raise_on_error=False)
+            changes: list[tuple[str, dict, Optional[set]]] = []
+            for index, correlation_id in enumerate(ids):
+                fields, _, raw = results[3 * index: 3 * index + 3]
+                if isinstance(raw, Exception):
+                    if not self._is_wrong_type(raw):
+                        continue
+                    record = self._decode_legacy(await client.get(self._key(correlation_id)))
+                else:
+                    record = self._decode_hash(raw) if raw else None
+                if not record:
+                    continue
+                names = None
+                if isinstance(fields, (set, list)) and fields:
+                    names = {f.decode("utf-8") if isinstance(f, (bytes, bytearray)) else f for f in fields}
+                record.setdefault("correlation_id", correlation_id)
+                changes.append((correlation_id, record, names))
+            return changes
+
+    async def mark_changed(self, correlation_id: str, fields=None) -> None:
+        """
+        Re-queue a task for the change-feed sync (e.g. after a failed Supabase write).
+        :param correlation_id: Task correlation id.
+        :param fields: Changed field names; None marks the whole record.
+        """
+        async with self.connector as conn:
+            client = await conn.get_client()
+            if client is None:
+                return
+            async with client.pipeline(transaction=True) as pipe:
+                self._mark_changed(pipe, correlation_id, fields or ())
+                await pipe.execute()
+
     async def delete_task(self, correlation_id: str) -> bool:
         """Delete a task record by key. Returns True if a key was removed."""
         async with self.connector as conn:
             client = await conn.get_client()
             if client is None:
                 return False
-            deleted = await client.delete(self._key(correlation_id))
+            async with client.pipeline(transaction=True) as pipe:
+                pipe.delete(self._key(correlation_id))
+                pipe.delete(self._fields_key(correlation_id))
+                pipe.srem(self.DIRTY_KEY, correlation_id)
+                deleted, _, _ = await pipe.execute()
             if deleted:
                 self.logger.info(f"Deleted task {correlation_id} (redis)")
             return bool(deleted)
@@ -0,0 +1,122 @@
+import asyncio
+import socket
+import threading
+
+import pytest
+
+from shared.connector_config import ConnectorConfig
+from shared.connector_redis import ConnectorRedis, close_shared_redis, shared_redis_client
+
+
+@pytest.fixture
+def config(monkeypatch):
+    # Nothing listens on port 1: no live Redis is needed for these tests.
+    monkeypatch.setenv("REDIS_URL", "redis://127.0.0.1:1/0")
+    monkeypatch.setenv("REDIS_POOL_SIZE", "4")
+    return ConnectorConfig()
+
+
+@pytest.mark.asyncio
+async def test_components_share_one_pooled_client(config):
+    first = shared_redis_client(config)
+    assert shared_redis_client(ConnectorConfig()) is first
+    pool = first.connection_pool
+    assert pool.max_connections == 4
+    assert pool.connection_kwargs["health_check_interval"] == config.redis_health_check_interval
+    await close_shared_redis()
+    assert shared_redis_client(config) is not first
+    await close_shared_redis()
+
+
+def test_new_event_loop_gets_its_own_client(config):
+    async def grab():
+        return shared_redis_client(config)
+
+    first = asyncio.run(grab())
+    second = asyncio.run(grab())
+    assert first is not second
+    asyncio.run(close_shared_redis())
+
+
+def test_no_url_means_no_client(monkeypatch):
+    monkeypatch.delenv("REDIS_URL", raising=False)
+    assert shared_redis_client(ConnectorConfig()) is None
+
+
+@pytest.mark.asyncio
+async def test_quick_ping_uses_shared_pool_and_fails_fast(config):
+    connector = ConnectorRedis(config)
+    assert await connector.quick_ping(timeout_s=0.5) is False
+    assert connector.redis_ready is False
+    assert shared_redis_client(config) is shared_redis_client(config)
+    await close_shared_redis()
+
+
+@pytest.fixture
+def pong_url(monkeypatch):
+    """A stand-in server that answers PING with PONG and anything else with OK."""
+    server = socket.create_server(("127.0.0.1", 0))
+    stop = threading.Event()
+
+    def serve(conn):
+        with conn:
+            while not stop.is_set():
+                try:
+                    data = conn.recv(4096)
+                except OSError:
+                    return
+                if not data:
+                    return
+                conn.sendall(b"+PONG\r\n" if b"PING" in data else b"+OK\r\n")
+
+    def accept():
+        while not stop.is_set():
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            threading.Thread(target=serve, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept, daemon=True).start()
+    monkeypatch.setenv("REDIS_URL", f"redis://127.0.0.1:{server.getsockname()[1]}/0")
+    yield
+    stop.set()
+    server.close()
+
+
+def _open_sockets(client):
+    return [c._writer.transport.get_extra_info("socket") for c in client.connection_pool._available_connections]
+
+
+def test_loop_change_closes_the_old_pool_and_detaches_connectors(pong_url):
+    connector = ConnectorRedis(ConnectorConfig())
+
+    async def use():
+        client = await connector.get_client()
+        assert await client.ping()
+        return client
+
+    first = asyncio.run(use())
+    sockets = _open_sockets(first)
+    assert sockets and connector.redis_ready
+
+    async def grab():
+        return shared_redis_client(ConnectorConfig())
+
+    second = asyncio.run(grab())
+    assert second is not first
+    assert all(s.fileno() == -1 for s in sockets)
+    assert connector.redis_ready is False
+    assert asyncio.run(use()) is not first
+    asyncio.run(close_shared_redis())
+
+
+@pytest.mark.asyncio
+async def test_close_shared_redis_detaches_connectors(pong_url):
+    connector = ConnectorRedis(ConnectorConfig())
+    first = await connector.get_client()
+    assert connector.redis_ready
+    await close_shared_redis()
+    assert connector.redis_ready is False
+    assert await connector.get_client() is not first
+    await close_shared_redis()
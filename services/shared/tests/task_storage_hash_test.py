@@ -0,0 +1,220 @@
+"""
+Unit tests for hash-backed RedisTaskStorage against an in-memory Redis stand-in.
+"""
+import json
+
+import pytest
+from redis.exceptions import ResponseError
+
+from shared.connector_config import ConnectorConfig
+from shared.storage import RedisTaskStorage
+
+WRONGTYPE = "WRONGTYPE Operation against a key holding the wrong kind of value"
+
+
+class MemoryRedis:
+    """Just enough of redis.asyncio.Redis for RedisTaskStorage (bytes in, bytes out)."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    @staticmethod
+    def _b(value):
+        return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+    def _hash(self, key):
+        value = self.data.setdefault(key, {})
+        if not isinstance(value, dict):
+            raise ResponseError(WRONGTYPE)
+        return value
+
+    async def _hgetall(self, key):
+        value = self.data.get(key, {})
+        if not isinstance(value, dict):
+            raise ResponseError(WRONGTYPE)
+        return dict(value)
+
+    async def _get(self, key):
+        value = self.data.get(key)
+        if isinstance(value, dict):
+            raise ResponseError(WRONGTYPE)
+        return value
+
+    async def _type(self, key):
+        value = self.data.get(key)
+        return b"none" if value is None else b"hash" if isinstance(value, dict) else b"string"
+
+    async def _hset(self, key, mapping):
+        self._hash(key).update({self._b(k): self._b(v) for k, v in mapping.items()})
+
+    async def _hsetnx(self, key, field, value):
+        self._hash(key).setdefault(self._b(field), self._b(value))
+
+    async def _delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+    async def _sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(self._b(m) for m in members)
+
+    async def _srem(self, key, *members):
+        self.data.get(key, set()).difference_update(self._b(m) for m in members)
+
+    async def _smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    async def spop(self, key, count):
+        self.round_trips += 1
+        members = self.data.get(key, set())
+        return [members.pop() for _ in range(min(count, len(members)))]
+
+    async def hgetall(self, key):
+        self.round_trips += 1
+        return await self._hgetall(key)
+
+    async def get(self, key):
+        self.round_trips += 1
+        return await self._get(key)
+
+    async def delete(self, key):
+        self.round_trips += 1
+        return await self._delete(key)
+
+    async def scan(self, cursor=0, match=None, count=None):
+        self.round_trips += 1
+        prefix = (match or "*").rstrip("*")
+        return 0, [k for k in self.data if k.startswith(prefix)]
+
+    async def mget(self, keys):
+        self.round_trips += 1
+        return [v if not isinstance(v, dict) else None for v in (self.data.get(k) for k in keys)]
+
+    def pipeline(self, transaction=True):
+        return MemoryPipeline(self)
+
+
+class MemoryPipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.queued = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def watch(self, key):
+        return None
+
+    def multi(self):
+        return None
+
+    async def type(self, key):
+        return await self.redis._type(key)
+
+    async def get(self, key):
+        return await self.redis._get(key)
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, f"_{name}")
+        return lambda *args, **kwargs: self.queued.append((method, args, kwargs))
+
+    async def execute(self, raise_on_error=True):
+        self.redis.round_trips += 1
+        results = []
+        for method, args, kwargs in self.queued:
+            try:
+                results.append(await method(*args, **kwargs))
+            except ResponseError as exc:
+                if raise_on_error:
+                    raise
+                results.append(exc)
+        self.queued = []
+        return results
+
+
+@pytest.fixture
+def storage():
+    store = RedisTaskStorage(ConnectorConfig())
+    client = MemoryRedis()
+
+    async def get_client():
+        return client
+
+    store.connector.redis_ready = True
+    store.connector.get_client = get_client
+    return store, client
+
+
+@pytest.mark.asyncio
+async def test_update_writes_only_changed_fields_in_one_round_trip(storage):
+    store, client = storage
+    await store.create_task("c1", {"status": "pending", "mandate": "m", "result": {"big": "x" * 1000}})
+    client.round_trips = 0
+    await store.update_task("c1", {"status": "in_progress", "tick": 3})
+    assert client.round_trips == 1
+    stored = client.data["task:c1"]
+    assert json.loads(stored[b"result"]) == {"big": "x" * 1000}
+    task = await store.get_task("c1")
+    assert task["status"] == "in_progress" and task["tick"] == 3 and task["correlation_id"] == "c1"
+    assert "updated_at" in task
+
+
+@pytest.mark.asyncio
+async def test_legacy_json_records_are_read_and_migrated(storage):
+    store, client = storage
+    client.data["task:old"] = json.dumps({"status": "in_progress", "mandate": "m"}).encode()
+    client.data["task:new"] = {}
+    await store.update_task("new", {"status": "completed"})
+    assert (await store.get_task("old"))["status"] == "in_progress"
+    assert sorted(t["status"] for t in await store.list_tasks()) == ["completed", "in_progress"]
+
+    await store.update_task("old", {"status": "completed"})
+    assert isinstance(client.data["task:old"], dict)
+    assert await store.get_task("old") == {
+        "status": "completed", "mandate": "m", "correlation_id": "old",
+        "updated_at": (await store.get_task("old"))["updated_at"],
+    }
+    assert await store.delete_task("old") and await store.get_task("old") is None
+
+
+@pytest.mark.asyncio
+async def test_drain_changes_returns_only_changed_fields_once(storage):
+    store, client = storage
+    await store.create_task("c1", {"status": "pending", "mandate": "m"})
+    first = await store.drain_changes(10)
+    assert [(cid, fields) for cid, _, fields in first] == [("c1", {"status", "mandate", "correlation_id"})]
+    assert await store.drain_changes(10) == []
+
+    await store.update_task("c1", {"tick": 4})
+    await store.update_task("c1", {"status": "in_progress"})
+    [(cid, record, fields)] = await store.drain_changes(10)
+    assert fields == {"tick", "status", "updated_at"} and record["tick"] == 4
+
+    await store.mark_changed("c1", {"tick"})
+    assert [f for _, _, f in await store.drain_changes(10)] == [{"tick"}]
+    await store.update_task("c1", {"tick": 5})
+    await store.delete_task("c1")
+    assert await store.drain_changes(10) == []
+
+
+@pytest.mark.asyncio
+async def test_drain_changes_includes_a_write_landing_after_the_pop(storage):
+    store, client = storage
+    await store.create_task("c1", {"status": "pending", "mandate": "m"})
+    await store.drain_changes(10)
+    await store.update_task("c1", {"tick": 1})
+    real_spop = client.spop
+
+    async def spop_then_write(key, count):
+        popped = await real_spop(key, count)
+        await store.update_task("c1", {"status": "in_progress"})
+        return popped
+
+    client.spop = spop_then_write
+    [(_, record, fields)] = await store.drain_changes(10)
+    client.spop = real_spop
+    assert fields == {"tick", "status", "updated_at"} and record["status"] == "in_progress"
+    # Nothing left to resend: the late write was part of this drain.
+    assert await store.drain_changes(10) == []
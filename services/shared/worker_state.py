@@ -33,15 +33,28 @@ class WorkerState:
         self._prefix = os.environ.get("WORKER_STATE_PREFIX", "worker_state")
         self._key = f"{self._prefix}:{self.worker_type}:{self.worker_id}"
 
-    async def set_state(self, state: str, ttl_seconds: int) -> bool:
+    async def set_state(
+        self,
+        state: str,
+        ttl_seconds: int,
+        active: Optional[int] = None,
+        capacity: Optional[int] = None,
+    ) -> bool:
         """
         Set the current worker state with a TTL.
 
         :param state: Worker state label
         :param ttl_seconds: Expiration for the state key
+        :param active: Tasks currently running on the worker
+        :param capacity: Tasks the worker can run at once
         :returns: True when updated, False otherwise
         """
         payload = {"state": state, "ts": datetime.utcnow().isoformat()}
+        if active is not None:
+            payload["active"] = int(active)
+        if capacity is not None:
+            payload["capacity"] = int(capacity)
+            payload["available"] = max(0, int(capacity) - int(active or 0))
         try:
             async with self._redis as conn:
                 return await conn.set_json(self._key, payload, ex=int(ttl_seconds))